@@ -0,0 +1,134 @@
+"""
+Benchmark of the creation of download cards and download list rows.
+
+Creates download items with:
+
+- legacy: the original card, which read its stylesheet and SVG icons from
+  the disk and registered the Nunito font again for every card.
+- card: the `Card` widget with the shared stylesheets, fonts and icons of
+  the asset registry.
+- row: a row of the `DownloadListModel` shown by the download page.
+
+Usage:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_card_creation.py --cards 500
+
+Every card is created and polished, so its stylesheet is applied, and its
+size hint is computed; the cards are deleted once timed. The package must be
+importable (e.g. `python -m pip install -e .`).
+"""
+
+import argparse, time
+from pathlib import Path
+from typing import Callable, Dict
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont, QFontDatabase, QIcon
+from PyQt5.QtSvg import QSvgWidget
+from PyQt5.QtWidgets import (
+    QApplication,
+    QFrame,
+    QHBoxLayout,
+    QLabel,
+    QProgressBar,
+    QPushButton,
+    QVBoxLayout,
+    QWidget,
+)
+from uqload_dl_gui.utils import format_video_size, format_video_type
+from uqload_dl_gui.views.cardDownload import Card
+from uqload_dl_gui.views.downloadList import DownloadListModel
+
+PARENT_PATH = Path(__file__).parent.parent / "uqload_dl_gui"
+
+VIDEO = {
+    "title": "Benchmark video",
+    "video_url": "https://test.com/test.mp4",
+    "size": 17000000,
+    "type": "video/mp4",
+}
+
+
+def legacy_card(parent: QWidget) -> QFrame:
+    card = QFrame(parent)
+    card.setObjectName("card")
+    card.setStyleSheet((PARENT_PATH / "assets/styles/cardDownload.qss").read_text())
+    font_path = str(PARENT_PATH / "assets/fonts/nunito-font/Nunito-Regular.ttf")
+    font_id = QFontDatabase.addApplicationFont(font_path)
+    font_family = QFontDatabase.applicationFontFamilies(font_id)[0]
+
+    total_size = format_video_size(VIDEO.get("size"))
+    thumbnail = QSvgWidget(str(PARENT_PATH / "assets/icons/video-solid.svg"))
+    thumbnail.setFixedSize(26, 26)
+    thumbnail.renderer().setAspectRatioMode(Qt.AspectRatioMode.KeepAspectRatio)
+    content = QFrame(card)
+    content_layout = QVBoxLayout(content)
+    title_frame = QFrame(content)
+    title_layout = QHBoxLayout(title_frame)
+    title = QLabel(VIDEO["title"])
+    title.setFont(QFont(font_family))
+    format_badge = QPushButton(format_video_type(VIDEO.get("type")))
+    format_badge.setFont(QFont(font_family))
+    size_badge = QPushButton(total_size)
+    size_badge.setFont(QFont(font_family))
+    title_layout.addWidget(title, 2)
+    title_layout.addWidget(size_badge)
+    title_layout.addWidget(format_badge)
+    bytes_label = QLabel(f"0 MB/{total_size}")
+    bytes_label.setFont(QFont(font_family))
+    content_layout.addWidget(title_frame)
+    content_layout.addWidget(QProgressBar())
+    content_layout.addWidget(bytes_label)
+    delete_button = QPushButton(
+        icon=QIcon(str(PARENT_PATH / "assets/icons/xmark-solid.svg"))
+    )
+    layout = QHBoxLayout(card)
+    layout.addWidget(thumbnail)
+    layout.addWidget(content, 2)
+    layout.addWidget(delete_button)
+    return card
+
+
+def run_cards(create: Callable[[QWidget], QWidget], count: int) -> float:
+    parent = QWidget()
+    cards = []
+    start = time.perf_counter()
+    for _ in range(count):
+        card = create(parent)
+        card.ensurePolished()
+        card.sizeHint()
+        cards.append(card)
+    elapsed = time.perf_counter() - start
+    for card in cards:
+        card.deleteLater()
+    parent.deleteLater()
+    QApplication.processEvents()
+    return elapsed
+
+
+def run_rows(count: int) -> float:
+    model = DownloadListModel()
+    start = time.perf_counter()
+    for index in range(count):
+        model.add_item(f"{index}", dict(VIDEO))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cards", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=10000)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    results: Dict[str, float] = {
+        "legacy": args.cards / run_cards(legacy_card, args.cards),
+        "card": args.cards
+        / run_cards(lambda parent: Card(parent, dict(VIDEO)), args.cards),
+        "row": args.rows / run_rows(args.rows),
+    }
+    for name, rate in results.items():
+        print(f"{name:8} {rate:12,.0f} items/s")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark of the extraction of the video information from UQLoad pages.
+
+Builds an embed page and a video page padded with filler markup, then
+extracts the video information with:
+
+- regex: the original parser, the pages joined, lowercased twice and
+  searched with seven separate regex passes.
+- extractor: PageExtractor fed in 16 KB chunks, stopping once every field
+  is found.
+
+Usage:
+    python benchmarks/bench_page_parsing.py --page-kb 256 --runs 200
+
+Peak memory is measured with tracemalloc and includes the joined pages for
+the regex parser and the chunks kept for the extractor.
+The package must be importable (e.g. `python -m pip install -e .`).
+"""
+
+import argparse, re, time, tracemalloc
+from typing import Callable, Dict, List
+from uqload_dl_gui.pageExtractor import PageExtractor
+from uqload_dl_gui.utils import remove_special_characters
+
+CHUNK_SIZE = 16 * 1024
+
+EMBED_FIELDS = """<script type='text/javascript'>var player = new Clappr.Player({
+        sources: ["https://m180.uqload.to/3rfkv4rhrvw2q4drdkgpxmnva6flydhkehdqtxrb6635d6s4w6jydebrci5q/v.mp4"],
+        poster: "https://m180.uqload.to/i/05/02288/vule3vel9n5q_xt.jpg",
+        ,chromecast: { media: {title: "python testing"}, poster: "https://m180.uqload.to/i/05/02288/vule3vel9n5q.jpg" }
+        });
+</script>
+"""
+
+VIDEO_FIELDS = """<h1>My video</h1>
+<textarea style="min-height:100px;" id="forumcodetext" class="form-control input-lg"
+onfocus="copy(this);">[URL=https://uqload.to/vule3vel9n5q.html][IMG]https://m180.uqload.to/i/05/02288/vule3vel9n5q_t.jpg[/IMG]
+python testing[/URL]
+[860x360, 00:22]</textarea>
+"""
+
+FILLER = '<div class="row"><a href="/videos/page">Related video</a></div>\n'
+
+
+def build_page(fields: str, size: int) -> str:
+    head = FILLER * (size // 4 // len(FILLER))
+    tail = FILLER * ((size - len(head) - len(fields)) // len(FILLER))
+    return head + fields + tail
+
+
+def parse_regex(pages: List[str]) -> Dict[str, str]:
+    concatenated_response = "\n".join(pages)
+    if (
+        concatenated_response.lower().find("file was deleted") > -1
+        or concatenated_response.lower().find("file not found") > -1
+    ):
+        raise RuntimeError("Video not Found")
+    video_url = re.search(r"https?://.+/v\.mp4", concatenated_response).group()
+    img_url = re.search(r"https?://.*?\.jpg", concatenated_response).group()
+    title = re.search(r"title:\s*\"(.*?)\"", concatenated_response).group(1)
+    video_info = {
+        "title": remove_special_characters(title),
+        "video_url": video_url,
+        "image_url": img_url,
+    }
+    h1_tag = re.findall(r"<h1[^>]*>(.*?)</h1>", concatenated_response, re.DOTALL)
+    if not len(h1_tag):
+        return video_info
+    video_info["title"] = remove_special_characters(" ".join(str(h1_tag[0]).split()))
+    textarea = re.findall(
+        r"<textarea[^>]*>(.*?)</textarea>", concatenated_response, re.DOTALL
+    )
+    for element in textarea:
+        matches = re.search(r"\[(\d+x\d+)\, ((\d+:)*\d+)\]", element)
+        if matches:
+            video_info.update(
+                {"resolution": matches.group(1), "duration": matches.group(2)}
+            )
+            break
+    return video_info
+
+
+def parse_extractor(pages: List[str]) -> Dict[str, str]:
+    extractor = PageExtractor()
+    for page in pages:
+        for offset in range(0, len(page), CHUNK_SIZE):
+            if extractor.feed(page[offset : offset + CHUNK_SIZE]):
+                return extractor.get_info()
+        extractor.end_page()
+    return extractor.get_info()
+
+
+def measure(
+    parse: Callable[[List[str]], Dict[str, str]], pages: List[str], runs: int
+) -> Dict[str, float]:
+    cpu_start = time.process_time()
+    for _ in range(runs):
+        parse(pages)
+    cpu = (time.process_time() - cpu_start) / runs
+
+    tracemalloc.start()
+    parse(pages)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"cpu": cpu, "peak": peak}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-kb", type=int, default=256)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    size = args.page_kb * 1024
+    pages = [build_page(EMBED_FIELDS, size), build_page(VIDEO_FIELDS, size)]
+    assert parse_regex(pages) == parse_extractor(pages)
+
+    print(f"{'parser':<12}{'cpu ms':>10}{'peak KB':>10}")
+    for name, parse in [("regex", parse_regex), ("extractor", parse_extractor)]:
+        result = measure(parse, pages, args.runs)
+        print(f"{name:<12}{result['cpu'] * 1000:>10.3f}{result['peak'] / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
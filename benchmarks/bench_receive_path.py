@@ -0,0 +1,97 @@
+"""
+Benchmark of the Worker receive paths against a local HTTP stand-in.
+
+Serves a file from memory over HTTP/1.1 on localhost and downloads it with:
+
+- iter_content: the original loop, `iter_content(10 KB)` + `file.write`.
+- chunks: Worker with adaptive `read1` chunks.
+
+Usage:
+    python benchmarks/bench_receive_path.py --size-mb 512 --runs 3
+
+CPU time includes the server thread, which is the same for every path.
+The package must be importable (e.g. `python -m pip install -e .`).
+"""
+
+import argparse, os, tempfile, time, requests
+from threading import Thread
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from uqload_dl_gui.connectionManager import get_connection_manager
+from uqload_dl_gui.worker import Worker
+
+PAYLOAD = b""
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        view = memoryview(PAYLOAD)
+        self.send_response(200)
+        self.send_header("Content-Type", "video/mp4")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        for offset in range(0, len(view), 1024 * 1024):
+            self.wfile.write(view[offset : offset + 1024 * 1024])
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def run_iter_content(url: str, output_dir: str) -> None:
+    with requests.get(url, stream=True, timeout=20) as response:
+        with open(os.path.join(output_dir, "iter_content.mp4"), "wb") as file:
+            for chunk in response.iter_content(chunk_size=10 * 1024):
+                file.write(chunk)
+
+
+def run_worker(url: str, output_dir: str) -> None:
+    worker = Worker({"title": "chunks", "video_url": url})
+    worker._Worker__output_dir = output_dir
+    worker._Worker__segments = 1
+    errors = []
+    worker.signals.download_error.connect(errors.append)
+    worker.run()
+    if errors:
+        raise RuntimeError(errors[0])
+    os.remove(worker.destination_path)
+
+
+def main() -> None:
+    global PAYLOAD
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    PAYLOAD = os.urandom(args.size_mb * 1024 * 1024)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/video.mp4"
+
+    candidates = {
+        "iter_content": lambda output_dir: run_iter_content(url, output_dir),
+        "chunks": lambda output_dir: run_worker(url, output_dir),
+    }
+
+    print(f"{'path':<14}{'wall s':>10}{'cpu s':>10}{'MB/s':>10}{'cpu s/GB':>10}")
+    with tempfile.TemporaryDirectory() as output_dir:
+        for name, candidate in candidates.items():
+            wall, cpu = [], []
+            for _ in range(args.runs):
+                wall_start, cpu_start = time.perf_counter(), time.process_time()
+                candidate(output_dir)
+                wall.append(time.perf_counter() - wall_start)
+                cpu.append(time.process_time() - cpu_start)
+            best_wall, best_cpu = min(wall), min(cpu)
+            print(
+                f"{name:<14}{best_wall:>10.3f}{best_cpu:>10.3f}"
+                f"{args.size_mb / best_wall:>10.0f}"
+                f"{best_cpu / (args.size_mb / 1024):>10.3f}"
+            )
+    print(f"connection pool: {get_connection_manager().get_stats()}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
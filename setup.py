@@ -43,6 +43,7 @@ setup(
     entry_points={
         "console_scripts": [
             "uqload-dl-gui=uqload_dl_gui.main:main",
+            "uqload-dl=uqload_dl_gui.cli:main",
         ]
     },
 )
@@ -0,0 +1,23 @@
+import pytest
+from pytest import MonkeyPatch
+from PyQt5.QtCore import QSettings
+from uqload_dl_gui import config
+
+
+@pytest.fixture(autouse=True)
+def temp_settings(tmp_path_factory: pytest.TempPathFactory, monkeypatch: MonkeyPatch):
+    """Keep the settings written by a test in a temporary directory."""
+    QSettings.setPath(
+        QSettings.IniFormat,
+        QSettings.UserScope,
+        str(tmp_path_factory.mktemp("settings")),
+    )
+    stored = QSettings(
+        QSettings.IniFormat,
+        QSettings.UserScope,
+        config.ORGANIZATION_NAME,
+        config.APPLICATION_NAME,
+    )
+    monkeypatch.setattr(config, "stored_settings", stored)
+    monkeypatch.setattr(config, "settings", stored)
+    yield stored
@@ -0,0 +1,27 @@
+import pytest
+from uqload_dl_gui.adaptiveChunkSize import AdaptiveChunkSize
+
+
+@pytest.mark.parametrize("bounds", [(0, 10), (-1, 10), (20, 10)])
+def test_incorrect_bounds(bounds) -> None:
+    with pytest.raises(ValueError):
+        AdaptiveChunkSize(*bounds)
+
+
+def test_grows_on_fast_links() -> None:
+    chunk_size = AdaptiveChunkSize(64 * 1024, 4 * 1024 * 1024, target_time=0.05)
+    assert chunk_size.size == 64 * 1024
+    sizes = [chunk_size.update(chunk_size.size, 0.0001) for _ in range(10)]
+    assert sizes[0] == 128 * 1024
+    assert sizes == sorted(sizes)
+    assert sizes[-1] == 4 * 1024 * 1024
+
+
+def test_shrinks_on_slow_links() -> None:
+    chunk_size = AdaptiveChunkSize(64 * 1024, 4 * 1024 * 1024, target_time=0.05)
+    chunk_size.size = 4 * 1024 * 1024
+    # 100 KB/s -> 5 KB per 50 ms, clamped to the lower bound
+    for _ in range(10):
+        chunk_size.update(10 * 1024, 0.1)
+    assert chunk_size.size == 64 * 1024
+    assert chunk_size.update(0, 1) == 64 * 1024
@@ -0,0 +1,55 @@
+import os
+from uqload_dl_gui.admissionQueue import AdmissionQueue
+
+
+def video(index: int):
+    return {"title": f"video {index}", "size": index}
+
+
+def drain(queue: AdmissionQueue):
+    items = []
+    item = queue.popleft()
+    while item is not None:
+        items.append(item)
+        item = queue.popleft()
+    return items
+
+
+def test_spills_to_disk_in_order(tmp_path) -> None:
+    queue = AdmissionQueue(os.path.join(str(tmp_path), "queue.sqlite3"), 4)
+    for index in range(50):
+        queue.append(f"{index}", video(index))
+    assert len(queue) == 50
+
+    assert queue.popleft() == ("0", video(0))
+    queue.append("50", video(50))
+    items = drain(queue)
+    assert [item_id for item_id, _ in items] == [f"{i}" for i in range(1, 51)]
+    assert items[-1][1] == video(50)
+    assert len(queue) == 0
+
+
+def test_reorder_and_remove(tmp_path) -> None:
+    path = os.path.join(str(tmp_path), "queue.sqlite3")
+    queue = AdmissionQueue(path, 3)
+    for index in range(6):
+        queue.append(f"{index}", video(index))
+
+    # on the disk, then in memory
+    assert queue.move_to_front("4")
+    assert queue.move_to_front("1")
+    assert queue.remove("5")
+    assert queue.remove("2")
+    assert not queue.remove("2")
+    assert not queue.move_to_front("missing")
+    queue.appendleft("6", video(6))
+    assert len(queue) == 5
+    assert [item_id for item_id, _ in drain(queue)] == ["6", "1", "4", "0", "3"]
+
+    queue.append("7", video(7))
+    queue.clear()
+    assert queue.popleft() is None
+    queue.append("8", video(8))
+    queue.close()
+    # the journal is the record of the items, the backlog starts empty
+    assert len(AdmissionQueue(path, 3)) == 0
@@ -0,0 +1,36 @@
+from pytestqt.qtbot import QtBot
+from PyQt5.QtGui import QFontDatabase
+from uqload_dl_gui import assetRegistry
+from uqload_dl_gui.assetRegistry import (
+    ASSETS_PATH,
+    get_font,
+    get_font_family,
+    get_icon,
+    get_pixmap,
+    get_stylesheet,
+    get_svg_data,
+)
+
+
+def test_assets_loaded_once(qtbot: QtBot) -> None:
+    font = get_font()
+    assert get_font() is font
+    assert get_font_family() == font.family()
+    assert font.family() in QFontDatabase().families()
+
+    stylesheet = get_stylesheet("cardDownload")
+    assert stylesheet == (ASSETS_PATH / "styles/cardDownload.qss").read_text()
+    assert get_stylesheet("cardDownload") is stylesheet
+
+    icon = get_icon("xmark-solid.svg")
+    assert not icon.isNull()
+    assert get_icon("xmark-solid.svg") is icon
+
+    data = get_svg_data("video-solid.svg")
+    assert b"<svg" in bytes(data)
+    assert get_svg_data("video-solid.svg") is data
+
+    pixmap = get_pixmap("video-solid.svg", 26)
+    assert (pixmap.width(), pixmap.height()) == (26, 26)
+    assert get_pixmap("video-solid.svg", 26) is pixmap
+    assert ("video-solid.svg", 26) in assetRegistry._pixmaps
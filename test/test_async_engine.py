@@ -0,0 +1,265 @@
+import asyncio, os, pytest, threading
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pytest import MonkeyPatch
+from pytestqt.qtbot import QtBot
+from uqload_dl_gui import requestThread
+from uqload_dl_gui.asyncEngine import AsyncEngine, AsyncPartWriter, AsyncWorker
+from uqload_dl_gui.diskWriter import MemoryBudget
+from uqload_dl_gui.partFile import PartFile
+from uqload_dl_gui.metadataCache import MetadataCache
+from uqload_dl_gui.uqload import UQLoad
+
+content = os.urandom(3 * 1024 * 1024)
+
+page = """
+<script type='text/javascript'>var player = new Clappr.Player({{
+        sources: ["{url}/v.mp4"],
+        poster: "{url}/i/05/02288/vule3vel9n5q_xt.jpg",
+        ,chromecast: {{ media: {{title: "python testing"}} }}
+        }});
+</script>
+<h1>My video</h1>
+<textarea>[860x360, 00:22]</textarea>
+"""
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    paths = []
+
+    def do_GET(self) -> None:
+        self.paths.append(self.path)
+        if self.path.endswith(".html"):
+            host = f"http://{self.headers['Host']}"
+            body = page.format(url=host).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        start, end = 0, len(content) - 1
+        if "Range" in self.headers:
+            first, last = self.headers["Range"][len("bytes=") :].split("-")
+            start, end = int(first), int(last) if last else len(content) - 1
+            self.send_response(206)
+        else:
+            self.send_response(200)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        self.wfile.write(content[start : end + 1])
+
+    def do_HEAD(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("Content-Type", "video/mp4")
+        self.end_headers()
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class Server(ThreadingHTTPServer):
+    def handle_error(self, *args) -> None:
+        # cancelled downloads drop their connections
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = Server(("127.0.0.1", 0), Handler)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("video_info", [(""), (True), ([]), ({}), (123)])
+def test_incorrect_params(video_info) -> None:
+    with pytest.raises(ValueError):
+        AsyncWorker(video_info)
+
+
+@pytest.mark.parametrize("segments", [(1), (3)])
+def test_download(qtbot: QtBot, tmp_path, server_url: str, segments: int) -> None:
+    engine = AsyncEngine(2, 5)
+    worker = AsyncWorker({"title": "async", "video_url": f"{server_url}/video.mp4"})
+    worker._AsyncWorker__output_dir = str(tmp_path)
+    worker._AsyncWorker__segments = segments
+    updates = []
+    worker.signals.progress_update.connect(lambda *args: updates.append(args))
+
+    with qtbot.waitSignal(worker.signals.download_completed, timeout=10000):
+        engine.submit_task(worker)
+
+    assert engine.waitForDone(5000)
+    assert updates[-1] == (len(content), len(content))
+    assert worker.bytes_downloaded == len(content)
+    with open(worker.destination_path, "rb") as file:
+        assert file.read() == content
+
+
+def test_part_writer_uses_shared_threads(tmp_path) -> None:
+    part = PartFile(os.path.join(str(tmp_path), "video.mp4"))
+    part.create("https://test.com/v.mp4", 8, [[0, 3], [4, 7]])
+    budget = MemoryBudget(4)
+    executor = ThreadPoolExecutor(2)
+    executor.submit(lambda: None).result()
+    threads = threading.active_count()
+
+    async def write() -> None:
+        writer = AsyncPartWriter(part, executor, budget)
+        await writer.write(1, 4, b"ef", lambda: None)
+        await writer.write(0, 0, b"ab", lambda: None)
+        await writer.write(1, 6, b"gh", lambda: None)
+        await writer.write(0, 2, b"cd", lambda: None)
+        assert threading.active_count() <= threads + 1
+        await writer.close()
+
+    asyncio.run(write())
+    executor.shutdown()
+    assert budget.used == 0
+    assert part.remaining() == []
+    with open(part.part_path, "rb") as file:
+        assert file.read() == b"abcdefgh"
+
+
+def test_download_through_proxy(
+    qtbot: QtBot, tmp_path, server_url: str, monkeypatch: MonkeyPatch
+) -> None:
+    # the test server answers proxied requests too
+    monkeypatch.setenv("HTTP_PROXY", server_url)
+    monkeypatch.delenv("NO_PROXY", raising=False)
+    monkeypatch.delenv("no_proxy", raising=False)
+    Handler.paths.clear()
+    engine = AsyncEngine(2, 5)
+    worker = AsyncWorker({"title": "proxy", "video_url": "http://video.test/v.mp4"})
+    worker._AsyncWorker__output_dir = str(tmp_path)
+
+    with qtbot.waitSignal(worker.signals.download_completed, timeout=10000):
+        engine.submit_task(worker)
+
+    assert engine.waitForDone(5000)
+    assert Handler.paths[0] == "http://video.test/v.mp4"
+    assert worker.bytes_downloaded == len(content)
+    assert os.path.dirname(worker.destination_path) == str(tmp_path)
+    with open(worker.destination_path, "rb") as file:
+        assert file.read() == content
+
+
+def test_engine_limits_and_take(qtbot: QtBot, tmp_path, server_url: str) -> None:
+    engine = AsyncEngine(1, 2)
+    workers = []
+    for index in range(3):
+        worker = AsyncWorker(
+            {"title": f"async {index}", "video_url": f"{server_url}/video.mp4"}
+        )
+        worker._AsyncWorker__output_dir = str(tmp_path)
+        workers.append(worker)
+
+    workers[0].pause_download()
+    with qtbot.waitSignal(workers[0].signals.download_started, timeout=5000):
+        engine.submit_task(workers[0])
+    engine.submit_task(workers[1])
+    assert engine.full()
+    engine.submit_task(workers[2])
+    assert engine.current_tasks == 2
+
+    assert engine.tryTake(workers[1])
+    assert not engine.tryTake(workers[0])
+
+    with qtbot.waitSignal(workers[0].signals.download_cancelled, timeout=5000):
+        workers[0].cancel_download()
+    assert engine.waitForDone(5000)
+    assert not workers[1].is_running
+
+
+def test_engine_set_limits(qtbot: QtBot, tmp_path, server_url: str) -> None:
+    engine = AsyncEngine(1, 2)
+    workers = []
+    for index in range(2):
+        worker = AsyncWorker(
+            {"title": f"async {index}", "video_url": f"{server_url}/video.mp4"}
+        )
+        worker._AsyncWorker__output_dir = str(tmp_path)
+        worker.pause_download()
+        workers.append(worker)
+
+    with qtbot.waitSignal(workers[0].signals.download_started, timeout=5000):
+        engine.submit_task(workers[0])
+    engine.submit_task(workers[1])
+    assert engine.full()
+    assert not workers[1].is_running
+
+    # raising the limits starts the waiting task right away
+    with qtbot.waitSignal(workers[1].signals.download_started, timeout=5000):
+        engine.set_limits(2, 3)
+    assert not engine.full()
+
+    # lowering them lets the running tasks finish
+    engine.set_limits(1, 1)
+    assert engine.full()
+    assert not engine.tryTake(workers[1])
+    for worker in workers:
+        with qtbot.waitSignal(worker.signals.download_cancelled, timeout=5000):
+            worker.cancel_download()
+    assert engine.waitForDone(5000)
+
+
+def test_engine_scheduling(qtbot: QtBot, tmp_path, server_url: str) -> None:
+    engine = AsyncEngine(1, 5)
+    workers = {}
+    started = []
+    for name in ("blocking", "low", "normal", "high", "pinned"):
+        worker = AsyncWorker({"title": name, "video_url": f"{server_url}/video.mp4"})
+        worker._AsyncWorker__output_dir = str(tmp_path)
+        worker.signals.download_started.connect(lambda name=name: started.append(name))
+        workers[name] = worker
+
+    workers["blocking"].pause_download()
+    with qtbot.waitSignal(workers["blocking"].signals.download_started, timeout=5000):
+        engine.submit_task(workers["blocking"])
+    engine.submit_task(workers["low"], -1)
+    engine.submit_task(workers["normal"])
+    engine.submit_task(workers["high"], 1)
+    engine.submit_task(workers["pinned"], -1)
+    assert engine.pin(workers["pinned"])
+    assert engine.set_priority(workers["normal"], 2)
+    assert not engine.set_priority(workers["blocking"], 2)
+
+    workers["blocking"].cancel_download()
+    qtbot.waitUntil(lambda: len(started) == 5, timeout=10000)
+    assert engine.waitForDone(5000)
+    assert started == ["blocking", "pinned", "normal", "high", "low"]
+
+
+def test_request(
+    qtbot: QtBot, tmp_path, server_url: str, monkeypatch: MonkeyPatch
+) -> None:
+    cache = MetadataCache(str(tmp_path / "metadata.sqlite3"))
+    monkeypatch.setattr(requestThread, "get_metadata_cache", lambda: cache)
+    monkeypatch.setattr(
+        UQLoad, "get_page_urls", lambda self: [f"{server_url}/embed-x.html"]
+    )
+    request = requestThread.AsyncRequest("https://uqload.to/embed-xxxxxxxxxxxx.html")
+
+    with qtbot.waitSignal(request.success_signal, timeout=5000) as blocker:
+        request.start()
+
+    video_info = blocker.args[0]
+    assert video_info["title"] == "My video"
+    assert video_info["video_url"] == f"{server_url}/v.mp4"
+    assert video_info["size"] == len(content)
+    assert video_info["type"] == "video/mp4"
+    assert video_info["resolution"] == "860x360"
+    assert cache.get("xxxxxxxxxxxx") == video_info
+
+    # a duplicate paste is resolved from the cache without any request
+    monkeypatch.setattr(UQLoad, "get_page_urls", lambda self: ["http://0.0.0.0:9/"])
+    with qtbot.waitSignal(request.success_signal, timeout=5000) as blocker:
+        request.start()
+    assert blocker.args[0] == video_info
@@ -0,0 +1,28 @@
+import threading
+from uqload_dl_gui.atomicCounter import AtomicCounter
+
+
+def test_limit() -> None:
+    counter = AtomicCounter()
+    assert counter.increment(2)
+    assert counter.increment(2)
+    assert not counter.increment(2)
+    assert counter.value == 2
+    assert counter.decrement() == 1
+    counter.set(0)
+    assert counter.decrement() == 0
+
+
+def test_threads() -> None:
+    counter = AtomicCounter()
+    accepted = []
+
+    def submit() -> None:
+        accepted.append(sum(counter.increment(5000) for _ in range(1000)))
+
+    threads = [threading.Thread(target=submit) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(accepted) == counter.value == 5000
@@ -0,0 +1,66 @@
+import pytest
+from uqload_dl_gui.bandwidthLimiter import BandwidthLimiter
+
+
+def test_unlimited() -> None:
+    limiter = BandwidthLimiter()
+    share = limiter.register()
+    assert share.reserve(10 * 1024 * 1024) == 0
+
+
+def test_delay_follows_rate() -> None:
+    limiter = BandwidthLimiter(1000)
+    share = limiter.register()
+    assert share.reserve(500) == pytest.approx(0.5, abs=0.05)
+    assert share.reserve(500) == pytest.approx(1.0, abs=0.05)
+
+
+def test_weights_split_rate() -> None:
+    limiter = BandwidthLimiter(3000)
+    first = limiter.register(2)
+    second = limiter.register(1)
+    assert first.rate == 2000
+    assert second.rate == 1000
+
+    second.set_weight(3)
+    assert first.rate == 1200
+    assert second.rate == 1800
+
+    second.close()
+    assert first.rate == 3000
+    assert second.reserve(1000) == 0
+
+
+def test_rate_changes_at_runtime() -> None:
+    limiter = BandwidthLimiter(1000)
+    share = limiter.register()
+    limiter.set_rate(0)
+    assert share.reserve(1000) == 0
+    limiter.set_rate(4000)
+    assert share.reserve(1000) == pytest.approx(0.25, abs=0.05)
+
+
+@pytest.mark.parametrize("weight", [0, -1])
+def test_incorrect_weight(weight) -> None:
+    limiter = BandwidthLimiter(1000)
+    with pytest.raises(ValueError):
+        limiter.register(weight)
+
+
+def test_idle_shares_leave_rate() -> None:
+    limiter = BandwidthLimiter(2000)
+    first = limiter.register()
+    second = limiter.register()
+    assert first.rate == second.rate == 1000
+
+    first.set_idle()
+    assert first.rate == 0
+    assert second.rate == 2000
+    assert first.reserve(1000) == pytest.approx(1.0, abs=0.05)
+    assert first.rate == second.rate == 1000
+
+    # a share that reserves nothing for a while leaves its rate too
+    first.last_used -= 2
+    second.reserve(1)
+    assert not first.active
+    assert second.rate == 2000
@@ -0,0 +1,78 @@
+import time
+from pytest import MonkeyPatch
+from pytestqt.qtbot import QtBot
+from uqload_dl_gui import bulkResolver
+from uqload_dl_gui.bulkResolver import BulkResolver, parse_urls
+
+
+def test_parse_urls() -> None:
+    text = """
+    https://uqload.to/aaaaaaaaaaaa.html
+    https://uqload.com/embed-aaaaaaaaaaaa.html, bbbbbbbbbbbb
+    not a link
+    https://uqload.to/embed-cccccccccccc.html
+    """
+    urls, invalid = parse_urls(text)
+    assert urls == [
+        "https://uqload.to/embed-aaaaaaaaaaaa.html",
+        "https://uqload.to/embed-bbbbbbbbbbbb.html",
+        "https://uqload.to/embed-cccccccccccc.html",
+    ]
+    assert invalid == 3
+    assert parse_urls("") == ([], 0)
+
+
+def test_resolve(qtbot: QtBot, monkeypatch: MonkeyPatch) -> None:
+    running = []
+    max_running = []
+
+    class FakeUQLoad:
+        def __init__(self, url, cache=None, probe_size=True, embed_only=False) -> None:
+            self.url = url
+
+        def get_info(self):
+            running.append(self.url)
+            max_running.append(len(running))
+            time.sleep(0.05)
+            running.remove(self.url)
+            if "bbbbbbbbbbbb" in self.url:
+                raise Exception("Video not found!")
+            return {"title": self.url}
+
+    monkeypatch.setattr(bulkResolver, "UQLoad", FakeUQLoad)
+    urls, _ = parse_urls(
+        " ".join(f"{letter * 12}" for letter in "abcdefgh"),
+    )
+    resolver = BulkResolver(urls, max_workers=3)
+    resolved, failed = [], []
+    resolver.resolved_signal.connect(resolved.append)
+    resolver.failed_signal.connect(lambda url, error: failed.append((url, error)))
+
+    with qtbot.waitSignal(resolver.finished_signal, timeout=5000):
+        resolver.start()
+
+    assert len(resolved) == 7
+    assert failed == [("https://uqload.to/embed-bbbbbbbbbbbb.html", "Video not found!")]
+    assert max(max_running) <= 3
+
+
+def test_cancel(qtbot: QtBot, monkeypatch: MonkeyPatch) -> None:
+    class FakeUQLoad:
+        def __init__(self, url, cache=None, probe_size=True, embed_only=False) -> None:
+            self.url = url
+
+        def get_info(self):
+            time.sleep(0.05)
+            return {"title": self.url}
+
+    monkeypatch.setattr(bulkResolver, "UQLoad", FakeUQLoad)
+    urls, _ = parse_urls(" ".join(f"{letter * 12}" for letter in "abcdefgh"))
+    resolver = BulkResolver(urls, max_workers=1)
+    resolved = []
+    resolver.resolved_signal.connect(resolved.append)
+
+    with qtbot.waitSignal(resolver.finished_signal, timeout=5000):
+        resolver.start()
+        resolver.cancel()
+
+    assert len(resolved) == 0
@@ -0,0 +1,93 @@
+import io, os
+from pytest import MonkeyPatch
+from uqload_dl_gui import cli
+from uqload_dl_gui.config import get_config
+from uqload_dl_gui.queueJournal import QueueJournal
+from uqload_dl_gui.uqload import UQLoad
+
+
+def test_download(tmp_path, monkeypatch: MonkeyPatch) -> None:
+    downloaded = []
+
+    class FakeManager:
+        def __init__(self, journal=None, on_event=None, **kwargs) -> None:
+            self.items_added = []
+
+        def restore(self):
+            return []
+
+        def add_url(self, url):
+            downloaded.append(url)
+
+        def wait(self, timeout=None):
+            return True
+
+        def items(self):
+            return []
+
+        def shutdown(self):
+            pass
+
+    monkeypatch.setattr(cli, "DownloadManager", FakeManager)
+    monkeypatch.setattr(cli, "get_metadata_cache", lambda: None)
+    links = tmp_path / "links.txt"
+    links.write_text("bbbbbbbbbbbb\nnot-a-link, aaaaaaaaaaaa\n")
+    output = io.StringIO()
+    output_dir = tmp_path / "videos"
+    stored_dir = get_config().value("output_dir")
+
+    code = cli.main(
+        [
+            "aaaaaaaaaaaa",
+            "-i",
+            str(links),
+            "-o",
+            str(output_dir),
+            "-j",
+            "3",
+            "--journal",
+            str(tmp_path / "queue.sqlite3"),
+        ],
+        output,
+    )
+
+    assert code == 0
+    assert downloaded == [
+        "https://uqload.to/embed-aaaaaaaaaaaa.html",
+        "https://uqload.to/embed-bbbbbbbbbbbb.html",
+    ]
+    assert "skipped 1 invalid link(s)" in output.getvalue()
+    assert output_dir.is_dir()
+    # the options override the settings of this run only
+    assert get_config().value("output_dir") == str(output_dir)
+    assert int(get_config().value("concurrent_downloads")) == 3
+    cli.override_config()
+    assert get_config().value("output_dir") == stored_dir
+
+
+def test_consume_links(tmp_path) -> None:
+    inbox = tmp_path / "inbox.txt"
+    assert cli.consume_links(str(inbox)) == ""
+    inbox.write_text("aaaaaaaaaaaa\n")
+    assert cli.consume_links(str(inbox)) == "aaaaaaaaaaaa\n"
+    assert not inbox.exists()
+    assert not os.path.exists(f"{inbox}.processing")
+
+
+def test_failed_download(tmp_path, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(cli, "get_metadata_cache", lambda: None)
+    monkeypatch.setattr(
+        UQLoad, "get_page_urls", lambda self: ["http://127.0.0.1:9/embed.html"]
+    )
+    output = io.StringIO()
+    journal = tmp_path / "queue.sqlite3"
+
+    code = cli.main(
+        ["xxxxxxxxxxxx", "-o", str(tmp_path), "-q", "--journal", str(journal)],
+        output,
+    )
+    cli.override_config()
+
+    assert code == 1
+    assert output.getvalue().startswith("failed ")
+    assert QueueJournal(str(journal)).pending() == []
@@ -1,6 +1,7 @@
-import pytest
+import pytest, time
+from threading import Lock
 from pytest import MonkeyPatch
-from uqload_dl_gui.concurrentRequester import ConcurrentRequester
+from uqload_dl_gui.concurrentRequester import ConcurrentRequester, RequestExecutor
 
 
 @pytest.mark.parametrize(
@@ -46,3 +47,95 @@ def test_get_responses_with_non_200_status_code(monkeypatch: MonkeyPatch) -> Non
     result = concurrent_requester.run_concurrent_requests()
     assert len(result) == 10
     assert None in result
+
+
+def test_responses_are_ordered(monkeypatch: MonkeyPatch) -> None:
+    urls = [f"https://test.com/{idx}" for idx in range(10)]
+    concurrent_requester = ConcurrentRequester(urls, executor=RequestExecutor(4, 4))
+
+    def mock_get(self, url, idx) -> None:
+        time.sleep(0.01 * (10 - idx))
+        concurrent_requester.responses.append((idx, url))
+
+    monkeypatch.setattr(ConcurrentRequester, "fetch_url", mock_get)
+    assert concurrent_requester.run_concurrent_requests() == urls
+
+
+def test_errors_are_raised(monkeypatch: MonkeyPatch) -> None:
+    concurrent_requester = ConcurrentRequester(
+        ["https://test.com/"], executor=RequestExecutor(2, 2)
+    )
+
+    def mock_get(self, url, idx) -> None:
+        raise ConnectionError("Connection refused")
+
+    monkeypatch.setattr(ConcurrentRequester, "fetch_url", mock_get)
+    with pytest.raises(ConnectionError):
+        concurrent_requester.run_concurrent_requests()
+
+
+def test_per_host_cap() -> None:
+    executor = RequestExecutor(max_workers=8, max_per_host=2)
+    lock = Lock()
+    running = {"a.com": 0, "b.com": 0}
+    peak = {"a.com": 0, "b.com": 0}
+
+    def request(host: str) -> str:
+        with lock:
+            running[host] += 1
+            peak[host] = max(peak[host], running[host])
+        time.sleep(0.02)
+        with lock:
+            running[host] -= 1
+        return host
+
+    futures = [
+        executor.submit(f"https://{host}/video", request, host)
+        for host in ["a.com", "b.com"] * 6
+    ]
+    assert [future.result(timeout=5) for future in futures] == ["a.com", "b.com"] * 6
+    assert peak == {"a.com": 2, "b.com": 2}
+    assert executor.active_requests("a.com") == 0
+
+
+def test_timeout_cancels_pending_requests(monkeypatch: MonkeyPatch) -> None:
+    urls = ["https://test.com/"] * 4
+    concurrent_requester = ConcurrentRequester(urls, executor=RequestExecutor(4, 1))
+    started = []
+
+    def mock_get(self, url, idx) -> None:
+        started.append(idx)
+        time.sleep(0.3)
+
+    monkeypatch.setattr(ConcurrentRequester, "fetch_url", mock_get)
+    with pytest.raises(TimeoutError):
+        concurrent_requester.run_concurrent_requests(timeout=0.1)
+    time.sleep(0.4)
+    assert started == [0]
+
+
+def test_timeout_closes_responses() -> None:
+    class FakeResponse:
+        status_code = 200
+        closed = False
+
+        def close(self) -> None:
+            self.closed = True
+
+    class FakeSession:
+        def get(self, url, **kwargs) -> FakeResponse:
+            if url.endswith("slow"):
+                time.sleep(0.3)
+            responses.append(FakeResponse())
+            return responses[-1]
+
+    responses = []
+    urls = ["https://a.com/fast", "https://b.com/slow"]
+    concurrent_requester = ConcurrentRequester(urls, executor=RequestExecutor(2, 1))
+    concurrent_requester.session = FakeSession()
+    with pytest.raises(TimeoutError):
+        concurrent_requester.run_concurrent_requests(timeout=0.1)
+    time.sleep(0.4)
+    assert len(responses) == 2
+    assert all(response.closed for response in responses)
+    assert concurrent_requester.responses == []
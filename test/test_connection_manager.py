@@ -0,0 +1,68 @@
+import pytest
+from threading import Thread
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from uqload_dl_gui.connectionManager import ConnectionManager, get_connection_manager
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        body = b"hello"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", "5")
+        self.end_headers()
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_connections_are_reused(server_url: str) -> None:
+    manager = ConnectionManager()
+    assert manager.get(f"{server_url}/a", timeout=5).text == "hello"
+    assert manager.head(f"{server_url}/b", timeout=5).status_code == 200
+    with manager.get(f"{server_url}/c", stream=True, timeout=5) as response:
+        assert response.content == b"hello"
+
+    assert manager.get_stats() == {"requests": 3, "new_connections": 1, "hits": 2}
+
+
+def test_ensure_pool_size(server_url: str) -> None:
+    manager = ConnectionManager(pool_maxsize=4)
+    adapter = manager.session.get_adapter(server_url)
+    with manager.get(f"{server_url}/a", stream=True, timeout=5) as running:
+        manager.ensure_pool_size(server_url, 2)
+        assert manager.get_pool_size(server_url) == 4
+        manager.ensure_pool_size(f"{server_url}/b", 8)
+        assert manager.get_pool_size(server_url) == 8
+        assert manager.get_pool_size("http://example.com/") == 4
+        # the response started on the previous pool is not interrupted
+        assert running.content == b"hello"
+    assert manager.session.get_adapter(server_url) is adapter
+    assert manager.pool_maxsize == 4
+
+    assert manager.get(server_url, timeout=5).status_code == 200
+    assert manager.get_stats()["requests"] == 2
+    pools = adapter.poolmanager.pools
+    sizes = [pools[key].pool.maxsize for key in pools.keys()]
+    assert sorted(sizes) == [4, 8]
+
+
+def test_singleton() -> None:
+    assert get_connection_manager() is get_connection_manager()
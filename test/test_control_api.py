@@ -0,0 +1,193 @@
+import json, threading, pytest
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+from pytest import MonkeyPatch
+from pytestqt.qtbot import QtBot
+from uqload_dl_gui import bulkResolver, queueJournal
+from uqload_dl_gui.config import override_config
+from uqload_dl_gui.controlApi import ControlServer, EventHub
+from uqload_dl_gui.controlBridge import ControlBridge
+
+
+class FakeController:
+    def __init__(self) -> None:
+        self.events = EventHub()
+        self.actions = []
+
+    def enqueue_urls(self, urls):
+        ids = []
+        for index, url in enumerate(urls):
+            item_id = f"{len(self.events.snapshot()) + index}"
+            ids.append(item_id)
+        for item_id, url in zip(ids, urls):
+            self.events.publish(
+                {"event": "queued", "id": item_id, "url": url, "state": "queued"}
+            )
+        return ids
+
+    def act(self, action, item_id):
+        self.actions.append((action, item_id))
+        return self.events.get(item_id)["state"] != queueJournal.DONE
+
+    def pause_item(self, item_id):
+        return self.act("pause", item_id)
+
+    def resume_item(self, item_id):
+        return self.act("resume", item_id)
+
+    def cancel_item(self, item_id):
+        return self.act("cancel", item_id)
+
+
+@pytest.fixture
+def server():
+    server = ControlServer(FakeController(), token="secret")
+    server.start()
+    yield server
+    server.stop()
+
+
+def call(server, path, body=None, content_type="application/json", token="secret"):
+    request = Request(f"{server.address}{path}", data=body)
+    request.add_header("Content-Type", content_type)
+    if token:
+        request.add_header("Authorization", f"Bearer {token}")
+    try:
+        with urlopen(request, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as ex:
+        return ex.code, json.loads(ex.read())
+
+
+def test_event_hub() -> None:
+    events = EventHub(max_finished=2)
+    subscriber = events.subscribe(max_size=2)
+    for item_id in "abc":
+        events.publish({"event": "queued", "id": item_id, "state": "queued"})
+        events.publish({"event": "done", "id": item_id, "state": "done"})
+    events.publish({"event": "queued", "id": "d", "state": "queued"})
+    events.publish({"event": "progress", "id": "d", "bytes_downloaded": 10})
+
+    assert events.get("a") is None
+    assert [item["id"] for item in events.snapshot()] == ["b", "c", "d"]
+    assert events.get("d") == {"id": "d", "state": "queued", "bytes_downloaded": 10}
+    # a slow subscriber keeps the latest events
+    assert subscriber.get_nowait()["id"] == "d"
+    assert subscriber.get_nowait()["event"] == "progress"
+    events.unsubscribe(subscriber)
+
+
+def test_queue(server: ControlServer) -> None:
+    body = json.dumps({"urls": ["aaaaaaaaaaaa", "not-a-link"]}).encode()
+    assert call(server, "/queue", body) == (202, {"ids": ["0"], "invalid": 1})
+    body = b"https://uqload.to/bbbbbbbbbbbb.html\ncccccccccccc"
+    status, result = call(server, "/queue", body, "text/plain")
+    assert (status, result["ids"]) == (202, ["1", "2"])
+    assert call(server, "/queue", b"{", "application/json")[0] == 400
+
+    status, result = call(server, "/queue")
+    assert status == 200
+    assert [item["url"] for item in result["items"]] == [
+        "https://uqload.to/embed-aaaaaaaaaaaa.html",
+        "https://uqload.to/embed-bbbbbbbbbbbb.html",
+        "https://uqload.to/embed-cccccccccccc.html",
+    ]
+    assert call(server, "/queue/1")[1]["state"] == "queued"
+    assert call(server, "/queue/9")[0] == 404
+
+    assert call(server, "/queue/1/pause", b"")[0] == 202
+    assert call(server, "/queue/9/cancel", b"")[0] == 404
+    server.events.publish({"event": "done", "id": "2", "state": queueJournal.DONE})
+    assert call(server, "/queue/2/cancel", b"")[0] == 409
+    assert server.controller.actions == [("pause", "1"), ("cancel", "2")]
+    assert call(server, "/queue", token=None)[0] == 401
+    assert call(server, "/missing")[0] == 404
+
+
+@pytest.mark.parametrize("format", [("ndjson"), ("sse")])
+def test_events(server: ControlServer, format: str) -> None:
+    server.events.publish({"event": "queued", "id": "a", "state": "queued"})
+    request = Request(f"{server.address}/events?format={format}")
+    request.add_header("Authorization", "Bearer secret")
+    with urlopen(request, timeout=5) as response:
+        content_type = response.headers["Content-Type"]
+
+        def read_event():
+            if format == "ndjson":
+                return json.loads(response.readline())
+            lines = [response.readline(), response.readline(), response.readline()]
+            assert lines[0].startswith(b"event: ") and lines[2] == b"\n"
+            return json.loads(lines[1][len("data: ") :])
+
+        snapshot = read_event()
+        assert snapshot["event"] == "snapshot"
+        assert snapshot["items"] == [{"id": "a", "state": "queued"}]
+        server.events.publish({"event": "progress", "id": "a", "bytes_downloaded": 5})
+        assert read_event() == {"event": "progress", "id": "a", "bytes_downloaded": 5}
+
+    expected = "application/x-ndjson" if format == "ndjson" else "text/event-stream"
+    assert content_type == expected
+
+
+def test_unix_socket(tmp_path) -> None:
+    path = str(tmp_path / "api.sock")
+    server = ControlServer(FakeController(), socket_path=path)
+    server.start()
+    assert server.address == f"unix:{path}"
+    server.stop()
+
+
+def test_bridge(qtbot: QtBot, monkeypatch: MonkeyPatch) -> None:
+    class FakeUQLoad:
+        def __init__(self, url, cache=None, probe_size=True, embed_only=False) -> None:
+            self.url = url
+
+        def get_info(self):
+            if "bbbbbbbbbbbb" in self.url:
+                raise Exception("Video not found!")
+            return {"title": self.url[-17:-5]}
+
+    class FakeDownloadPage:
+        def __init__(self) -> None:
+            self.events = EventHub()
+            self.queued = []
+            self.threads = []
+            self.paused = []
+
+        def enqueue(self, video_info, item_id):
+            self.threads.append(threading.current_thread())
+            self.queued.append((item_id, video_info["title"]))
+            self.events.publish(
+                {"event": "queued", "id": item_id, "state": queueJournal.QUEUED}
+            )
+
+        def pause_item(self, item_id):
+            self.paused.append(item_id)
+            return True
+
+    monkeypatch.setattr(bulkResolver, "UQLoad", FakeUQLoad)
+    override_config(resolver_workers=2, download_engine="threads")
+    page = FakeDownloadPage()
+    bridge = ControlBridge(page)
+    urls = [f"https://uqload.to/embed-{letter * 12}.html" for letter in "abc"]
+    ids = []
+    thread = threading.Thread(target=lambda: ids.extend(bridge.enqueue_urls(urls)))
+    thread.start()
+    thread.join()
+    assert page.events.get(ids[0])["state"] == "resolving"
+    # not resolved yet
+    assert not bridge.pause_item(ids[0])
+    assert bridge.cancel_item(ids[2])
+
+    qtbot.waitUntil(
+        lambda: page.events.get(ids[1])["state"] == queueJournal.FAILED, timeout=5000
+    )
+    qtbot.waitUntil(lambda: len(page.queued) == 1, timeout=5000)
+    override_config()
+    assert page.queued == [(ids[0], "aaaaaaaaaaaa")]
+    assert page.threads == [threading.main_thread()]
+    assert page.events.get(ids[2])["state"] == queueJournal.CANCELLED
+
+    assert bridge.pause_item(ids[0])
+    qtbot.waitUntil(lambda: page.paused == [ids[0]], timeout=5000)
+    assert not bridge.cancel_item(ids[2])
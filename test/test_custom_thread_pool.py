@@ -1,4 +1,4 @@
-import time
+import threading, time
 from PyQt5.QtCore import QRunnable
 from uqload_dl_gui.customThreadPool import CustomThreadPool
 
@@ -23,3 +23,65 @@ def test_default_values() -> None:
     thread_pool.waitForDone(1000)
 
     assert thread_pool.activeThreadCount() == 0
+
+
+def test_set_limits() -> None:
+    thread_pool = CustomThreadPool(2, 10)
+    thread_pool.current_tasks = 10
+    assert thread_pool.full()
+
+    thread_pool.set_limits(4, 20)
+    assert thread_pool.maxThreadCount() == 4
+    assert not thread_pool.full()
+
+    thread_pool.set_limits(1, 5)
+    assert thread_pool.maxThreadCount() == 1
+    assert thread_pool.full()
+
+
+def test_full_and_task_done() -> None:
+    class Task:
+        def run(self) -> None:
+            pass
+
+    thread_pool = CustomThreadPool(2, 3)
+    # the queue limit is not the stack size of the threads
+    assert thread_pool.stackSize() == 0
+    assert all(thread_pool.submit_task(Task()) for _ in range(3))
+    assert not thread_pool.submit_task(Task())
+    assert thread_pool.waitForDone(1000)
+    assert thread_pool.current_tasks == 3
+    for _ in range(4):
+        thread_pool.task_done()
+    assert thread_pool.current_tasks == 0
+    assert thread_pool.submit_task(Task())
+    assert thread_pool.waitForDone(1000)
+
+
+def test_scheduling() -> None:
+    release = threading.Event()
+    started = []
+
+    class Task:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        def run(self) -> None:
+            started.append(self.name)
+            if self.name == "blocking":
+                release.wait(5)
+
+    thread_pool = CustomThreadPool(1, 10)
+    tasks = {name: Task(name) for name in ("blocking", "low", "normal", "high", "b")}
+    thread_pool.submit_task(tasks["blocking"])
+    thread_pool.submit_task(tasks["low"], -1)
+    thread_pool.submit_task(tasks["normal"])
+    thread_pool.submit_task(tasks["high"], 1)
+    thread_pool.submit_task(tasks["b"])
+    assert thread_pool.pin(tasks["low"])
+    assert thread_pool.tryTake(tasks["b"])
+    assert not thread_pool.tryTake(tasks["b"])
+
+    release.set()
+    assert thread_pool.waitForDone(5000)
+    assert started == ["blocking", "low", "high", "normal"]
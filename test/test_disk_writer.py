@@ -0,0 +1,80 @@
+import os, pytest, threading
+from uqload_dl_gui.diskWriter import DiskWriter, MemoryBudget
+
+
+def test_writes_at_offsets(tmp_path) -> None:
+    path = str(tmp_path / "file.bin")
+    with open(path, "wb") as file:
+        file.truncate(12)
+
+    written = []
+    writer = DiskWriter(
+        path, lambda index, size: written.append((index, size)), MemoryBudget(1024)
+    )
+    writer.write(1, 6, b"world!")
+    writer.write(0, 0, b"hello ")
+    buffer = writer.get_buffer(4)
+    buffer[:] = b"HELL"
+    writer.write(0, 0, buffer)
+    writer.close()
+
+    with open(path, "rb") as file:
+        assert file.read() == b"HELLo world!"
+    assert sum(size for _, size in written) == 16
+    assert {index for index, _ in written} == {0, 1}
+
+
+def test_budget_blocks_until_released() -> None:
+    budget = MemoryBudget(100)
+    assert budget.acquire(80, timeout=0)
+    assert not budget.acquire(30, timeout=0.01)
+
+    acquired = threading.Event()
+    thread = threading.Thread(
+        target=lambda: budget.acquire(30) and acquired.set(), daemon=True
+    )
+    thread.start()
+    assert not acquired.wait(0.05)
+    budget.release(80)
+    assert acquired.wait(1)
+    assert budget.used == 30
+
+
+def test_budget_grants_oversized_when_idle() -> None:
+    budget = MemoryBudget(10)
+    assert budget.acquire(50, timeout=0)
+    budget.release(50)
+    assert budget.used == 0
+
+
+def test_write_error_is_raised(tmp_path) -> None:
+    path = str(tmp_path / "file.bin")
+    open(path, "wb").close()
+
+    def fail(index: int, size: int) -> None:
+        raise OSError("disk full")
+
+    budget = MemoryBudget(1024)
+    writer = DiskWriter(path, fail, budget)
+    writer.write(0, 0, b"data")
+    with pytest.raises(OSError):
+        writer.close()
+    assert budget.used == 0
+
+
+def test_check_aborts_blocked_write(tmp_path) -> None:
+    path = str(tmp_path / "file.bin")
+    open(path, "wb").close()
+
+    budget = MemoryBudget(10)
+    budget.acquire(10)
+    writer = DiskWriter(path, lambda index, size: None, budget)
+
+    def check() -> None:
+        raise InterruptedError
+
+    with pytest.raises(InterruptedError):
+        writer.write(0, 0, b"data", check)
+    budget.release(10)
+    writer.close()
+    assert os.path.getsize(path) == 0
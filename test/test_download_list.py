@@ -0,0 +1,95 @@
+import pytest
+from pytestqt.qtbot import QtBot
+from PyQt5.QtCore import QPoint, Qt
+from PyQt5.QtWidgets import QListView
+from uqload_dl_gui.views.downloadList import (
+    ITEM_ID_ROLE,
+    PROGRESS_ROLE,
+    VIDEO_ROLE,
+    DownloadItemDelegate,
+    DownloadListModel,
+)
+
+video_info = {
+    "title": "Test Video",
+    "video_url": "https://test.com/test.mp4",
+    "size": 17000000,
+    "type": "video/m4a",
+}
+
+
+@pytest.fixture
+def view(qtbot: QtBot) -> QListView:
+    model = DownloadListModel()
+    view = QListView()
+    view.setModel(model)
+    view.setItemDelegate(DownloadItemDelegate(view))
+    view.setUniformItemSizes(True)
+    view.resize(600, 400)
+    qtbot.addWidget(view)
+    return view
+
+
+def test_model(view: QListView, qtbot: QtBot) -> None:
+    model: DownloadListModel = view.model()
+    for index in range(5):
+        model.add_item(f"{index}", {**video_info, "title": f"video {index}"})
+    assert model.rowCount() == 5
+
+    changed = []
+    model.dataChanged.connect(lambda first, last, roles: changed.append(first.row()))
+    model.update_progress("3", 50, 100)
+    model.update_video_info("3", {"size": 100})
+    model.update_progress("missing", 50, 100)
+    assert changed == [3, 3]
+    assert model.index(3).data(PROGRESS_ROLE) == (50, 100)
+    assert model.index(3).data(VIDEO_ROLE)["size"] == 100
+
+    assert model.remove_item("1")
+    assert not model.remove_item("1")
+    assert [model.index(row).data(ITEM_ID_ROLE) for row in range(4)] == [
+        "0",
+        "2",
+        "3",
+        "4",
+    ]
+    assert model.row_of("3") == 2
+    assert model.index(2).data() == "video 3"
+
+    removed = []
+    model.rowsRemoved.connect(lambda *args: removed.append(args))
+    with qtbot.waitSignal(model.modelReset):
+        model.clear()
+    assert removed == []
+    assert model.rowCount() == 0
+    assert model.row_of("3") is None
+
+
+def test_delegate(view: QListView, qtbot: QtBot) -> None:
+    model: DownloadListModel = view.model()
+    delegate: DownloadItemDelegate = view.itemDelegate()
+    model.add_item("a", dict(video_info))
+    model.add_item("b", dict(video_info))
+    model.update_progress("a", 8500000, 17000000)
+    view.show()
+    qtbot.waitExposed(view)
+    assert not view.grab().isNull()
+
+    assert delegate.bytes_text(0, 0, "16.21 MB") == "0 MB/16.21 MB"
+    assert delegate.bytes_text(8500000, 17000000, "16.21 MB") == "8.11 MB / 16.21 MB"
+
+    rect = view.visualRect(model.index(1))
+    with qtbot.waitSignal(delegate.cancel_requested) as blocker:
+        qtbot.mouseClick(
+            view.viewport(),
+            Qt.MouseButton.LeftButton,
+            pos=delegate.delete_rect(rect).center(),
+        )
+    assert blocker.args == ["b"]
+
+    with qtbot.assertNotEmitted(delegate.cancel_requested):
+        qtbot.mouseClick(
+            view.viewport(),
+            Qt.MouseButton.LeftButton,
+            pos=QPoint(rect.left() + 60, rect.top() + 20),
+        )
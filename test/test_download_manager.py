@@ -0,0 +1,212 @@
+import os, subprocess, sys, time, pytest
+from threading import Event, Thread
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pytest import MonkeyPatch
+from uqload_dl_gui import queueJournal
+from uqload_dl_gui.config import override_config
+from uqload_dl_gui.downloadManager import RESOLVING, DownloadManager
+from uqload_dl_gui.queueJournal import QueueJournal
+from uqload_dl_gui.uqload import UQLoad
+
+content = os.urandom(2 * 1024 * 1024)
+
+page = """
+<script type='text/javascript'>var player = new Clappr.Player({{
+        sources: ["{url}/v.mp4"],
+        poster: "{url}/i/05/02288/vule3vel9n5q_xt.jpg",
+        ,chromecast: {{ media: {{title: "python testing"}} }}
+        }});
+</script>
+<h1>{title}</h1>
+<textarea>[860x360, 00:22]</textarea>
+"""
+
+# cleared to hold the video responses until the test sets it
+release = Event()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        if self.path.endswith(".html"):
+            title = self.path.strip("/").split(".")[0]
+            body = page.format(url=f"http://{self.headers['Host']}", title=title)
+            body = body.encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        release.wait(10)
+        start = 0
+        if "Range" in self.headers:
+            start = int(self.headers["Range"][len("bytes=") :].split("-")[0])
+            self.send_response(206)
+        else:
+            self.send_response(200)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(content) - start))
+        self.end_headers()
+        self.wfile.write(content[start:])
+
+    def do_HEAD(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("Content-Type", "video/mp4")
+        self.end_headers()
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class Server(ThreadingHTTPServer):
+    def handle_error(self, *args) -> None:
+        # stopped downloads drop their connections
+        pass
+
+
+@pytest.fixture
+def server_url(tmp_path, monkeypatch: MonkeyPatch):
+    server = Server(("127.0.0.1", 0), Handler)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr(
+        UQLoad, "get_page_urls", lambda self: [f"{url}/{self.video_id}.html"]
+    )
+    override_config(output_dir=str(tmp_path), download_segments=1)
+    release.set()
+    yield url
+    override_config()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("engine", [("threads"), ("asyncio")])
+def test_download(tmp_path, server_url: str, engine: str) -> None:
+    journal = QueueJournal(str(tmp_path / "queue.sqlite3"))
+    events = []
+    manager = DownloadManager(
+        2, engine, journal, on_event=lambda item, event: events.append(event)
+    )
+    items = [manager.add_url(f"{letter * 12}") for letter in "abc"]
+
+    assert manager.wait(10)
+    assert [item.state for item in items] == [queueJournal.DONE] * 3
+    assert [item.title for item in items] == [
+        "aaaaaaaaaaaa",
+        "bbbbbbbbbbbb",
+        "cccccccccccc",
+    ]
+    assert events.count("started") == 3
+    for item in items:
+        assert item.bytes_downloaded == len(content)
+        with open(tmp_path / f"{item.title}.mp4", "rb") as file:
+            assert file.read() == content
+    assert journal.pending() == []
+    manager.shutdown()
+
+
+def test_failed_link(tmp_path, server_url: str, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        UQLoad, "get_page_urls", lambda self: [f"{server_url}/missing/"]
+    )
+    manager = DownloadManager(1, "threads")
+    item = manager.add_url("xxxxxxxxxxxx")
+    assert manager.wait(10)
+    assert item.state == queueJournal.FAILED
+    assert item.error
+    manager.shutdown()
+
+
+def test_cancel_and_pause(tmp_path, server_url: str) -> None:
+    release.clear()
+    manager = DownloadManager(1, "threads")
+    first = manager.add_url("aaaaaaaaaaaa")
+    second = manager.add_url("bbbbbbbbbbbb")
+    while first.state == RESOLVING:
+        time.sleep(0.01)
+
+    assert manager.cancel(second.item_id)
+    assert manager.pause(first.item_id)
+    assert first.state == queueJournal.PAUSED
+    assert manager.resume(first.item_id)
+    release.set()
+
+    assert manager.wait(10)
+    assert first.state == queueJournal.DONE
+    assert second.state == queueJournal.CANCELLED
+    assert not manager.cancel(second.item_id)
+    manager.shutdown()
+
+
+def test_pause_frees_slot(tmp_path, server_url: str) -> None:
+    release.clear()
+    manager = DownloadManager(1, "threads")
+    first = manager.add_url("aaaaaaaaaaaa")
+    second = manager.add_url("bbbbbbbbbbbb")
+    while first.state == RESOLVING or second.state == RESOLVING:
+        time.sleep(0.01)
+
+    assert manager.pause(first.item_id)
+    release.set()
+    while second.state != queueJournal.DONE:
+        time.sleep(0.01)
+    assert first.state == queueJournal.PAUSED
+
+    assert manager.resume(first.item_id)
+    assert manager.wait(10)
+    assert first.state == queueJournal.DONE
+    with open(tmp_path / "aaaaaaaaaaaa.mp4", "rb") as file:
+        assert file.read() == content
+    manager.shutdown()
+
+
+def test_shutdown_and_restore(tmp_path, server_url: str) -> None:
+    release.clear()
+    journal = QueueJournal(str(tmp_path / "queue.sqlite3"))
+    manager = DownloadManager(1, "threads", journal)
+    manager.add_url("aaaaaaaaaaaa")
+    manager.add_url("bbbbbbbbbbbb")
+    manager.shutdown(wait=False)
+    release.set()
+    manager.shutdown()
+
+    pending = journal.pending()
+    assert [state for _, _, state, _ in pending] == [queueJournal.PAUSED] * 2
+    assert pending[0][1] == {"page_url": "https://uqload.to/embed-aaaaaaaaaaaa.html"}
+
+    manager = DownloadManager(1, "threads", journal)
+    restored = manager.restore()
+    assert [item.item_id for item in restored] == [item_id for item_id, *_ in pending]
+    assert manager.wait(10)
+    assert [item.state for item in restored] == [queueJournal.DONE] * 2
+    assert journal.pending() == []
+    manager.shutdown()
+
+
+def test_core_without_qt(tmp_path) -> None:
+    code = (
+        "import sys\n"
+        "class Block:\n"
+        "    def find_spec(self, name, path=None, target=None):\n"
+        "        if name.split('.')[0] == 'PyQt5':\n"
+        "            raise ImportError(name)\n"
+        "sys.meta_path.insert(0, Block())\n"
+        "import uqload_dl_gui.cli, uqload_dl_gui.downloadManager\n"
+        "from uqload_dl_gui.worker import Worker\n"
+        "from uqload_dl_gui.signals import DownloadSignals\n"
+        "worker = Worker({'video_url': 'http://localhost/v.mp4'})\n"
+        "assert isinstance(worker.signals, DownloadSignals)\n"
+        "assert not any(name.startswith('PyQt5') for name in sys.modules)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        timeout=60,
+        env={**os.environ, "XDG_DATA_HOME": str(tmp_path)},
+    )
+    assert result.returncode == 0, result.stderr
@@ -1,7 +1,12 @@
-import pytest
+import asyncio, socket, pytest
 from pytest import MonkeyPatch
 from pytestqt.qtbot import QtBot
 from PyQt5.QtWidgets import QMessageBox
+from uqload_dl_gui import bulkResolver, queueJournal
+from uqload_dl_gui.asyncEngine import get_loop_thread
+from uqload_dl_gui.config import override_config
+from uqload_dl_gui.queueJournal import QueueJournal
+from uqload_dl_gui.views.downloadPage import DownloadPage
 from uqload_dl_gui.views.mainWindow import MainWindow
 
 
@@ -19,6 +24,192 @@ def test_basic_widgets(app: MainWindow) -> None:
     assert app.download_page.thread_pool_size == 0
 
 
+@pytest.fixture
+def unanswered_url(qtbot: QtBot, tmp_path):
+    # accepts connections but never answers, so downloads keep their place
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(16)
+    override_config(
+        download_engine="asyncio",
+        max_queue=2,
+        concurrent_downloads=1,
+        output_dir=str(tmp_path),
+    )
+    yield f"http://127.0.0.1:{server.getsockname()[1]}"
+    override_config()
+    server.close()
+
+    async def count_tasks() -> int:
+        return len(asyncio.all_tasks()) - 1
+
+    # the downloads fail once the server is closed, let them finish before the
+    # pages are deleted
+    qtbot.waitUntil(lambda: get_loop_thread().submit(count_tasks()).result() == 0)
+
+
+def create_page(qtbot: QtBot, tmp_path, url: str, count: int) -> DownloadPage:
+    page = DownloadPage(QueueJournal(str(tmp_path / "queue.sqlite3")))
+    qtbot.addWidget(page)
+    for index in range(count):
+        page.enqueue({"title": f"{index}", "video_url": f"{url}/{index}.mp4"})
+    return page
+
+
+def test_backlog(qtbot: QtBot, tmp_path, unanswered_url: str) -> None:
+    page = create_page(qtbot, tmp_path, unanswered_url, 5)
+    try:
+        page.receive_data({"title": "full", "video_url": f"{unanswered_url}/f.mp4"})
+        assert page.thread_pool_size == 2
+        assert page.backlog_size == 4
+        assert page.total_tasks_label.text() == "2 item(s), 4 waiting"
+        assert len(page.journal.pending()) == 6
+
+        waiting = [
+            item["id"] for item in page.events.snapshot() if item["title"] == "3"
+        ]
+        assert page.pin_item(waiting[0])
+        assert page.cancel_item(waiting[0])
+        assert not page.cancel_item(waiting[0])
+        assert page.backlog_size == 3
+
+        page.set_limits(1, 3)
+        assert page.thread_pool_size == 3
+        assert page.backlog_size == 2
+    finally:
+        page.shutdown()
+
+
+def test_pause_frees_slot(qtbot: QtBot, tmp_path, unanswered_url: str) -> None:
+    page = create_page(qtbot, tmp_path, unanswered_url, 3)
+    try:
+        ids = {item["title"]: item["id"] for item in page.events.snapshot()}
+        assert page.thread_pool_size == 2
+        assert page.backlog_size == 1
+
+        # a queued item leaves the thread pool, the backlog takes its slot
+        assert page.pause_item(ids["1"])
+        assert page.thread_pool_size == 2
+        assert page.backlog_size == 0
+        assert page.total_tasks_label.text() == "2 item(s), 1 paused"
+        assert page.journal.pending()[1][2] == queueJournal.PAUSED
+
+        # a resumed item waits for a slot like any other
+        assert page.resume_item(ids["1"])
+        assert not page.resume_item(ids["1"])
+        assert page.backlog_size == 1
+        assert page.events.get(ids["1"])["state"] == queueJournal.QUEUED
+
+        # a running item is stopped
+        assert page.pause_item(ids["0"])
+        assert page.thread_pool_size == 2
+        assert page.backlog_size == 0
+        assert page.cancel_item(ids["0"])
+        assert page.total_tasks_label.text() == "2 item(s)"
+    finally:
+        page.shutdown()
+
+
+def test_cancel_all_with_backlog(
+    qtbot: QtBot, tmp_path, unanswered_url: str, monkeypatch: MonkeyPatch
+) -> None:
+    page = create_page(qtbot, tmp_path, unanswered_url, 5)
+    monkeypatch.setattr(
+        page, "show_message_dialog", lambda *args: QMessageBox.StandardButton.Yes
+    )
+    try:
+        assert page.total_tasks_label.text() == "2 item(s), 3 waiting"
+        page.cancel_all()
+        assert page.thread_pool_size == 0
+        assert page.backlog_size == 0
+        assert page.total_tasks_label.text() == "0 item(s)"
+        assert page.journal.pending() == []
+
+        # only waiting items, the queue has no room
+        page.set_limits(1, 0)
+        page.enqueue({"title": "waiting", "video_url": f"{unanswered_url}/w.mp4"})
+        assert page.thread_pool_size == 0
+        assert page.backlog_size == 1
+        page.cancel_all()
+        assert page.backlog_size == 0
+        assert page.journal.pending() == []
+
+        page.set_limits(1, 2)
+        page.enqueue({"title": "next", "video_url": f"{unanswered_url}/n.mp4"})
+        assert page.total_tasks_label.text() == "1 item(s)"
+    finally:
+        page.shutdown()
+
+
+def test_shutdown_keeps_backlog(qtbot: QtBot, tmp_path, unanswered_url: str) -> None:
+    page = create_page(qtbot, tmp_path, unanswered_url, 5)
+    page.shutdown()
+    pending = page.journal.pending()
+    assert [video_info["title"] for _, video_info, _, _ in pending] == [
+        f"{index}" for index in range(5)
+    ]
+
+    restored = DownloadPage(QueueJournal(str(tmp_path / "queue.sqlite3")))
+    qtbot.addWidget(restored)
+    try:
+        assert restored.backlog_size == 5
+        qtbot.waitUntil(lambda: restored.thread_pool_size == 2)
+        assert restored.backlog_size == 3
+    finally:
+        restored.shutdown()
+
+
+def test_restore_resolves_links_again(
+    qtbot: QtBot, tmp_path, unanswered_url: str, monkeypatch: MonkeyPatch
+) -> None:
+    resolved = []
+
+    async def fetch_video_info(url, *args):
+        resolved.append(url)
+        return {"title": "resolved", "video_url": f"{unanswered_url}/new.mp4"}
+
+    monkeypatch.setattr(bulkResolver, "fetch_video_info", fetch_video_info)
+    links = [f"https://uqload.to/embed-{letter * 12}.html" for letter in "ab"]
+    page = DownloadPage(QueueJournal(str(tmp_path / "queue.sqlite3")))
+    qtbot.addWidget(page)
+    for page_url in links:
+        page.enqueue(
+            {
+                "title": "mine",
+                "video_url": f"{unanswered_url}/old.mp4",
+                "page_url": page_url,
+            }
+        )
+    paused, queued = [item["id"] for item in page.events.snapshot()]
+    assert page.pause_item(paused)
+    page.shutdown()
+
+    pending = page.journal.pending()
+    assert [state for _, _, state, _ in pending] == [
+        queueJournal.PAUSED,
+        queueJournal.QUEUED,
+    ]
+    # the signed video URL expires, the link is resolved again
+    assert pending[0][1] == {"title": "mine", "page_url": links[0]}
+
+    restored = DownloadPage(QueueJournal(str(tmp_path / "queue.sqlite3")))
+    qtbot.addWidget(restored)
+    try:
+        # the paused item holds no slot until it is resumed
+        qtbot.waitUntil(lambda: restored.thread_pool_size == 1)
+        assert resolved == links[1:]
+        assert restored.total_tasks_label.text() == "1 item(s), 1 paused"
+        items = {item["id"]: item for item in restored.events.snapshot()}
+        assert items[paused]["state"] == queueJournal.PAUSED
+        assert items[queued]["title"] == "mine"
+        assert restored.resume_item(paused)
+        assert restored.events.snapshot()[0]["state"] != queueJournal.PAUSED
+        qtbot.waitUntil(lambda: restored.thread_pool_size == 2)
+        assert sorted(resolved) == links
+    finally:
+        restored.shutdown()
+
+
 def test_add_to_queue(app: MainWindow, monkeypatch: MonkeyPatch) -> None:
     app.download_page.test_start_download()
     monkeypatch.setattr(
@@ -1,7 +1,11 @@
 import pytest
+from pytest import MonkeyPatch
 from PyQt5.QtCore import QTimer
 from pytestqt.qtbot import QtBot
 from PyQt5.QtWidgets import QMessageBox
+from uqload_dl_gui import bulkResolver
+from uqload_dl_gui.views import homePage
+from uqload_dl_gui.views.homePage import HomePage
 from uqload_dl_gui.views.mainWindow import MainWindow
 
 
@@ -63,3 +67,60 @@ def test_show_card_info(app: MainWindow, qtbot: QtBot) -> None:
         == "https://m180.uqload.to/i/05/02288/vule3vel9n5q_xt.jpg"
     )
     assert blocker.args[0].get("title") == "python $$%%& testing time!"
+
+
+def test_bulk_import(qtbot: QtBot, monkeypatch: MonkeyPatch) -> None:
+    class FakeUQLoad:
+        def __init__(self, url, cache=None, probe_size=True, embed_only=False) -> None:
+            self.url = url
+
+        def get_info(self):
+            if "bbbbbbbbbbbb" in self.url:
+                raise Exception("Video not found!")
+            return {"title": self.url}
+
+    monkeypatch.setattr(bulkResolver, "UQLoad", FakeUQLoad)
+    monkeypatch.setattr(homePage, "get_metadata_cache", lambda: None)
+    home_page = HomePage()
+    qtbot.addWidget(home_page)
+    queued = []
+    home_page.bulk_data_sent.connect(queued.append)
+
+    home_page.url_input.setText(
+        "aaaaaaaaaaaa bbbbbbbbbbbb aaaaaaaaaaaa cccccccccccc xx"
+    )
+    home_page.search_button.click()
+    qtbot.waitUntil(lambda: home_page.bulk_resolver is None, timeout=5000)
+
+    assert len(queued) == 2
+    assert home_page.bulk_counts == {
+        "total": 4,
+        "resolved": 2,
+        "failed": 2,
+        "queued": 2,
+    }
+    assert home_page.bulk_status_label.text() == (
+        "Resolved 2 · Failed 2 · Queued 2 of 4"
+    )
+    assert home_page.import_button.isEnabled()
+
+
+def test_embed_only_details(qtbot: QtBot) -> None:
+    home_page = HomePage()
+    qtbot.addWidget(home_page)
+    home_page.video_info = {"title": "embed title", "video_url": "http://a/v.mp4"}
+    home_page.card_frame.update_card_info(home_page.video_info)
+    assert home_page.card_frame.duration_label.text() == "Duration: ..."
+
+    details = {"title": "full title", "resolution": "860x360", "duration": "00:22"}
+    home_page.handle_details_finished("http://b/v.mp4", details)
+    assert home_page.card_frame.card_title.text() == "embed title"
+
+    home_page.handle_details_finished("http://a/v.mp4", details)
+    assert home_page.card_frame.card_title.text() == "full title"
+    assert home_page.card_frame.duration_label.text() == "Duration: 00:22"
+
+    # a title edited by the user is kept
+    home_page.card_frame.card_title.setText("my title")
+    home_page.handle_details_finished("http://a/v.mp4", {"title": "other"})
+    assert home_page.card_frame.card_title.text() == "my title"
@@ -0,0 +1,76 @@
+import time
+from uqload_dl_gui.metadataCache import MetadataCache
+
+video_info = {
+    "title": "My video",
+    "video_url": "https://m180.uqload.to/xxxx/v.mp4",
+    "image_url": "https://m180.uqload.to/i/05/02288/vule3vel9n5q_xt.jpg",
+    "size": 123,
+    "type": "video/mp4",
+    "resolution": "860x360",
+    "duration": "00:22",
+}
+
+
+def test_get_and_put(tmp_path) -> None:
+    cache = MetadataCache(str(tmp_path / "metadata.sqlite3"))
+    assert cache.get("xxxxxxxxxxxx") is None
+    cache.put("xxxxxxxxxxxx", video_info)
+    assert cache.get("xxxxxxxxxxxx") == video_info
+    cache.close()
+
+    reopened = MetadataCache(str(tmp_path / "metadata.sqlite3"))
+    assert reopened.get("xxxxxxxxxxxx") == video_info
+
+
+def test_expiry(tmp_path) -> None:
+    cache = MetadataCache(str(tmp_path / "metadata.sqlite3"), ttl=0.2, video_url_ttl=0)
+    cache.put("xxxxxxxxxxxx", video_info)
+
+    cached = cache.get("xxxxxxxxxxxx")
+    assert "video_url" not in cached
+    assert cached["size"] == 123
+
+    cache.put_video_url("xxxxxxxxxxxx", "https://m180.uqload.to/yyyy/v.mp4")
+    cache.video_url_ttl = 60
+    cache.put_video_url("xxxxxxxxxxxx", "https://m180.uqload.to/zzzz/v.mp4")
+    assert cache.get("xxxxxxxxxxxx")["video_url"] == "https://m180.uqload.to/zzzz/v.mp4"
+
+    time.sleep(0.25)
+    assert cache.get("xxxxxxxxxxxx") is None
+    assert len(cache) == 0
+
+
+def test_lru_eviction(tmp_path) -> None:
+    cache = MetadataCache(str(tmp_path / "metadata.sqlite3"), max_entries=2)
+    cache.put("aaaaaaaaaaaa", video_info)
+    time.sleep(0.01)
+    cache.put("bbbbbbbbbbbb", video_info)
+    time.sleep(0.01)
+    assert cache.get("aaaaaaaaaaaa") is not None
+    time.sleep(0.01)
+    cache.put("cccccccccccc", video_info)
+
+    assert len(cache) == 2
+    assert cache.get("bbbbbbbbbbbb") is None
+    assert cache.get("aaaaaaaaaaaa") is not None
+    assert cache.get("cccccccccccc") is not None
+
+
+def test_update(tmp_path) -> None:
+    cache = MetadataCache(str(tmp_path / "metadata.sqlite3"))
+    cache.update("xxxxxxxxxxxx", {"duration": "00:22"})
+    assert cache.get("xxxxxxxxxxxx") is None
+
+    embed_info = {key: video_info[key] for key in ["title", "video_url", "image_url"]}
+    cache.put("xxxxxxxxxxxx", embed_info)
+    cache.update(
+        "xxxxxxxxxxxx",
+        {"title": "My full video", "resolution": "860x360", "duration": "00:22"},
+    )
+    assert cache.get("xxxxxxxxxxxx") == {
+        **embed_info,
+        "title": "My full video",
+        "resolution": "860x360",
+        "duration": "00:22",
+    }
@@ -0,0 +1,92 @@
+import pytest
+from uqload_dl_gui.exceptions import VideoNotFoundError
+from uqload_dl_gui.pageExtractor import PageExtractor
+
+embed_page = """
+<script type='text/javascript'>var player = new Clappr.Player({
+        sources: ["https://m180.uqload.to/xxxx/v.mp4"],
+        poster: "https://m180.uqload.to/i/05/02288/vule3vel9n5q_xt.jpg",
+        ,chromecast: { media: {title: "python testing"}, poster: "https://m180.uqload.to/i/05/02288/vule3vel9n5q.jpg" }
+        });
+</script>
+"""
+
+video_page = """
+<h1 class="title">
+    My   video
+</h1>
+<textarea id="embedcodetext">no resolution here</textarea>
+<textarea style="min-height:100px;" id="forumcodetext"
+onfocus="copy(this);">[URL=https://uqload.to/vule3vel9n5q.html]
+[860x360, 01:00:22]</textarea>
+"""
+
+expected = {
+    "title": "My video",
+    "video_url": "https://m180.uqload.to/xxxx/v.mp4",
+    "image_url": "https://m180.uqload.to/i/05/02288/vule3vel9n5q_xt.jpg",
+    "resolution": "860x360",
+    "duration": "01:00:22",
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 100000])
+def test_chunked_pages(chunk_size: int) -> None:
+    extractor = PageExtractor()
+    for page in [embed_page, video_page]:
+        for offset in range(0, len(page), chunk_size):
+            extractor.feed(page[offset : offset + chunk_size])
+        extractor.end_page()
+    assert extractor.done
+    assert extractor.get_info() == expected
+
+
+def test_stops_once_every_field_is_found() -> None:
+    extractor = PageExtractor()
+    extractor.feed(embed_page)
+    assert not extractor.end_page()
+    assert extractor.feed(video_page + "\n")
+    # nothing after the fields is needed
+    assert extractor.get_info() == expected
+
+
+def test_without_h1() -> None:
+    extractor = PageExtractor()
+    extractor.feed(embed_page)
+    assert extractor.get_info() == {
+        "title": "python testing",
+        "video_url": "https://m180.uqload.to/xxxx/v.mp4",
+        "image_url": "https://m180.uqload.to/i/05/02288/vule3vel9n5q_xt.jpg",
+    }
+
+
+@pytest.mark.parametrize(
+    "page", ["<p>File was deleted</p>", "<b>File Not Found</b>", "<html></html>"]
+)
+def test_video_not_found(page: str) -> None:
+    extractor = PageExtractor()
+    extractor.feed(page)
+    with pytest.raises(VideoNotFoundError):
+        extractor.get_info()
+
+
+def test_embed_only() -> None:
+    extractor = PageExtractor(embed_only=True)
+    assert extractor.feed(embed_page)
+    assert extractor.get_info() == {
+        "title": "python testing",
+        "video_url": "https://m180.uqload.to/xxxx/v.mp4",
+        "image_url": "https://m180.uqload.to/i/05/02288/vule3vel9n5q_xt.jpg",
+    }
+
+
+def test_details_only() -> None:
+    extractor = PageExtractor(details_only=True)
+    assert not extractor.feed(embed_page)
+    assert extractor.feed(video_page)
+    assert extractor.video_url is None
+    assert extractor.get_details() == {
+        "title": "My video",
+        "resolution": "860x360",
+        "duration": "01:00:22",
+    }
@@ -0,0 +1,112 @@
+import os, errno, pytest
+from pytest import MonkeyPatch
+from uqload_dl_gui.partFile import (
+    PartFile,
+    claim_part_file,
+    get_validators,
+    release_part_file,
+)
+from uqload_dl_gui.exceptions import InsufficientSpaceError
+
+
+def test_create_and_commit(tmp_path) -> None:
+    part = PartFile(os.path.join(str(tmp_path), "video.mp4"))
+    assert not part.exists()
+    assert not part.load()
+
+    part.create("https://test.com/v.mp4", 100, [[0, 49], [50, 99]])
+    assert part.exists()
+    assert os.path.getsize(part.part_path) == 100
+    assert part.remaining() == [0, 1]
+
+    part.commit(0, 50)
+    part.commit(1, 20)
+
+    loaded = PartFile(part.destination_path)
+    assert loaded.load()
+    assert loaded.url == "https://test.com/v.mp4"
+    assert loaded.bytes_committed == 70
+    assert loaded.remaining() == [1]
+    assert loaded.matches(100)
+    assert not loaded.matches(101)
+
+
+def test_matches_the_same_file(tmp_path) -> None:
+    part = PartFile(os.path.join(str(tmp_path), "video.mp4"))
+    part.create("https://a.test/x/v.mp4?t=1", 100, [[0, 99]], etag='"1"')
+    loaded = PartFile(part.destination_path)
+    assert loaded.load()
+    assert loaded.etag == '"1"'
+    # the ETag wins over the URL, which changes every time a link is resolved
+    assert loaded.matches(100, "https://b.test/y/v.mp4", '"1"')
+    assert not loaded.matches(100, "https://a.test/x/v.mp4", '"2"')
+    # without validators, only the same URL path is continued
+    assert loaded.matches(100, "https://b.test/x/v.mp4?t=2")
+    assert not loaded.matches(100, "https://a.test/y/v.mp4")
+
+
+def test_get_validators() -> None:
+    headers = {"etag": '"abc"', "last-modified": "Wed, 21 Oct 2015 07:28:00 GMT"}
+    assert get_validators(headers) == ('"abc"', headers["last-modified"])
+    assert get_validators({"etag": 'W/"abc"'}) == ("", "")
+
+
+def test_claim_reuses_destination(tmp_path) -> None:
+    output_dir = str(tmp_path)
+    open(os.path.join(output_dir, "video.mp4"), "wb").close()
+    first = claim_part_file(output_dir, "video", ".mp4")
+    assert first.destination_path != os.path.join(output_dir, "video.mp4")
+    first.create("https://test.com/v.mp4", 10, [[0, 9]])
+    release_part_file(first)
+
+    # a unique name is found again when the destination is known
+    second = claim_part_file(output_dir, "video", ".mp4", first.destination_path)
+    assert second.destination_path == first.destination_path
+    # but not while it is in use
+    third = claim_part_file(output_dir, "video", ".mp4", first.destination_path)
+    assert third.destination_path != first.destination_path
+    release_part_file(second)
+    release_part_file(third)
+
+
+def test_corrupted_sidecar(tmp_path) -> None:
+    part = PartFile(os.path.join(str(tmp_path), "video.mp4"))
+    part.create("https://test.com/v.mp4", 10, [[0, 9]])
+    with open(part.meta_path, "w") as file:
+        file.write("{not json")
+    assert not PartFile(part.destination_path).load()
+
+
+def test_finalize_and_discard(tmp_path) -> None:
+    part = PartFile(os.path.join(str(tmp_path), "video.mp4"))
+    part.create("https://test.com/v.mp4", 10, [[0, 9]])
+    part.commit(0, 10)
+    assert part.remaining() == []
+    part.finalize()
+    assert os.path.isfile(part.destination_path)
+    assert not part.exists()
+
+    part.create("https://test.com/v.mp4", 10, [[0, 9]])
+    part.discard()
+    assert not os.path.exists(part.part_path)
+    assert not os.path.exists(part.meta_path)
+
+
+@pytest.mark.skipif(not hasattr(os, "posix_fallocate"), reason="requires fallocate")
+def test_preallocate(tmp_path) -> None:
+    part = PartFile(os.path.join(str(tmp_path), "video.mp4"))
+    part.create("https://test.com/v.mp4", 1024 * 1024, [[0, 1024 * 1024 - 1]], True)
+    assert os.path.getsize(part.part_path) == 1024 * 1024
+    assert os.stat(part.part_path).st_blocks * 512 >= 1024 * 1024
+
+
+def test_preallocate_fails_fast(tmp_path, monkeypatch: MonkeyPatch) -> None:
+    def no_space(fd: int, offset: int, length: int) -> None:
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(os, "posix_fallocate", no_space, raising=False)
+    part = PartFile(os.path.join(str(tmp_path), "video.mp4"))
+    with pytest.raises(InsufficientSpaceError):
+        part.create("https://test.com/v.mp4", 100, [[0, 99]], True)
+    assert not os.path.exists(part.part_path)
+    assert not os.path.exists(part.meta_path)
@@ -0,0 +1,28 @@
+import time
+from uqload_dl_gui.progressThrottle import ProgressThrottle
+
+
+def test_time_limit() -> None:
+    throttle = ProgressThrottle(interval=0.05)
+    assert throttle.ready(10, 100)
+    assert not throttle.ready(20, 100)
+    assert not throttle.ready(30, 100)
+    time.sleep(0.06)
+    assert throttle.ready(40, 100)
+
+
+def test_byte_limit() -> None:
+    throttle = ProgressThrottle(interval=0, min_bytes=50)
+    assert throttle.ready(10, 100)
+    assert not throttle.ready(40, 100)
+    assert throttle.ready(60, 100)
+    assert not throttle.ready(70, 100)
+
+
+def test_final_update_and_flush() -> None:
+    throttle = ProgressThrottle(interval=10)
+    assert throttle.ready(10, 100)
+    assert not throttle.ready(50, 100)
+    assert throttle.flush() == (50, 100)
+    assert throttle.flush() is None
+    assert throttle.ready(100, 100)
@@ -0,0 +1,74 @@
+import os
+from uqload_dl_gui import queueJournal
+from uqload_dl_gui.queueJournal import QueueJournal
+
+video_info = {
+    "title": "My video",
+    "video_url": "https://test.com/v.mp4",
+    "size": 123,
+    "type": "video/mp4",
+}
+
+
+def test_pending_items(tmp_path) -> None:
+    journal = QueueJournal(os.path.join(str(tmp_path), "queue.sqlite3"))
+    journal.append("a", queueJournal.QUEUED, video_info)
+    journal.append("b", queueJournal.QUEUED, {**video_info, "title": "Other"})
+    journal.append("c", queueJournal.QUEUED, video_info)
+    journal.append("a", queueJournal.RUNNING)
+    journal.append("a", queueJournal.PAUSED, offset=100)
+    journal.append("b", queueJournal.DONE, offset=123)
+    journal.append("c", queueJournal.FAILED, offset=10)
+
+    pending = journal.pending()
+    assert len(pending) == 1
+    assert pending[0] == ("a", video_info, queueJournal.PAUSED, 100)
+
+
+def test_latest_video_info(tmp_path) -> None:
+    journal = QueueJournal(os.path.join(str(tmp_path), "queue.sqlite3"))
+    journal.append("a", queueJournal.QUEUED, video_info)
+    started = {**video_info, "destination_path": "/videos/My video_1.mp4"}
+    journal.append("a", queueJournal.RUNNING, started)
+    journal.append("a", queueJournal.PAUSED, offset=100)
+
+    assert journal.pending() == [("a", started, queueJournal.PAUSED, 100)]
+
+
+def test_survives_reopen_and_compact(tmp_path) -> None:
+    path = os.path.join(str(tmp_path), "queue.sqlite3")
+    journal = QueueJournal(path)
+    for item_id in ("a", "b", "c"):
+        journal.append(item_id, queueJournal.QUEUED, video_info)
+    journal.append("b", queueJournal.CANCELLED)
+    journal.close()
+
+    journal = QueueJournal(path)
+    journal.compact()
+    assert [item[0] for item in journal.pending()] == ["a", "c"]
+    journal.append("a", queueJournal.RUNNING)
+    assert [item[2] for item in journal.pending()] == [
+        queueJournal.RUNNING,
+        queueJournal.QUEUED,
+    ]
+
+
+def test_iter_pending_in_batches(tmp_path) -> None:
+    journal = QueueJournal(os.path.join(str(tmp_path), "queue.sqlite3"))
+    for index in range(10):
+        journal.append(f"{index}", queueJournal.QUEUED, video_info)
+    journal.append_many(["1", "4", "5"], queueJournal.CANCELLED)
+    journal.append("2", queueJournal.PAUSED, offset=5)
+
+    pending = list(journal.iter_pending(batch=2))
+    assert [item[0] for item in pending] == ["0", "2", "3", "6", "7", "8", "9"]
+    assert pending[1] == ("2", video_info, queueJournal.PAUSED, 5)
+    assert journal.pending() == pending
+
+
+def test_journal_info_drops_signed_url() -> None:
+    assert queueJournal.get_journal_info(video_info) == video_info
+    page_url = "https://uqload.to/embed-aaaaaaaaaaaa.html"
+    recorded = queueJournal.get_journal_info({**video_info, "page_url": page_url})
+    assert "video_url" not in recorded
+    assert recorded["page_url"] == page_url
@@ -1,6 +1,7 @@
 import pytest
 from pytestqt.qtbot import QtBot
 from uqload_dl_gui.views.settings import Settings
+from uqload_dl_gui.bandwidthLimiter import get_bandwidth_limiter
 
 
 @pytest.fixture
@@ -18,3 +19,46 @@ def test_basic(app: Settings) -> None:
     assert app.max_size_label.text() == "Max queue size: "
     assert app.concurrent_downloads_label.text() == "Concurrent Downloads: "
     assert app.change_folder_button.text() == "Browse..."
+
+
+def test_bandwidth_limit_applies_immediately(app: Settings) -> None:
+    previous = app.bandwidth_spin_box.value()
+    try:
+        app.bandwidth_spin_box.setValue(300)
+        assert get_bandwidth_limiter().rate == 300 * 1024
+        assert int(app.settings.value("bandwidth_limit_kbps")) == 300
+        assert not app.changes_pending
+    finally:
+        app.bandwidth_spin_box.setValue(previous)
+
+
+def test_download_engine(app: Settings) -> None:
+    assert app.engine_label.text() == "Download Engine: "
+    assert app.engine_combo_box.findData("threads") == 0
+    assert app.engine_combo_box.findData("asyncio") == 1
+    assert app.engine_combo_box.currentData() == app.settings.value("download_engine")
+
+
+def test_limits_apply_immediately(app: Settings, qtbot: QtBot) -> None:
+    previous = app.max_queue_size_spin_box.value()
+    try:
+        with qtbot.waitSignal(app.limits_changed) as blocker:
+            app.max_queue_size_spin_box.setValue(previous + 1)
+        assert blocker.args == [app.concurrent_download_spin_box.value(), previous + 1]
+        assert int(app.settings.value("max_queue")) == previous + 1
+        assert not app.changes_pending
+    finally:
+        app.max_queue_size_spin_box.setValue(previous)
+
+
+def test_scheduling_policy_applies_immediately(app: Settings, qtbot: QtBot) -> None:
+    previous = app.scheduling_combo_box.currentIndex()
+    try:
+        index = app.scheduling_combo_box.findData("shortest_first")
+        with qtbot.waitSignal(app.policy_changed) as blocker:
+            app.scheduling_combo_box.setCurrentIndex(index)
+        assert blocker.args == ["shortest_first"]
+        assert app.settings.value("scheduling_policy") == "shortest_first"
+        assert not app.changes_pending
+    finally:
+        app.scheduling_combo_box.setCurrentIndex(previous)
@@ -0,0 +1,39 @@
+import os
+from uqload_dl_gui.startupTimer import (
+    DEFERRED_MODULES,
+    measure_startup,
+    parse_import_times,
+)
+
+# regression thresholds, generous enough for slow CI machines
+FIRST_PAINT_BUDGET_MS = 3000
+MAIN_WINDOW_IMPORT_BUDGET_MS = 1500
+
+
+def test_parse_import_times() -> None:
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   json.decoder\n"
+        "import time:       300 |        420 | json\n"
+        "unrelated warning\n"
+    )
+    assert parse_import_times(output) == [
+        {"module": "json.decoder", "self_us": 120, "cumulative_us": 120},
+        {"module": "json", "self_us": 300, "cumulative_us": 420},
+    ]
+
+
+def test_startup(tmp_path) -> None:
+    env = dict(
+        os.environ,
+        QT_QPA_PLATFORM="offscreen",
+        XDG_CONFIG_HOME=str(tmp_path / "config"),
+        XDG_DATA_HOME=str(tmp_path / "data"),
+    )
+    report = measure_startup(env)
+    assert report["first_paint_ms"] < FIRST_PAINT_BUDGET_MS
+    imports = {item["module"]: item for item in report["imports"]}
+    main_window = imports["uqload_dl_gui.views.mainWindow"]
+    assert main_window["cumulative_us"] / 1000 < MAIN_WINDOW_IMPORT_BUDGET_MS
+    # the download page, settings dialog and network stack are created on first use
+    assert report["loaded"] == {name: False for name in DEFERRED_MODULES}
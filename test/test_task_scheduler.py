@@ -0,0 +1,79 @@
+import pytest
+from uqload_dl_gui.taskScheduler import (
+    FIFO,
+    SHORTEST_FIRST,
+    TaskScheduler,
+    get_remaining_bytes,
+)
+
+
+class Task:
+    def __init__(self, name, size=None, bytes_downloaded=0) -> None:
+        self.name = name
+        self.video_info = {"title": name, "size": size}
+        self.bytes_downloaded = bytes_downloaded
+
+
+def drain(scheduler: TaskScheduler):
+    names = []
+    task = scheduler.pop()
+    while task is not None:
+        names.append(task.name)
+        task = scheduler.pop()
+    return names
+
+
+def test_priorities_and_pins() -> None:
+    scheduler = TaskScheduler()
+    tasks = {name: Task(name) for name in "abcde"}
+    for task in tasks.values():
+        scheduler.push(task)
+    scheduler.set_priority(tasks["d"], 1)
+    scheduler.set_priority(tasks["a"], -1)
+    scheduler.pin(tasks["c"])
+    scheduler.pin(tasks["e"])
+    assert scheduler.priority(tasks["d"]) == 1
+    assert scheduler.peek() is tasks["e"]
+    assert scheduler.remove(tasks["b"])
+    assert not scheduler.remove(tasks["b"])
+    assert tasks["b"] not in scheduler
+    assert len(scheduler) == 4
+    assert drain(scheduler) == ["e", "c", "d", "a"]
+    assert not scheduler.set_priority(tasks["a"], 1)
+    assert not scheduler.pin(tasks["a"])
+    assert scheduler.pop() is None
+
+
+def test_shortest_first() -> None:
+    scheduler = TaskScheduler(SHORTEST_FIRST)
+    scheduler.push(Task("big", 4 * 1024**3))
+    scheduler.push(Task("unknown"))
+    scheduler.push(Task("resumed", 900, bytes_downloaded=850))
+    scheduler.push(Task("small", 100))
+    scheduler.push(Task("urgent", 10**9), priority=1)
+    assert drain(scheduler) == ["urgent", "resumed", "small", "big", "unknown"]
+
+    for name, size in (("a", 300), ("b", 200), ("c", 100)):
+        scheduler.push(Task(name, size))
+    scheduler.set_policy(FIFO)
+    assert drain(scheduler) == ["a", "b", "c"]
+    with pytest.raises(ValueError):
+        scheduler.set_policy("random")
+
+
+def test_many_reorders() -> None:
+    scheduler = TaskScheduler()
+    tasks = [Task(f"{index}") for index in range(10)]
+    for task in tasks:
+        scheduler.push(task)
+    for priority in range(100):
+        scheduler.set_priority(tasks[5], priority)
+    assert scheduler.peek() is tasks[5]
+    assert len(drain(scheduler)) == 10
+
+
+def test_remaining_bytes() -> None:
+    assert get_remaining_bytes(Task("a", 100, 40)) == 60
+    assert get_remaining_bytes(Task("a", "100")) == 100
+    assert get_remaining_bytes(Task("a")) is None
+    assert get_remaining_bytes(object()) is None
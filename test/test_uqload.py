@@ -1,9 +1,10 @@
 import requests_mock, requests, pytest
 from typing import List
 from pytest import MonkeyPatch
-from uqload_dl_gui.uqload import UQLoad
+from uqload_dl_gui.uqload import UQLoad, probe_video
 from uqload_dl_gui.utils import remove_special_characters
 from uqload_dl_gui.exceptions import InvalidUQLoadURL
+from uqload_dl_gui.metadataCache import MetadataCache
 
 html_template = """
 <script type='text/javascript'>var player = new Clappr.Player({
@@ -87,3 +88,112 @@ def test_get_video_info(monkeypatch: MonkeyPatch) -> None:
         video_info.get("video_url")
         == "https://m180.uqload.to/3rfkv4rhrvw2q4drdkgpxmnva6flydhkehdqtxrb6635d6s4w6jydebrci5q/v.mp4"
     )
+
+
+def test_get_video_info_from_cache(tmp_path, monkeypatch: MonkeyPatch) -> None:
+    cache = MetadataCache(str(tmp_path / "metadata.sqlite3"), video_url_ttl=0)
+    calls = []
+
+    def mock_responses() -> List[requests.Response]:
+        calls.append("pages")
+        response = requests.Response()
+        response.status_code = 200
+        response._content = html_template.encode()
+        return [response, response]
+
+    def mock_head(url: str) -> requests.Response:
+        calls.append("head")
+        response = requests.Response()
+        response.headers.update({"content-length": "123", "content-type": "video/mp4"})
+        return response
+
+    uqload = UQLoad("xxxxxxxxxxxx", cache)
+    monkeypatch.setattr(uqload, "get_responses", mock_responses)
+    monkeypatch.setattr(uqload, "request_head", mock_head)
+    video_info = uqload.get_info()
+    assert calls == ["pages", "head"]
+    assert uqload.video_id == "xxxxxxxxxxxx"
+
+    # the signed video URL expired: only the pages are fetched again
+    uqload = UQLoad("https://uqload.to/xxxxxxxxxxxx.html", cache)
+    monkeypatch.setattr(uqload, "get_responses", mock_responses)
+    monkeypatch.setattr(uqload, "request_head", mock_head)
+    assert uqload.get_info() == video_info
+    assert calls == ["pages", "head", "pages"]
+
+    # a valid cached entry needs no request at all
+    cache.video_url_ttl = 60
+    cache.put_video_url("xxxxxxxxxxxx", video_info["video_url"])
+    uqload = UQLoad("xxxxxxxxxxxx", cache)
+    monkeypatch.setattr(uqload, "get_responses", mock_responses)
+    monkeypatch.setattr(uqload, "request_head", mock_head)
+    assert uqload.get_info() == video_info
+    assert calls == ["pages", "head", "pages"]
+
+
+def test_fast_resolve_skips_head(monkeypatch: MonkeyPatch) -> None:
+    def mock_responses() -> List[requests.Response]:
+        response = requests.Response()
+        response.status_code = 200
+        response._content = html_template.encode()
+        return [response, response]
+
+    def mock_head(url: str) -> requests.Response:
+        raise AssertionError("HEAD request sent in fast resolve mode")
+
+    uqload = UQLoad("xxxxxxxxxxxx", probe_size=False)
+    monkeypatch.setattr(uqload, "get_responses", mock_responses)
+    monkeypatch.setattr(uqload, "request_head", mock_head)
+    video_info = uqload.get_info()
+    assert video_info["resolution"] == "860x360"
+    assert "size" not in video_info and "type" not in video_info
+
+
+def test_probe_video() -> None:
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            "http://my_video.com/v.mp4",
+            status_code=206,
+            content=b"\x00",
+            headers={"content-range": "bytes 0-0/5249454", "content-type": "video/mp4"},
+        )
+        assert probe_video("http://my_video.com/v.mp4") == {
+            "size": 5249454,
+            "type": "video/mp4",
+        }
+        assert mock.last_request.headers["Range"] == "bytes=0-0"
+
+        # the server ignored the range
+        mock.get(
+            "http://my_video.com/v.mp4",
+            content=b"\x00" * 10,
+            headers={"content-length": "10", "content-type": "video/mp4"},
+        )
+        assert probe_video("http://my_video.com/v.mp4")["size"] == 10
+
+
+def test_embed_only(tmp_path) -> None:
+    cache = MetadataCache(str(tmp_path / "metadata.sqlite3"))
+    embed_page, video_page = html_template.split("<h1>")
+    uqload = UQLoad("xxxxxxxxxxxx", cache, probe_size=False, embed_only=True)
+    assert uqload.get_page_urls() == ["https://uqload.to/embed-xxxxxxxxxxxx.html"]
+
+    with requests_mock.Mocker() as mock:
+        mock.get("https://uqload.to/embed-xxxxxxxxxxxx.html", text=embed_page)
+        mock.get("https://uqload.to/xxxxxxxxxxxx.html", text="<h1>" + video_page)
+        video_info = uqload.get_info()
+        assert mock.call_count == 1
+        assert video_info["title"] == remove_special_characters(
+            "python  $$%%& testing? time!"
+        )
+        assert "duration" not in video_info
+
+        assert uqload.get_details() == {
+            "title": "My video",
+            "resolution": "860x360",
+            "duration": "00:22",
+        }
+        assert mock.last_request.url == "https://uqload.to/xxxxxxxxxxxx.html"
+
+    assert cache.get("xxxxxxxxxxxx")["duration"] == "00:22"
+    assert cache.get("xxxxxxxxxxxx")["title"] == "My video"
@@ -1,10 +1,12 @@
 import pytest
+from uqload_dl_gui.exceptions import InvalidUQLoadURL
 from uqload_dl_gui.utils import (
     check_special_characters,
     remove_special_characters,
     convert_size,
     is_uqload_url,
     validate_uqload_url,
+    get_video_id,
 )
 
 
@@ -70,3 +72,10 @@ def test_convert_size() -> None:
     assert convert_size(100000000) == "95.37 MB"
     assert convert_size(659874523) == "629.31 MB"
     assert convert_size(2015477) == "1.92 MB"
+
+
+def test_get_video_id() -> None:
+    assert get_video_id("https://uqload.to/embed-vule3vel9n5q.html") == "vule3vel9n5q"
+    assert get_video_id("https://uqload.io/vule3vel9n5q.html") == "vule3vel9n5q"
+    with pytest.raises(InvalidUQLoadURL):
+        get_video_id("https://uqload.io/")
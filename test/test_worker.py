@@ -1,7 +1,11 @@
-import pytest, time, os, requests_mock
+import pytest, time, os, errno, logging, requests_mock
 from pytest import MonkeyPatch
 from pytestqt.qtbot import QtBot
-from uqload_dl_gui.worker import Worker
+from uqload_dl_gui import worker as worker_module
+from uqload_dl_gui.worker import Worker, apply_transfer_limits
+from uqload_dl_gui.partFile import PartFile
+from uqload_dl_gui.bandwidthLimiter import get_bandwidth_limiter
+from uqload_dl_gui.taskScheduler import get_remaining_bytes
 
 video_info = {
     "title": "my video",
@@ -48,6 +52,30 @@ def test_download_cancel_by_the_user(qtbot: QtBot) -> None:
         print(str(ex))
 
 
+def test_settings_are_read_once(monkeypatch: MonkeyPatch) -> None:
+    settings = worker_module.get_config()
+    calls = []
+    monkeypatch.setattr(
+        worker_module, "get_config", lambda: calls.append(1) or settings
+    )
+    Worker(video_info)
+    assert len(calls) == 1
+
+
+def test_transfer_limits_are_applied_once() -> None:
+    settings = worker_module.get_config()
+    settings.setValue("bandwidth_limit_kbps", 100)
+    apply_transfer_limits(settings)
+    try:
+        assert get_bandwidth_limiter().rate == 100 * 1024
+        # a new download leaves the limit set by the owner of the queue alone
+        settings.setValue("bandwidth_limit_kbps", 0)
+        Worker(video_info)
+        assert get_bandwidth_limiter().rate == 100 * 1024
+    finally:
+        get_bandwidth_limiter().set_rate(0)
+
+
 def test_missing_content_length(qtbot: QtBot) -> None:
     with requests_mock.Mocker() as mock:
         mock.get("http://my_video.com/video.mp4", text="response")
@@ -66,3 +94,245 @@ def test_non_200_status_code_error(qtbot: QtBot) -> None:
         with qtbot.waitSignal(worker.signals.download_error, timeout=2000) as blocker:
             worker.run()
         assert blocker.args[0] == "Unexpected status code: 401"
+
+
+def range_callback(content: bytes):
+    def callback(request, context) -> bytes:
+        range_header = request.headers.get("Range")
+        if range_header is None:
+            context.headers["content-length"] = str(len(content))
+            context.headers["accept-ranges"] = "bytes"
+            return content
+        start, end = range_header.replace("bytes=", "").split("-")
+        end = int(end) if end else len(content) - 1
+        context.status_code = 206
+        return content[int(start) : end + 1]
+
+    return callback
+
+
+def test_segmented_download(qtbot: QtBot, tmp_path) -> None:
+    content = os.urandom(3 * 1024 * 1024 + 123)
+    with requests_mock.Mocker() as mock:
+        mock.get("http://my_video.com/video.mp4", content=range_callback(content))
+
+        worker = Worker(
+            {"title": "segmented", "video_url": "http://my_video.com/video.mp4"}
+        )
+        worker._Worker__output_dir = str(tmp_path)
+        worker._Worker__segments = 3
+        with qtbot.waitSignal(worker.signals.download_completed, timeout=5000):
+            worker.run()
+
+        ranges = [r.headers.get("Range") for r in mock.request_history[1:]]
+
+    assert len(ranges) == 3
+    with open(worker.destination_path, "rb") as file:
+        assert file.read() == content
+
+
+def test_segmented_download_fallback(qtbot: QtBot, tmp_path) -> None:
+    content = os.urandom(3 * 1024 * 1024)
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            "http://my_video.com/video.mp4",
+            content=content,
+            headers={"content-length": str(len(content))},
+        )
+
+        worker = Worker(
+            {"title": "single", "video_url": "http://my_video.com/video.mp4"}
+        )
+        worker._Worker__output_dir = str(tmp_path)
+        worker._Worker__segments = 4
+        with qtbot.waitSignal(worker.signals.download_completed, timeout=5000):
+            worker.run()
+
+        assert mock.call_count == 1
+
+    with open(worker.destination_path, "rb") as file:
+        assert file.read() == content
+
+
+def test_resume_partial_download(
+    qtbot: QtBot, tmp_path, caplog: pytest.LogCaptureFixture, capsys
+) -> None:
+    content = os.urandom(2 * 1024 * 1024)
+    committed = 700000
+
+    part = PartFile(os.path.join(str(tmp_path), "resume.mp4"))
+    part.create("http://my_video.com/video.mp4", len(content), [[0, len(content) - 1]])
+    with open(part.part_path, "r+b") as file:
+        file.write(content[:committed])
+    part.commit(0, committed)
+
+    with requests_mock.Mocker() as mock:
+        mock.get("http://my_video.com/video.mp4", content=range_callback(content))
+
+        worker = Worker(
+            {"title": "resume", "video_url": "http://my_video.com/video.mp4"}
+        )
+        worker._Worker__output_dir = str(tmp_path)
+        worker._Worker__segments = 1
+        with caplog.at_level(logging.INFO, logger=worker_module.__name__):
+            with qtbot.waitSignal(worker.signals.download_completed, timeout=5000):
+                worker.run()
+
+        assert mock.request_history[-1].headers.get("Range") == f"bytes={committed}-"
+
+    assert f"at {committed} bytes" in caplog.text
+    assert capsys.readouterr().out == ""
+
+    assert worker.destination_path == part.destination_path
+    assert not os.path.exists(part.part_path)
+    assert not os.path.exists(part.meta_path)
+    with open(worker.destination_path, "rb") as file:
+        assert file.read() == content
+
+
+def test_changed_file_is_not_resumed(qtbot: QtBot, tmp_path) -> None:
+    content = os.urandom(1024 * 1024)
+    part = PartFile(os.path.join(str(tmp_path), "changed.mp4"))
+    part.create("http://my_video.com/video.mp4", len(content), [[0, len(content) - 1]])
+    part.etag = '"old"'
+    with open(part.part_path, "r+b") as file:
+        file.write(os.urandom(1000))
+    part.commit(0, 1000)
+
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            "http://my_video.com/video.mp4",
+            content=range_callback(content),
+            headers={"ETag": '"new"'},
+        )
+        info = {"title": "changed", "video_url": "http://my_video.com/video.mp4"}
+        worker = Worker(info, output_dir=str(tmp_path))
+        worker._Worker__segments = 1
+        with qtbot.waitSignal(worker.signals.download_completed, timeout=5000):
+            worker.run()
+
+        assert "Range" not in mock.request_history[-1].headers
+    assert info["destination_path"] == part.destination_path
+    with open(part.destination_path, "rb") as file:
+        assert file.read() == content
+
+
+def test_queued_worker_counts_partial_file(tmp_path) -> None:
+    part = PartFile(os.path.join(str(tmp_path), "queued.mp4"))
+    part.create("http://my_video.com/video.mp4", 1000, [[0, 999]])
+    with open(part.part_path, "r+b") as file:
+        file.write(os.urandom(900))
+    part.commit(0, 900)
+    info = {
+        "title": "queued",
+        "video_url": "http://my_video.com/video.mp4",
+        "size": 1000,
+    }
+
+    worker = Worker(info, output_dir=str(tmp_path))
+    assert worker.bytes_downloaded == 900
+    assert get_remaining_bytes(worker) == 100
+    # a partial file of another size is not resumed
+    assert (
+        Worker({**info, "size": 2000}, output_dir=str(tmp_path)).bytes_downloaded == 0
+    )
+
+
+def test_progress_is_throttled(qtbot: QtBot, tmp_path) -> None:
+    content = os.urandom(1024 * 1024)
+    updates = []
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            "http://my_video.com/video.mp4",
+            content=content,
+            headers={"content-length": str(len(content))},
+        )
+
+        worker = Worker(
+            {"title": "throttled", "video_url": "http://my_video.com/video.mp4"},
+            progress_interval=60,
+        )
+        worker._Worker__output_dir = str(tmp_path)
+        worker.signals.progress_update.connect(lambda *args: updates.append(args))
+        with qtbot.waitSignal(worker.signals.download_completed, timeout=5000):
+            worker.run()
+
+    assert len(updates) == 2
+    assert updates[-1] == (len(content), len(content))
+
+
+def test_preallocation_failure(
+    qtbot: QtBot, tmp_path, monkeypatch: MonkeyPatch
+) -> None:
+    def no_space(fd: int, offset: int, length: int) -> None:
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(os, "posix_fallocate", no_space, raising=False)
+    content = os.urandom(1024)
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            "http://my_video.com/video.mp4",
+            content=content,
+            headers={"content-length": str(len(content))},
+        )
+
+        worker = Worker(
+            {"title": "no space", "video_url": "http://my_video.com/video.mp4"}
+        )
+        worker._Worker__output_dir = str(tmp_path)
+        worker._Worker__preallocate = True
+        with qtbot.waitSignal(worker.signals.download_error, timeout=5000) as blocker:
+            worker.run()
+
+    assert "Cannot reserve" in blocker.args[0]
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_bandwidth_limit(qtbot: QtBot, tmp_path) -> None:
+    content = os.urandom(256 * 1024)
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            "http://my_video.com/video.mp4",
+            content=content,
+            headers={"content-length": str(len(content))},
+        )
+
+        worker = Worker(
+            {"title": "limited", "video_url": "http://my_video.com/video.mp4"}
+        )
+        worker._Worker__output_dir = str(tmp_path)
+        worker._Worker__min_chunk_size = 64 * 1024
+        worker._Worker__max_chunk_size = 64 * 1024
+        get_bandwidth_limiter().set_rate(512 * 1024)
+        try:
+            started = time.monotonic()
+            with qtbot.waitSignal(worker.signals.download_completed, timeout=5000):
+                worker.run()
+            elapsed = time.monotonic() - started
+        finally:
+            get_bandwidth_limiter().set_rate(0)
+
+    # the last chunk is not waited for
+    assert elapsed >= 0.35
+    with open(worker.destination_path, "rb") as file:
+        assert file.read() == content
+
+
+def test_missing_info_from_download_response(qtbot: QtBot, tmp_path) -> None:
+    content = os.urandom(1024)
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            "http://my_video.com/video.mp4",
+            content=content,
+            headers={"content-length": "1024", "content-type": "video/mp4"},
+        )
+
+        worker = Worker({"title": "lazy", "video_url": "http://my_video.com/video.mp4"})
+        worker._Worker__output_dir = str(tmp_path)
+        updates = []
+        worker.signals.info_update.connect(updates.append)
+        with qtbot.waitSignal(worker.signals.download_completed, timeout=5000):
+            worker.run()
+
+    assert updates == [{"size": 1024, "type": "video/mp4"}]
+    assert worker.video_info["size"] == 1024
@@ -0,0 +1,58 @@
+class AdaptiveChunkSize:
+    """
+    Read size that follows the measured throughput of a download.
+
+    The size is chosen so that a single read takes about `target_time` seconds
+    at the current throughput, which keeps the number of Python-level
+    iterations low on fast links while pause and cancel checks still happen
+    several times per second on slow ones. The size at most doubles or halves
+    per read and always stays within the configured bounds.
+
+    Attributes:
+        min_size (int): The smallest read size in bytes.
+        max_size (int): The largest read size in bytes.
+        target_time (float): The desired duration of a single read in seconds.
+        size (int): The current read size in bytes.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 64 * 1024,
+        max_size: int = 4 * 1024 * 1024,
+        target_time: float = 0.05,
+    ) -> None:
+        """
+        Initialize the AdaptiveChunkSize.
+
+        Args:
+            min_size (int): The smallest read size in bytes.
+            max_size (int): The largest read size in bytes.
+            target_time (float): The desired duration of a single read in seconds.
+
+        Raises:
+            ValueError: If the bounds are not positive or min_size is larger than max_size.
+        """
+        if min_size <= 0 or max_size < min_size:
+            raise ValueError("chunk size bounds must be positive and ordered")
+        self.min_size = int(min_size)
+        self.max_size = int(max_size)
+        self.target_time = target_time
+        self.size = self.min_size
+
+    def update(self, received: int, elapsed: float) -> int:
+        """
+        Adjust the read size after a read.
+
+        Args:
+            received (int): The number of bytes returned by the read.
+            elapsed (float): The number of seconds the read took.
+
+        Returns:
+            int: The size to use for the next read.
+        """
+        if received <= 0:
+            return self.size
+        target = received / max(elapsed, 1e-6) * self.target_time
+        size = min(self.size * 2, max(self.size // 2, int(target)))
+        self.size = min(self.max_size, max(self.min_size, size))
+        return self.size
@@ -0,0 +1,213 @@
+import json, sqlite3
+from collections import deque
+from threading import Lock
+from typing import Any, Deque, Dict, Optional, Tuple
+
+# items of the backlog kept in memory, the others wait on the disk
+MEMORY_ITEMS = 256
+# items read back from the disk at once
+REFILL_BATCH = 128
+
+
+class AdmissionQueue:
+    """
+    Backlog of the items waiting for room in the download queue.
+
+    Items are taken in FIFO order. The head of the backlog is kept in memory,
+    up to `memory_items` items; later items spill over to an SQLite table and
+    are read back in batches once the head drains. The backlog can hold any
+    number of items while its memory stays bounded.
+
+    The queue journal remains the record of the queued items, so the table is
+    emptied when the backlog is opened. It can live in the journal database.
+
+    Attributes:
+        path (str): The path of the SQLite database.
+        memory_items (int): Maximum number of items kept in memory.
+    """
+
+    def __init__(self, path: str, memory_items: int = MEMORY_ITEMS) -> None:
+        """
+        Open (and create if needed) the backlog table, and empty it.
+
+        Args:
+            path (str): The path of the SQLite database.
+            memory_items (int): Maximum number of items kept in memory.
+        """
+        self.path = path
+        self.memory_items = max(1, int(memory_items))
+        self.__lock = Lock()
+        self.__memory: Deque[Tuple[str, Dict[str, Any]]] = deque()
+        self.__spilled = 0
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        # rebuilt from the journal after a crash, it does not need to be durable
+        self.__connection.execute("PRAGMA synchronous=OFF")
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS backlog ("
+            "position INTEGER PRIMARY KEY, "
+            "item_id TEXT NOT NULL, "
+            "video_info TEXT NOT NULL)"
+        )
+        self.__connection.execute(
+            "CREATE INDEX IF NOT EXISTS backlog_item_id ON backlog (item_id)"
+        )
+        self.__connection.execute("DELETE FROM backlog")
+        self.__connection.commit()
+
+    def append(self, item_id: str, video_info: Dict[str, Any]) -> None:
+        """
+        Add an item at the end of the backlog.
+
+        Args:
+            item_id (str): The identifier of the item.
+            video_info (Dict[str, Any]): Information about the video.
+        """
+        with self.__lock:
+            if not self.__spilled and len(self.__memory) < self.memory_items:
+                self.__memory.append((item_id, video_info))
+                return
+            self.__connection.execute(
+                "INSERT INTO backlog (item_id, video_info) VALUES (?, ?)",
+                (item_id, json.dumps(video_info)),
+            )
+            self.__connection.commit()
+            self.__spilled += 1
+
+    def appendleft(self, item_id: str, video_info: Dict[str, Any]) -> None:
+        """
+        Add an item at the front of the backlog, to be taken next.
+
+        Args:
+            item_id (str): The identifier of the item.
+            video_info (Dict[str, Any]): Information about the video.
+        """
+        with self.__lock:
+            self.__push_front(item_id, video_info)
+
+    def __push_front(self, item_id: str, video_info: Dict[str, Any]) -> None:
+        """
+        Add an item at the front of the backlog. The lock must be held.
+
+        Args:
+            item_id (str): The identifier of the item.
+            video_info (Dict[str, Any]): Information about the video.
+        """
+        self.__memory.appendleft((item_id, video_info))
+        if len(self.__memory) <= self.memory_items:
+            return
+        # the last item in memory goes before the ones on the disk
+        last_id, last_info = self.__memory.pop()
+        self.__connection.execute(
+            "INSERT INTO backlog (position, item_id, video_info) "
+            "SELECT COALESCE(MIN(position), 1) - 1, ?, ? FROM backlog",
+            (last_id, json.dumps(last_info)),
+        )
+        self.__connection.commit()
+        self.__spilled += 1
+
+    def popleft(self) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Take the first item of the backlog.
+
+        Returns:
+            Optional[Tuple[str, Dict[str, Any]]]: The identifier and video
+            information of the item, None if the backlog is empty.
+        """
+        with self.__lock:
+            if not self.__memory and self.__spilled:
+                self.__refill()
+            return self.__memory.popleft() if self.__memory else None
+
+    def __refill(self) -> None:
+        """Move the first items on the disk to memory. The lock must be held."""
+        rows = self.__connection.execute(
+            "SELECT position, item_id, video_info FROM backlog "
+            "ORDER BY position LIMIT ?",
+            (min(REFILL_BATCH, self.memory_items),),
+        ).fetchall()
+        if not rows:
+            self.__spilled = 0
+            return
+        self.__connection.execute(
+            "DELETE FROM backlog WHERE position <= ?", (rows[-1][0],)
+        )
+        self.__connection.commit()
+        self.__spilled -= len(rows)
+        self.__memory.extend(
+            (item_id, json.loads(video_info)) for _, item_id, video_info in rows
+        )
+
+    def __take(self, item_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Remove an item wherever it is in the backlog. The lock must be held.
+
+        Args:
+            item_id (str): The identifier of the item.
+
+        Returns:
+            Optional[Tuple[str, Dict[str, Any]]]: The item, None if it is not in the backlog.
+        """
+        for index, item in enumerate(self.__memory):
+            if item[0] == item_id:
+                del self.__memory[index]
+                return item
+        if not self.__spilled:
+            return None
+        row = self.__connection.execute(
+            "SELECT position, video_info FROM backlog WHERE item_id = ? "
+            "ORDER BY position LIMIT 1",
+            (item_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        self.__connection.execute("DELETE FROM backlog WHERE position = ?", (row[0],))
+        self.__connection.commit()
+        self.__spilled -= 1
+        return item_id, json.loads(row[1])
+
+    def remove(self, item_id: str) -> bool:
+        """
+        Remove an item from the backlog.
+
+        Args:
+            item_id (str): The identifier of the item.
+
+        Returns:
+            bool: True if the item was in the backlog.
+        """
+        with self.__lock:
+            return self.__take(item_id) is not None
+
+    def move_to_front(self, item_id: str) -> bool:
+        """
+        Move an item to the front of the backlog, to be taken next.
+
+        Args:
+            item_id (str): The identifier of the item.
+
+        Returns:
+            bool: True if the item was in the backlog.
+        """
+        with self.__lock:
+            item = self.__take(item_id)
+            if item is None:
+                return False
+            self.__push_front(*item)
+            return True
+
+    def clear(self) -> None:
+        """Remove every item of the backlog."""
+        with self.__lock:
+            self.__memory.clear()
+            self.__connection.execute("DELETE FROM backlog")
+            self.__connection.commit()
+            self.__spilled = 0
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self.__lock:
+            self.__connection.close()
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__memory) + self.__spilled
@@ -0,0 +1,121 @@
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional, Tuple
+from PyQt5.QtCore import QByteArray, Qt
+from PyQt5.QtGui import QFont, QFontDatabase, QIcon, QPainter, QPixmap
+from PyQt5.QtSvg import QSvgRenderer
+
+ASSETS_PATH = Path(__file__).parent / "assets"
+FONT_PATH = ASSETS_PATH / "fonts/nunito-font/Nunito-Regular.ttf"
+
+_font: Optional[QFont] = None
+_stylesheets: Dict[str, str] = {}
+_icons: Dict[str, QIcon] = {}
+_svg_data: Dict[str, QByteArray] = {}
+_pixmaps: Dict[Tuple[str, int], QPixmap] = {}
+_assets_lock = Lock()
+
+
+def get_font() -> QFont:
+    """
+    Retrieves the process-wide application font.
+
+    The Nunito font is registered with the font database the first time only.
+    The returned font is shared: widgets copy it on `setFont`, and callers that
+    change it must copy it first with `QFont(get_font())`.
+
+    Returns:
+        QFont: The application font.
+    """
+    global _font
+    with _assets_lock:
+        if _font is None:
+            font_id = QFontDatabase.addApplicationFont(str(FONT_PATH))
+            families = QFontDatabase.applicationFontFamilies(font_id)
+            _font = QFont(families[0]) if families else QFont()
+        return _font
+
+
+def get_font_family() -> str:
+    """
+    Retrieves the family of the application font.
+
+    Returns:
+        str: The family of the Nunito font.
+    """
+    return get_font().family()
+
+
+def get_stylesheet(name: str) -> str:
+    """
+    Retrieves a stylesheet, read from the disk the first time only.
+
+    Args:
+        name (str): The name of the stylesheet without extension, e.g. 'cardDownload'.
+
+    Returns:
+        str: The content of the stylesheet.
+    """
+    with _assets_lock:
+        if name not in _stylesheets:
+            _stylesheets[name] = (ASSETS_PATH / "styles" / f"{name}.qss").read_text()
+        return _stylesheets[name]
+
+
+def get_icon(name: str) -> QIcon:
+    """
+    Retrieves a shared icon, loaded the first time only.
+
+    Args:
+        name (str): The file name of the icon, e.g. 'xmark-solid.svg'.
+
+    Returns:
+        QIcon: The icon.
+    """
+    with _assets_lock:
+        if name not in _icons:
+            _icons[name] = QIcon(str(ASSETS_PATH / "icons" / name))
+        return _icons[name]
+
+
+def get_svg_data(name: str) -> QByteArray:
+    """
+    Retrieves the content of an SVG icon, read from the disk the first time only.
+
+    Used to load `QSvgWidget`s without reading the file again.
+
+    Args:
+        name (str): The file name of the icon, e.g. 'video-solid.svg'.
+
+    Returns:
+        QByteArray: The content of the SVG file.
+    """
+    with _assets_lock:
+        if name not in _svg_data:
+            _svg_data[name] = QByteArray((ASSETS_PATH / "icons" / name).read_bytes())
+        return _svg_data[name]
+
+
+def get_pixmap(name: str, size: int) -> QPixmap:
+    """
+    Retrieves an SVG icon rendered at a given size, rendered the first time only.
+
+    Args:
+        name (str): The file name of the icon, e.g. 'video-solid.svg'.
+        size (int): The width and height of the pixmap in pixels.
+
+    Returns:
+        QPixmap: The rendered icon, keeping its aspect ratio.
+    """
+    data = get_svg_data(name)
+    with _assets_lock:
+        if (name, size) not in _pixmaps:
+            renderer = QSvgRenderer(data)
+            renderer.setAspectRatioMode(Qt.AspectRatioMode.KeepAspectRatio)
+            pixmap = QPixmap(size, size)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pixmap)
+            renderer.render(painter)
+            painter.end()
+            _pixmaps[(name, size)] = pixmap
+        return _pixmaps[(name, size)]
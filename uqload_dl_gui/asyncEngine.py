@@ -0,0 +1,961 @@
+import asyncio, codecs, logging, os, time
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Coroutine, Dict, List, Optional
+from urllib.parse import urlparse
+from uuid import uuid4
+from uqload_dl_gui.asyncHttp import AsyncHTTPClient, AsyncResponse
+from uqload_dl_gui.adaptiveChunkSize import AdaptiveChunkSize
+from uqload_dl_gui.atomicCounter import AtomicCounter
+from uqload_dl_gui.bandwidthLimiter import BandwidthShare, get_bandwidth_limiter
+from uqload_dl_gui.config import get_config
+from uqload_dl_gui.connectionManager import get_connection_manager
+from uqload_dl_gui.diskWriter import MemoryBudget, get_memory_budget, write_at
+from uqload_dl_gui.partFile import PartFile, release_part_file
+from uqload_dl_gui.taskScheduler import FIFO, NORMAL_PRIORITY, TaskScheduler
+from uqload_dl_gui.signals import create_download_signals
+from uqload_dl_gui.uqload import PAGE_CHUNK_SIZE, UQLoad
+from uqload_dl_gui.pageExtractor import PageExtractor
+from uqload_dl_gui.metadataCache import MetadataCache, get_metadata_cache
+from uqload_dl_gui.worker import (
+    COMMIT_SIZE,
+    USER_AGENT,
+    DownloadProgress,
+    Worker,
+    claim_download,
+    get_committed_bytes,
+    get_content_length,
+    get_missing_info,
+    prepare_part_file,
+)
+from uqload_dl_gui.exceptions import (
+    MissingContentLengthError,
+    Non200StatusCodeError,
+    DownloadCancelledError,
+    IncompleteDownloadError,
+    InsufficientSpaceError,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncLoopThread:
+    """
+    Background thread running the event loop of the asyncio engine.
+
+    All metadata requests and downloads of the engine run as coroutines on
+    this single loop. Blocking file writes go to a small thread pool so the
+    loop keeps serving sockets.
+
+    Attributes:
+        loop (asyncio.AbstractEventLoop): The event loop.
+        client (AsyncHTTPClient): The HTTP client shared by every coroutine.
+        disk_executor (ThreadPoolExecutor): The threads writing to disk.
+    """
+
+    def __init__(self, disk_threads: int = 4) -> None:
+        """
+        Start the loop thread.
+
+        Args:
+            disk_threads (int): The number of threads writing to disk.
+        """
+        self.loop = asyncio.new_event_loop()
+        self.client = AsyncHTTPClient()
+        self.disk_executor = ThreadPoolExecutor(
+            disk_threads, thread_name_prefix="async-engine-disk"
+        )
+        self.__thread = Thread(target=self.__run, name="async-engine-loop", daemon=True)
+        self.__thread.start()
+
+    def __run(self) -> None:
+        """Run the event loop forever."""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coroutine: Coroutine[Any, Any, Any]) -> Future:
+        """
+        Schedule a coroutine on the loop from any thread.
+
+        Args:
+            coroutine (Coroutine[Any, Any, Any]): The coroutine to run.
+
+        Returns:
+            Future: The future of the coroutine result.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+
+_loop_thread: Optional[AsyncLoopThread] = None
+_loop_thread_lock = Lock()
+
+
+def get_loop_thread() -> AsyncLoopThread:
+    """
+    Retrieves the process-wide asyncio engine loop, starting it on first use.
+
+    Returns:
+        AsyncLoopThread: The shared loop thread.
+    """
+    global _loop_thread
+    with _loop_thread_lock:
+        if _loop_thread is None:
+            _loop_thread = AsyncLoopThread()
+        return _loop_thread
+
+
+async def fetch_video_info(
+    url: str,
+    cache: Optional[MetadataCache] = None,
+    probe_size: bool = True,
+    embed_only: bool = False,
+) -> Dict[str, Any]:
+    """
+    Extract the information of a UQLoad video with the asyncio HTTP client.
+
+    Pages that would be requested through a proxy or that come back
+    content-encoded are resolved with `UQLoad.get_info` on a thread instead,
+    since AsyncHTTPClient supports neither.
+
+    Args:
+        url (str): The UQLoad URL of the video.
+        cache (Optional[MetadataCache]): The metadata cache to use, if any.
+        probe_size (bool): True to read the size and type with a HEAD request.
+        embed_only (bool): True to resolve from the embed page alone.
+
+    Returns:
+        Dict[str, Any]: The same information as `UQLoad.get_info`.
+
+    Raises:
+        Exception: If a page cannot be fetched.
+        VideoNotFoundError: If the video is not found.
+    """
+    client = get_loop_thread().client
+    uqload = UQLoad(url, cache, probe_size, embed_only)
+    cached_info = uqload.get_cached_info()
+    if cached_info is not None and "video_url" in cached_info:
+        return cached_info
+
+    loop = asyncio.get_running_loop()
+    connection_manager = get_connection_manager()
+    if any(
+        connection_manager.get_proxy(page_url) is not None
+        for page_url in uqload.get_page_urls()
+    ):
+        return await loop.run_in_executor(None, uqload.get_info)
+
+    async def open_page(page_url: str) -> AsyncResponse:
+        response = await client.get(
+            page_url, headers={"User-Agent": USER_AGENT}, timeout=20
+        )
+        if response.status_code != 200:
+            response.close()
+            raise Exception("None in responses")
+        return response
+
+    # the pages are requested together, then scanned in order while they are read
+    responses = await asyncio.gather(
+        *map(open_page, uqload.get_page_urls()), return_exceptions=True
+    )
+    try:
+        for response in responses:
+            if isinstance(response, BaseException):
+                raise response
+        encoded = any(
+            response.headers.get("content-encoding", "identity").lower() != "identity"
+            for response in responses
+        )
+        extractor = PageExtractor(embed_only=uqload.embed_only)
+        for response in [] if encoded else responses:
+            decoder = codecs.getincrementaldecoder(response.charset)("replace")
+            while not extractor.done:
+                data = await response.read(PAGE_CHUNK_SIZE)
+                if extractor.feed(decoder.decode(data, not data)) or not data:
+                    break
+            if extractor.end_page():
+                break
+    finally:
+        for response in responses:
+            if isinstance(response, AsyncResponse):
+                response.close()
+    if encoded:
+        return await loop.run_in_executor(None, uqload.get_info)
+    video_info = extractor.get_info()
+
+    if cached_info is not None:
+        video_info = {**cached_info, "video_url": video_info["video_url"]}
+        uqload.cache_info(video_info, True)
+        return video_info
+
+    if not probe_size:
+        uqload.cache_info(video_info, False)
+        return video_info
+
+    parsed_url = urlparse(video_info["video_url"])
+    async with await client.head(
+        video_info["video_url"],
+        headers={
+            "User-Agent": USER_AGENT,
+            "Referer": f"{parsed_url.scheme}://{parsed_url.netloc}",
+        },
+        timeout=20,
+    ) as response:
+        video_info.update(
+            {
+                "size": int(response.headers.get("content-length", 0)),
+                "type": response.headers.get("content-type"),
+            }
+        )
+    uqload.cache_info(video_info, False)
+    return video_info
+
+
+class AsyncPartWriter:
+    """
+    Write-behind writer of a partial file for the asyncio engine.
+
+    It has no thread of its own: chunks are written by the shared disk threads
+    of the engine loop and charged to the shared MemoryBudget. Each segment
+    keeps one write in flight, so the next chunk is read from the network while
+    the previous one reaches the disk, and bytes are committed to the sidecar in
+    order, every `COMMIT_SIZE` bytes per segment and once more on close.
+    """
+
+    def __init__(
+        self,
+        part: PartFile,
+        executor: ThreadPoolExecutor,
+        budget: Optional[MemoryBudget] = None,
+    ) -> None:
+        """
+        Initialize the writer.
+
+        Args:
+            part (PartFile): The partial file, with its segments created or loaded.
+            executor (ThreadPoolExecutor): The disk threads to write on.
+            budget (Optional[MemoryBudget]): The memory budget to charge. Defaults
+            to the process-wide budget.
+        """
+        self.__part = part
+        self.__executor = executor
+        self.__budget = get_memory_budget() if budget is None else budget
+        self.__uncommitted = [0] * len(part.segments)
+        # one descriptor per segment, as lseek would race without pwritev
+        self.__fds: Dict[int, int] = {}
+        self.__pending: Dict[int, asyncio.Future] = {}
+
+    async def write(
+        self, index: int, offset: int, data: bytes, check: Callable[[], None]
+    ) -> None:
+        """
+        Queue data of a segment to be written at the given offset.
+
+        Waits for the previous write of the segment and for room in the memory
+        budget, without blocking the loop.
+
+        Args:
+            index (int): The index of the segment the data belongs to.
+            offset (int): The file offset to write the data at.
+            data (bytes): The data to write.
+            check (Callable[[], None]): Called while waiting for the memory budget,
+            may raise to abort the wait.
+
+        Raises:
+            OSError: If the previous write of the segment failed.
+        """
+        pending = self.__pending.get(index)
+        if pending is not None:
+            # a cancelled segment must not cancel a write the disk thread holds
+            await asyncio.shield(pending)
+        while not self.__budget.acquire(len(data), timeout=0):
+            check()
+            await asyncio.sleep(0.01)
+        self.__pending[index] = asyncio.get_running_loop().run_in_executor(
+            self.__executor, self.__write, index, offset, data
+        )
+
+    async def close(self) -> None:
+        """
+        Wait for the writes in flight, then commit what was written to the sidecar.
+
+        Raises:
+            OSError: If any write failed.
+        """
+        pending, self.__pending = list(self.__pending.values()), {}
+        results = await asyncio.gather(*pending, return_exceptions=True)
+        await asyncio.get_running_loop().run_in_executor(self.__executor, self.__close)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    def __write(self, index: int, offset: int, data: bytes) -> None:
+        """
+        Write data of a segment and commit it every `COMMIT_SIZE` bytes.
+
+        Called from a disk thread, never twice at once for the same segment.
+
+        Args:
+            index (int): The index of the segment in the partial file.
+            offset (int): The file offset to write the data at.
+            data (bytes): The data to write.
+        """
+        try:
+            fd = self.__fds.get(index)
+            if fd is None:
+                fd = os.open(
+                    self.__part.part_path, os.O_WRONLY | getattr(os, "O_BINARY", 0)
+                )
+                self.__fds[index] = fd
+            write_at(fd, offset, [data])
+            self.__uncommitted[index] += len(data)
+            if self.__uncommitted[index] >= COMMIT_SIZE:
+                self.__part.commit(index, self.__uncommitted[index])
+                self.__uncommitted[index] = 0
+        finally:
+            self.__budget.release(len(data))
+
+    def __close(self) -> None:
+        """Close the descriptors and commit the rest of every segment."""
+        for fd in self.__fds.values():
+            os.close(fd)
+        self.__fds = {}
+        for index, size in enumerate(self.__uncommitted):
+            self.__part.commit(index, size)
+        self.__uncommitted = [0] * len(self.__uncommitted)
+
+
+class AsyncWorker:
+    """
+    A coroutine based worker for downloading videos.
+
+    It has the interface and signals of Worker, but runs on the asyncio engine
+    loop instead of occupying a thread of the pool. It shares the partial file,
+    resume, progress and write-behind helpers of Worker, so downloads behave
+    the same with both engines.
+
+    AsyncHTTPClient supports neither proxies nor content encodings. When the
+    shared session would send the request through a proxy, or the server
+    answers with an encoded body anyway, the download is handed to a Worker
+    running on a thread of the engine loop.
+
+    Attributes:
+        video_info (Dict[str, str]): A dictionary containing information about the video,
+        including title and video URL.
+        item_id (str): The identifier of the item in the queue journal.
+    """
+
+    def __init__(
+        self,
+        video_info: Dict[str, str],
+        item_id: Optional[str] = None,
+        progress_interval: Optional[float] = None,
+        progress_min_bytes: Optional[int] = None,
+        weight: float = 1.0,
+        signals: Any = None,
+    ) -> None:
+        """
+        Initialize the AsyncWorker instance with video information.
+
+        Args:
+            video_info (Dict[str, str]): A dictionary containing information about the video,
+            including title and video URL.
+            item_id (Optional[str]): The identifier of the item in the queue journal.
+            progress_interval (Optional[float]): Minimum seconds between two progress
+            updates. Defaults to the 'progress_interval_ms' setting.
+            progress_min_bytes (Optional[int]): Minimum bytes between two progress
+            updates. Defaults to the 'progress_min_bytes' setting.
+            weight (float): The share of the bandwidth limit relative to other downloads.
+            signals (Any): The signals to emit, `DownloadSignals` for a headless
+            download. Defaults to the Qt signals when PyQt5 is installed.
+        """
+        if not isinstance(video_info, dict) or not len(video_info):
+            raise ValueError("video_info must be a dict")
+        settings = get_config()
+        self.video_info = video_info
+        self.item_id = uuid4().hex if item_id is None else item_id
+        self.signals = create_download_signals() if signals is None else signals
+        self.is_running = False
+        self.destination_path = ""
+        self.__pause_event = Event()
+        self.__pause_event.set()
+        self.__cancelled = False
+        self.__output_dir = str(settings.value("output_dir"))
+        if not os.path.isdir(self.__output_dir):
+            self.__output_dir = os.getcwd()
+        self.__segments = max(1, int(settings.value("download_segments")))
+        self.__min_chunk_size = int(settings.value("min_chunk_kb")) * 1024
+        self.__max_chunk_size = int(settings.value("max_chunk_kb")) * 1024
+        self.__preallocate = settings.value("preallocate", type=bool)
+        self.__weight = weight
+        self.__bandwidth: Optional[BandwidthShare] = None
+        self.__part: Optional[PartFile] = None
+        self.__writer: Optional[AsyncPartWriter] = None
+        self.__fallback: Optional[Worker] = None
+        self.__progress = DownloadProgress(
+            self.signals,
+            (
+                int(settings.value("progress_interval_ms")) / 1000
+                if progress_interval is None
+                else progress_interval
+            ),
+            (
+                int(settings.value("progress_min_bytes"))
+                if progress_min_bytes is None
+                else progress_min_bytes
+            ),
+        )
+        self.__progress.reset(get_committed_bytes(self.video_info, self.__output_dir))
+
+    @property
+    def bytes_downloaded(self) -> int:
+        """
+        Get the number of bytes downloaded so far.
+
+        Returns:
+            int: The number of bytes downloaded.
+        """
+        if self.__fallback is not None:
+            return self.__fallback.bytes_downloaded
+        return self.__progress.value
+
+    async def run(self) -> None:
+        """Run the download of the video."""
+        fallback = False
+        try:
+            url, self.headers, self.__part = claim_download(
+                self.video_info, self.__output_dir
+            )
+            self.destination_path = self.__part.destination_path
+            if get_connection_manager().get_proxy(url) is not None:
+                fallback = True
+            else:
+                fallback = await self.__download_file(url)
+        except Exception as ex:
+            logger.warning("Download of %s failed: %s", self.item_id, ex)
+            self.on_download_error(str(ex))
+        finally:
+            self.__release_part()
+        if fallback:
+            await self.__run_fallback()
+
+    async def __run_fallback(self) -> None:
+        """Download the video with a Worker on a thread, keeping the same signals."""
+        worker = Worker(
+            self.video_info,
+            self.item_id,
+            self.__progress.interval,
+            self.__progress.min_bytes,
+            self.__weight,
+            self.signals,
+            self.__output_dir,
+        )
+        self.__fallback = worker
+        # the state may have changed before the worker was visible
+        if self.__cancelled:
+            worker.cancel_download()
+        elif not self.__pause_event.is_set():
+            worker.pause_download()
+        self.is_running = True
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, worker.run)
+        finally:
+            self.is_running = False
+            self.destination_path = getattr(
+                worker, "destination_path", self.destination_path
+            )
+
+    async def __download_file(self, url: str) -> bool:
+        """
+        Download the file, resuming or splitting it into segments when possible.
+
+        Args:
+            url (str): The URL of the file to be downloaded.
+
+        Returns:
+            bool: True if the body is content-encoded and the download must be
+            handed to a Worker, False once the download is over.
+        """
+        client = get_loop_thread().client
+        try:
+            async with await client.get(
+                url, headers=self.headers, timeout=20
+            ) as response:
+                encoding = response.headers.get("content-encoding", "identity")
+                if encoding.lower() != "identity":
+                    return True
+                total_size = get_content_length(response.status_code, response.headers)
+
+                self.start_download()
+                missing_info = get_missing_info(self.video_info, response.headers)
+                if missing_info:
+                    self.video_info.update(missing_info)
+                    self.signals.info_update.emit(missing_info)
+
+                stream_response = prepare_part_file(
+                    self.__part,
+                    url,
+                    total_size,
+                    response.headers,
+                    self.__segments,
+                    self.__preallocate,
+                )
+                if not stream_response:
+                    response.close()
+
+                self.__bandwidth = get_bandwidth_limiter().register(self.__weight)
+                self.__writer = AsyncPartWriter(
+                    self.__part, get_loop_thread().disk_executor
+                )
+                try:
+                    if stream_response:
+                        self.__progress.reset(0)
+                        await self.__write_segment(response, 0, total_size)
+                    else:
+                        await self.__download_segments(url, total_size)
+                finally:
+                    self.__bandwidth.close()
+                    await self.__writer.close()
+                self.__part.finalize()
+                self.on_download_complete()
+        except Non200StatusCodeError as e:
+            self.on_download_error(str(e))
+        except MissingContentLengthError as e:
+            self.on_download_error(str(e))
+        except IncompleteDownloadError as e:
+            self.on_download_error(str(e))
+        except InsufficientSpaceError as e:
+            self.on_download_error(str(e))
+        except DownloadCancelledError:
+            self.on_download_cancelled()
+        finally:
+            self.is_running = False
+        return False
+
+    async def __download_segments(self, url: str, total_size: int) -> None:
+        """
+        Download the unfinished segments of the partial file concurrently.
+
+        The first error cancels the other segments and is raised.
+
+        Args:
+            url (str): The URL of the file to be downloaded.
+            total_size (int): The total size of the file.
+        """
+        self.__progress.reset(self.__part.bytes_committed)
+        tasks = [
+            asyncio.ensure_future(self.__download_segment(url, index, total_size))
+            for index in self.__part.remaining()
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def __download_segment(self, url: str, index: int, total_size: int) -> None:
+        """
+        Download the rest of a single segment with an HTTP Range request.
+
+        Args:
+            url (str): The URL of the file to be downloaded.
+            index (int): The index of the segment in the partial file.
+            total_size (int): The total size of the file.
+
+        Raises:
+            Non200StatusCodeError: If the server does not answer with 206.
+        """
+        start, end, committed = self.__part.segments[index]
+        # the last segment is open-ended so a stale size does not cut it short
+        requested_end = "" if end == total_size - 1 else str(end)
+        headers = {
+            **self.headers,
+            "Range": f"bytes={start + committed}-{requested_end}",
+        }
+        async with await get_loop_thread().client.get(
+            url, headers=headers, timeout=20
+        ) as response:
+            if response.status_code != 206:
+                raise Non200StatusCodeError(
+                    f"Unexpected status code: {response.status_code}"
+                )
+            await self.__write_segment(response, index, total_size)
+
+    async def __write_segment(
+        self, response: AsyncResponse, index: int, total_size: int
+    ) -> None:
+        """
+        Stream a response into the partial file at the offset of a segment.
+
+        Args:
+            response (AsyncResponse): The response to read from.
+            index (int): The index of the segment in the partial file.
+            total_size (int): The total size of the file.
+
+        Raises:
+            DownloadCancelledError: If the download is cancelled by the user.
+            IncompleteDownloadError: If the response ends before the segment is complete.
+        """
+        chunk_size = AdaptiveChunkSize(self.__min_chunk_size, self.__max_chunk_size)
+        start, end, committed = self.__part.segments[index]
+        offset = start + committed
+        while offset <= end:
+            await self.__wait_if_paused()
+            self.is_download_cancelled()
+            started = time.monotonic()
+            chunk = await response.read(min(chunk_size.size, end + 1 - offset))
+            if not chunk:
+                break
+            chunk_size.update(len(chunk), time.monotonic() - started)
+            await self.__writer.write(index, offset, chunk, self.is_download_cancelled)
+            offset += len(chunk)
+            self.__progress.add(len(chunk), total_size)
+            delay = self.__bandwidth.reserve(len(chunk))
+            if delay > 0:
+                await self.__sleep(delay)
+
+        if offset != end + 1:
+            raise IncompleteDownloadError(
+                f"Incomplete download: {offset - start} of {end - start + 1} bytes received"
+            )
+
+    async def __sleep(self, delay: float) -> None:
+        """
+        Wait for the bandwidth limit, checking for cancellation.
+
+        Args:
+            delay (float): The number of seconds to wait.
+        """
+        deadline = time.monotonic() + delay
+        while True:
+            self.is_download_cancelled()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(min(remaining, 0.1))
+
+    async def __wait_if_paused(self) -> None:
+        """Wait while the download is paused, after flushing the held back progress."""
+        if self.__pause_event.is_set():
+            return
+        self.__progress.flush()
+        while not self.__pause_event.is_set():
+            await asyncio.sleep(0.1)
+
+    def set_weight(self, weight: float) -> None:
+        """
+        Change the share of the bandwidth limit relative to other downloads.
+
+        Args:
+            weight (float): The new weight, must be positive.
+
+        Raises:
+            ValueError: If the weight is not positive.
+        """
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        self.__weight = weight
+        if self.__bandwidth is not None:
+            self.__bandwidth.set_weight(weight)
+        if self.__fallback is not None:
+            self.__fallback.set_weight(weight)
+
+    def start_download(self) -> None:
+        """Start the download process."""
+        self.is_running = True
+        self.signals.download_started.emit()
+
+    def cancel_download(self) -> None:
+        """Cancel the download process."""
+        self.__cancelled = True
+        self.__pause_event.set()
+        if self.__fallback is not None:
+            self.__fallback.cancel_download()
+
+    def pause_download(self) -> None:
+        """Pause the download process, leaving its bandwidth to the other downloads."""
+        self.__pause_event.clear()
+        if self.__bandwidth is not None:
+            self.__bandwidth.set_idle()
+        if self.__fallback is not None:
+            self.__fallback.pause_download()
+
+    def resume_download(self) -> None:
+        """Resume the download process."""
+        self.__pause_event.set()
+        if self.__fallback is not None:
+            self.__fallback.resume_download()
+
+    def is_download_cancelled(self) -> None:
+        """
+        Check if the download has been cancelled.
+
+        Raises:
+            DownloadCancelledError: If the download has been cancelled.
+        """
+        if self.__cancelled:
+            raise DownloadCancelledError("Download cancelled by the user.")
+
+    def __release_part(self) -> None:
+        """
+        Mark the partial file as no longer active.
+
+        Called before the outcome of the download is reported, so a download
+        resumed right away can claim the same partial file.
+        """
+        if self.__part is not None:
+            release_part_file(self.__part)
+            self.__part = None
+
+    def on_download_cancelled(self) -> None:
+        """Handle the case when the download is cancelled."""
+        self.__release_part()
+        logger.info("Download of %s cancelled, partial file kept", self.item_id)
+        self.signals.download_cancelled.emit()
+
+    def on_download_complete(self) -> None:
+        """Handle the case when the download is completed successfully."""
+        self.__release_part()
+        logger.info("Download of %s saved to %s", self.item_id, self.__output_dir)
+        self.signals.download_completed.emit()
+
+    def on_download_error(self, error: str) -> None:
+        """
+        Handle the case when an error occurs during the download.
+
+        Args:
+            error (str): The error message.
+        """
+        self.__release_part()
+        self.signals.download_error.emit(str(error))
+
+
+class AsyncEngine:
+    """
+    Download scheduler running AsyncWorker coroutines on the engine loop.
+
+    It has the interface of CustomThreadPool, so the download page can use
+    either engine. At most `max_workers` downloads run at the same time; the
+    others wait on the loop without holding a thread, and start in the order of
+    a TaskScheduler. Both limits can be changed while downloads run with
+    `set_limits`.
+
+    Attributes:
+        max_workers (int): Maximum number of downloads running at the same time.
+        max_size (int): Maximum number of tasks allowed in the engine.
+    """
+
+    def __init__(
+        self, max_workers: int = 2, max_size: int = 5, policy: str = FIFO
+    ) -> None:
+        """
+        Initialize the AsyncEngine instance.
+
+        Args:
+            max_workers (int): Maximum number of downloads running at the same time.
+            max_size (int): Maximum number of tasks allowed in the engine.
+            policy (str): The scheduling policy, 'fifo' or 'shortest_first'.
+        """
+        self.max_workers = max_workers
+        self.max_size = max_size
+        self.__current_tasks = AtomicCounter()
+        self.__lock = Lock()
+        self.__scheduler = TaskScheduler(policy)
+        # only used on the engine loop
+        self.__running = 0
+        self.__slot_freed: Optional[asyncio.Condition] = None
+        self.__futures: List[Future] = []
+
+    @property
+    def current_tasks(self) -> int:
+        """
+        Get the number of currently active tasks in the engine.
+
+        Returns:
+            int: The number of currently active tasks.
+        """
+        return self.__current_tasks.value
+
+    @current_tasks.setter
+    def current_tasks(self, value) -> None:
+        """
+        Set the number of currently active tasks in the engine.
+
+        Args:
+            value (int): The new value for the number of currently active tasks.
+        """
+        self.__current_tasks.set(value)
+
+    def task_done(self) -> None:
+        """Count a submitted task as finished, freeing its place in the engine."""
+        self.__current_tasks.decrement()
+
+    @property
+    def policy(self) -> str:
+        """
+        Get the scheduling policy.
+
+        Returns:
+            str: 'fifo' or 'shortest_first'.
+        """
+        return self.__scheduler.policy
+
+    def submit_task(self, task: AsyncWorker, priority: int = NORMAL_PRIORITY) -> bool:
+        """
+        Submit a task to the engine if the maximum size has not been reached.
+
+        Args:
+            task (AsyncWorker): The task to be submitted to the engine.
+            priority (int): The priority of the task, higher runs first.
+
+        Returns:
+            bool: True if the task was accepted, False if the engine is full.
+        """
+        if not self.__current_tasks.increment(self.max_size):
+            return False
+        self.__scheduler.push(task, priority)
+        future = get_loop_thread().submit(self.__run(task))
+        self.__futures = [item for item in self.__futures if not item.done()]
+        self.__futures.append(future)
+        return True
+
+    async def __run(self, task: AsyncWorker) -> None:
+        """
+        Run a task once a slot is free and it is the next scheduled one, unless
+        it was taken back meanwhile.
+
+        Args:
+            task (AsyncWorker): The task to run.
+        """
+        if self.__slot_freed is None:
+            self.__slot_freed = asyncio.Condition()
+        async with self.__slot_freed:
+            await self.__slot_freed.wait_for(
+                lambda: task not in self.__scheduler
+                or (
+                    self.__running < self.max_workers
+                    and self.__scheduler.peek() is task
+                )
+            )
+            if not self.__scheduler.remove(task):
+                return
+            self.__running += 1
+            # the next scheduled task may fit in a free slot too
+            self.__slot_freed.notify_all()
+        try:
+            await task.run()
+        finally:
+            async with self.__slot_freed:
+                self.__running -= 1
+                self.__slot_freed.notify_all()
+
+    async def __notify_slots(self) -> None:
+        """Wake up the waiting tasks, so they check the limits and their order again."""
+        if self.__slot_freed is None:
+            return
+        async with self.__slot_freed:
+            self.__slot_freed.notify_all()
+
+    def set_limits(self, max_workers: int, max_size: int) -> None:
+        """
+        Change the limits of the engine while downloads run.
+
+        Raising `max_workers` starts waiting tasks right away. Lowering it lets
+        the running downloads finish and holds back the waiting ones until
+        fewer than `max_workers` run. Lowering `max_size` only rejects new
+        tasks; submitted ones are kept.
+
+        Args:
+            max_workers (int): Maximum number of downloads running at the same time.
+            max_size (int): Maximum number of tasks allowed in the engine.
+        """
+        with self.__lock:
+            self.max_workers = max(1, int(max_workers))
+            self.max_size = int(max_size)
+        get_loop_thread().submit(self.__notify_slots())
+
+    def tryTake(self, task: AsyncWorker) -> bool:
+        """
+        Remove a task that has not started yet.
+
+        Args:
+            task (AsyncWorker): The task to remove.
+
+        Returns:
+            bool: True if the task was removed, False if it already started.
+        """
+        if not self.__scheduler.remove(task):
+            return False
+        get_loop_thread().submit(self.__notify_slots())
+        return True
+
+    def set_priority(self, task: AsyncWorker, priority: int) -> bool:
+        """
+        Change the priority of a task that has not started yet.
+
+        Args:
+            task (AsyncWorker): The submitted task.
+            priority (int): The new priority, higher runs first.
+
+        Returns:
+            bool: True if the task was reordered, False if it already started.
+        """
+        if not self.__scheduler.set_priority(task, priority):
+            return False
+        get_loop_thread().submit(self.__notify_slots())
+        return True
+
+    def pin(self, task: AsyncWorker) -> bool:
+        """
+        Make a task that has not started yet the next one to start.
+
+        Args:
+            task (AsyncWorker): The submitted task.
+
+        Returns:
+            bool: True if the task was pinned, False if it already started.
+        """
+        if not self.__scheduler.pin(task):
+            return False
+        get_loop_thread().submit(self.__notify_slots())
+        return True
+
+    def set_policy(self, policy: str) -> None:
+        """
+        Change the scheduling policy of the tasks that have not started yet.
+
+        Args:
+            policy (str): 'fifo' or 'shortest_first'.
+        """
+        self.__scheduler.set_policy(policy)
+        get_loop_thread().submit(self.__notify_slots())
+
+    def full(self) -> bool:
+        """
+        Check if the engine is full (maximum number of tasks reached).
+
+        Returns:
+            bool: True if the engine is full, False otherwise.
+        """
+        return self.__current_tasks.value >= self.max_size
+
+    def waitForDone(self, msecs: int = -1) -> bool:
+        """
+        Wait until every submitted task has finished.
+
+        Args:
+            msecs (int): The maximum number of milliseconds to wait, -1 for no limit.
+
+        Returns:
+            bool: True if every task finished in time.
+        """
+        deadline = None if msecs < 0 else time.monotonic() + msecs / 1000
+        for future in list(self.__futures):
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                future.result(timeout)
+            except Exception:
+                if not future.done():
+                    return False
+        return True
@@ -0,0 +1,451 @@
+import asyncio, codecs, ssl
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+from requests.utils import requote_uri
+from uqload_dl_gui.connectionManager import PoolStats
+
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 5
+
+# (scheme, host, port) of a pooled connection
+PoolKey = Tuple[str, str, int]
+
+
+def get_host_header(url: str) -> str:
+    """
+    Get the value of the Host header of a request.
+
+    Args:
+        url (str): The requested URL.
+
+    Returns:
+        str: The host without credentials, bracketed if it is an IPv6 address,
+        followed by the port unless it is the default one of the scheme.
+    """
+    parts = urlsplit(url)
+    host = parts.hostname
+    if ":" in host:
+        host = f"[{host}]"
+    default_port = 443 if parts.scheme.lower() == "https" else 80
+    if parts.port is not None and parts.port != default_port:
+        host = f"{host}:{parts.port}"
+    return host
+
+
+def parse_status_line(line: bytes) -> int:
+    """
+    Get the status code of an HTTP/1.x status line.
+
+    Args:
+        line (bytes): The status line, e.g. 'HTTP/1.1 200 OK'.
+
+    Returns:
+        int: The status code.
+
+    Raises:
+        ConnectionError: If the line is not a valid HTTP/1.x status line.
+    """
+    version, _, rest = line.decode("latin-1").strip().partition(" ")
+    code = rest.partition(" ")[0]
+    if version not in ("HTTP/1.0", "HTTP/1.1") or len(code) != 3 or not code.isdigit():
+        raise ConnectionError(f"Invalid status line: {line[:100]!r}")
+    return int(code)
+
+
+class AsyncResponse:
+    """
+    Response of an HTTP/1.1 request sent by AsyncHTTPClient.
+
+    The body is read on demand with `read`. Closing the response hands the
+    connection back to the pool when the whole body was read and drops it
+    otherwise.
+
+    Attributes:
+        url (str): The URL of the response after redirects.
+        status_code (int): The HTTP status code.
+        headers (Dict[str, str]): The response headers with lower-case names.
+    """
+
+    def __init__(
+        self,
+        client: "AsyncHTTPClient",
+        key: PoolKey,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        url: str,
+        status_code: int,
+        headers: Dict[str, str],
+        has_body: bool,
+        timeout: Optional[float],
+    ) -> None:
+        """
+        Initialize the AsyncResponse once the headers have been received.
+
+        Args:
+            client (AsyncHTTPClient): The client the connection belongs to.
+            key (PoolKey): The pool the connection belongs to.
+            reader (asyncio.StreamReader): The reading end of the connection.
+            writer (asyncio.StreamWriter): The writing end of the connection.
+            url (str): The requested URL.
+            status_code (int): The HTTP status code.
+            headers (Dict[str, str]): The response headers with lower-case names.
+            has_body (bool): False for responses that never have a body.
+            timeout (Optional[float]): The maximum number of seconds a read may take.
+        """
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.__client = client
+        self.__key = key
+        self.__reader = reader
+        self.__writer = writer
+        self.__timeout = timeout
+        self.__chunked = "chunked" in headers.get("transfer-encoding", "").lower()
+        self.__keep_alive = headers.get("connection", "").lower() != "close"
+        self.__chunk_left = 0
+        if not has_body:
+            self.__remaining: Optional[int] = 0
+        elif self.__chunked:
+            self.__remaining = None
+        elif "content-length" in headers:
+            self.__remaining = int(headers["content-length"])
+        else:
+            # the body ends when the server closes the connection
+            self.__remaining = None
+            self.__keep_alive = False
+        self.__done = self.__remaining == 0 and not self.__chunked
+        self.__closed = False
+
+    async def __aenter__(self) -> "AsyncResponse":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        self.close()
+
+    async def read(self, size: int = -1) -> bytes:
+        """
+        Read the body.
+
+        Args:
+            size (int): The maximum number of bytes to return, -1 for the rest
+            of the body.
+
+        Returns:
+            bytes: Up to `size` bytes as soon as some are available, or an empty
+            bytes object at the end of the body.
+        """
+        if size < 0:
+            parts = []
+            while True:
+                part = await self.read(1024 * 1024)
+                if not part:
+                    return b"".join(parts)
+                parts.append(part)
+
+        if self.__done or size == 0:
+            return b""
+
+        if self.__chunked:
+            if not self.__chunk_left:
+                line = await self.__wait(self.__reader.readline())
+                self.__chunk_left = int(line.split(b";", 1)[0].strip() or b"0", 16)
+                if not self.__chunk_left:
+                    # skip the trailers
+                    while (await self.__wait(self.__reader.readline())).strip():
+                        pass
+                    self.__done = True
+                    return b""
+            data = await self.__wait(self.__reader.read(min(size, self.__chunk_left)))
+            if not data:
+                raise ConnectionError("Connection closed in the middle of a chunk")
+            self.__chunk_left -= len(data)
+            if not self.__chunk_left:
+                await self.__wait(self.__reader.readexactly(2))
+            return data
+
+        if self.__remaining is not None:
+            size = min(size, self.__remaining)
+        data = await self.__wait(self.__reader.read(size))
+        if self.__remaining is not None:
+            if not data:
+                raise ConnectionError("Connection closed before the body was complete")
+            self.__remaining -= len(data)
+            self.__done = not self.__remaining
+        elif not data:
+            self.__done = True
+        return data
+
+    @property
+    def charset(self) -> str:
+        """
+        Get the charset of the body.
+
+        Returns:
+            str: The known charset of the content type, UTF-8 by default.
+        """
+        for parameter in self.headers.get("content-type", "").split(";")[1:]:
+            name, _, value = parameter.strip().partition("=")
+            if name.lower() == "charset" and value:
+                try:
+                    return codecs.lookup(value.strip("\"'")).name
+                except LookupError:
+                    break
+        return "utf-8"
+
+    async def text(self) -> str:
+        """
+        Read the whole body and decode it.
+
+        Returns:
+            str: The body decoded with the charset of the content type, UTF-8 by default.
+        """
+        body = await self.read()
+        return body.decode(self.charset, errors="replace")
+
+    def close(self) -> None:
+        """Release the connection, keeping it alive if the body was fully read."""
+        if self.__closed:
+            return
+        self.__closed = True
+        if self.__done and self.__keep_alive:
+            self.__client.release(self.__key, self.__reader, self.__writer)
+        else:
+            self.__writer.close()
+
+    async def __wait(self, awaitable):
+        """Await a read with the timeout of the request."""
+        return await asyncio.wait_for(awaitable, self.__timeout)
+
+
+class AsyncHTTPClient:
+    """
+    Minimal asyncio HTTP/1.1 client with keep-alive connection pooling.
+
+    It is used by the asyncio download engine so that hundreds of transfers
+    run as coroutines on one event loop, and by nothing else: it fetches the
+    pages of a video, probes its size and streams its body. Only what the engine
+    needs is supported: GET and HEAD, identity or chunked bodies, redirects and
+    TLS. URLs are requoted the way `requests` does. The client must only be
+    used from the loop it was first used on. Any other request goes through the
+    shared `requests` session of the ConnectionManager.
+
+    Known limits:
+
+    - Proxies are not supported, connections always go to the host of the URL.
+      The engine sends proxied requests through `requests` instead.
+    - Bodies are never decoded. `Accept-Encoding: identity` is sent unless the
+      caller sets it, and a response with a `Content-Encoding` is returned as is.
+      The engine hands such responses to `requests` instead.
+    - Credentials in the URL are ignored, there is no authentication.
+    - Cookies are neither sent nor stored. None of the requests above need them.
+    - Only HTTP/1.0 and HTTP/1.1 responses are understood.
+
+    Attributes:
+        stats (PoolStats): The pool usage counters.
+        pool_maxsize (int): Number of idle keep-alive connections kept per host.
+    """
+
+    def __init__(self, pool_maxsize: int = 10) -> None:
+        """
+        Initialize the AsyncHTTPClient.
+
+        Args:
+            pool_maxsize (int): Number of idle keep-alive connections kept per host.
+        """
+        self.stats = PoolStats()
+        self.pool_maxsize = pool_maxsize
+        self.__idle: Dict[
+            PoolKey, List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]
+        ] = {}
+        self.__ssl_context: Optional[ssl.SSLContext] = None
+
+    async def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncResponse:
+        """
+        Send a GET request, following redirects.
+
+        Args:
+            url (str): The URL to request.
+            headers (Optional[Dict[str, str]]): Additional request headers.
+            timeout (Optional[float]): The maximum number of seconds to connect
+            and to wait for each read.
+
+        Returns:
+            AsyncResponse: The response, with the body not read yet.
+        """
+        return await self.request("GET", url, headers, timeout)
+
+    async def head(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncResponse:
+        """
+        Send a HEAD request, following redirects.
+
+        Args:
+            url (str): The URL to request.
+            headers (Optional[Dict[str, str]]): Additional request headers.
+            timeout (Optional[float]): The maximum number of seconds to connect
+            and to wait for each read.
+
+        Returns:
+            AsyncResponse: The response.
+        """
+        return await self.request("HEAD", url, headers, timeout)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncResponse:
+        """
+        Send a request, following redirects.
+
+        Args:
+            method (str): The HTTP method, 'GET' or 'HEAD'.
+            url (str): The URL to request.
+            headers (Optional[Dict[str, str]]): Additional request headers.
+            timeout (Optional[float]): The maximum number of seconds to connect
+            and to wait for each read.
+
+        Returns:
+            AsyncResponse: The response, with the body not read yet.
+
+        Raises:
+            ConnectionError: If there are too many redirects.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            response = await self.__send(method, url, headers or {}, timeout)
+            location = response.headers.get("location")
+            if response.status_code not in REDIRECT_CODES or not location:
+                return response
+            await response.read()
+            response.close()
+            url = urljoin(url, location)
+        raise ConnectionError(f"Too many redirects: {url}")
+
+    def release(
+        self, key: PoolKey, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Keep a connection whose response was fully read for the next request.
+
+        Args:
+            key (PoolKey): The pool the connection belongs to.
+            reader (asyncio.StreamReader): The reading end of the connection.
+            writer (asyncio.StreamWriter): The writing end of the connection.
+        """
+        idle = self.__idle.setdefault(key, [])
+        if len(idle) < self.pool_maxsize and not writer.is_closing():
+            idle.append((reader, writer))
+        else:
+            writer.close()
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        for idle in self.__idle.values():
+            for _, writer in idle:
+                writer.close()
+        self.__idle.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the pool usage counters.
+
+        Returns:
+            Dict[str, int]: The number of requests, new connections and hits.
+        """
+        return self.stats.as_dict()
+
+    async def __send(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        timeout: Optional[float],
+    ) -> AsyncResponse:
+        """Send a single request, retrying once if a pooled connection went stale."""
+        parts = urlsplit(requote_uri(url))
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {get_host_header(url)}"]
+        names = {name.lower() for name in headers}
+        if "accept-encoding" not in names:
+            lines.append("Accept-Encoding: identity")
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        payload = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+        self.stats.add_request()
+        while True:
+            reader, writer, reused = await self.__acquire(key, timeout)
+            try:
+                writer.write(payload)
+                await asyncio.wait_for(writer.drain(), timeout)
+                status_line = await asyncio.wait_for(reader.readline(), timeout)
+                if not status_line:
+                    raise ConnectionResetError("Connection closed by the server")
+                break
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if not reused:
+                    raise
+
+        status_code = parse_status_line(status_line)
+        response_headers: Dict[str, str] = {}
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        has_body = method != "HEAD" and status_code not in (204, 304)
+        return AsyncResponse(
+            self,
+            key,
+            reader,
+            writer,
+            url,
+            status_code,
+            response_headers,
+            has_body,
+            timeout,
+        )
+
+    async def __acquire(
+        self, key: PoolKey, timeout: Optional[float]
+    ) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]:
+        """Get an idle connection of the pool, or open a new one."""
+        idle = self.__idle.get(key, [])
+        while len(idle):
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+
+        scheme, host, port = key
+        context = None
+        if scheme == "https":
+            if self.__ssl_context is None:
+                self.__ssl_context = ssl.create_default_context()
+            context = self.__ssl_context
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=context), timeout
+        )
+        self.stats.add_connection()
+        return reader, writer, False
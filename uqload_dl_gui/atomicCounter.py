@@ -0,0 +1,69 @@
+from threading import Lock
+from typing import Optional
+
+
+class AtomicCounter:
+    """
+    Integer counter that can be changed from several threads.
+
+    Every change is made under a lock, so a check and an increment cannot be
+    interleaved with the change of another thread.
+    """
+
+    def __init__(self, value: int = 0) -> None:
+        """
+        Initialize the AtomicCounter.
+
+        Args:
+            value (int): The initial value.
+        """
+        self.__lock = Lock()
+        self.__value = int(value)
+
+    @property
+    def value(self) -> int:
+        """
+        Get the current value.
+
+        Returns:
+            int: The value of the counter.
+        """
+        with self.__lock:
+            return self.__value
+
+    def set(self, value: int) -> None:
+        """
+        Set the value.
+
+        Args:
+            value (int): The new value.
+        """
+        with self.__lock:
+            self.__value = int(value)
+
+    def increment(self, limit: Optional[int] = None) -> bool:
+        """
+        Add one, unless the counter already reached a limit.
+
+        Args:
+            limit (Optional[int]): The value the counter must stay below, None for no limit.
+
+        Returns:
+            bool: True if the counter was incremented.
+        """
+        with self.__lock:
+            if limit is not None and self.__value >= limit:
+                return False
+            self.__value += 1
+            return True
+
+    def decrement(self) -> int:
+        """
+        Subtract one, never going below zero.
+
+        Returns:
+            int: The new value.
+        """
+        with self.__lock:
+            self.__value = max(0, self.__value - 1)
+            return self.__value
@@ -0,0 +1,245 @@
+import time
+from threading import Lock
+from typing import List, Optional
+
+# a share that reserved nothing for this many seconds gives its rate back
+IDLE_TIMEOUT = 1.0
+
+
+class BandwidthShare:
+    """
+    Share of the global bandwidth held by a single download.
+
+    Every segment of the download reserves its received bytes from the same
+    share. An active share refills at `weight / total weight` of the global
+    rate, the total counting active shares only, so downloads split the cap in
+    proportion to their weights and a paused or idle download leaves its part
+    to the others.
+
+    Attributes:
+        weight (float): The relative weight of the download.
+        active (bool): False while the download is paused or idle.
+    """
+
+    def __init__(self, limiter: "BandwidthLimiter", weight: float) -> None:
+        """
+        Initialize the BandwidthShare.
+
+        Args:
+            limiter (BandwidthLimiter): The limiter the share belongs to.
+            weight (float): The relative weight of the download.
+        """
+        self.weight = weight
+        self.rate = 0.0
+        self.ready_at = 0.0
+        self.active = True
+        self.closed = False
+        self.last_used = time.monotonic()
+        self.__limiter = limiter
+
+    def reserve(self, size: int) -> float:
+        """
+        Take bytes from the share.
+
+        Args:
+            size (int): The number of bytes received.
+
+        Returns:
+            float: The number of seconds to wait before receiving more data.
+        """
+        # unlimited: no lock and no clock on the hot loop
+        if self.__limiter.rate <= 0 or self.closed:
+            return 0.0
+        return self.__limiter.reserve(self, size)
+
+    def set_weight(self, weight: float) -> None:
+        """
+        Change the relative weight of the download.
+
+        Args:
+            weight (float): The new weight, must be positive.
+        """
+        self.__limiter.set_weight(self, weight)
+
+    def set_idle(self) -> None:
+        """Give the rate back while the download is paused, until it reserves again."""
+        self.__limiter.set_idle(self)
+
+    def close(self) -> None:
+        """Give the share back, so the remaining downloads split the cap."""
+        self.__limiter.unregister(self)
+
+
+class BandwidthLimiter:
+    """
+    Token-bucket limiter of the combined bandwidth of all downloads.
+
+    Each registered download gets a BandwidthShare whose bucket refills at
+    its weighted part of the global rate. A download reserves the bytes it
+    has received and sleeps for the returned delay, so the sum of all
+    downloads never exceeds the cap. Only active shares split the rate: a
+    share becomes idle when its download pauses or reserves nothing for
+    `IDLE_TIMEOUT` seconds, and active again on its next reservation, so the
+    cap is not wasted on downloads that do not use it. The rate and the
+    weights can be changed at any time and apply to the next reservation.
+
+    Attributes:
+        rate (int): The global cap in bytes per second, 0 for no limit.
+    """
+
+    def __init__(self, rate: int = 0) -> None:
+        """
+        Initialize the BandwidthLimiter.
+
+        Args:
+            rate (int): The global cap in bytes per second, 0 for no limit.
+        """
+        self.rate = max(0, int(rate))
+        self.__shares: List[BandwidthShare] = []
+        self.__lock = Lock()
+        self.__next_idle_check = 0.0
+
+    def set_rate(self, rate: int) -> None:
+        """
+        Change the global cap.
+
+        Args:
+            rate (int): The new cap in bytes per second, 0 for no limit.
+        """
+        with self.__lock:
+            self.rate = max(0, int(rate))
+            self.__rebalance()
+
+    def register(self, weight: float = 1.0) -> BandwidthShare:
+        """
+        Add a download to the limiter.
+
+        Args:
+            weight (float): The relative weight of the download, must be positive.
+
+        Returns:
+            BandwidthShare: The share the download reserves its bytes from.
+
+        Raises:
+            ValueError: If the weight is not positive.
+        """
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        share = BandwidthShare(self, weight)
+        with self.__lock:
+            self.__shares.append(share)
+            self.__rebalance()
+        return share
+
+    def unregister(self, share: BandwidthShare) -> None:
+        """
+        Remove a download from the limiter.
+
+        Args:
+            share (BandwidthShare): The share of the download.
+        """
+        with self.__lock:
+            if share in self.__shares:
+                self.__shares.remove(share)
+                share.closed = True
+                share.rate = 0.0
+                self.__rebalance()
+
+    def set_idle(self, share: BandwidthShare) -> None:
+        """
+        Leave the rate of a share to the others until it reserves bytes again.
+
+        Args:
+            share (BandwidthShare): The share of the download.
+        """
+        with self.__lock:
+            if share.active and not share.closed:
+                share.active = False
+                self.__rebalance()
+
+    def set_weight(self, share: BandwidthShare, weight: float) -> None:
+        """
+        Change the relative weight of a download.
+
+        Args:
+            share (BandwidthShare): The share of the download.
+            weight (float): The new weight, must be positive.
+
+        Raises:
+            ValueError: If the weight is not positive.
+        """
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        with self.__lock:
+            share.weight = weight
+            self.__rebalance()
+
+    def reserve(self, share: BandwidthShare, size: int) -> float:
+        """
+        Take bytes from a share.
+
+        Args:
+            share (BandwidthShare): The share of the download.
+            size (int): The number of bytes received.
+
+        Returns:
+            float: The number of seconds to wait before receiving more data.
+        """
+        with self.__lock:
+            if self.rate <= 0 or share.closed:
+                return 0.0
+            now = time.monotonic()
+            share.last_used = now
+            if not share.active:
+                share.active = True
+                self.__rebalance()
+            elif now >= self.__next_idle_check:
+                self.__find_idle(now)
+            share.ready_at = max(share.ready_at, now) + size / share.rate
+            return share.ready_at - now
+
+    def __find_idle(self, now: float) -> None:
+        """
+        Mark the shares that reserved nothing for `IDLE_TIMEOUT` seconds as idle.
+
+        Args:
+            now (float): The current monotonic time.
+        """
+        self.__next_idle_check = now + IDLE_TIMEOUT / 2
+        idle = [
+            share
+            for share in self.__shares
+            if share.active and now - share.last_used > IDLE_TIMEOUT
+        ]
+        for share in idle:
+            share.active = False
+        if len(idle):
+            self.__rebalance()
+
+    def __rebalance(self) -> None:
+        """Split the global rate between the active shares by weight."""
+        total_weight = sum(share.weight for share in self.__shares if share.active)
+        for share in self.__shares:
+            share.rate = (
+                self.rate * share.weight / total_weight
+                if self.rate and share.active
+                else 0.0
+            )
+
+
+_bandwidth_limiter: Optional[BandwidthLimiter] = None
+_bandwidth_limiter_lock = Lock()
+
+
+def get_bandwidth_limiter() -> BandwidthLimiter:
+    """
+    Retrieves the process-wide bandwidth limiter.
+
+    Returns:
+        BandwidthLimiter: The shared limiter, unlimited unless changed.
+    """
+    global _bandwidth_limiter
+    with _bandwidth_limiter_lock:
+        if _bandwidth_limiter is None:
+            _bandwidth_limiter = BandwidthLimiter()
+        return _bandwidth_limiter
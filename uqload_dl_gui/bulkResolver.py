@@ -0,0 +1,173 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Dict, List, Optional
+from PyQt5.QtCore import QObject, pyqtSignal
+from uqload_dl_gui.asyncEngine import fetch_video_info, get_loop_thread
+from uqload_dl_gui.metadataCache import MetadataCache
+from uqload_dl_gui.uqload import UQLoad
+from uqload_dl_gui.utils import parse_urls
+
+
+class BulkResolver(QObject):
+    """
+    Resolves many UQLoad links with a bounded number of parallel requests.
+
+    Every link is resolved as soon as a slot is free and its result is
+    emitted right away, so resolved videos can be queued while the rest are
+    still being resolved. With the asyncio engine the links are resolved as
+    coroutines on the engine loop, otherwise on a small thread pool.
+
+    Attributes:
+        resolved_signal (pyqtSignal): Signal emitted with the information of a resolved video.
+        url_resolved_signal (pyqtSignal): Signal emitted with the link and the information of a resolved video.
+        failed_signal (pyqtSignal): Signal emitted with the link and the error of a failure.
+        finished_signal (pyqtSignal): Signal emitted once every link was handled.
+        urls (List[str]): The links to resolve.
+        max_workers (int): Maximum number of links resolved at the same time.
+    """
+
+    resolved_signal = pyqtSignal(object)
+    url_resolved_signal = pyqtSignal(str, object)
+    failed_signal = pyqtSignal(str, str)
+    finished_signal = pyqtSignal()
+
+    def __init__(
+        self,
+        urls: List[str],
+        max_workers: int = 4,
+        cache: Optional[MetadataCache] = None,
+        use_asyncio: bool = False,
+        probe_size: bool = True,
+        embed_only: bool = False,
+    ) -> None:
+        """
+        Initialize the BulkResolver.
+
+        Args:
+            urls (List[str]): The normalised links to resolve.
+            max_workers (int): Maximum number of links resolved at the same time.
+            cache (Optional[MetadataCache]): The metadata cache to use, if any.
+            use_asyncio (bool): Resolve on the asyncio engine loop instead of threads.
+            probe_size (bool): True to read the size and type with a HEAD request.
+            embed_only (bool): True to resolve from the embed page alone.
+        """
+        super().__init__()
+        self.urls = urls
+        self.max_workers = max(1, int(max_workers))
+        self.__cache = cache
+        self.__use_asyncio = use_asyncio
+        self.__probe_size = probe_size
+        self.__embed_only = embed_only
+        self.__lock = Lock()
+        self.__remaining = len(urls)
+        self.__cancelled = False
+        self.__executor: Optional[ThreadPoolExecutor] = None
+
+    def start(self) -> None:
+        """Start resolving the links."""
+        if not len(self.urls):
+            self.finished_signal.emit()
+            return
+        if self.__use_asyncio:
+            get_loop_thread().submit(self.__resolve_all())
+            return
+        self.__executor = ThreadPoolExecutor(
+            self.max_workers, thread_name_prefix="bulk-resolver"
+        )
+        for url in self.urls:
+            future = self.__executor.submit(self.__resolve, url)
+            future.add_done_callback(lambda item, url=url: self.__on_done(url, item))
+        self.__executor.shutdown(wait=False)
+
+    def cancel(self) -> None:
+        """Stop resolving the links that have not started yet."""
+        with self.__lock:
+            self.__cancelled = True
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False, cancel_futures=True)
+
+    def __resolve(self, url: str) -> Dict[str, Any]:
+        """
+        Resolve a single link on a thread of the pool.
+
+        Args:
+            url (str): The link to resolve.
+
+        Returns:
+            Dict[str, Any]: The video information.
+        """
+        return UQLoad(
+            url, self.__cache, self.__probe_size, self.__embed_only
+        ).get_info()
+
+    def __on_done(self, url: str, future: Future) -> None:
+        """
+        Emit the result of a link resolved on the thread pool.
+
+        Args:
+            url (str): The resolved link.
+            future (Future): The future of the resolution.
+        """
+        if future.cancelled():
+            self.__finish_one()
+            return
+        error = future.exception()
+        if error is None:
+            self.__emit_result(url, future.result(), None)
+        else:
+            self.__emit_result(url, None, error)
+
+    async def __resolve_all(self) -> None:
+        """Resolve every link on the engine loop, `max_workers` at a time."""
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def resolve(url: str) -> None:
+            async with semaphore:
+                if self.__cancelled:
+                    self.__finish_one()
+                    return
+                try:
+                    video_info = await fetch_video_info(
+                        url, self.__cache, self.__probe_size, self.__embed_only
+                    )
+                except Exception as ex:
+                    self.__emit_result(url, None, ex)
+                else:
+                    self.__emit_result(url, video_info, None)
+
+        await asyncio.gather(*map(resolve, self.urls))
+
+    def __emit_result(
+        self,
+        url: str,
+        video_info: Optional[Dict[str, Any]],
+        error: Optional[BaseException],
+    ) -> None:
+        """
+        Emit the result of a link unless the resolver was cancelled.
+
+        Args:
+            url (str): The resolved link.
+            video_info (Optional[Dict[str, Any]]): The video information on success.
+            error (Optional[BaseException]): The error on failure.
+        """
+        with self.__lock:
+            cancelled = self.__cancelled
+        if not cancelled:
+            if error is None:
+                # kept so the item can be resolved again once the video URL expires
+                video_info = {**video_info, "page_url": url}
+                self.resolved_signal.emit(video_info)
+                self.url_resolved_signal.emit(url, video_info)
+            else:
+                self.failed_signal.emit(url, str(error))
+        self.__finish_one()
+
+    def __finish_one(self) -> None:
+        """Count a handled link and emit the finished signal after the last one."""
+        with self.__lock:
+            self.__remaining -= 1
+            finished = self.__remaining == 0
+        if finished:
+            self.finished_signal.emit()
@@ -0,0 +1,342 @@
+import argparse, os, signal, sys, time
+from threading import Event, Lock
+from typing import Dict, List, Optional, TextIO
+from uqload_dl_gui import queueJournal
+from uqload_dl_gui.controlApi import ControlServer, EventHub, ManagerController
+from uqload_dl_gui.config import get_config, get_data_dir, override_config
+from uqload_dl_gui.downloadManager import DownloadItem, DownloadManager
+from uqload_dl_gui.metadataCache import get_metadata_cache
+from uqload_dl_gui.queueJournal import QueueJournal
+from uqload_dl_gui.utils import convert_size, get_video_id, parse_urls
+
+# seconds between two status reports of the running downloads
+REPORT_INTERVAL = 5
+# seconds between two checks of the stop flag while waiting
+WAIT_STEP = 0.5
+
+# command line option -> setting it overrides for this process
+OVERRIDES = {
+    "output_dir": "output_dir",
+    "concurrent_downloads": "concurrent_downloads",
+    "segments": "download_segments",
+    "limit_rate": "bandwidth_limit_kbps",
+    "engine": "download_engine",
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the parser of the command line options.
+
+    Returns:
+        argparse.ArgumentParser: The parser of `uqload-dl`.
+    """
+    parser = argparse.ArgumentParser(
+        prog="uqload-dl",
+        description="Download UQLoad videos without the GUI.",
+    )
+    parser.add_argument("urls", nargs="*", metavar="URL", help="UQLoad links")
+    parser.add_argument(
+        "-i",
+        "--input-file",
+        metavar="FILE",
+        help="file of links separated by whitespace or commas, '-' for stdin",
+    )
+    parser.add_argument("-o", "--output-dir", metavar="DIR")
+    parser.add_argument(
+        "-j", "--concurrent-downloads", type=int, metavar="N", help="parallel downloads"
+    )
+    parser.add_argument(
+        "-s", "--segments", type=int, metavar="N", help="segments per download"
+    )
+    parser.add_argument(
+        "--limit-rate", type=int, metavar="KBPS", help="bandwidth limit, 0 for none"
+    )
+    parser.add_argument("--engine", choices=["threads", "asyncio"])
+    parser.add_argument(
+        "--fast-resolve", action="store_true", help="skip the size request"
+    )
+    parser.add_argument(
+        "--embed-only", action="store_true", help="resolve from the embed page only"
+    )
+    parser.add_argument(
+        "--journal",
+        metavar="FILE",
+        help="queue journal of unfinished downloads (default: cli-queue.sqlite3 "
+        "in the application data directory)",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="do not resume the unfinished downloads of previous runs",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="keep running; links appended to the input file are downloaded "
+        "and removed from it",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=5,
+        metavar="SECONDS",
+        help="seconds between two reads of the input file in daemon mode",
+    )
+    parser.add_argument(
+        "--api-port",
+        type=int,
+        metavar="PORT",
+        help="serve the control API on 127.0.0.1:PORT, 0 for any free port",
+    )
+    parser.add_argument(
+        "--api-socket", metavar="PATH", help="serve the control API on a Unix socket"
+    )
+    parser.add_argument(
+        "--api-token", metavar="TOKEN", help="bearer token the control API requires"
+    )
+    parser.add_argument("-q", "--quiet", action="store_true")
+    return parser
+
+
+def read_links(path: str) -> str:
+    """
+    Read a file of links.
+
+    Args:
+        path (str): The path of the file, '-' for the standard input.
+
+    Returns:
+        str: The content of the file.
+    """
+    if path == "-":
+        return sys.stdin.read()
+    with open(path, "r", encoding="utf-8", errors="replace") as file:
+        return file.read()
+
+
+def consume_links(path: str) -> str:
+    """
+    Read and remove the links appended to the input file of the daemon.
+
+    The file is renamed before it is read, so links appended meanwhile go to a
+    new file and are read by the next call.
+
+    Args:
+        path (str): The path of the input file.
+
+    Returns:
+        str: The links of the file, empty if there is no file.
+    """
+    processing = f"{path}.processing"
+    try:
+        os.replace(path, processing)
+    except FileNotFoundError:
+        if not os.path.exists(processing):
+            return ""
+    text = read_links(processing)
+    os.remove(processing)
+    return text
+
+
+class Reporter:
+    """
+    Prints what happens to the downloads of the command line.
+
+    Attributes:
+        stream (TextIO): The stream the lines are written to.
+        quiet (bool): True to print errors only.
+    """
+
+    def __init__(self, stream: TextIO, quiet: bool = False) -> None:
+        """
+        Initialize the Reporter.
+
+        Args:
+            stream (TextIO): The stream the lines are written to.
+            quiet (bool): True to print errors only.
+        """
+        self.stream = stream
+        self.quiet = quiet
+        self.counts: Dict[str, int] = {}
+        self.__lock = Lock()
+
+    def print(self, line: str) -> None:
+        """
+        Print a line.
+
+        Args:
+            line (str): The line to print.
+        """
+        with self.__lock:
+            self.stream.write(f"{line}\n")
+            self.stream.flush()
+
+    def on_event(self, item: DownloadItem, event: str) -> None:
+        """
+        Report an event of a download.
+
+        Args:
+            item (DownloadItem): The download.
+            event (str): What happened to it.
+        """
+        if event in (queueJournal.DONE, queueJournal.FAILED, queueJournal.CANCELLED):
+            with self.__lock:
+                self.counts[event] = self.counts.get(event, 0) + 1
+        if event == queueJournal.FAILED:
+            self.print(f"failed     {item.title}: {item.error}")
+        elif self.quiet or event == "progress":
+            return
+        elif event == "started":
+            self.print(f"started    {item.title}")
+        elif event == queueJournal.DONE:
+            self.print(f"done       {item.title}")
+        elif event == queueJournal.CANCELLED:
+            self.print(f"cancelled  {item.title}")
+
+    def report(self, items: List[DownloadItem]) -> None:
+        """
+        Print the progress of the running downloads.
+
+        Args:
+            items (List[DownloadItem]): The downloads.
+        """
+        if self.quiet:
+            return
+        for item in items:
+            if item.state != queueJournal.RUNNING:
+                continue
+            percent = (
+                100 * item.bytes_downloaded / item.total_size if item.total_size else 0
+            )
+            self.print(
+                f"{percent:5.1f}%     {convert_size(item.bytes_downloaded)} / "
+                f"{convert_size(item.total_size)}  {item.title}"
+            )
+
+
+def main(argv: Optional[List[str]] = None, stream: TextIO = sys.stdout) -> int:
+    """
+    Run `uqload-dl`.
+
+    Downloads the given links with the same concurrency, limits and resume
+    behaviour as the GUI, without Qt. Options override the settings for this
+    run only. Interrupted downloads are recorded in the queue journal and
+    resumed by the next run. With a control API, it runs until it is stopped.
+
+    Args:
+        argv (Optional[List[str]]): The arguments, defaults to the process arguments.
+        stream (TextIO): The stream the progress is written to.
+
+    Returns:
+        int: 0 if every download succeeded, 1 if one failed, 130 if interrupted.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.daemon and (args.input_file is None or args.input_file == "-"):
+        parser.error("--daemon requires an --input-file to watch")
+
+    get_config()
+    overrides = {
+        setting: getattr(args, option)
+        for option, setting in OVERRIDES.items()
+        if getattr(args, option) is not None
+    }
+    if "output_dir" in overrides:
+        overrides["output_dir"] = os.path.abspath(overrides["output_dir"])
+        os.makedirs(overrides["output_dir"], exist_ok=True)
+    override_config(**overrides)
+    settings = get_config()
+
+    text = " ".join(args.urls)
+    if args.input_file is not None and not args.daemon:
+        try:
+            text += "\n" + read_links(args.input_file)
+        except OSError as ex:
+            parser.error(str(ex))
+    urls, invalid = parse_urls(text)
+    if invalid:
+        stream.write(f"skipped {invalid} invalid link(s)\n")
+
+    reporter = Reporter(stream, args.quiet)
+    events = EventHub()
+
+    def on_event(item: DownloadItem, event: str) -> None:
+        reporter.on_event(item, event)
+        events.publish({"event": event, **item.to_dict()})
+
+    journal = QueueJournal(
+        args.journal or os.path.join(get_data_dir(), "cli-queue.sqlite3")
+    )
+    journal.compact()
+    manager = DownloadManager(
+        journal=journal,
+        cache=get_metadata_cache(),
+        probe_size=not (args.fast_resolve or settings.value("fast_resolve", type=bool)),
+        embed_only=args.embed_only or settings.value("embed_only", type=bool),
+        on_event=on_event,
+    )
+    server = None
+    if args.api_port is not None or args.api_socket is not None:
+        try:
+            server = ControlServer(
+                ManagerController(manager, events),
+                args.api_port or 0,
+                socket_path=args.api_socket,
+                token=args.api_token,
+            )
+        except OSError as ex:
+            manager.shutdown()
+            journal.close()
+            parser.error(f"cannot serve the control API: {ex}")
+        server.start()
+        reporter.print(f"control API listening on {server.address}")
+
+    stop = Event()
+    handlers = {
+        signum: signal.signal(signum, lambda *_: stop.set())
+        for signum in (signal.SIGINT, signal.SIGTERM)
+    }
+    try:
+        queued = set()
+        if not args.no_resume:
+            for item in manager.restore():
+                if item.page_url:
+                    queued.add(get_video_id(item.page_url))
+        for url in urls:
+            if get_video_id(url) not in queued:
+                queued.add(get_video_id(url))
+                manager.add_url(url)
+
+        last_report = time.monotonic()
+        next_poll = 0.0
+        while not stop.is_set():
+            if args.daemon and time.monotonic() >= next_poll:
+                next_poll = time.monotonic() + args.poll_interval
+                try:
+                    for url in parse_urls(consume_links(args.input_file))[0]:
+                        manager.add_url(url)
+                except OSError as ex:
+                    reporter.print(f"cannot read {args.input_file}: {ex}")
+            if manager.wait(WAIT_STEP) and not args.daemon and server is None:
+                break
+            if time.monotonic() - last_report >= REPORT_INTERVAL:
+                last_report = time.monotonic()
+                reporter.report(manager.items())
+    finally:
+        if stop.is_set():
+            reporter.print("stopping, unfinished downloads are resumed by the next run")
+        if server is not None:
+            server.stop()
+        manager.shutdown()
+        journal.close()
+        for signum, handler in handlers.items():
+            signal.signal(signum, handler)
+
+    if stop.is_set():
+        return 130
+    return 1 if reporter.counts.get(queueJournal.FAILED) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,31 +1,187 @@
 import requests
-from threading import Thread
-from typing import List, Union
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from threading import Lock
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+from uqload_dl_gui.config import get_config
+from uqload_dl_gui.connectionManager import get_connection_manager
+from uqload_dl_gui.worker import USER_AGENT
+
+# (future, function, arguments) of a request waiting for a slot of its host
+PendingRequest = Tuple[Future, Callable[..., Any], Tuple[Any, ...]]
+
+
+class RequestExecutor:
+    """
+    Process-wide, bounded executor for metadata requests.
+
+    Requests run on a fixed number of threads instead of one new thread per
+    URL, and at most `max_per_host` requests run against the same host at a
+    time. Requests over the host cap wait in a queue without holding a thread
+    and can be cancelled until they start.
+
+    Attributes:
+        max_workers (int): Number of threads running requests.
+        max_per_host (int): Maximum number of concurrent requests per host.
+    """
+
+    def __init__(self, max_workers: int = 8, max_per_host: int = 4) -> None:
+        """
+        Initialize the RequestExecutor.
+
+        Args:
+            max_workers (int): Number of threads running requests.
+            max_per_host (int): Maximum number of concurrent requests per host.
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.max_per_host = max(1, int(max_per_host))
+        self.__executor = ThreadPoolExecutor(
+            self.max_workers, thread_name_prefix="metadata"
+        )
+        self.__lock = Lock()
+        self.__active: Dict[str, int] = {}
+        self.__pending: Dict[str, Deque[PendingRequest]] = {}
+
+    def submit(self, url: str, fn: Callable[..., Any], *args: Any) -> Future:
+        """
+        Schedule a request to a URL.
+
+        Args:
+            url (str): The requested URL, used to apply the per-host cap.
+            fn (Callable[..., Any]): The function sending the request.
+            *args (Any): The arguments of the function.
+
+        Returns:
+            Future: The future of the result. It can be cancelled until the
+            request starts.
+        """
+        future: Future = Future()
+        host = (urlsplit(url).hostname or "").lower()
+        with self.__lock:
+            if self.__active.get(host, 0) < self.max_per_host:
+                self.__active[host] = self.__active.get(host, 0) + 1
+                start = True
+            else:
+                self.__pending.setdefault(host, deque()).append((future, fn, args))
+                start = False
+        if start:
+            self.__executor.submit(self.__run, host, future, fn, args)
+        return future
+
+    def active_requests(self, host: str) -> int:
+        """
+        Get the number of running requests to a host.
+
+        Args:
+            host (str): The host name.
+
+        Returns:
+            int: The number of requests holding a slot of the host.
+        """
+        with self.__lock:
+            return self.__active.get(host.lower(), 0)
+
+    def __run(
+        self,
+        host: str,
+        future: Future,
+        fn: Callable[..., Any],
+        args: Tuple[Any, ...],
+    ) -> None:
+        """Run a request on a thread of the pool, then hand its slot over."""
+        try:
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = fn(*args)
+                except BaseException as ex:
+                    future.set_exception(ex)
+                else:
+                    future.set_result(result)
+        finally:
+            self.__release(host)
+
+    def __release(self, host: str) -> None:
+        """Start the next waiting request of a host, or free the slot."""
+        with self.__lock:
+            pending = self.__pending.get(host)
+            if pending:
+                future, fn, args = pending.popleft()
+                if not pending:
+                    del self.__pending[host]
+            else:
+                self.__active[host] -= 1
+                if not self.__active[host]:
+                    del self.__active[host]
+                return
+        self.__executor.submit(self.__run, host, future, fn, args)
+
+
+_request_executor: Optional[RequestExecutor] = None
+_request_executor_lock = Lock()
+
+
+def get_request_executor() -> RequestExecutor:
+    """
+    Retrieves the process-wide metadata request executor.
+
+    Returns:
+        RequestExecutor: The shared executor, configured from the settings.
+    """
+    global _request_executor
+    with _request_executor_lock:
+        if _request_executor is None:
+            settings = get_config()
+            _request_executor = RequestExecutor(
+                int(settings.value("metadata_workers")),
+                int(settings.value("metadata_per_host")),
+            )
+        return _request_executor
 
 
 class ConcurrentRequester:
     """Performs parallel requests..
 
-    Performs parallel requests from a given list of urls.
+    Performs parallel requests from a given list of urls on the shared
+    request executor.
 
     Attributes:
         urls (List[str]): A list of URLs to fetch.
-        session (requests.Session): A requests Session object used for making requests.
+        session (requests.Session): The shared, pooled requests Session used for making requests.
+        timeout (float): The timeout of every request in seconds.
+        stream (bool): True to return the responses before their bodies are read.
         responses (List[Tuple[int, Union[requests.Response, None]]]):
         A list of tuples containing the index of the URL in the input list and the
         corresponding response object or None if the request failed.
     """
 
-    def __init__(self, urls: List[str]) -> None:
+    def __init__(
+        self,
+        urls: List[str],
+        timeout: float = 20,
+        executor: Optional[RequestExecutor] = None,
+        stream: bool = False,
+    ) -> None:
         """
         Initializes a ConcurrentRequester object.
 
         Args:
             urls (List[str]): A list of URLs to fetch.
+            timeout (float): The timeout of every request in seconds.
+            executor (Optional[RequestExecutor]): The executor to run the requests
+            on. Defaults to the shared executor.
+            stream (bool): True to return the responses before their bodies are read.
+            The caller must then close them.
         """
         self.urls = self.__validate_urls(urls)
-        self.session = requests.Session()
+        self.session = get_connection_manager().session
+        self.timeout = timeout
+        self.stream = stream
         self.responses = []
+        self.__executor = executor
+        self.__futures: List[Future] = []
+        self.__lock = Lock()
+        self.__abandoned = False
 
     def __validate_urls(self, urls: List[str]) -> List[str]:
         """
@@ -46,9 +202,8 @@ class ConcurrentRequester:
 
     def fetch_url(self, url: str, idx: int) -> None:
         """
-        This method prints a message indicating the start of the request for the URL,
-        fetches the URL using the requests library, and stores the response or None if the request fails
-        in the `responses` attribute.
+        This method fetches the URL using the requests library, and stores the response
+        or None if the request fails in the `responses` attribute.
 
         Args:
             url (str): The URL to fetch.
@@ -56,38 +211,71 @@ class ConcurrentRequester:
         """
         response = self.session.get(
             url,
-            timeout=20,
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/124.0.0.0 Safari/537.36"
-            },
+            timeout=self.timeout,
+            stream=self.stream,
+            headers={"User-Agent": USER_AGENT},
         )
-        if response.status_code == 200:
-            self.responses.append((idx, response))
-            return
-        self.responses.append((idx, None))
+        if response.status_code != 200:
+            response.close()
+            response = None
+        with self.__lock:
+            if not self.__abandoned:
+                self.responses.append((idx, response))
+                return
+        if response is not None:
+            response.close()
 
-    def run_concurrent_requests(self) -> List[Union[requests.Response, None]]:
+    def run_concurrent_requests(
+        self, timeout: Optional[float] = None
+    ) -> List[Union[requests.Response, None]]:
         """
         Fetches all URLs concurrently and returns the responses.
 
-        This method creates a list of threads, one for each URL. Each thread calls the `fetch_url`
-        method to fetch the corresponding URL. The method then waits for all threads to finish
+        Every URL is submitted to the request executor, which calls `fetch_url`
+        within the per-host cap. The method then waits for all requests to finish
         and returns a list of responses sorted by the order of the URLs in the input list.
 
+        Args:
+            timeout (Optional[float]): The maximum number of seconds to wait for all
+            the responses, None to wait until every request is done.
+
         Returns:
             List[Union[requests.Response, None]]:
             A list of responses or None objects corresponding to the URLs.
+
+        Raises:
+            TimeoutError: If the responses are not all received in time. Requests
+            that have not started yet are cancelled, and the responses already
+            received or still running are closed.
+            CancelledError: If the requests were cancelled with `cancel`.
         """
-        __thread_list: List[Thread] = []
+        executor = self.__executor or get_request_executor()
+        self.__futures = [
+            executor.submit(url, self.fetch_url, url, idx)
+            for idx, url in enumerate(self.urls)
+        ]
+        _, not_done = wait(self.__futures, timeout)
+        if len(not_done):
+            self.cancel()
+            self.__abandon()
+            raise TimeoutError(f"No response after {timeout} seconds")
+
+        for future in self.__futures:
+            future.result()
 
-        for idx, url in enumerate(self.urls):
-            __thread = Thread(target=self.fetch_url, args=(url, idx))
-            __thread_list.append(__thread)
-            __thread.start()
+        with self.__lock:
+            return [response for _, response in sorted(self.responses)]
 
-        for __thread in __thread_list:
-            __thread.join()
+    def __abandon(self) -> None:
+        """Close the received responses and the ones of requests still running."""
+        with self.__lock:
+            self.__abandoned = True
+            responses, self.responses = self.responses, []
+        for _, response in responses:
+            if response is not None:
+                response.close()
 
-        return [response for _, response in sorted(self.responses)]
+    def cancel(self) -> None:
+        """Cancel the requests that have not started yet."""
+        for future in self.__futures:
+            future.cancel()
@@ -1,7 +1,179 @@
-import os
-from PyQt5.QtCore import QSettings
+import json, os, sys
+from threading import Lock
+from typing import Any, Dict, Optional
 
-settings = QSettings("VideoDownloader", "uqload downloader gui")
+try:
+    from PyQt5.QtCore import QSettings, QStandardPaths
+except ImportError:  # headless install, see JsonSettings
+    QSettings = QStandardPaths = None
+
+ORGANIZATION_NAME = "VideoDownloader"
+APPLICATION_NAME = "uqload downloader gui"
+
+
+def get_user_data_location() -> str:
+    """
+    Get the per-user data location without Qt.
+
+    Returns:
+        str: The equivalent of QStandardPaths.GenericDataLocation.
+    """
+    if sys.platform == "win32":
+        return os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Application Support")
+    return os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+
+
+def convert_value(value: Any, type: Optional[type] = None) -> Any:
+    """
+    Convert a stored setting like QSettings.value does with its `type` argument.
+
+    Args:
+        value (Any): The stored value.
+        type (Optional[type]): The expected type, None to return the value as is.
+
+    Returns:
+        Any: The converted value.
+    """
+    if type is None or value is None:
+        return value
+    if type is bool and isinstance(value, str):
+        return value.lower() in ("true", "1")
+    return type(value)
+
+
+class JsonSettings:
+    """
+    Qt-free replacement of QSettings, used when PyQt5 is not installed.
+
+    The settings are kept in a JSON file and written on every change. Only the
+    part of the QSettings interface used by the application is provided.
+    """
+
+    def __init__(self, organization: str, application: str) -> None:
+        """
+        Load the settings of an application.
+
+        Args:
+            organization (str): The organization name.
+            application (str): The application name.
+        """
+        self.__organization = organization
+        self.__application = application
+        self.__lock = Lock()
+        self.path = os.path.join(
+            get_user_data_location(), organization, application, "settings.json"
+        )
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                self.__values: Dict[str, Any] = json.load(file)
+        except (OSError, ValueError):
+            self.__values = {}
+
+    def organizationName(self) -> str:
+        """Get the organization name."""
+        return self.__organization
+
+    def applicationName(self) -> str:
+        """Get the application name."""
+        return self.__application
+
+    def value(
+        self, key: str, defaultValue: Any = None, type: Optional[type] = None
+    ) -> Any:
+        """
+        Get a setting.
+
+        Args:
+            key (str): The name of the setting.
+            defaultValue (Any): The value returned if the setting is not set.
+            type (Optional[type]): The type to convert the value to.
+
+        Returns:
+            Any: The value of the setting.
+        """
+        with self.__lock:
+            value = self.__values.get(key, defaultValue)
+        return convert_value(value, type)
+
+    def setValue(self, key: str, value: Any) -> None:
+        """
+        Set a setting and write the settings file.
+
+        Args:
+            key (str): The name of the setting.
+            value (Any): The new value, which must be JSON serializable.
+        """
+        with self.__lock:
+            self.__values[key] = value
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as file:
+                json.dump(self.__values, file, indent=2)
+
+
+class SettingsOverrides:
+    """
+    Settings with values overridden for the running process only.
+
+    Overridden keys are read from memory and never written to the stored
+    settings, every other call goes to the stored settings.
+    """
+
+    def __init__(self, stored: Any, overrides: Dict[str, Any]) -> None:
+        """
+        Initialize the overrides.
+
+        Args:
+            stored (Any): The stored settings.
+            overrides (Dict[str, Any]): The overridden values.
+        """
+        self.stored = stored
+        self.overrides = overrides
+
+    def value(
+        self, key: str, defaultValue: Any = None, type: Optional[type] = None
+    ) -> Any:
+        """Get a setting, overridden or stored."""
+        if key in self.overrides:
+            return convert_value(self.overrides[key], type)
+        if type is None:
+            return self.stored.value(key, defaultValue)
+        return self.stored.value(key, defaultValue, type=type)
+
+    def setValue(self, key: str, value: Any) -> None:
+        """Set a setting, in memory only if it is overridden."""
+        if key in self.overrides:
+            self.overrides[key] = value
+            return
+        self.stored.setValue(key, value)
+
+    def __getattr__(self, name: str) -> Any:
+        """Forward the rest of the interface to the stored settings."""
+        return getattr(self.stored, name)
+
+
+if QSettings is not None:
+    stored_settings = QSettings(ORGANIZATION_NAME, APPLICATION_NAME)
+else:
+    stored_settings = JsonSettings(ORGANIZATION_NAME, APPLICATION_NAME)
+settings = stored_settings
+
+
+def override_config(**values: Any) -> None:
+    """
+    Override settings for the running process without storing them.
+
+    Used by the command line, so its options do not change the settings of
+    the GUI. Calling it again replaces the previous overrides.
+
+    Args:
+        **values (Any): The overridden settings.
+    """
+    global settings
+    settings = (
+        SettingsOverrides(stored_settings, dict(values)) if values else stored_settings
+    )
 
 
 def get_config() -> QSettings:
@@ -12,6 +184,27 @@ def get_config() -> QSettings:
     - 'output_dir': Current working directory.
     - 'max_queue': 10.
     - 'concurrent_downloads': 2.
+    - 'download_segments': 4.
+    - 'progress_interval_ms': 100.
+    - 'progress_min_bytes': 0.
+    - 'min_chunk_kb': 64.
+    - 'max_chunk_kb': 4096.
+    - 'write_buffer_mb': 64.
+    - 'preallocate': False.
+    - 'bandwidth_limit_kbps': 0 (no limit).
+    - 'download_engine': 'threads' ('threads' or 'asyncio').
+    - 'scheduling_policy': 'fifo' ('fifo' or 'shortest_first').
+    - 'metadata_ttl_s': 604800 (one week).
+    - 'video_url_ttl_s': 1800.
+    - 'metadata_cache_size': 500.
+    - 'resolver_workers': 4.
+    - 'metadata_workers': 8.
+    - 'metadata_per_host': 4.
+    - 'fast_resolve': False.
+    - 'embed_only': False.
+    - 'control_api_enabled': False.
+    - 'control_api_port': 8765.
+    - 'control_api_token': '' (no token).
 
     Returns:
         QSettings: A QSettings object containing the configuration settings.
@@ -22,5 +215,69 @@ def get_config() -> QSettings:
         settings.setValue("max_queue", 10)
     if settings.value("concurrent_downloads") is None:
         settings.setValue("concurrent_downloads", 2)
+    if settings.value("download_segments") is None:
+        settings.setValue("download_segments", 4)
+    if settings.value("progress_interval_ms") is None:
+        settings.setValue("progress_interval_ms", 100)
+    if settings.value("progress_min_bytes") is None:
+        settings.setValue("progress_min_bytes", 0)
+    if settings.value("min_chunk_kb") is None:
+        settings.setValue("min_chunk_kb", 64)
+    if settings.value("max_chunk_kb") is None:
+        settings.setValue("max_chunk_kb", 4096)
+    if settings.value("write_buffer_mb") is None:
+        settings.setValue("write_buffer_mb", 64)
+    if settings.value("preallocate") is None:
+        settings.setValue("preallocate", False)
+    if settings.value("bandwidth_limit_kbps") is None:
+        settings.setValue("bandwidth_limit_kbps", 0)
+    if settings.value("download_engine") is None:
+        settings.setValue("download_engine", "threads")
+    if settings.value("scheduling_policy") is None:
+        settings.setValue("scheduling_policy", "fifo")
+    if settings.value("metadata_ttl_s") is None:
+        settings.setValue("metadata_ttl_s", 7 * 24 * 3600)
+    if settings.value("video_url_ttl_s") is None:
+        settings.setValue("video_url_ttl_s", 30 * 60)
+    if settings.value("metadata_cache_size") is None:
+        settings.setValue("metadata_cache_size", 500)
+    if settings.value("resolver_workers") is None:
+        settings.setValue("resolver_workers", 4)
+    if settings.value("metadata_workers") is None:
+        settings.setValue("metadata_workers", 8)
+    if settings.value("metadata_per_host") is None:
+        settings.setValue("metadata_per_host", 4)
+    if settings.value("fast_resolve") is None:
+        settings.setValue("fast_resolve", False)
+    if settings.value("embed_only") is None:
+        settings.setValue("embed_only", False)
+    if settings.value("control_api_enabled") is None:
+        settings.setValue("control_api_enabled", False)
+    if settings.value("control_api_port") is None:
+        settings.setValue("control_api_port", 8765)
+    if settings.value("control_api_token") is None:
+        settings.setValue("control_api_token", "")
 
     return settings
+
+
+def get_data_dir() -> str:
+    """
+    Retrieves the directory where the application keeps its data files.
+
+    The directory is created if it does not exist yet.
+
+    Returns:
+        str: The path of the application data directory.
+    """
+    if QStandardPaths is not None:
+        location = QStandardPaths.writableLocation(QStandardPaths.GenericDataLocation)
+    else:
+        location = get_user_data_location()
+    data_dir = os.path.join(
+        location,
+        settings.organizationName(),
+        settings.applicationName(),
+    )
+    os.makedirs(data_dir, exist_ok=True)
+    return os.path.normpath(data_dir)
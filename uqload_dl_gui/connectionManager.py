@@ -0,0 +1,281 @@
+import requests
+from threading import Lock
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from requests.utils import get_environ_proxies, select_proxy
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# (scheme, host, port) of the pool of a host
+HostKey = Tuple[str, str, int]
+
+
+def get_host_key(scheme: str, host: str, port: Optional[int]) -> HostKey:
+    """
+    Get the key of the connection pool of a host.
+
+    Args:
+        scheme (str): The scheme, 'http' or 'https'.
+        host (str): The host name.
+        port (Optional[int]): The port, None for the default port of the scheme.
+
+    Returns:
+        HostKey: The lower-case scheme and host, and the port.
+    """
+    scheme = scheme.lower()
+    if port is None:
+        port = 443 if scheme == "https" else 80
+    return scheme, host.lower(), port
+
+
+class PoolStats:
+    """
+    Thread-safe counters of the connection pool usage.
+
+    Attributes:
+        requests (int): Number of requests sent through the pool.
+        new_connections (int): Number of TCP (and TLS) connections opened.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the counters at zero."""
+        self.requests = 0
+        self.new_connections = 0
+        self.__lock = Lock()
+
+    def add_request(self) -> None:
+        """Count a request sent through the pool."""
+        with self.__lock:
+            self.requests += 1
+
+    def add_connection(self) -> None:
+        """Count a newly opened connection."""
+        with self.__lock:
+            self.new_connections += 1
+
+    def as_dict(self) -> Dict[str, int]:
+        """
+        Get a snapshot of the counters.
+
+        Returns:
+            Dict[str, int]: The number of requests, new connections and reused
+            connections (hits).
+        """
+        with self.__lock:
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "hits": max(0, self.requests - self.new_connections),
+            }
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter that reports requests and new connections to a PoolStats object.
+
+    Hosts listed in `pool_sizes` get a connection pool of their own size instead
+    of `pool_maxsize`.
+    """
+
+    def __init__(
+        self,
+        stats: PoolStats,
+        pool_sizes: Optional[Dict[HostKey, int]] = None,
+        **kwargs,
+    ) -> None:
+        """
+        Initialize the adapter.
+
+        Args:
+            stats (PoolStats): The counters to update.
+            pool_sizes (Optional[Dict[HostKey, int]]): The number of connections
+            kept per host, shared with the owner so it can be changed later.
+            **kwargs: Keyword arguments forwarded to HTTPAdapter.
+        """
+        self.stats = stats
+        self.pool_sizes = {} if pool_sizes is None else pool_sizes
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        """Create the pool manager with connection pools that count new connections."""
+        super().init_poolmanager(*args, **kwargs)
+        stats = self.stats
+
+        class CountingHTTPConnectionPool(HTTPConnectionPool):
+            def _new_conn(self):
+                stats.add_connection()
+                return super()._new_conn()
+
+        class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+            def _new_conn(self):
+                stats.add_connection()
+                return super()._new_conn()
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CountingHTTPConnectionPool,
+            "https": CountingHTTPSConnectionPool,
+        }
+
+    def build_connection_pool_key_attributes(self, request, verify, cert=None):
+        """Select the pool of the host, with its own size if it has one."""
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(
+            request, verify, cert
+        )
+        pool_size = self.pool_sizes.get(
+            get_host_key(
+                host_params["scheme"], host_params["host"], host_params["port"]
+            )
+        )
+        if pool_size is not None:
+            pool_kwargs = {**pool_kwargs, "maxsize": pool_size}
+        return host_params, pool_kwargs
+
+    def send(self, request, **kwargs) -> requests.Response:
+        """Send the request, counting it."""
+        self.stats.add_request()
+        return super().send(request, **kwargs)
+
+
+class ConnectionManager:
+    """
+    Process-wide, thread-safe pool of keep-alive HTTP connections.
+
+    Metadata requests, HEAD probes and downloads share one `requests.Session`,
+    so connections to the same host are reused instead of paying TCP and TLS
+    setup for every job.
+
+    Attributes:
+        session (requests.Session): The shared session.
+        stats (PoolStats): The pool usage counters.
+        pool_connections (int): Number of hosts whose pools are kept.
+        pool_maxsize (int): Number of keep-alive connections kept per host, unless
+        the host needs more.
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10) -> None:
+        """
+        Initialize the ConnectionManager.
+
+        Args:
+            pool_connections (int): Number of hosts whose pools are kept.
+            pool_maxsize (int): Number of keep-alive connections kept per host.
+        """
+        self.stats = PoolStats()
+        self.session = requests.Session()
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.__lock = Lock()
+        self.__pool_sizes: Dict[HostKey, int] = {}
+        for prefix in ("http://", "https://"):
+            self.session.mount(
+                prefix,
+                PooledHTTPAdapter(
+                    self.stats,
+                    self.__pool_sizes,
+                    pool_connections=self.pool_connections,
+                    pool_maxsize=self.pool_maxsize,
+                ),
+            )
+
+    def get_pool_size(self, url: str) -> int:
+        """
+        Get the number of connections kept to the host of a URL.
+
+        Args:
+            url (str): A URL of the host.
+
+        Returns:
+            int: The size of the pool of the host.
+        """
+        parts = urlsplit(url)
+        key = get_host_key(parts.scheme, parts.hostname or "", parts.port)
+        return self.__pool_sizes.get(key, self.pool_maxsize)
+
+    def ensure_pool_size(self, url: str, pool_maxsize: int) -> None:
+        """
+        Grow the number of connections kept to the host of a URL if needed.
+
+        Later requests to the host use a pool of the new size. Requests running
+        on the previous pool are not interrupted and the pools of other hosts
+        are left alone.
+
+        Args:
+            url (str): A URL of the host.
+            pool_maxsize (int): The minimum number of connections kept to the host.
+        """
+        parts = urlsplit(url)
+        key = get_host_key(parts.scheme, parts.hostname or "", parts.port)
+        with self.__lock:
+            if pool_maxsize <= self.__pool_sizes.get(key, self.pool_maxsize):
+                return
+            self.__pool_sizes[key] = pool_maxsize
+
+    def get_proxy(self, url: str) -> Optional[str]:
+        """
+        Get the proxy the shared session sends a request for a URL through.
+
+        Args:
+            url (str): The URL to request.
+
+        Returns:
+            Optional[str]: The proxy URL from the session or the environment,
+            None if the request goes direct.
+        """
+        proxies = dict(self.session.proxies)
+        if self.session.trust_env:
+            for scheme, proxy in get_environ_proxies(url).items():
+                proxies.setdefault(scheme, proxy)
+        return select_proxy(url, proxies)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Send a GET request through the shared session.
+
+        Args:
+            url (str): The URL to request.
+            **kwargs: Keyword arguments forwarded to `requests.Session.get`.
+
+        Returns:
+            requests.Response: The response.
+        """
+        return self.session.get(url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        """
+        Send a HEAD request through the shared session.
+
+        Args:
+            url (str): The URL to request.
+            **kwargs: Keyword arguments forwarded to `requests.Session.head`.
+
+        Returns:
+            requests.Response: The response.
+        """
+        return self.session.head(url, **kwargs)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the pool usage counters.
+
+        Returns:
+            Dict[str, int]: The number of requests, new connections and hits.
+        """
+        return self.stats.as_dict()
+
+
+_connection_manager: Optional[ConnectionManager] = None
+_connection_manager_lock = Lock()
+
+
+def get_connection_manager() -> ConnectionManager:
+    """
+    Retrieves the process-wide connection manager, creating it on first use.
+
+    Returns:
+        ConnectionManager: The shared connection manager.
+    """
+    global _connection_manager
+    with _connection_manager_lock:
+        if _connection_manager is None:
+            _connection_manager = ConnectionManager()
+        return _connection_manager
@@ -0,0 +1,416 @@
+import json, os, queue, socketserver
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from uqload_dl_gui import queueJournal
+from uqload_dl_gui.utils import parse_urls
+
+# item states that never change again
+FINISHED_STATES = (queueJournal.DONE, queueJournal.FAILED, queueJournal.CANCELLED)
+# seconds between two heartbeats of an idle event stream
+HEARTBEAT_INTERVAL = 15
+# largest request body accepted, in bytes
+MAX_BODY_SIZE = 16 * 1024 * 1024
+ACTIONS = ("pause", "resume", "cancel")
+
+
+class EventHub:
+    """
+    Thread-safe fan-out of the download events and latest state of every item.
+
+    Every event is a dict with the name of the event in 'event' and the state
+    of the item: 'id', 'title', 'state', 'bytes_downloaded', 'total_size' and
+    'error'. The latest state of each item is kept for listing; only the last
+    `max_finished` finished items are kept.
+
+    Attributes:
+        max_finished (int): Number of finished items kept for listing.
+    """
+
+    def __init__(self, max_finished: int = 1000) -> None:
+        """
+        Initialize the EventHub.
+
+        Args:
+            max_finished (int): Number of finished items kept for listing.
+        """
+        self.max_finished = max_finished
+        self.__lock = Lock()
+        self.__items: Dict[str, Dict[str, Any]] = {}
+        self.__finished: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.__subscribers: List[queue.Queue] = []
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """
+        Record the state of an item and send the event to every subscriber.
+
+        Args:
+            event (Dict[str, Any]): The event, with at least 'event' and 'id'.
+        """
+        with self.__lock:
+            item_id = event["id"]
+            state = {key: value for key, value in event.items() if key != "event"}
+            previous = self.__items.pop(item_id, None)
+            if previous is None:
+                previous = self.__finished.pop(item_id, {})
+            item = {**previous, **state}
+            if item.get("state") in FINISHED_STATES:
+                self.__finished[item_id] = item
+                while len(self.__finished) > self.max_finished:
+                    self.__finished.popitem(last=False)
+            else:
+                self.__items[item_id] = item
+            subscribers = list(self.__subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                # a slow reader loses its oldest events instead of blocking downloads
+                try:
+                    subscriber.get_nowait()
+                    subscriber.put_nowait(event)
+                except (queue.Empty, queue.Full):
+                    pass
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Get the latest state of every item.
+
+        Returns:
+            List[Dict[str, Any]]: The finished items, then the unfinished ones.
+        """
+        with self.__lock:
+            return [dict(item) for item in self.__finished.values()] + [
+                dict(item) for item in self.__items.values()
+            ]
+
+    def get(self, item_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest state of an item.
+
+        Args:
+            item_id (str): The identifier of the item.
+
+        Returns:
+            Optional[Dict[str, Any]]: The state of the item, None if it is unknown.
+        """
+        with self.__lock:
+            item = self.__items.get(item_id) or self.__finished.get(item_id)
+            return None if item is None else dict(item)
+
+    def subscribe(self, max_size: int = 10000) -> queue.Queue:
+        """
+        Start receiving the events.
+
+        Args:
+            max_size (int): Number of unread events kept for the subscriber.
+
+        Returns:
+            queue.Queue: The queue the events are put in.
+        """
+        subscriber: queue.Queue = queue.Queue(max_size)
+        with self.__lock:
+            self.__subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: queue.Queue) -> None:
+        """
+        Stop receiving the events.
+
+        Args:
+            subscriber (queue.Queue): The queue returned by `subscribe`.
+        """
+        with self.__lock:
+            if subscriber in self.__subscribers:
+                self.__subscribers.remove(subscriber)
+
+
+class ManagerController:
+    """
+    Controller of the control API for a DownloadManager.
+
+    Attributes:
+        manager (DownloadManager): The download queue.
+        events (EventHub): The hub the manager events are published to.
+    """
+
+    def __init__(self, manager: Any, events: EventHub) -> None:
+        """
+        Initialize the ManagerController.
+
+        Args:
+            manager (DownloadManager): The download queue.
+            events (EventHub): The hub the manager events are published to.
+        """
+        self.manager = manager
+        self.events = events
+
+    def enqueue_urls(self, urls: List[str]) -> List[str]:
+        """Queue links and return the identifiers of their items."""
+        return [self.manager.add_url(url).item_id for url in urls]
+
+    def pause_item(self, item_id: str) -> bool:
+        """Pause an item."""
+        return self.manager.pause(item_id)
+
+    def resume_item(self, item_id: str) -> bool:
+        """Resume an item."""
+        return self.manager.resume(item_id)
+
+    def cancel_item(self, item_id: str) -> bool:
+        """Cancel an item."""
+        return self.manager.cancel(item_id)
+
+
+class ControlRequestHandler(BaseHTTPRequestHandler):
+    """Handles the requests of the control API."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "uqload-dl"
+
+    def do_GET(self) -> None:
+        """List the queue, get an item or stream the events."""
+        if not self.__authorized():
+            return
+        path, query = self.__split_path()
+        if path == ["queue"]:
+            self.__send_json(200, {"items": self.server.control.events.snapshot()})
+        elif len(path) == 2 and path[0] == "queue":
+            item = self.server.control.events.get(path[1])
+            if item is None:
+                self.__send_json(404, {"error": "unknown item"})
+            else:
+                self.__send_json(200, item)
+        elif path == ["events"]:
+            self.__stream_events(query)
+        else:
+            self.__send_json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        """Queue links, or pause, resume or cancel an item."""
+        if not self.__authorized():
+            return
+        path, _ = self.__split_path()
+        if path == ["queue"]:
+            self.__enqueue()
+        elif len(path) == 3 and path[0] == "queue" and path[2] in ACTIONS:
+            controller = self.server.control.controller
+            if self.server.control.events.get(path[1]) is None:
+                self.__send_json(404, {"error": "unknown item"})
+            elif getattr(controller, f"{path[2]}_item")(path[1]):
+                self.__send_json(202, {"id": path[1], "action": path[2]})
+            else:
+                self.__send_json(409, {"error": f"cannot {path[2]} the item"})
+        else:
+            self.__send_json(404, {"error": "not found"})
+
+    def __enqueue(self) -> None:
+        """Queue the links of the request body, a JSON list, object or plain text."""
+        size = int(self.headers.get("Content-Length") or 0)
+        if size > MAX_BODY_SIZE:
+            self.close_connection = True
+            self.__send_json(413, {"error": "request body too large"})
+            return
+        body = self.rfile.read(size).decode("utf-8", errors="replace")
+        text = body
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            try:
+                payload = json.loads(body or "null")
+            except ValueError:
+                self.__send_json(400, {"error": "invalid JSON"})
+                return
+            if isinstance(payload, dict):
+                payload = payload.get("urls")
+            if not isinstance(payload, list):
+                self.__send_json(400, {"error": "expected a list of urls"})
+                return
+            text = " ".join(str(url) for url in payload)
+        urls, invalid = parse_urls(text)
+        ids = self.server.control.controller.enqueue_urls(urls) if urls else []
+        self.__send_json(202, {"ids": ids, "invalid": invalid})
+
+    def __stream_events(self, query: Dict[str, List[str]]) -> None:
+        """Stream the events as server-sent events or newline-delimited JSON."""
+        requested = (query.get("format") or [""])[0]
+        sse = requested == "sse" or (
+            requested != "ndjson"
+            and "text/event-stream" in self.headers.get("Accept", "")
+        )
+        events = self.server.control.events
+        subscriber = events.subscribe()
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header(
+            "Content-Type", "text/event-stream" if sse else "application/x-ndjson"
+        )
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        try:
+            self.__write_event({"event": "snapshot", "items": events.snapshot()}, sse)
+            while not self.server.control.stopped:
+                try:
+                    event = subscriber.get(timeout=HEARTBEAT_INTERVAL)
+                except queue.Empty:
+                    if sse:
+                        self.wfile.write(b": heartbeat\n\n")
+                        self.wfile.flush()
+                    else:
+                        self.__write_event({"event": "heartbeat"}, sse)
+                    continue
+                self.__write_event(event, sse)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            events.unsubscribe(subscriber)
+
+    def __write_event(self, event: Dict[str, Any], sse: bool) -> None:
+        """Write a single event of a stream."""
+        data = json.dumps(event)
+        if sse:
+            self.wfile.write(f"event: {event['event']}\ndata: {data}\n\n".encode())
+        else:
+            self.wfile.write(f"{data}\n".encode())
+        self.wfile.flush()
+
+    def __authorized(self) -> bool:
+        """Check the bearer token, if the server has one."""
+        token = self.server.control.token
+        if not token or self.headers.get("Authorization") == f"Bearer {token}":
+            return True
+        self.__send_json(401, {"error": "unauthorized"})
+        return False
+
+    def __split_path(self) -> Tuple[List[str], Dict[str, List[str]]]:
+        """Split the request path into its segments and query."""
+        parts = urlsplit(self.path)
+        return [part for part in parts.path.split("/") if part], parse_qs(parts.query)
+
+    def __send_json(self, status: int, payload: Any) -> None:
+        """Send a JSON response."""
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        """Get the client address, also for Unix sockets."""
+        if isinstance(self.client_address, tuple):
+            return str(self.client_address[0])
+        return "local"
+
+    def log_message(self, *args: Any) -> None:
+        """Do not log every request."""
+
+
+class UnixControlServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Control API server listening on a Unix socket."""
+
+    daemon_threads = True
+
+
+class ControlServer:
+    """
+    Optional local HTTP API to queue and monitor downloads.
+
+    It listens on 127.0.0.1 only, or on a Unix socket, and can require a
+    bearer token. The controller is what the requests act on:
+
+    - `events` (EventHub): the events and latest state of the items.
+    - `enqueue_urls(urls)`: queue normalised links and return their ids.
+    - `pause_item(id)`, `resume_item(id)`, `cancel_item(id)`: return False
+      if the action does not apply to the item.
+
+    Endpoints:
+        GET /queue: the state of every item.
+        GET /queue/<id>: the state of an item.
+        POST /queue: queue the links of a JSON list, a JSON object with 'urls',
+        or text separated by whitespace or commas.
+        POST /queue/<id>/pause, /resume or /cancel: act on an item.
+        GET /events: stream the events as newline-delimited JSON, or as
+        server-sent events with `Accept: text/event-stream` or `?format=sse`.
+
+    Attributes:
+        controller (Any): The controller the requests act on.
+        token (Optional[str]): The bearer token required, if any.
+        stopped (bool): True once the server was stopped.
+    """
+
+    def __init__(
+        self,
+        controller: Any,
+        port: int = 0,
+        host: str = "127.0.0.1",
+        socket_path: Optional[str] = None,
+        token: Optional[str] = None,
+    ) -> None:
+        """
+        Create the server, listening right away.
+
+        Args:
+            controller (Any): The controller the requests act on.
+            port (int): The TCP port, 0 for any free port.
+            host (str): The address to listen on.
+            socket_path (Optional[str]): The path of a Unix socket to listen on
+            instead of TCP.
+            token (Optional[str]): The bearer token to require, if any.
+
+        Raises:
+            OSError: If the address cannot be listened on.
+        """
+        self.controller = controller
+        self.token = token
+        self.stopped = False
+        self.socket_path = socket_path
+        if socket_path is not None:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            self.__server = UnixControlServer(socket_path, ControlRequestHandler)
+        else:
+            self.__server = ThreadingHTTPServer((host, port), ControlRequestHandler)
+            self.__server.daemon_threads = True
+        self.__server.control = self
+        self.__thread: Optional[Thread] = None
+
+    @property
+    def events(self) -> EventHub:
+        """
+        Get the event hub of the controller.
+
+        Returns:
+            EventHub: The events and latest state of the items.
+        """
+        return self.controller.events
+
+    @property
+    def address(self) -> str:
+        """
+        Get the address the server listens on.
+
+        Returns:
+            str: The base URL, or 'unix:' and the path of the socket.
+        """
+        if self.socket_path is not None:
+            return f"unix:{self.socket_path}"
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        """Serve the requests on a background thread."""
+        self.__thread = Thread(
+            target=self.__server.serve_forever, name="control-api", daemon=True
+        )
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """Stop the server and end the event streams."""
+        self.stopped = True
+        if self.__thread is not None:
+            self.__server.shutdown()
+        self.__server.server_close()
+        if self.socket_path is not None and os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
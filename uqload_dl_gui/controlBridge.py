@@ -0,0 +1,186 @@
+from typing import Any, Dict, List, Set, Tuple
+from uuid import uuid4
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from uqload_dl_gui import queueJournal
+from uqload_dl_gui.bulkResolver import BulkResolver
+from uqload_dl_gui.config import get_config
+from uqload_dl_gui.controlApi import EventHub
+from uqload_dl_gui.metadataCache import get_metadata_cache
+
+
+class ControlBridge(QObject):
+    """
+    Controller of the control API for the download page of the GUI.
+
+    The API calls it from its own threads; every call is handed to the GUI
+    thread with a queued signal, so the download page is only touched from
+    there. Queued links get their identifiers right away and are resolved like
+    a bulk import before they are added to the download page.
+
+    Attributes:
+        enqueue_requested (pyqtSignal): Signal emitted with the identifiers and links to queue.
+        action_requested (pyqtSignal): Signal emitted with an action and the identifier of an item.
+        download_page (DownloadPage): The download page the items are added to.
+        events (EventHub): The events and latest state of the items.
+    """
+
+    enqueue_requested = pyqtSignal(object)
+    action_requested = pyqtSignal(str, str)
+
+    def __init__(self, download_page: Any) -> None:
+        """
+        Initialize the ControlBridge in the GUI thread.
+
+        Args:
+            download_page (DownloadPage): The download page the items are added to.
+        """
+        super().__init__()
+        self.download_page = download_page
+        self.events: EventHub = download_page.events
+        self.__resolving: Set[str] = set()
+        self.__cancelled: Set[str] = set()
+        self.__resolvers: Set[BulkResolver] = set()
+        self.enqueue_requested.connect(
+            self.__enqueue, Qt.ConnectionType.QueuedConnection
+        )
+        self.action_requested.connect(self.__act, Qt.ConnectionType.QueuedConnection)
+
+    def enqueue_urls(self, urls: List[str]) -> List[str]:
+        """
+        Queue links from any thread.
+
+        Args:
+            urls (List[str]): The normalised links.
+
+        Returns:
+            List[str]: The identifiers of the new items.
+        """
+        items = [(uuid4().hex, url) for url in urls]
+        for item_id, url in items:
+            self.events.publish(
+                {
+                    "event": "resolving",
+                    "id": item_id,
+                    "url": url,
+                    "title": url,
+                    "state": "resolving",
+                    "bytes_downloaded": 0,
+                    "total_size": 0,
+                    "error": None,
+                }
+            )
+        self.enqueue_requested.emit(items)
+        return [item_id for item_id, _ in items]
+
+    def pause_item(self, item_id: str) -> bool:
+        """Pause an item from any thread."""
+        return self.__request("pause", item_id)
+
+    def resume_item(self, item_id: str) -> bool:
+        """Resume an item from any thread."""
+        return self.__request("resume", item_id)
+
+    def cancel_item(self, item_id: str) -> bool:
+        """Cancel an item from any thread."""
+        return self.__request("cancel", item_id)
+
+    def __request(self, action: str, item_id: str) -> bool:
+        """
+        Hand an action on an item to the GUI thread.
+
+        Args:
+            action (str): 'pause', 'resume' or 'cancel'.
+            item_id (str): The identifier of the item.
+
+        Returns:
+            bool: False if the item is finished, or not queued yet for a pause
+            or resume.
+        """
+        item = self.events.get(item_id)
+        if item is None or item.get("state") in (
+            queueJournal.DONE,
+            queueJournal.FAILED,
+            queueJournal.CANCELLED,
+        ):
+            return False
+        if action != "cancel" and item.get("state") == "resolving":
+            return False
+        self.action_requested.emit(action, item_id)
+        return True
+
+    def __enqueue(self, items: List[Tuple[str, str]]) -> None:
+        """
+        Resolve queued links in the GUI thread.
+
+        Args:
+            items (List[Tuple[str, str]]): The identifiers and links of the items.
+        """
+        settings = get_config()
+        ids = {url: item_id for item_id, url in items}
+        self.__resolving.update(ids.values())
+        resolver = BulkResolver(
+            [url for _, url in items],
+            int(settings.value("resolver_workers")),
+            get_metadata_cache(),
+            settings.value("download_engine") == "asyncio",
+            not settings.value("fast_resolve", type=bool),
+            settings.value("embed_only", type=bool),
+        )
+        # queued, so the results are handled in the GUI thread
+        resolver.url_resolved_signal.connect(
+            lambda url, video_info: self.__on_resolved(ids[url], video_info),
+            Qt.ConnectionType.QueuedConnection,
+        )
+        resolver.failed_signal.connect(
+            lambda url, error: self.__on_failed(ids[url], error),
+            Qt.ConnectionType.QueuedConnection,
+        )
+        resolver.finished_signal.connect(
+            lambda: self.__resolvers.discard(resolver),
+            Qt.ConnectionType.QueuedConnection,
+        )
+        self.__resolvers.add(resolver)
+        resolver.start()
+
+    def __on_resolved(self, item_id: str, video_info: Dict[str, Any]) -> None:
+        """Add a resolved link to the download page, unless it was cancelled."""
+        self.__resolving.discard(item_id)
+        if item_id in self.__cancelled:
+            self.__cancelled.discard(item_id)
+            return
+        self.download_page.enqueue(video_info, item_id)
+
+    def __on_failed(self, item_id: str, error: str) -> None:
+        """Publish that a link could not be resolved, unless it was cancelled."""
+        self.__resolving.discard(item_id)
+        if item_id in self.__cancelled:
+            self.__cancelled.discard(item_id)
+            return
+        self.events.publish(
+            {
+                "event": queueJournal.FAILED,
+                "id": item_id,
+                "state": queueJournal.FAILED,
+                "error": error,
+            }
+        )
+
+    def __act(self, action: str, item_id: str) -> None:
+        """
+        Pause, resume or cancel an item in the GUI thread.
+
+        Args:
+            action (str): 'pause', 'resume' or 'cancel'.
+            item_id (str): The identifier of the item.
+        """
+        if action == "cancel" and item_id in self.__resolving:
+            self.__cancelled.add(item_id)
+            self.events.publish(
+                {
+                    "event": queueJournal.CANCELLED,
+                    "id": item_id,
+                    "state": queueJournal.CANCELLED,
+                }
+            )
+            return
+        getattr(self.download_page, f"{action}_item")(item_id)
@@ -1,29 +1,83 @@
-from PyQt5.QtCore import QThreadPool, QMutex
+import time
+from typing import Any, Callable, Dict, Optional
+from PyQt5.QtCore import QRunnable, QThreadPool, QMutex
+from uqload_dl_gui.atomicCounter import AtomicCounter
+from uqload_dl_gui.taskScheduler import FIFO, NORMAL_PRIORITY, TaskScheduler
+
+
+class TaskRunnable(QRunnable):
+    """
+    QRunnable running a task submitted to the CustomThreadPool, such as a Worker.
+
+    Attributes:
+        task (Any): The task, with a `run` method.
+        finished (bool): True once the task has run.
+    """
+
+    def __init__(
+        self,
+        task: Any,
+        on_finished: Optional[Callable[["TaskRunnable"], None]] = None,
+    ) -> None:
+        """
+        Initialize the TaskRunnable.
+
+        Args:
+            task (Any): The task, with a `run` method.
+            on_finished (Optional[Callable[[TaskRunnable], None]]): Called in the
+            worker thread once the task has run.
+        """
+        super().__init__()
+        # kept alive by the pool until it is pruned, not deleted by Qt
+        self.setAutoDelete(False)
+        self.task = task
+        self.finished = False
+        self.__on_finished = on_finished
+
+    def run(self) -> None:
+        """Run the task."""
+        try:
+            self.task.run()
+        finally:
+            self.finished = True
+            if self.__on_finished is not None:
+                self.__on_finished(self)
 
 
 class CustomThreadPool(QThreadPool):
     """
     Custom thread pool with additional functionality for limiting the number of tasks and threads.
 
+    Submitted tasks wait in a TaskScheduler and are handed to Qt only when a
+    thread is free, so they start by priority, pins and the scheduling policy
+    instead of in submission order. Waiting tasks can still be reordered or
+    taken back with `tryTake`.
+
     Attributes:
         max_size (int): Maximum number of tasks allowed in the thread pool.
-        __current_tasks (int): Number of currently active tasks in the thread pool.
-        __mutex (QMutex): Mutex for thread-safe access to shared resources.
+        __current_tasks (AtomicCounter): Number of currently active tasks in the thread pool.
     """
 
-    def __init__(self, max_workers: int = 2, max_size: int = 5) -> None:
+    def __init__(
+        self, max_workers: int = 2, max_size: int = 5, policy: str = FIFO
+    ) -> None:
         """
         Initialize the CustomThreadPool instance.
 
         Args:
             max_workers (int): Maximum number of worker threads.
             max_size (int): Maximum number of tasks allowed in the thread pool.
+            policy (str): The scheduling policy, 'fifo' or 'shortest_first'.
         """
         super().__init__()
         self.setMaxThreadCount(max_workers)
-        self.setStackSize(max_size)
-        self.__current_tasks = 0
-        self.__mutex = QMutex()
+        self.max_size = int(max_size)
+        self.__current_tasks = AtomicCounter()
+        self.__runnables: Dict[Any, TaskRunnable] = {}
+        self.__scheduler = TaskScheduler(policy)
+        # tasks handed to Qt that have not finished yet
+        self.__running = 0
+        self.__dispatch_mutex = QMutex()
 
     @property
     def current_tasks(self) -> int:
@@ -33,10 +87,7 @@ class CustomThreadPool(QThreadPool):
         Returns:
             int: The number of currently active tasks.
         """
-        self.__mutex.lock()
-        total = self.__current_tasks
-        self.__mutex.unlock()
-        return total
+        return self.__current_tasks.value
 
     @current_tasks.setter
     def current_tasks(self, value) -> None:
@@ -46,21 +97,176 @@ class CustomThreadPool(QThreadPool):
         Args:
             value (int): The new value for the number of currently active tasks.
         """
-        self.__mutex.lock()
-        self.__current_tasks = int(value)
-        self.__mutex.unlock()
+        self.__current_tasks.set(value)
 
-    def submit_task(self, task) -> None:
+    def task_done(self) -> None:
+        """Count a submitted task as finished, freeing its place in the thread pool."""
+        self.__current_tasks.decrement()
+
+    @property
+    def policy(self) -> str:
+        """
+        Get the scheduling policy.
+
+        Returns:
+            str: 'fifo' or 'shortest_first'.
+        """
+        return self.__scheduler.policy
+
+    def submit_task(self, task, priority: int = NORMAL_PRIORITY) -> bool:
         """
         Submit a task to the thread pool if the maximum size has not been reached.
 
         Args:
             task: The task to be submitted to the thread pool.
+            priority (int): The priority of the task, higher runs first.
+
+        Returns:
+            bool: True if the task was accepted, False if the thread pool is full.
+        """
+        if not self.__current_tasks.increment(self.max_size):
+            return False
+        runnable = TaskRunnable(task, self.__on_finished)
+        # __dispatch reads the runnables from the threads of finished tasks
+        self.__dispatch_mutex.lock()
+        try:
+            self.__runnables = {
+                key: item for key, item in self.__runnables.items() if not item.finished
+            }
+            self.__runnables[task] = runnable
+        finally:
+            self.__dispatch_mutex.unlock()
+        self.__scheduler.push(task, priority)
+        self.__dispatch()
+        return True
+
+    def __dispatch(self) -> None:
+        """Start the next scheduled tasks while threads are free."""
+        self.__dispatch_mutex.lock()
+        try:
+            while self.__running < self.maxThreadCount():
+                task = self.__scheduler.pop()
+                if task is None:
+                    break
+                self.__running += 1
+                self.start(self.__runnables[task])
+        finally:
+            self.__dispatch_mutex.unlock()
+
+    def __on_finished(self, runnable: TaskRunnable) -> None:
+        """
+        Free the thread of a finished task and start the next one.
+
+        Args:
+            runnable (TaskRunnable): The finished task.
+        """
+        self.__dispatch_mutex.lock()
+        self.__running -= 1
+        self.__dispatch_mutex.unlock()
+        self.__dispatch()
+
+    def set_priority(self, task: Any, priority: int) -> bool:
+        """
+        Change the priority of a task that has not started yet.
+
+        Args:
+            task (Any): The submitted task.
+            priority (int): The new priority, higher runs first.
+
+        Returns:
+            bool: True if the task was reordered, False if it already started.
+        """
+        return self.__scheduler.set_priority(task, priority)
+
+    def pin(self, task: Any) -> bool:
+        """
+        Make a task that has not started yet the next one to start.
+
+        Args:
+            task (Any): The submitted task.
+
+        Returns:
+            bool: True if the task was pinned, False if it already started.
+        """
+        return self.__scheduler.pin(task)
+
+    def set_policy(self, policy: str) -> None:
+        """
+        Change the scheduling policy of the tasks that have not started yet.
+
+        Args:
+            policy (str): 'fifo' or 'shortest_first'.
+        """
+        self.__scheduler.set_policy(policy)
+
+    def set_limits(self, max_workers: int, max_size: int) -> None:
+        """
+        Change the limits of the thread pool while tasks run.
+
+        Raising `max_workers` starts queued tasks right away. Lowering it lets
+        the running tasks finish, and queued ones wait until fewer than
+        `max_workers` run. Lowering `max_size` only rejects new tasks; the
+        submitted ones are kept.
+
+        Args:
+            max_workers (int): Maximum number of worker threads.
+            max_size (int): Maximum number of tasks allowed in the thread pool.
+        """
+        self.setMaxThreadCount(max(1, int(max_workers)))
+        self.max_size = int(max_size)
+        self.__dispatch()
+
+    def tryTake(self, task: Any) -> bool:
+        """
+        Remove a task that has not started yet.
+
+        Args:
+            task (Any): The submitted task.
+
+        Returns:
+            bool: True if the task was removed, False if it already started.
+        """
+        # __dispatch may start the task meanwhile from the thread of a finished one
+        self.__dispatch_mutex.lock()
+        try:
+            if self.__scheduler.remove(task):
+                self.__runnables.pop(task, None)
+                return True
+            runnable = self.__runnables.get(task)
+            if runnable is None or not super().tryTake(runnable):
+                return False
+            # handed to Qt, but no thread picked it up yet
+            self.__runnables.pop(task, None)
+        finally:
+            self.__dispatch_mutex.unlock()
+        # locks the mutex itself, which is not recursive
+        self.__on_finished(runnable)
+        return True
+
+    def waitForDone(self, msecs: int = -1) -> bool:
+        """
+        Wait until every submitted task has finished, including the scheduled ones.
+
+        Args:
+            msecs (int): The maximum number of milliseconds to wait, -1 for no limit.
+
+        Returns:
+            bool: True if every task finished in time.
         """
-        if self.__current_tasks >= self.stackSize():
-            return
-        self.start(task)
-        self.__current_tasks += 1
+        deadline = None if msecs < 0 else time.monotonic() + msecs / 1000
+        while True:
+            timeout = (
+                -1
+                if deadline is None
+                else max(0, int((deadline - time.monotonic()) * 1000))
+            )
+            if not super().waitForDone(timeout):
+                return False
+            if not len(self.__scheduler):
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            self.__dispatch()
 
     def full(self) -> bool:
         """
@@ -69,7 +275,4 @@ class CustomThreadPool(QThreadPool):
         Returns:
             bool: True if the thread pool is full, False otherwise.
         """
-        self.__mutex.lock()
-        is_full = True if self.__current_tasks >= self.stackSize() else False
-        self.__mutex.unlock()
-        return is_full
+        return self.__current_tasks.value >= self.max_size
@@ -0,0 +1,313 @@
+import os, queue
+from threading import Condition, Event, Lock, Thread
+from typing import Callable, List, Optional, Tuple, Union
+
+# a single coalesced write never exceeds this many bytes or buffers
+BLOCK_SIZE = 8 * 1024 * 1024
+MAX_BLOCK_BUFFERS = 64
+
+
+class MemoryBudget:
+    """
+    Process-wide limit on the bytes waiting to be written to disk.
+
+    Every DiskWriter charges the data it queues to the same budget, so the
+    memory used by write-behind buffers stays bounded no matter how many
+    downloads are running. When the budget is exhausted, producers block
+    until the writers catch up.
+
+    Attributes:
+        limit (int): The maximum number of bytes in flight.
+        used (int): The number of bytes currently in flight.
+    """
+
+    def __init__(self, limit: int) -> None:
+        """
+        Initialize the MemoryBudget.
+
+        Args:
+            limit (int): The maximum number of bytes in flight.
+        """
+        self.limit = max(1, int(limit))
+        self.used = 0
+        self.__condition = Condition()
+
+    def set_limit(self, limit: int) -> None:
+        """
+        Change the maximum number of bytes in flight.
+
+        Args:
+            limit (int): The new limit.
+        """
+        with self.__condition:
+            self.limit = max(1, int(limit))
+            self.__condition.notify_all()
+
+    def acquire(self, size: int, timeout: Optional[float] = None) -> bool:
+        """
+        Reserve bytes from the budget, blocking until they are available.
+
+        A reservation larger than the whole limit is granted once nothing
+        else is in flight.
+
+        Args:
+            size (int): The number of bytes to reserve.
+            timeout (Optional[float]): The maximum number of seconds to wait.
+
+        Returns:
+            bool: True if the bytes were reserved, False on timeout.
+        """
+        with self.__condition:
+            granted = self.__condition.wait_for(
+                lambda: self.used == 0 or self.used + size <= self.limit, timeout
+            )
+            if granted:
+                self.used += size
+            return granted
+
+    def release(self, size: int) -> None:
+        """
+        Return bytes to the budget.
+
+        Args:
+            size (int): The number of bytes to return.
+        """
+        with self.__condition:
+            self.used = max(0, self.used - size)
+            self.__condition.notify_all()
+
+
+_memory_budget: Optional[MemoryBudget] = None
+_memory_budget_lock = Lock()
+
+
+def get_memory_budget() -> MemoryBudget:
+    """
+    Retrieves the process-wide write-behind memory budget.
+
+    Returns:
+        MemoryBudget: The shared memory budget, 64 MB unless changed.
+    """
+    global _memory_budget
+    with _memory_budget_lock:
+        if _memory_budget is None:
+            _memory_budget = MemoryBudget(64 * 1024 * 1024)
+        return _memory_budget
+
+
+def write_at(fd: int, offset: int, buffers: List[Union[bytes, memoryview]]) -> None:
+    """
+    Write buffers sequentially to a file starting at the given offset.
+
+    Args:
+        fd (int): The file descriptor, open for writing.
+        offset (int): The file offset of the first buffer.
+        buffers (List[Union[bytes, memoryview]]): The buffers to write.
+    """
+    views = [memoryview(buffer).cast("B") for buffer in buffers]
+    while len(views):
+        if hasattr(os, "pwritev"):
+            written = os.pwritev(fd, views, offset)
+        else:
+            os.lseek(fd, offset, os.SEEK_SET)
+            written = os.write(fd, views[0])
+        offset += written
+        # drop fully written views, keep the rest of a partial one
+        while len(views) and written >= len(views[0]):
+            written -= len(views[0])
+            views.pop(0)
+        if written:
+            views[0] = views[0][written:]
+
+
+class DiskWriter:
+    """
+    Write-behind writer for a single file.
+
+    Network readers queue chunks with their file offsets and return to the
+    socket immediately, while a dedicated thread writes them to disk.
+    Contiguous chunks are coalesced into large sequential writes. The queue
+    is bounded both per file and by the shared MemoryBudget, so a slow disk
+    slows the readers down instead of growing memory without limit.
+
+    Buffers handed out by `get_buffer` are recycled once their data is written.
+
+    Attributes:
+        path (str): The path of the file being written.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        on_written: Callable[[int, int], None],
+        budget: Optional[MemoryBudget] = None,
+        max_pending: int = 32,
+    ) -> None:
+        """
+        Open the file and start the writer thread.
+
+        Args:
+            path (str): The path of an existing file to write into.
+            on_written (Callable[[int, int], None]): Called from the writer thread
+            with the segment index and the number of bytes written to disk.
+            budget (Optional[MemoryBudget]): The memory budget to charge. Defaults
+            to the process-wide budget.
+            max_pending (int): The maximum number of chunks queued for this file.
+        """
+        self.path = path
+        self.__on_written = on_written
+        self.__budget = get_memory_budget() if budget is None else budget
+        self.__fd = os.open(path, os.O_WRONLY | getattr(os, "O_BINARY", 0))
+        self.__queue = queue.Queue(max_pending)
+        self.__free_buffers: List[bytearray] = []
+        self.__max_free_buffers = max_pending
+        self.__buffers_lock = Lock()
+        self.__error: Optional[BaseException] = None
+        self.__closed = Event()
+        self.__thread = Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def get_buffer(self, size: int) -> memoryview:
+        """
+        Get a writable buffer of the given size, reusing written ones.
+
+        Args:
+            size (int): The number of bytes needed.
+
+        Returns:
+            memoryview: A view of exactly `size` bytes over a pooled buffer.
+        """
+        with self.__buffers_lock:
+            for position, buffer in enumerate(self.__free_buffers):
+                if len(buffer) >= size:
+                    del self.__free_buffers[position]
+                    return memoryview(buffer)[:size]
+        return memoryview(bytearray(size))
+
+    def write(
+        self,
+        index: int,
+        offset: int,
+        data: Union[bytes, memoryview],
+        check: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Queue data to be written at the given offset.
+
+        Blocks while the memory budget or the queue of this file is full.
+
+        Args:
+            index (int): The index of the segment the data belongs to.
+            offset (int): The file offset to write the data at.
+            data (Union[bytes, memoryview]): The data to write. Views over buffers
+            from `get_buffer` must not be modified afterwards.
+            check (Optional[Callable[[], None]]): Called periodically while blocked,
+            may raise to abort the wait.
+
+        Raises:
+            OSError: If a previous write failed.
+        """
+        self.__raise_error()
+        while not self.__budget.acquire(len(data), timeout=0.1):
+            self.__raise_error()
+            if check is not None:
+                check()
+
+        while True:
+            try:
+                self.__queue.put((index, offset, data), timeout=0.1)
+                return
+            except queue.Full:
+                pass
+            try:
+                self.__raise_error()
+                if check is not None:
+                    check()
+            except BaseException:
+                self.__budget.release(len(data))
+                raise
+
+    def close(self) -> None:
+        """
+        Write all queued data, stop the writer thread and close the file.
+
+        Raises:
+            OSError: If any write failed.
+        """
+        if not self.__closed.is_set():
+            self.__closed.set()
+            self.__queue.put(None)
+            self.__thread.join()
+            os.close(self.__fd)
+        self.__raise_error()
+
+    def __raise_error(self) -> None:
+        """Raise the error of the writer thread, if any."""
+        if self.__error is not None:
+            raise self.__error
+
+    def __run(self) -> None:
+        """Write queued chunks until the sentinel is received."""
+        carry = None
+        stop = False
+        while not stop:
+            item = carry if carry is not None else self.__queue.get()
+            carry = None
+            if item is None:
+                return
+
+            # coalesce queued chunks that continue the same region of the file
+            batch = [item]
+            size = len(item[2])
+            while size < BLOCK_SIZE and len(batch) < MAX_BLOCK_BUFFERS:
+                try:
+                    following = self.__queue.get_nowait()
+                except queue.Empty:
+                    break
+                if following is None:
+                    stop = True
+                    break
+                _, last_offset, last_data = batch[-1]
+                if following[1] != last_offset + len(last_data):
+                    carry = following
+                    break
+                batch.append(following)
+                size += len(following[2])
+
+            self.__write_batch(batch)
+
+    def __write_batch(
+        self, batch: List[Tuple[int, int, Union[bytes, memoryview]]]
+    ) -> None:
+        """
+        Write contiguous chunks with as few system calls as possible.
+
+        Args:
+            batch (List[Tuple[int, int, Union[bytes, memoryview]]]): The chunks,
+            ordered by offset without gaps.
+        """
+        size = sum(len(data) for _, _, data in batch)
+        try:
+            if self.__error is None:
+                write_at(self.__fd, batch[0][1], [data for _, _, data in batch])
+                for index, _, data in batch:
+                    self.__on_written(index, len(data))
+        except BaseException as ex:
+            self.__error = ex
+        finally:
+            self.__budget.release(size)
+            self.__recycle(batch)
+
+    def __recycle(self, batch: List[Tuple[int, int, Union[bytes, memoryview]]]) -> None:
+        """
+        Return the buffers of written chunks to the pool.
+
+        Args:
+            batch (List[Tuple[int, int, Union[bytes, memoryview]]]): The written chunks.
+        """
+        with self.__buffers_lock:
+            for _, _, data in batch:
+                if isinstance(data, memoryview) and isinstance(data.obj, bytearray):
+                    if len(self.__free_buffers) < self.__max_free_buffers:
+                        self.__free_buffers.append(data.obj)
+                    data.release()
@@ -0,0 +1,540 @@
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Condition
+from typing import Any, Callable, Dict, List, Optional
+from uuid import uuid4
+from uqload_dl_gui import queueJournal
+from uqload_dl_gui.asyncEngine import AsyncEngine, AsyncWorker
+from uqload_dl_gui.config import get_config
+from uqload_dl_gui.metadataCache import MetadataCache
+from uqload_dl_gui.queueJournal import QueueJournal
+from uqload_dl_gui.signals import DownloadSignals
+from uqload_dl_gui.uqload import UQLoad
+from uqload_dl_gui.utils import validate_uqload_url
+from uqload_dl_gui.worker import Worker, apply_transfer_limits
+
+# state of an item whose link is being resolved
+RESOLVING = "resolving"
+# states after which an item never changes again
+FINISHED_STATES = (queueJournal.DONE, queueJournal.FAILED, queueJournal.CANCELLED)
+
+
+class DownloadItem:
+    """
+    An item of the DownloadManager.
+
+    Attributes:
+        item_id (str): The identifier of the item in the queue journal.
+        page_url (Optional[str]): The UQLoad link, None if the item was queued resolved.
+        video_info (Optional[Dict[str, Any]]): The video information, once resolved.
+        state (str): The state of the item, a queue journal state or RESOLVING.
+        bytes_downloaded (int): The number of bytes downloaded so far.
+        total_size (int): The size of the video, 0 while unknown.
+        error (Optional[str]): The error message of a failed item.
+        destination_path (Optional[str]): The destination chosen by an earlier
+        attempt, so a restored item resumes its partial file.
+    """
+
+    def __init__(
+        self,
+        item_id: str,
+        page_url: Optional[str] = None,
+        video_info: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Initialize the DownloadItem.
+
+        Args:
+            item_id (str): The identifier of the item in the queue journal.
+            page_url (Optional[str]): The UQLoad link to resolve.
+            video_info (Optional[Dict[str, Any]]): The video information, if resolved.
+        """
+        self.item_id = item_id
+        self.page_url = page_url
+        self.video_info = video_info
+        self.state = RESOLVING if video_info is None else queueJournal.QUEUED
+        self.bytes_downloaded = 0
+        self.total_size = int((video_info or {}).get("size") or 0)
+        self.error: Optional[str] = None
+        self.destination_path: Optional[str] = None
+        self.started = False
+        self.stopping = False
+        self.settled = False
+        # resumed before the worker it was paused in stopped
+        self.resuming = False
+
+    @property
+    def title(self) -> str:
+        """
+        Get the title of the item.
+
+        Returns:
+            str: The title of the video, or the link while it is being resolved.
+        """
+        if self.video_info and self.video_info.get("title"):
+            return str(self.video_info["title"])
+        return str(self.page_url or self.item_id)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get a snapshot of the item.
+
+        Returns:
+            Dict[str, Any]: The id, link, title, state, progress and error of the item.
+        """
+        return {
+            "id": self.item_id,
+            "url": self.page_url,
+            "title": self.title,
+            "state": self.state,
+            "bytes_downloaded": self.bytes_downloaded,
+            "total_size": self.total_size,
+            "error": self.error,
+        }
+
+
+class DownloadManager:
+    """
+    Qt-free download queue used by the headless command line.
+
+    Links are resolved on a small thread pool of `resolver_workers` threads
+    and downloaded by Worker on a pool of `concurrent_downloads` threads, or
+    by AsyncWorker on the AsyncEngine. Every state change is recorded in the
+    queue journal, so `restore` resumes the unfinished items of a previous run
+    and the workers resume their partial files. Items restored with their link
+    are resolved again, since the signed video URL may have expired. A paused
+    item holds no worker and no download slot: its download is stopped, keeping
+    the partial file, and it is started again when resumed.
+
+    Attributes:
+        max_workers (int): Maximum number of downloads running at the same time.
+        engine (str): The download engine, 'threads' or 'asyncio'.
+        journal (Optional[QueueJournal]): The queue journal, if any.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        engine: Optional[str] = None,
+        journal: Optional[QueueJournal] = None,
+        cache: Optional[MetadataCache] = None,
+        probe_size: bool = True,
+        embed_only: bool = False,
+        on_event: Optional[Callable[[DownloadItem, str], None]] = None,
+    ) -> None:
+        """
+        Initialize the DownloadManager.
+
+        Args:
+            max_workers (Optional[int]): Maximum number of downloads running at the
+            same time. Defaults to the 'concurrent_downloads' setting.
+            engine (Optional[str]): The download engine. Defaults to the
+            'download_engine' setting.
+            journal (Optional[QueueJournal]): The queue journal to record the items in.
+            cache (Optional[MetadataCache]): The metadata cache to resolve links with.
+            probe_size (bool): True to read the size and type with a HEAD request.
+            embed_only (bool): True to resolve links from the embed page alone.
+            on_event (Optional[Callable[[DownloadItem, str], None]]): Called with an
+            item and the name of what happened to it, from any thread.
+        """
+        settings = get_config()
+        self.max_workers = max(
+            1,
+            int(
+                settings.value("concurrent_downloads")
+                if max_workers is None
+                else max_workers
+            ),
+        )
+        self.engine = str(
+            settings.value("download_engine") if engine is None else engine
+        )
+        apply_transfer_limits(settings)
+        self.journal = journal
+        self.__cache = cache
+        self.__probe_size = probe_size
+        self.__embed_only = embed_only
+        self.__on_event = on_event
+        self.__condition = Condition()
+        self.__items: Dict[str, DownloadItem] = {}
+        self.__workers: Dict[str, Any] = {}
+        self.__futures: Dict[str, Future] = {}
+        self.__resolver = ThreadPoolExecutor(
+            max(1, int(settings.value("resolver_workers"))),
+            thread_name_prefix="resolver",
+        )
+        if self.engine == "asyncio":
+            self.__engine = AsyncEngine(self.max_workers, sys.maxsize)
+            self.__executor = None
+        else:
+            self.__engine = None
+            self.__executor = ThreadPoolExecutor(
+                self.max_workers, thread_name_prefix="download"
+            )
+
+    def add_url(
+        self,
+        url: str,
+        item_id: Optional[str] = None,
+        destination_path: Optional[str] = None,
+    ) -> DownloadItem:
+        """
+        Queue a UQLoad link, resolved before it is downloaded.
+
+        Args:
+            url (str): The UQLoad link.
+            item_id (Optional[str]): The journal identifier of a restored item.
+            destination_path (Optional[str]): The destination of the partial file
+            of a restored item.
+
+        Returns:
+            DownloadItem: The queued item.
+
+        Raises:
+            InvalidUQLoadURL: If the link is not a valid UQLoad URL.
+        """
+        item = DownloadItem(item_id or uuid4().hex, page_url=validate_uqload_url(url))
+        item.destination_path = destination_path
+        if item_id is None and self.journal is not None:
+            self.journal.append(
+                item.item_id, queueJournal.QUEUED, {"page_url": item.page_url}
+            )
+        with self.__condition:
+            self.__items[item.item_id] = item
+        self.__emit(item, queueJournal.QUEUED)
+        self.__resolver.submit(self.__resolve, item)
+        return item
+
+    def add(
+        self, video_info: Dict[str, Any], item_id: Optional[str] = None
+    ) -> DownloadItem:
+        """
+        Queue a resolved video.
+
+        Args:
+            video_info (Dict[str, Any]): Information about the video to be downloaded.
+            item_id (Optional[str]): The journal identifier of a restored item.
+
+        Returns:
+            DownloadItem: The queued item.
+        """
+        item = DownloadItem(
+            item_id or uuid4().hex, video_info.get("page_url"), video_info
+        )
+        if item_id is None and self.journal is not None:
+            self.journal.append(
+                item.item_id,
+                queueJournal.QUEUED,
+                queueJournal.get_journal_info(video_info),
+            )
+        with self.__condition:
+            self.__items[item.item_id] = item
+        self.__emit(item, queueJournal.QUEUED)
+        self.__start(item)
+        return item
+
+    def restore(self) -> List[DownloadItem]:
+        """
+        Queue the unfinished items of the journal.
+
+        Returns:
+            List[DownloadItem]: The restored items.
+        """
+        if self.journal is None:
+            return []
+        restored = []
+        for item_id, video_info, _, _ in self.journal.pending():
+            with self.__condition:
+                if item_id in self.__items:
+                    continue
+            if video_info.get("page_url"):
+                restored.append(
+                    self.add_url(
+                        video_info["page_url"],
+                        item_id,
+                        video_info.get("destination_path"),
+                    )
+                )
+            else:
+                restored.append(self.add(video_info, item_id))
+        return restored
+
+    def items(self) -> List[DownloadItem]:
+        """
+        Get the items, in the order they were queued.
+
+        Returns:
+            List[DownloadItem]: Every item of the manager.
+        """
+        with self.__condition:
+            return list(self.__items.values())
+
+    def get(self, item_id: str) -> Optional[DownloadItem]:
+        """
+        Get an item.
+
+        Args:
+            item_id (str): The identifier of the item.
+
+        Returns:
+            Optional[DownloadItem]: The item, None if it does not exist.
+        """
+        with self.__condition:
+            return self.__items.get(item_id)
+
+    def pause(self, item_id: str) -> bool:
+        """
+        Pause a queued or running download, freeing its slot.
+
+        A running download is stopped, keeping its partial file, and a queued
+        one is dropped from its pool. The item is started again by `resume`.
+
+        Args:
+            item_id (str): The identifier of the item.
+
+        Returns:
+            bool: True if the item was paused.
+        """
+        with self.__condition:
+            item = self.__items.get(item_id)
+            worker = self.__workers.get(item_id)
+            future = self.__futures.get(item_id)
+            if item is None or worker is None or item.state in FINISHED_STATES:
+                return False
+            if item.state == queueJournal.PAUSED:
+                return True
+            item.state = queueJournal.PAUSED
+            stopping = item.resuming
+            item.resuming = False
+        if not stopping:
+            if self.__take(worker, future):
+                self.__forget_worker(item)
+            else:
+                worker.cancel_download()
+        if self.journal is not None:
+            self.journal.append(
+                item_id, queueJournal.PAUSED, offset=item.bytes_downloaded
+            )
+        self.__emit(item, queueJournal.PAUSED)
+        return True
+
+    def resume(self, item_id: str) -> bool:
+        """
+        Start a paused download again.
+
+        Args:
+            item_id (str): The identifier of the item.
+
+        Returns:
+            bool: True if the item was resumed.
+        """
+        with self.__condition:
+            item = self.__items.get(item_id)
+            if item is None or item.state != queueJournal.PAUSED:
+                return False
+            item.state = queueJournal.QUEUED
+            # started once the worker it was paused in releases the partial file
+            item.resuming = item_id in self.__workers
+        if self.journal is not None:
+            self.journal.append(item_id, item.state, offset=item.bytes_downloaded)
+        self.__emit(item, item.state)
+        if not item.resuming:
+            self.__start(item)
+        return True
+
+    def cancel(self, item_id: str) -> bool:
+        """
+        Cancel a download. The partial file is kept.
+
+        Args:
+            item_id (str): The identifier of the item.
+
+        Returns:
+            bool: True if the item was cancelled or is being cancelled.
+        """
+        with self.__condition:
+            item = self.__items.get(item_id)
+            if item is None or item.state in FINISHED_STATES:
+                return False
+            worker = self.__workers.get(item_id)
+            future = self.__futures.get(item_id)
+            # a paused item is stopped, or stopping, already
+            stopped = item.state == queueJournal.PAUSED or item.resuming
+        if worker is None or stopped or self.__take(worker, future):
+            self.__finish(item, queueJournal.CANCELLED)
+        else:
+            worker.cancel_download()
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every item has finished.
+
+        Args:
+            timeout (Optional[float]): The maximum number of seconds to wait, None
+            to wait until every item has finished.
+
+        Returns:
+            bool: True if every item has finished.
+        """
+        with self.__condition:
+            return self.__condition.wait_for(
+                lambda: all(
+                    item.settled or item.stopping for item in self.__items.values()
+                ),
+                timeout,
+            )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop every download so it can be resumed by the next `restore`.
+
+        Every unfinished item is recorded as paused with its byte offset, then
+        running downloads are stopped, keeping their partial files, and queued
+        ones are dropped.
+
+        Args:
+            wait (bool): True to wait until the running downloads have stopped.
+        """
+        with self.__condition:
+            items = [
+                item
+                for item in self.__items.values()
+                if not item.settled and not item.stopping
+            ]
+            for item in items:
+                item.stopping = True
+        for item in items:
+            if self.journal is not None:
+                self.journal.append(
+                    item.item_id, queueJournal.PAUSED, offset=item.bytes_downloaded
+                )
+            with self.__condition:
+                worker = self.__workers.get(item.item_id)
+                future = self.__futures.get(item.item_id)
+            if worker is not None and not self.__take(worker, future):
+                worker.cancel_download()
+        self.__resolver.shutdown(wait=wait, cancel_futures=True)
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=wait, cancel_futures=True)
+        elif wait:
+            self.__engine.waitForDone()
+        with self.__condition:
+            self.__condition.notify_all()
+
+    def __take(self, worker: Any, future: Optional[Future]) -> bool:
+        """Remove a download that has not started yet from its pool."""
+        if future is not None:
+            return future.cancel()
+        return self.__engine is not None and self.__engine.tryTake(worker)
+
+    def __resolve(self, item: DownloadItem) -> None:
+        """Resolve the link of an item on the resolver pool, then start it."""
+        if item.stopping or item.state in FINISHED_STATES:
+            return
+        try:
+            video_info = UQLoad(
+                item.page_url, self.__cache, self.__probe_size, self.__embed_only
+            ).get_info()
+        except Exception as ex:
+            self.__finish(item, queueJournal.FAILED, str(ex))
+            return
+        item.video_info = {**video_info, "page_url": item.page_url}
+        if item.destination_path:
+            item.video_info["destination_path"] = item.destination_path
+        item.total_size = int(item.video_info.get("size") or 0)
+        self.__emit(item, "resolved")
+        self.__start(item)
+
+    def __start(self, item: DownloadItem) -> None:
+        """Create the worker of a resolved item and submit it."""
+        signals = DownloadSignals()
+        worker_class = AsyncWorker if self.__engine is not None else Worker
+        worker = worker_class(item.video_info, item.item_id, signals=signals)
+        signals.download_started.connect(lambda: self.__on_started(item))
+        signals.progress_update.connect(
+            lambda done, total: self.__on_progress(item, done, total)
+        )
+        signals.info_update.connect(item.video_info.update)
+        signals.download_completed.connect(
+            lambda: self.__finish(item, queueJournal.DONE)
+        )
+        signals.download_cancelled.connect(lambda: self.__on_cancelled(item, worker))
+        signals.download_error.connect(
+            lambda error: self.__finish(item, queueJournal.FAILED, error)
+        )
+        with self.__condition:
+            if item.stopping or item.state in FINISHED_STATES:
+                return
+            item.state = queueJournal.QUEUED
+            self.__workers[item.item_id] = worker
+            if self.__executor is not None:
+                self.__futures[item.item_id] = self.__executor.submit(worker.run)
+        if self.__engine is not None:
+            self.__engine.submit_task(worker)
+
+    def __on_started(self, item: DownloadItem) -> None:
+        """Record that the download of an item started."""
+        with self.__condition:
+            item.started = True
+            if item.state == queueJournal.QUEUED:
+                item.state = queueJournal.RUNNING
+        if self.journal is not None and not item.stopping:
+            # with the destination the worker chose, so `restore` resumes it
+            self.journal.append(
+                item.item_id,
+                queueJournal.RUNNING,
+                queueJournal.get_journal_info(item.video_info),
+            )
+        self.__emit(item, "started")
+
+    def __on_cancelled(self, item: DownloadItem, worker: Any) -> None:
+        """Record that the download of an item was cancelled or stopped by `pause`."""
+        with self.__condition:
+            paused = not item.stopping and self.__workers.get(item.item_id) is worker
+            paused = paused and (item.state == queueJournal.PAUSED or item.resuming)
+            if paused:
+                self.__workers.pop(item.item_id, None)
+                self.__futures.pop(item.item_id, None)
+                resuming = item.resuming
+                item.resuming = False
+        if not paused:
+            self.__finish(item, queueJournal.CANCELLED)
+        elif resuming:
+            self.__start(item)
+
+    def __forget_worker(self, item: DownloadItem) -> None:
+        """Drop the worker of an item that will not run."""
+        with self.__condition:
+            self.__workers.pop(item.item_id, None)
+            self.__futures.pop(item.item_id, None)
+
+    def __on_progress(self, item: DownloadItem, done: int, total: int) -> None:
+        """Record the progress of the download of an item."""
+        item.bytes_downloaded = done
+        item.total_size = total
+        self.__emit(item, "progress")
+
+    def __finish(
+        self, item: DownloadItem, state: str, error: Optional[str] = None
+    ) -> None:
+        """Record the final state of an item, unless it was stopped by `shutdown`."""
+        with self.__condition:
+            if item.settled or item.stopping or item.state in FINISHED_STATES:
+                self.__condition.notify_all()
+                return
+            item.state = state
+            item.error = error
+            self.__workers.pop(item.item_id, None)
+            self.__futures.pop(item.item_id, None)
+        if self.journal is not None:
+            self.journal.append(item.item_id, state, offset=item.bytes_downloaded)
+        with self.__condition:
+            item.settled = True
+            self.__condition.notify_all()
+        self.__emit(item, state)
+
+    def __emit(self, item: DownloadItem, event: str) -> None:
+        """Report an event of an item to the `on_event` callback, if any."""
+        if self.__on_event is not None:
+            self.__on_event(item, event)
@@ -26,3 +26,15 @@ class VideoNotFoundError(Exception):
     """Requested video is not found."""
 
     pass
+
+
+class IncompleteDownloadError(Exception):
+    """Fewer bytes than expected were received."""
+
+    pass
+
+
+class InsufficientSpaceError(Exception):
+    """Disk space for a download cannot be reserved."""
+
+    pass
@@ -1,4 +1,9 @@
-import sys
+import time
+
+# measured by --measure-startup, before the Qt and application imports
+STARTED = time.perf_counter()
+
+import argparse, sys
 from typing import NoReturn
 from PyQt5.QtWidgets import QApplication
 from uqload_dl_gui.config import get_config
@@ -6,9 +11,28 @@ from uqload_dl_gui.views.mainWindow import MainWindow
 
 
 def main() -> NoReturn:
+    parser = argparse.ArgumentParser(prog="uqload-dl-gui")
+    parser.add_argument(
+        "--measure-startup",
+        action="store_true",
+        help="report the time to first paint and the slowest imports, then exit",
+    )
+    parser.add_argument("--startup-report", metavar="FILE", help=argparse.SUPPRESS)
+    # the remaining arguments are for Qt
+    args, qt_args = parser.parse_known_args()
+    if args.measure_startup:
+        from uqload_dl_gui.startupTimer import measure_startup, print_startup_report
+
+        print_startup_report(measure_startup())
+        sys.exit(0)
+
     get_config()
-    app = QApplication(sys.argv)
+    app = QApplication(sys.argv[:1] + qt_args)
     main_window = MainWindow()
+    if args.startup_report:
+        from uqload_dl_gui.startupTimer import write_startup_report
+
+        write_startup_report(main_window, args.startup_report, STARTED)
     main_window.show()
     sys.exit(app.exec())
 
@@ -0,0 +1,219 @@
+import json, os, sqlite3, time
+from threading import Lock
+from typing import Any, Dict, Optional
+from uqload_dl_gui.config import get_config, get_data_dir
+
+
+class MetadataCache:
+    """
+    Persistent cache of the information extracted from UQLoad pages.
+
+    Entries are keyed by the 12-character video ID and expire after `ttl`
+    seconds. The signed video URL is only valid for a short time, so it is
+    kept with its own, shorter expiry: once it expires the rest of the entry
+    can still be used and only the URL has to be resolved again. When more
+    than `max_entries` videos are cached, the least recently used are removed.
+
+    Attributes:
+        path (str): The path of the SQLite database.
+        ttl (float): Seconds the video information stays valid.
+        video_url_ttl (float): Seconds the signed video URL stays valid.
+        max_entries (int): Maximum number of cached videos.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 7 * 24 * 3600,
+        video_url_ttl: float = 30 * 60,
+        max_entries: int = 500,
+    ) -> None:
+        """
+        Open (and create if needed) the cache database.
+
+        Args:
+            path (str): The path of the SQLite database.
+            ttl (float): Seconds the video information stays valid.
+            video_url_ttl (float): Seconds the signed video URL stays valid.
+            max_entries (int): Maximum number of cached videos.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.video_url_ttl = video_url_ttl
+        self.max_entries = max(1, int(max_entries))
+        self.__lock = Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS metadata ("
+            "video_id TEXT PRIMARY KEY, "
+            "video_info TEXT NOT NULL, "
+            "created_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL, "
+            "video_url TEXT, "
+            "video_url_expires_at REAL NOT NULL DEFAULT 0)"
+        )
+        self.__connection.execute(
+            "CREATE INDEX IF NOT EXISTS metadata_accessed_at ON metadata (accessed_at)"
+        )
+        self.__connection.commit()
+
+    def get(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached information of a video.
+
+        Args:
+            video_id (str): The 12-character video ID.
+
+        Returns:
+            Optional[Dict[str, Any]]: The video information, without 'video_url'
+            if only the signed URL has expired, or None if nothing valid is cached.
+        """
+        now = time.time()
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT video_info, created_at, video_url, video_url_expires_at "
+                "FROM metadata WHERE video_id = ?",
+                (video_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            video_info, created_at, video_url, video_url_expires_at = row
+            if now - created_at > self.ttl:
+                self.__connection.execute(
+                    "DELETE FROM metadata WHERE video_id = ?", (video_id,)
+                )
+                self.__connection.commit()
+                return None
+            self.__connection.execute(
+                "UPDATE metadata SET accessed_at = ? WHERE video_id = ?",
+                (now, video_id),
+            )
+            self.__connection.commit()
+
+        video_info = json.loads(video_info)
+        if video_url is not None and now < video_url_expires_at:
+            video_info["video_url"] = video_url
+        return video_info
+
+    def put(self, video_id: str, video_info: Dict[str, Any]) -> None:
+        """
+        Cache the information of a video, evicting the least recently used ones.
+
+        Args:
+            video_id (str): The 12-character video ID.
+            video_info (Dict[str, Any]): The video information. Its 'video_url' is
+            stored with the shorter expiry.
+        """
+        now = time.time()
+        video_info = dict(video_info)
+        video_url = video_info.pop("video_url", None)
+        with self.__lock:
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO metadata (video_id, video_info, created_at, "
+                "accessed_at, video_url, video_url_expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    video_id,
+                    json.dumps(video_info),
+                    now,
+                    now,
+                    video_url,
+                    now + self.video_url_ttl if video_url is not None else 0,
+                ),
+            )
+            self.__connection.execute(
+                "DELETE FROM metadata WHERE video_id IN ("
+                "SELECT video_id FROM metadata ORDER BY accessed_at DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self.__connection.commit()
+
+    def put_video_url(self, video_id: str, video_url: str) -> None:
+        """
+        Store a newly resolved signed video URL of a cached video.
+
+        Args:
+            video_id (str): The 12-character video ID.
+            video_url (str): The signed video URL.
+        """
+        now = time.time()
+        with self.__lock:
+            self.__connection.execute(
+                "UPDATE metadata SET video_url = ?, video_url_expires_at = ?, "
+                "accessed_at = ? WHERE video_id = ?",
+                (video_url, now + self.video_url_ttl, now, video_id),
+            )
+            self.__connection.commit()
+
+    def update(self, video_id: str, fields: Dict[str, Any]) -> None:
+        """
+        Add fields to the information of a cached video, keeping its expiry.
+
+        Args:
+            video_id (str): The 12-character video ID.
+            fields (Dict[str, Any]): The fields to add or replace.
+        """
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT video_info FROM metadata WHERE video_id = ?", (video_id,)
+            ).fetchone()
+            if row is None:
+                return
+            video_info = {**json.loads(row[0]), **fields}
+            video_info.pop("video_url", None)
+            self.__connection.execute(
+                "UPDATE metadata SET video_info = ? WHERE video_id = ?",
+                (json.dumps(video_info), video_id),
+            )
+            self.__connection.commit()
+
+    def __len__(self) -> int:
+        """
+        Get the number of cached videos.
+
+        Returns:
+            int: The number of cached videos, including expired ones.
+        """
+        with self.__lock:
+            (count,) = self.__connection.execute(
+                "SELECT COUNT(*) FROM metadata"
+            ).fetchone()
+        return count
+
+    def clear(self) -> None:
+        """Remove every cached video."""
+        with self.__lock:
+            self.__connection.execute("DELETE FROM metadata")
+            self.__connection.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self.__lock:
+            self.__connection.close()
+
+
+_metadata_cache: Optional[MetadataCache] = None
+_metadata_cache_lock = Lock()
+
+
+def get_metadata_cache() -> MetadataCache:
+    """
+    Retrieves the process-wide metadata cache in the application data directory.
+
+    Returns:
+        MetadataCache: The shared cache, configured from the settings.
+    """
+    global _metadata_cache
+    with _metadata_cache_lock:
+        if _metadata_cache is None:
+            settings = get_config()
+            _metadata_cache = MetadataCache(
+                os.path.join(get_data_dir(), "metadata.sqlite3"),
+                float(settings.value("metadata_ttl_s")),
+                float(settings.value("video_url_ttl_s")),
+                int(settings.value("metadata_cache_size")),
+            )
+        return _metadata_cache
@@ -0,0 +1,267 @@
+import re
+from typing import Dict, List, Optional, Pattern, Tuple
+from uqload_dl_gui.exceptions import VideoNotFoundError
+from uqload_dl_gui.utils import remove_special_characters
+
+NOT_FOUND_MARKERS = ("file was deleted", "file not found")
+VIDEO_URL_PATTERN = re.compile(r"https?://.+/v\.mp4")
+IMAGE_URL_PATTERN = re.compile(r"https?://.*?\.jpg")
+TITLE_PATTERN = re.compile(r"title:\s*\"(.*?)\"")
+OPEN_TAG_PATTERN = re.compile(r"<(h1|textarea)")
+RESOLUTION_PATTERN = re.compile(r"\[(\d+x\d+)\, ((\d+:)*\d+)\]")
+# (missing URLs, missing title) -> pattern of the lines worth scanning. The URL
+# trigger starts with "ttp" because the regex engine skips ahead much faster on
+# an uncommon literal prefix than on "h".
+TRIGGER_PATTERNS: Dict[Tuple[bool, bool], Pattern[str]] = {
+    (True, True): re.compile(r"ttps?://|title:"),
+    (True, False): re.compile(r"ttps?://"),
+    (False, True): re.compile(r"title:"),
+}
+
+
+class PageExtractor:
+    """
+    Incremental, single-pass extractor of the video information of UQLoad pages.
+
+    The HTML of the pages is fed in chunks of any size, in page order, and
+    every chunk is scanned once. Precompiled patterns jump straight to the
+    lines that may hold a missing field and to the <h1> and <textarea> tags,
+    so the rest of the markup is never looked at from Python. Once the video
+    URL, image URL, title, <h1> and resolution are found, `done` becomes True
+    and the rest of the pages does not need to be read. Fields are matched
+    line by line, which gives the same first matches as searching the
+    concatenated pages. With `details_only`, only the <h1> and resolution of
+    the video page are looked for, and with `embed_only` only the fields of
+    the embed page.
+
+    Attributes:
+        video_url (Optional[str]): The signed video URL.
+        image_url (Optional[str]): The poster URL.
+        title (Optional[str]): The player title.
+        h1 (Optional[str]): The content of the first <h1> tag.
+        resolution (Optional[str]): The resolution of the first <textarea> that has one.
+        duration (Optional[str]): The duration next to the resolution.
+        not_found (bool): True if the pages say the video does not exist.
+        details_only (bool): True to look for the <h1> and resolution only.
+        embed_only (bool): True to look for the video URL, image URL and title only.
+    """
+
+    def __init__(self, details_only: bool = False, embed_only: bool = False) -> None:
+        """
+        Initialize the PageExtractor.
+
+        Args:
+            details_only (bool): True to look for the <h1> and resolution only.
+            embed_only (bool): True to look for the video URL, image URL and title only.
+        """
+        self.details_only = details_only
+        self.embed_only = embed_only
+        self.video_url: Optional[str] = None
+        self.image_url: Optional[str] = None
+        self.title: Optional[str] = None
+        self.h1: Optional[str] = None
+        self.resolution: Optional[str] = None
+        self.duration: Optional[str] = None
+        self.not_found = False
+        self.__line_parts: List[str] = []
+        self.__block_tag: Optional[str] = None
+        self.__in_open_tag = False
+        self.__block_parts: List[str] = []
+
+    @property
+    def done(self) -> bool:
+        """
+        Check if every field has been found.
+
+        Returns:
+            bool: True if the rest of the pages can be skipped.
+        """
+        if self.details_only:
+            return self.not_found or (
+                self.h1 is not None and self.resolution is not None
+            )
+        if self.not_found:
+            return True
+        embed_done = (
+            self.video_url is not None
+            and self.image_url is not None
+            and self.title is not None
+        )
+        if self.embed_only:
+            return embed_done
+        return embed_done and self.h1 is not None and self.resolution is not None
+
+    def feed(self, text: str) -> bool:
+        """
+        Scan the next chunk of the current page.
+
+        Args:
+            text (str): The next chunk of HTML.
+
+        Returns:
+            bool: True if every field has been found.
+        """
+        end = text.rfind("\n")
+        if end < 0:
+            self.__line_parts.append(text)
+            return self.done
+        self.__line_parts.append(text[: end + 1])
+        lines = "".join(self.__line_parts)
+        self.__line_parts = [text[end + 1 :]]
+        self.__scan(lines)
+        return self.done
+
+    def end_page(self) -> bool:
+        """
+        Scan the end of the current page. The next page starts on a new line.
+
+        Returns:
+            bool: True if every field has been found.
+        """
+        self.__line_parts.append("\n")
+        lines = "".join(self.__line_parts)
+        self.__line_parts = []
+        self.__scan(lines)
+        return self.done
+
+    def get_info(self) -> Dict[str, str]:
+        """
+        Get the extracted video information.
+
+        Returns:
+            Dict[str, str]: The title, video URL and image URL, plus the resolution
+            and duration when available.
+
+        Raises:
+            VideoNotFoundError: If the video is not found in the pages.
+        """
+        if self.__line_parts:
+            self.end_page()
+        if (
+            self.not_found
+            or self.video_url is None
+            or self.image_url is None
+            or self.title is None
+        ):
+            raise VideoNotFoundError("Video not Found")
+
+        video_info = {
+            "title": remove_special_characters(self.title),
+            "video_url": self.video_url,
+            "image_url": self.image_url,
+        }
+        if self.h1 is None:
+            return video_info
+        video_info["title"] = remove_special_characters(" ".join(self.h1.split()))
+        if self.resolution is not None:
+            video_info.update(
+                {"resolution": self.resolution, "duration": self.duration}
+            )
+        return video_info
+
+    def get_details(self) -> Dict[str, str]:
+        """
+        Get the details found in the video page.
+
+        Returns:
+            Dict[str, str]: The <h1> title, resolution and duration that were found.
+
+        Raises:
+            VideoNotFoundError: If the page says the video does not exist.
+        """
+        if self.__line_parts:
+            self.end_page()
+        if self.not_found:
+            raise VideoNotFoundError("Video not Found")
+        details = {}
+        if self.h1 is not None:
+            details["title"] = remove_special_characters(" ".join(self.h1.split()))
+        if self.resolution is not None:
+            details.update({"resolution": self.resolution, "duration": self.duration})
+        return details
+
+    def __scan(self, lines: str) -> None:
+        """Scan complete lines, each ending with a newline."""
+        lowered = lines.lower()
+        if any(marker in lowered for marker in NOT_FOUND_MARKERS):
+            self.not_found = True
+            return
+        if not self.done and not self.details_only:
+            self.__scan_fields(lines)
+        if not self.done:
+            self.__scan_blocks(lines)
+
+    def __scan_fields(self, lines: str) -> None:
+        """Match the missing single-line fields in the lines that may hold them."""
+        position = 0
+        while self.video_url is None or self.image_url is None or self.title is None:
+            match = self.__get_trigger().search(lines, position)
+            if match is None:
+                return
+            start = lines.rfind("\n", 0, match.start()) + 1
+            end = lines.find("\n", match.end())
+            self.__scan_line(lines[start:end])
+            position = end + 1
+
+    def __get_trigger(self) -> Pattern[str]:
+        """Get the pattern of the lines worth scanning for the missing fields."""
+        need_urls = self.video_url is None or self.image_url is None
+        need_title = self.title is None
+        return TRIGGER_PATTERNS[(need_urls, need_title)]
+
+    def __scan_line(self, line: str) -> None:
+        """Match the missing fields in a complete line."""
+        if self.video_url is None:
+            match = VIDEO_URL_PATTERN.search(line)
+            if match:
+                self.video_url = match.group()
+        if self.image_url is None:
+            match = IMAGE_URL_PATTERN.search(line)
+            if match:
+                self.image_url = match.group()
+        if self.title is None:
+            match = TITLE_PATTERN.search(line)
+            if match:
+                self.title = match.group(1)
+
+    def __scan_blocks(self, lines: str) -> None:
+        """Collect the content of <h1> and <textarea> tags, which may span lines."""
+        position = 0
+        while self.h1 is None or self.resolution is None:
+            if self.__block_tag is None:
+                match = OPEN_TAG_PATTERN.search(lines, position)
+                if not match:
+                    return
+                self.__block_tag = match.group(1)
+                self.__in_open_tag = True
+                self.__block_parts.clear()
+                position = match.end()
+
+            if self.__in_open_tag:
+                # the attributes of the opening tag may span lines too
+                end = lines.find(">", position)
+                if end < 0:
+                    return
+                self.__in_open_tag = False
+                position = end + 1
+
+            end = lines.find(f"</{self.__block_tag}>", position)
+            if end < 0:
+                self.__block_parts.append(lines[position:])
+                return
+            self.__block_parts.append(lines[position:end])
+            position = end + len(self.__block_tag) + 3
+            self.__close_block("".join(self.__block_parts))
+
+    def __close_block(self, content: str) -> None:
+        """Match the fields of a complete <h1> or <textarea> tag."""
+        if self.__block_tag == "h1":
+            if self.h1 is None:
+                self.h1 = content
+        elif self.resolution is None:
+            match = RESOLUTION_PATTERN.search(content)
+            if match:
+                self.resolution = match.group(1)
+                self.duration = match.group(2)
+        self.__block_tag = None
+        self.__block_parts.clear()
@@ -0,0 +1,356 @@
+import os, json, errno
+from threading import Lock
+from typing import Dict, List, Mapping, Optional, Set, Tuple, Union
+from urllib.parse import urlsplit
+from uuid import uuid4
+from uqload_dl_gui.exceptions import InsufficientSpaceError
+
+
+class PartFile:
+    """
+    Partial download stored next to its final destination.
+
+    The data is written to `<destination>.part` and a small JSON sidecar
+    (`<destination>.part.json`) records the URL, the expected content length,
+    the validators of the response and how many bytes of every segment have
+    been committed to disk. A later attempt can load the sidecar and continue
+    where the previous one stopped, if the server still sends the same file.
+
+    Attributes:
+        destination_path (str): The final path of the file.
+        part_path (str): The path of the partial data file.
+        meta_path (str): The path of the JSON sidecar.
+        url (str): The URL the data is downloaded from.
+        content_length (int): The expected size of the complete file.
+        etag (str): The strong ETag of the file, empty if the server sent none.
+        last_modified (str): The Last-Modified date of the file, empty if unknown.
+        segments (List[List[int]]): Inclusive [start, end, committed] entries.
+    """
+
+    def __init__(self, destination_path: str) -> None:
+        """
+        Initialize the PartFile for the given destination.
+
+        Args:
+            destination_path (str): The final path of the file.
+        """
+        self.destination_path = destination_path
+        self.part_path = f"{destination_path}.part"
+        self.meta_path = f"{destination_path}.part.json"
+        self.url = ""
+        self.content_length = 0
+        self.etag = ""
+        self.last_modified = ""
+        self.segments: List[List[int]] = []
+        self.__lock = Lock()
+
+    @property
+    def bytes_committed(self) -> int:
+        """
+        Get the number of bytes already written to the partial file.
+
+        Returns:
+            int: The sum of the committed bytes of every segment.
+        """
+        return sum(committed for _, _, committed in self.segments)
+
+    def exists(self) -> bool:
+        """
+        Check if a partial download is present on disk.
+
+        Returns:
+            bool: True if both the partial file and its sidecar exist.
+        """
+        return os.path.isfile(self.part_path) and os.path.isfile(self.meta_path)
+
+    def load(self) -> bool:
+        """
+        Load the sidecar of a previous attempt.
+
+        Returns:
+            bool: True if a valid sidecar was loaded, False otherwise.
+        """
+        if not self.exists():
+            return False
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as file:
+                meta: Dict[str, Union[str, int, list]] = json.load(file)
+            segments = [
+                [int(value) for value in segment] for segment in meta["segments"]
+            ]
+            content_length = int(meta["content_length"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+        if os.path.getsize(self.part_path) < sum(c for _, _, c in segments):
+            return False
+
+        self.url = str(meta.get("url", ""))
+        self.content_length = content_length
+        self.etag = str(meta.get("etag", ""))
+        self.last_modified = str(meta.get("last_modified", ""))
+        self.segments = segments
+        return True
+
+    def matches(
+        self,
+        content_length: int,
+        url: Optional[str] = None,
+        etag: str = "",
+        last_modified: str = "",
+    ) -> bool:
+        """
+        Check if the loaded partial belongs to the file the server sends.
+
+        The sizes must match. The ETag, or else the Last-Modified date, must
+        match when both the sidecar and the response have one; without them
+        the URL paths must match, unless no URL is given.
+
+        Args:
+            content_length (int): The size reported by the server.
+            url (Optional[str]): The URL of the file, None to compare sizes only.
+            etag (str): The strong ETag of the response, empty if it has none.
+            last_modified (str): The Last-Modified date of the response, if any.
+
+        Returns:
+            bool: True if the partial can be continued.
+        """
+        if not (
+            len(self.segments) > 0
+            and self.content_length == content_length
+            and self.segments[-1][1] == content_length - 1
+        ):
+            return False
+        if self.etag and etag:
+            return self.etag == etag
+        if self.last_modified and last_modified:
+            return self.last_modified == last_modified
+        return url is None or urlsplit(url).path == urlsplit(self.url).path
+
+    def create(
+        self,
+        url: str,
+        content_length: int,
+        ranges: List[List[int]],
+        preallocate: bool = False,
+        etag: str = "",
+        last_modified: str = "",
+    ) -> None:
+        """
+        Start a new partial download, discarding any previous data.
+
+        Args:
+            url (str): The URL the data is downloaded from.
+            content_length (int): The expected size of the complete file.
+            ranges (List[List[int]]): Inclusive (start, end) offsets of every segment.
+            preallocate (bool): Reserve the disk space of the whole file up front.
+            etag (str): The strong ETag of the response, empty if it has none.
+            last_modified (str): The Last-Modified date of the response, if any.
+
+        Raises:
+            InsufficientSpaceError: If the disk space cannot be reserved. The
+            partial file is removed.
+        """
+        self.url = url
+        self.content_length = content_length
+        self.etag = etag
+        self.last_modified = last_modified
+        self.segments = [[start, end, 0] for start, end in ranges]
+        with open(self.part_path, "wb") as file:
+            file.truncate(content_length)
+        if preallocate:
+            try:
+                self.preallocate()
+            except InsufficientSpaceError:
+                self.discard()
+                raise
+        self.save()
+
+    def preallocate(self) -> None:
+        """
+        Reserve disk blocks for the whole partial file with `posix_fallocate`.
+
+        Blocks already allocated are kept, so this can be called again when a
+        download is resumed. Nothing is done on platforms or file systems
+        without fallocate support, where the file stays sparse.
+
+        Raises:
+            InsufficientSpaceError: If the space cannot be reserved.
+        """
+        if not hasattr(os, "posix_fallocate") or self.content_length <= 0:
+            return
+        fd = os.open(self.part_path, os.O_WRONLY)
+        try:
+            os.posix_fallocate(fd, 0, self.content_length)
+        except OSError as ex:
+            if ex.errno in (errno.EOPNOTSUPP, errno.ENOSYS):
+                return
+            raise InsufficientSpaceError(
+                f"Cannot reserve {self.content_length} bytes for "
+                f"{os.path.basename(self.destination_path)}: {ex.strerror}"
+            ) from ex
+        finally:
+            os.close(fd)
+
+    def commit(self, index: int, size: int) -> None:
+        """
+        Record bytes flushed to disk by a segment and update the sidecar.
+
+        Args:
+            index (int): The index of the segment.
+            size (int): The number of bytes flushed since the last commit.
+        """
+        if size <= 0:
+            return
+        with self.__lock:
+            self.segments[index][2] += size
+            self.__save()
+
+    def save(self) -> None:
+        """Write the sidecar to disk."""
+        with self.__lock:
+            self.__save()
+
+    def __save(self) -> None:
+        """Atomically replace the sidecar with the current state."""
+        meta = {
+            "url": self.url,
+            "content_length": self.content_length,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "bytes_committed": self.bytes_committed,
+            "segments": self.segments,
+        }
+        tmp_path = f"{self.meta_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(meta, file)
+        os.replace(tmp_path, self.meta_path)
+
+    def finalize(self) -> None:
+        """Atomically move the complete file to its destination and drop the sidecar."""
+        os.replace(self.part_path, self.destination_path)
+        self.remove_meta()
+
+    def remove_meta(self) -> None:
+        """Remove the sidecar if it exists."""
+        try:
+            os.remove(self.meta_path)
+        except FileNotFoundError:
+            pass
+
+    def discard(self) -> None:
+        """Remove the partial file and its sidecar."""
+        for path in (self.part_path, self.meta_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.segments = []
+
+    def remaining(self) -> List[int]:
+        """
+        Get the indexes of the segments that are not complete yet.
+
+        Returns:
+            List[int]: The indexes of the unfinished segments.
+        """
+        return [
+            index
+            for index, (start, end, committed) in enumerate(self.segments)
+            if start + committed <= end
+        ]
+
+
+_active_parts: Set[str] = set()
+_active_parts_lock = Lock()
+
+
+def get_validators(headers: Mapping[str, str]) -> Tuple[str, str]:
+    """
+    Get the headers of a response that identify the version of a file.
+
+    A weak ETag is left out, since it does not promise the same bytes.
+
+    Args:
+        headers (Mapping[str, str]): The headers of the response.
+
+    Returns:
+        Tuple[str, str]: The strong ETag and the Last-Modified date, empty
+        when the response has none.
+    """
+    etag = headers.get("etag", "")
+    if etag.startswith("W/"):
+        etag = ""
+    return etag, headers.get("last-modified", "")
+
+
+def claim_part_file(
+    output_dir: str, filename: str, ext: str, destination_path: Optional[str] = None
+) -> PartFile:
+    """
+    Choose the destination of a new download and mark it as active.
+
+    The destination chosen by an earlier attempt of the same download is
+    reused while it is free, so a partial saved under a unique name is found
+    again. Otherwise a partial download of the same file is resumed, and an
+    existing file or a download that is already running gets a unique name.
+
+    Args:
+        output_dir (str): The directory to save the file in.
+        filename (str): The name of the file without extension.
+        ext (str): The extension of the file, including the dot.
+        destination_path (Optional[str]): The destination of an earlier attempt.
+
+    Returns:
+        PartFile: The partial file of the chosen destination.
+    """
+    with _active_parts_lock:
+        if destination_path:
+            part = PartFile(destination_path)
+            if part.part_path not in _active_parts and (
+                part.exists() or not os.path.isfile(part.destination_path)
+            ):
+                _active_parts.add(part.part_path)
+                return part
+        part = PartFile(os.path.join(output_dir, f"{filename}{ext}"))
+        if part.part_path in _active_parts or (
+            os.path.isfile(part.destination_path) and not part.exists()
+        ):
+            part = PartFile(os.path.join(output_dir, f"{filename}_{uuid4().hex}{ext}"))
+        _active_parts.add(part.part_path)
+    return part
+
+
+def release_part_file(part: PartFile) -> None:
+    """
+    Mark the destination of a download as no longer active.
+
+    Args:
+        part (PartFile): The partial file returned by `claim_part_file`.
+    """
+    with _active_parts_lock:
+        _active_parts.discard(part.part_path)
+
+
+def split_ranges(
+    total_size: int, segments: int, min_segment_size: int
+) -> List[List[int]]:
+    """
+    Split a file into contiguous, inclusive byte ranges.
+
+    Args:
+        total_size (int): The total size of the file.
+        segments (int): The desired number of ranges.
+        min_segment_size (int): Ranges are merged so that none is smaller than this.
+
+    Returns:
+        List[List[int]]: The [start, end] offsets of every range.
+    """
+    segments = max(1, min(segments, total_size // min_segment_size))
+    segment_size = total_size // segments
+    ranges = []
+    for index in range(segments):
+        start = index * segment_size
+        end = total_size - 1 if index == segments - 1 else start + segment_size - 1
+        ranges.append([start, end])
+    return ranges
@@ -0,0 +1,71 @@
+import time
+from typing import Optional, Tuple
+
+
+class ProgressThrottle:
+    """
+    Rate limiter for progress notifications.
+
+    A progress update is let through only when at least `interval` seconds have
+    passed and at least `min_bytes` bytes have been downloaded since the last
+    update that was let through. Setting a limit to 0 disables it. The update
+    that completes the download is always let through.
+
+    Attributes:
+        interval (float): Minimum number of seconds between two updates.
+        min_bytes (int): Minimum number of bytes between two updates.
+    """
+
+    def __init__(self, interval: float = 0.1, min_bytes: int = 0) -> None:
+        """
+        Initialize the ProgressThrottle.
+
+        Args:
+            interval (float): Minimum number of seconds between two updates.
+            min_bytes (int): Minimum number of bytes between two updates.
+        """
+        self.interval = max(0.0, float(interval))
+        self.min_bytes = max(0, int(min_bytes))
+        self.__last_time = 0.0
+        self.__last_bytes: Optional[int] = None
+        self.__pending: Optional[Tuple[int, int]] = None
+
+    def ready(self, bytes_downloaded: int, total: int) -> bool:
+        """
+        Check if a progress update should be emitted.
+
+        Args:
+            bytes_downloaded (int): The number of bytes downloaded so far.
+            total (int): The total size of the file being downloaded.
+
+        Returns:
+            bool: True if the update should be emitted, False if it is coalesced.
+        """
+        now = time.monotonic()
+        # the first update and the final one are never held back
+        if self.__last_bytes is not None and bytes_downloaded < total:
+            if (
+                now - self.__last_time < self.interval
+                or bytes_downloaded - self.__last_bytes < self.min_bytes
+            ):
+                self.__pending = (bytes_downloaded, total)
+                return False
+
+        self.__last_time = now
+        self.__last_bytes = bytes_downloaded
+        self.__pending = None
+        return True
+
+    def flush(self) -> Optional[Tuple[int, int]]:
+        """
+        Get the last coalesced update, if any.
+
+        Returns:
+            Optional[Tuple[int, int]]: The (bytes_downloaded, total) pair that was
+            held back, or None if the last update was already emitted.
+        """
+        pending, self.__pending = self.__pending, None
+        if pending is not None:
+            self.__last_time = time.monotonic()
+            self.__last_bytes = pending[0]
+        return pending
@@ -0,0 +1,22 @@
+from PyQt5.QtCore import pyqtSignal, QObject
+
+
+class Signals(QObject):
+    """
+    Custom signals emitted by the Worker class during different stages of the download process.
+
+    Signals:
+        progress_update: Emitted to update the progress of the download.
+        download_started: Emitted when the download process starts.
+        download_completed: Emitted when the download process is successfully completed.
+        download_cancelled: Emitted when the download process is cancelled by the user.
+        download_error: Emitted when an error occurs during the download process.
+        info_update: Emitted with the size and type of a video resolved without them.
+    """
+
+    progress_update = pyqtSignal(int, int)
+    download_started = pyqtSignal()
+    download_completed = pyqtSignal()
+    download_cancelled = pyqtSignal()
+    download_error = pyqtSignal(str)
+    info_update = pyqtSignal(object)
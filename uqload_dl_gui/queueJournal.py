@@ -0,0 +1,185 @@
+import json, sqlite3, time
+from threading import Lock
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+QUEUED = "queued"
+RUNNING = "running"
+PAUSED = "paused"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# items whose latest state is one of these are resumed on startup
+UNFINISHED_STATES = (QUEUED, RUNNING, PAUSED)
+# unfinished items read from the database at once
+PENDING_BATCH = 256
+
+
+def get_journal_info(video_info: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Get the video information to record for a queued item.
+
+    The signed video URL expires after a while, so it is left out when the
+    item has its UQLoad link in 'page_url'; the link is resolved again when
+    the item is restored.
+
+    Args:
+        video_info (Dict[str, Any]): Information about the video.
+
+    Returns:
+        Dict[str, Any]: The video information to record.
+    """
+    if not video_info.get("page_url"):
+        return video_info
+    return {key: value for key, value in video_info.items() if key != "video_url"}
+
+
+class QueueJournal:
+    """
+    Durable, append-only journal of the download queue.
+
+    Every state change of a queued item is appended as a new row to an SQLite
+    database. The latest row of an item tells whether it still has to be
+    downloaded, so the queue can be rebuilt after a restart or a crash.
+
+    Attributes:
+        path (str): The path of the SQLite database.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Open (and create if needed) the journal database.
+
+        Args:
+            path (str): The path of the SQLite database.
+        """
+        self.path = path
+        self.__lock = Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "item_id TEXT NOT NULL, "
+            "state TEXT NOT NULL, "
+            "video_info TEXT, "
+            "offset INTEGER NOT NULL DEFAULT 0, "
+            "created_at REAL NOT NULL)"
+        )
+        self.__connection.execute(
+            "CREATE INDEX IF NOT EXISTS events_item_id ON events (item_id, id)"
+        )
+        self.__connection.commit()
+
+    def append(
+        self,
+        item_id: str,
+        state: str,
+        video_info: Optional[Dict[str, Any]] = None,
+        offset: int = 0,
+    ) -> None:
+        """
+        Append a state change of an item to the journal.
+
+        Args:
+            item_id (str): The unique identifier of the queued item.
+            state (str): The new state of the item.
+            video_info (Optional[Dict[str, Any]]): The video information, required
+            when the item is queued. A later state change may record it again,
+            with what the download learned, such as its destination.
+            offset (int): The number of bytes downloaded so far.
+        """
+        payload = None if video_info is None else json.dumps(video_info)
+        with self.__lock:
+            self.__connection.execute(
+                "INSERT INTO events (item_id, state, video_info, offset, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (item_id, state, payload, int(offset), time.time()),
+            )
+            self.__connection.commit()
+
+    def append_many(self, item_ids: Iterable[str], state: str) -> None:
+        """
+        Append the same state change of many items in a single transaction.
+
+        Args:
+            item_ids (Iterable[str]): The unique identifiers of the items.
+            state (str): The new state of the items.
+        """
+        created_at = time.time()
+        with self.__lock:
+            self.__connection.executemany(
+                "INSERT INTO events (item_id, state, video_info, offset, created_at) "
+                "VALUES (?, ?, NULL, 0, ?)",
+                ((item_id, state, created_at) for item_id in item_ids),
+            )
+            self.__connection.commit()
+
+    def pending(self) -> List[Tuple[str, Dict[str, Any], str, int]]:
+        """
+        Get the items that have not finished, in the order they were queued.
+
+        Returns:
+            List[Tuple[str, Dict[str, Any], str, int]]: The item id, latest video
+            information, latest state and latest byte offset of every unfinished item.
+        """
+        return list(self.iter_pending())
+
+    def iter_pending(
+        self, batch: int = PENDING_BATCH
+    ) -> Iterator[Tuple[str, Dict[str, Any], str, int]]:
+        """
+        Iterate over the items that have not finished, in the order they were queued.
+
+        Items are read `batch` at a time, so a long queue is never loaded in
+        memory at once.
+
+        Args:
+            batch (int): The number of items read from the database at once.
+
+        Yields:
+            Tuple[str, Dict[str, Any], str, int]: The item id, latest video
+            information, latest state and latest byte offset of an unfinished item.
+        """
+        placeholders = ",".join("?" * len(UNFINISHED_STATES))
+        after = 0
+        while True:
+            with self.__lock:
+                rows = self.__connection.execute(
+                    "SELECT ids.first_id, last.item_id, info.video_info, "
+                    "last.state, last.offset "
+                    "FROM (SELECT item_id, MIN(id) AS first_id, MAX(id) AS last_id, "
+                    "MAX(CASE WHEN video_info IS NOT NULL THEN id END) AS info_id "
+                    "FROM events GROUP BY item_id) AS ids "
+                    "JOIN events AS last ON last.id = ids.last_id "
+                    "JOIN events AS first ON first.id = ids.first_id "
+                    "JOIN events AS info ON info.id = ids.info_id "
+                    "WHERE ids.first_id > ? AND first.video_info IS NOT NULL "
+                    f"AND last.state IN ({placeholders}) "
+                    "ORDER BY ids.first_id LIMIT ?",
+                    (after, *UNFINISHED_STATES, max(1, int(batch))),
+                ).fetchall()
+            for _, item_id, video_info, state, offset in rows:
+                yield item_id, json.loads(video_info), state, offset
+            if len(rows) < batch:
+                return
+            after = rows[-1][0]
+
+    def compact(self) -> None:
+        """Remove every row of the items that already finished."""
+        with self.__lock:
+            self.__connection.execute(
+                "DELETE FROM events WHERE item_id IN ("
+                "SELECT events.item_id FROM events "
+                "JOIN (SELECT item_id, MAX(id) AS last_id FROM events "
+                "GROUP BY item_id) AS ids ON events.id = ids.last_id "
+                f"WHERE events.state NOT IN ({','.join('?' * len(UNFINISHED_STATES))}))",
+                UNFINISHED_STATES,
+            )
+            self.__connection.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self.__lock:
+            self.__connection.close()
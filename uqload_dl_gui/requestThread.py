@@ -1,6 +1,8 @@
-from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+from uqload_dl_gui.asyncEngine import fetch_video_info, get_loop_thread
 from uqload_dl_gui.utils import validate_uqload_url
 from uqload_dl_gui.uqload import UQLoad
+from uqload_dl_gui.metadataCache import get_metadata_cache
 
 
 class RequestThread(QThread):
@@ -21,15 +23,21 @@ class RequestThread(QThread):
     success_signal = pyqtSignal(object)
     error_signal = pyqtSignal(str)
 
-    def __init__(self, url: str) -> None:
+    def __init__(
+        self, url: str, probe_size: bool = True, embed_only: bool = False
+    ) -> None:
         """
         Initialize the RequestThread with the given URL.
 
         Args:
             url (str): The URL for the HTTP request.
+            probe_size (bool): True to read the size and type with a HEAD request.
+            embed_only (bool): True to resolve from the embed page alone.
         """
         super().__init__()
         self.url = validate_uqload_url(url)
+        self.probe_size = probe_size
+        self.embed_only = embed_only
 
     def run(self) -> None:
         """
@@ -39,7 +47,59 @@ class RequestThread(QThread):
         Emits the error_signal with the error message if an exception occurs during the request.
         """
         try:
-            video_info = UQLoad(self.url).get_info()
+            video_info = UQLoad(
+                self.url, get_metadata_cache(), self.probe_size, self.embed_only
+            ).get_info()
+            self.success_signal.emit(video_info)
+        except Exception as ex:
+            self.error_signal.emit(str(ex))
+
+
+class AsyncRequest(QObject):
+    """
+    Fetches the information of a video on the asyncio engine loop.
+
+    Drop-in replacement of RequestThread that does not start a thread per request.
+
+    Attributes:
+        success_signal (pyqtSignal): Signal emitted with the video information.
+        error_signal (pyqtSignal): Signal emitted when an error occurs during the request.
+    """
+
+    success_signal = pyqtSignal(object)
+    error_signal = pyqtSignal(str)
+
+    def __init__(
+        self, url: str, probe_size: bool = True, embed_only: bool = False
+    ) -> None:
+        """
+        Initialize the AsyncRequest with the given URL.
+
+        Args:
+            url (str): The UQLoad URL of the video.
+            probe_size (bool): True to read the size and type with a HEAD request.
+            embed_only (bool): True to resolve from the embed page alone.
+        """
+        super().__init__()
+        self.url = validate_uqload_url(url)
+        self.probe_size = probe_size
+        self.embed_only = embed_only
+
+    def start(self) -> None:
+        """Schedule the request on the engine loop."""
+        get_loop_thread().submit(self.run())
+
+    async def run(self) -> None:
+        """
+        Fetch the video information.
+
+        Emits the success_signal with the video information if the request is successful.
+        Emits the error_signal with the error message if an exception occurs during the request.
+        """
+        try:
+            video_info = await fetch_video_info(
+                self.url, get_metadata_cache(), self.probe_size, self.embed_only
+            )
             self.success_signal.emit(video_info)
         except Exception as ex:
             self.error_signal.emit(str(ex))
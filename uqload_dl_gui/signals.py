@@ -0,0 +1,93 @@
+from threading import Lock
+from typing import Any, Callable, List, Optional
+
+
+class Signal:
+    """
+    Qt-free stand-in for a pyqtSignal.
+
+    Connected callables are called directly, in the thread that emits the
+    signal, so they must be thread-safe. Only the part of the pyqtSignal
+    interface used by the download engine is provided.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the Signal without any connected callable."""
+        self.__lock = Lock()
+        self.__slots: List[Callable[..., Any]] = []
+
+    def connect(self, slot: Callable[..., Any]) -> None:
+        """
+        Connect a callable to the signal.
+
+        Args:
+            slot (Callable[..., Any]): The callable called on every emit.
+        """
+        with self.__lock:
+            self.__slots.append(slot)
+
+    def disconnect(self, slot: Optional[Callable[..., Any]] = None) -> None:
+        """
+        Disconnect a callable, or every callable.
+
+        Args:
+            slot (Optional[Callable[..., Any]]): The callable to disconnect, None for all.
+        """
+        with self.__lock:
+            if slot is None:
+                self.__slots.clear()
+            elif slot in self.__slots:
+                self.__slots.remove(slot)
+
+    def emit(self, *args: Any) -> None:
+        """
+        Call every connected callable with the given arguments.
+
+        Args:
+            *args (Any): The arguments of the signal.
+        """
+        with self.__lock:
+            slots = list(self.__slots)
+        for slot in slots:
+            slot(*args)
+
+
+class DownloadSignals:
+    """
+    Qt-free signals emitted by the workers during a download.
+
+    It has the attributes of the Qt `Signals` of the GUI, so the workers can
+    report to either. Used when PyQt5 is not installed and by the command line.
+
+    Attributes:
+        progress_update (Signal): Emitted with the bytes downloaded and the total size.
+        download_started (Signal): Emitted when the download process starts.
+        download_completed (Signal): Emitted when the download process is successfully completed.
+        download_cancelled (Signal): Emitted when the download process is cancelled by the user.
+        download_error (Signal): Emitted with the message of an error.
+        info_update (Signal): Emitted with the size and type of a video resolved without them.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the signals."""
+        self.progress_update = Signal()
+        self.download_started = Signal()
+        self.download_completed = Signal()
+        self.download_cancelled = Signal()
+        self.download_error = Signal()
+        self.info_update = Signal()
+
+
+def create_download_signals() -> Any:
+    """
+    Create the signals of a worker.
+
+    Returns:
+        Any: The Qt `Signals` when PyQt5 is installed, so the GUI receives them
+        as queued signals in its own thread, otherwise `DownloadSignals`.
+    """
+    try:
+        from uqload_dl_gui.qtSignals import Signals
+    except ImportError:
+        return DownloadSignals()
+    return Signals()
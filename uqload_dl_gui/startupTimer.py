@@ -0,0 +1,143 @@
+import json, os, subprocess, sys, tempfile, time
+from typing import Any, Dict, List, Optional, TextIO
+
+# modules that should only be imported on first use, after the first paint
+DEFERRED_MODULES = (
+    "requests",
+    "http.server",
+    "uqload_dl_gui.views.downloadPage",
+    "uqload_dl_gui.views.settings",
+    "uqload_dl_gui.controlApi",
+    "uqload_dl_gui.uqload",
+)
+
+# seconds to wait for the measured application to paint its window
+MEASURE_TIMEOUT = 60
+
+
+def parse_import_times(output: str) -> List[Dict[str, Any]]:
+    """
+    Parse the report written to stderr by `python -X importtime`.
+
+    Args:
+        output (str): The stderr of the process.
+
+    Returns:
+        List[Dict[str, Any]]: Every imported module, in import order, with its
+        own import time ('self_us') and the time including its own imports
+        ('cumulative_us'), in microseconds.
+    """
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        modules.append(
+            {
+                "module": fields[2].strip(),
+                "self_us": int(fields[0]),
+                "cumulative_us": int(fields[1]),
+            }
+        )
+    return modules
+
+
+def write_startup_report(window: Any, path: str, started: float) -> None:
+    """
+    Write the startup report of the application once its window is painted, then quit.
+
+    The report holds the milliseconds between `started` and the first paint,
+    and which of the `DEFERRED_MODULES` were already imported.
+
+    Args:
+        window (MainWindow): The main window, not shown yet.
+        path (str): The path of the JSON report.
+        started (float): The `time.perf_counter()` when the application started.
+    """
+    from PyQt5.QtWidgets import QApplication
+
+    def on_first_paint() -> None:
+        report = {
+            "first_paint_ms": (time.perf_counter() - started) * 1000,
+            "loaded": {name: name in sys.modules for name in DEFERRED_MODULES},
+        }
+        with open(path, "w") as file:
+            json.dump(report, file)
+        QApplication.quit()
+
+    window.first_paint.connect(on_first_paint)
+
+
+def measure_startup(env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Start the application in a new process and measure its startup.
+
+    The application runs with `-X importtime` and quits once its window is
+    painted for the first time.
+
+    Args:
+        env (Optional[Dict[str, str]]): The environment of the process. Defaults
+        to the environment of this process.
+
+    Raises:
+        RuntimeError: If the application did not write its report.
+
+    Returns:
+        Dict[str, Any]: The milliseconds to first paint ('first_paint_ms'), the
+        `DEFERRED_MODULES` imported before it ('loaded'), the total import time in
+        milliseconds ('import_ms') and every imported module ('imports').
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "startup.json")
+        process = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-m",
+                "uqload_dl_gui.main",
+                "--startup-report",
+                path,
+            ],
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=MEASURE_TIMEOUT,
+        )
+        if not os.path.exists(path):
+            raise RuntimeError(
+                f"The application exited with code {process.returncode} "
+                f"before its first paint:\n{process.stderr[-2000:]}"
+            )
+        with open(path) as file:
+            report = json.load(file)
+    report["imports"] = parse_import_times(process.stderr)
+    report["import_ms"] = sum(item["self_us"] for item in report["imports"]) / 1000
+    return report
+
+
+def print_startup_report(
+    report: Dict[str, Any], top: int = 20, file: TextIO = sys.stdout
+) -> None:
+    """
+    Print the time to first paint and the slowest imports of a startup report.
+
+    Args:
+        report (Dict[str, Any]): The report of `measure_startup`.
+        top (int): The number of modules to list.
+        file (TextIO): The stream to print to.
+    """
+    print(f"time to first paint: {report['first_paint_ms']:8.1f} ms", file=file)
+    print(f"imports:             {report['import_ms']:8.1f} ms", file=file)
+    loaded = [name for name, imported in report["loaded"].items() if imported]
+    print(f"deferred modules loaded: {', '.join(loaded) or 'none'}", file=file)
+    print(f"\n{'self ms':>9} {'cumul. ms':>10}  module", file=file)
+    imports = sorted(report["imports"], key=lambda item: item["self_us"], reverse=True)
+    for item in imports[:top]:
+        print(
+            f"{item['self_us'] / 1000:9.1f} {item['cumulative_us'] / 1000:10.1f}  "
+            f"{item['module']}",
+            file=file,
+        )
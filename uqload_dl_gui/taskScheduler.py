@@ -0,0 +1,262 @@
+import heapq, itertools
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+# scheduling policies
+FIFO = "fifo"
+SHORTEST_FIRST = "shortest_first"
+POLICIES = (FIFO, SHORTEST_FIRST)
+
+# priorities offered by the download page, any int can be used
+LOW_PRIORITY = -1
+NORMAL_PRIORITY = 0
+HIGH_PRIORITY = 1
+
+
+def get_remaining_bytes(task: Any) -> Optional[int]:
+    """
+    Get the number of bytes a download task still has to receive.
+
+    Args:
+        task (Any): The task, a Worker or an AsyncWorker.
+
+    Returns:
+        Optional[int]: The size from `UQLoad.get_info` minus the bytes already
+        downloaded, which include those a previous attempt left in the partial
+        file, None if the size is unknown.
+    """
+    video_info = getattr(task, "video_info", None)
+    if not isinstance(video_info, dict) or not video_info.get("size"):
+        return None
+    try:
+        size = int(video_info["size"])
+    except (TypeError, ValueError):
+        return None
+    return max(0, size - int(getattr(task, "bytes_downloaded", 0) or 0))
+
+
+class TaskScheduler:
+    """
+    Ready queue of the tasks waiting for a free worker.
+
+    Tasks are taken in this order:
+
+    1. Pinned tasks, the most recently pinned first.
+    2. Higher priority first.
+    3. With the 'shortest_first' policy, fewest remaining bytes first; tasks of
+       unknown size come last.
+    4. Submission order.
+
+    Priorities, pins and the policy can change while tasks wait. Replaced heap
+    entries are only marked as removed, so every change costs O(log n). All
+    methods are thread-safe.
+
+    Attributes:
+        policy (str): The scheduling policy, 'fifo' or 'shortest_first'.
+    """
+
+    def __init__(self, policy: str = FIFO) -> None:
+        """
+        Initialize an empty TaskScheduler.
+
+        Args:
+            policy (str): The scheduling policy, 'fifo' or 'shortest_first'.
+
+        Raises:
+            ValueError: If the policy is unknown.
+        """
+        self.policy = self.__validate_policy(policy)
+        self.__lock = Lock()
+        # entry: [sort key, entry number, task, priority, pin]; task is None
+        # once replaced, and the unique entry number keeps tasks from being compared
+        self.__heap: List[List[Any]] = []
+        self.__entries: Dict[Any, List[Any]] = {}
+        self.__sequence: Dict[Any, int] = {}
+        self.__counter = itertools.count()
+        self.__entry_numbers = itertools.count()
+        self.__pins = itertools.count(1)
+
+    def __validate_policy(self, policy: str) -> str:
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {', '.join(POLICIES)}")
+        return policy
+
+    def __key(self, task: Any, priority: int, pin: int) -> Tuple[Any, ...]:
+        """
+        Get the sort key of a task; smaller keys run first.
+
+        Args:
+            task (Any): The task.
+            priority (int): The priority of the task.
+            pin (int): The pin number of the task, 0 if it is not pinned.
+
+        Returns:
+            Tuple[Any, ...]: The sort key.
+        """
+        size_key: float = 0
+        if self.policy == SHORTEST_FIRST:
+            remaining = get_remaining_bytes(task)
+            size_key = float("inf") if remaining is None else remaining
+        return (0 if pin else 1, -pin, -priority, size_key, self.__sequence[task])
+
+    def __add(self, task: Any, priority: int, pin: int) -> None:
+        """
+        Add or replace the heap entry of a task. The lock must be held.
+
+        Args:
+            task (Any): The task.
+            priority (int): The priority of the task.
+            pin (int): The pin number of the task, 0 if it is not pinned.
+        """
+        previous = self.__entries.get(task)
+        if previous is not None:
+            previous[2] = None
+        entry = [
+            self.__key(task, priority, pin),
+            next(self.__entry_numbers),
+            task,
+            priority,
+            pin,
+        ]
+        self.__entries[task] = entry
+        heapq.heappush(self.__heap, entry)
+        if len(self.__heap) > 2 * len(self.__entries) + 16:
+            # mostly replaced entries, keep the heap proportional to the queue
+            self.__heap = list(self.__entries.values())
+            heapq.heapify(self.__heap)
+
+    def __discard_removed(self) -> None:
+        """Drop the replaced entries from the top of the heap. The lock must be held."""
+        while self.__heap and self.__heap[0][2] is None:
+            heapq.heappop(self.__heap)
+
+    def push(self, task: Any, priority: int = NORMAL_PRIORITY) -> None:
+        """
+        Add a task to the queue, or change its priority if it is already queued.
+
+        Args:
+            task (Any): The task.
+            priority (int): The priority of the task, higher runs first.
+        """
+        with self.__lock:
+            self.__sequence.setdefault(task, next(self.__counter))
+            self.__add(task, int(priority), 0)
+
+    def pop(self) -> Optional[Any]:
+        """
+        Take the next task to run.
+
+        Returns:
+            Optional[Any]: The task, None if the queue is empty.
+        """
+        with self.__lock:
+            self.__discard_removed()
+            if not self.__heap:
+                return None
+            task = heapq.heappop(self.__heap)[2]
+            del self.__entries[task]
+            del self.__sequence[task]
+            return task
+
+    def peek(self) -> Optional[Any]:
+        """
+        Get the next task to run without taking it.
+
+        Returns:
+            Optional[Any]: The task, None if the queue is empty.
+        """
+        with self.__lock:
+            self.__discard_removed()
+            return self.__heap[0][2] if self.__heap else None
+
+    def remove(self, task: Any) -> bool:
+        """
+        Remove a task from the queue.
+
+        Args:
+            task (Any): The task.
+
+        Returns:
+            bool: True if the task was queued.
+        """
+        with self.__lock:
+            entry = self.__entries.pop(task, None)
+            if entry is None:
+                return False
+            entry[2] = None
+            del self.__sequence[task]
+            return True
+
+    def set_priority(self, task: Any, priority: int) -> bool:
+        """
+        Change the priority of a queued task, keeping its pin.
+
+        Args:
+            task (Any): The task.
+            priority (int): The new priority, higher runs first.
+
+        Returns:
+            bool: True if the task is queued.
+        """
+        with self.__lock:
+            entry = self.__entries.get(task)
+            if entry is None:
+                return False
+            self.__add(task, int(priority), entry[4])
+            return True
+
+    def pin(self, task: Any) -> bool:
+        """
+        Make a queued task the next one to run.
+
+        Args:
+            task (Any): The task.
+
+        Returns:
+            bool: True if the task is queued.
+        """
+        with self.__lock:
+            entry = self.__entries.get(task)
+            if entry is None:
+                return False
+            self.__add(task, entry[3], next(self.__pins))
+            return True
+
+    def priority(self, task: Any) -> Optional[int]:
+        """
+        Get the priority of a queued task.
+
+        Args:
+            task (Any): The task.
+
+        Returns:
+            Optional[int]: The priority, None if the task is not queued.
+        """
+        with self.__lock:
+            entry = self.__entries.get(task)
+            return None if entry is None else entry[3]
+
+    def set_policy(self, policy: str) -> None:
+        """
+        Change the scheduling policy and reorder the queued tasks.
+
+        Args:
+            policy (str): The scheduling policy, 'fifo' or 'shortest_first'.
+
+        Raises:
+            ValueError: If the policy is unknown.
+        """
+        with self.__lock:
+            self.policy = self.__validate_policy(policy)
+            for entry in self.__entries.values():
+                entry[0] = self.__key(entry[2], entry[3], entry[4])
+            self.__heap = list(self.__entries.values())
+            heapq.heapify(self.__heap)
+
+    def __contains__(self, task: Any) -> bool:
+        with self.__lock:
+            return task in self.__entries
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__entries)
@@ -1,10 +1,18 @@
-import re
-from typing import Dict, List, Union
+from typing import Any, Dict, List, Optional, Union
 from urllib.parse import urlparse
 from requests import Response
 from uqload_dl_gui.concurrentRequester import ConcurrentRequester
-from uqload_dl_gui.exceptions import VideoNotFoundError
-from uqload_dl_gui.utils import validate_uqload_url, remove_special_characters
+from uqload_dl_gui.connectionManager import get_connection_manager
+from uqload_dl_gui.exceptions import Non200StatusCodeError, VideoNotFoundError
+from uqload_dl_gui.metadataCache import MetadataCache
+from uqload_dl_gui.pageExtractor import PageExtractor
+from uqload_dl_gui.utils import validate_uqload_url, get_video_id
+from uqload_dl_gui.worker import USER_AGENT
+
+# seconds to wait for the pages, including the time queued behind other requests
+RESPONSES_TIMEOUT = 60
+# characters of a page decoded and scanned at a time
+PAGE_CHUNK_SIZE = 16 * 1024
 
 
 class UQLoad:
@@ -14,22 +22,99 @@ class UQLoad:
     This class retrieves video information including title, video URL, image URL, size, type, resolution, and duration
     from a UQLoad URL.
 
+    When a metadata cache is given, cached information is returned without any
+    request, and only the signed video URL is resolved again once it expires.
+    Without `probe_size` the HEAD request is skipped and the size and type are
+    left for the download response or `probe_video` to fill in. With
+    `embed_only` only the embed page is fetched, and the <h1> title, resolution
+    and duration of the video page are left for `get_details`.
+
     Attributes:
         url (str): The UQLoad URL from which to extract video information.
+        video_id (str): The 12-character ID of the video.
+        cache (Optional[MetadataCache]): The metadata cache to use, if any.
+        probe_size (bool): True to read the size and type with a HEAD request.
+        embed_only (bool): True to resolve from the embed page alone.
 
     Raises:
         InvalidUQLoadURL: If the provided URL is not a valid UQLoad URL.
     """
 
-    def __init__(self, url: str) -> None:
+    def __init__(
+        self,
+        url: str,
+        cache: Optional[MetadataCache] = None,
+        probe_size: bool = True,
+        embed_only: bool = False,
+    ) -> None:
         """
         Initialize the UQLoad instance with the provided URL.
 
         Args:
             url (str): The UQLoad URL from which to extract video information.
+            cache (Optional[MetadataCache]): The metadata cache to use, if any.
+            probe_size (bool): True to read the size and type with a HEAD request.
+            embed_only (bool): True to resolve from the embed page alone.
         """
         self.__video_info = {}
         self.url = validate_uqload_url(url)
+        self.video_id = get_video_id(self.url)
+        self.cache = cache
+        self.probe_size = probe_size
+        self.embed_only = embed_only
+
+    def get_page_urls(self) -> List[str]:
+        """
+        Get the URLs of the pages the video information is extracted from.
+
+        Returns:
+            List[str]: The embed page URL and, unless `embed_only`, the video page URL.
+        """
+        if self.embed_only:
+            return [self.url]
+        return [self.url, self.get_video_page_url()]
+
+    def get_video_page_url(self) -> str:
+        """
+        Get the URL of the video page, which has the <h1> title and the resolution.
+
+        Returns:
+            str: The URL of the non-embed page.
+        """
+        return self.url.replace("embed-", "")
+
+    def get_details(self) -> Dict[str, str]:
+        """
+        Fetch the details that an embed-only resolve skipped.
+
+        Only the video page is requested, and reading stops once the <h1> and the
+        resolution are found. The details are added to the cached entry, if any.
+
+        Returns:
+            Dict[str, str]: The <h1> title, resolution and duration that were found.
+
+        Raises:
+            Non200StatusCodeError: If the video page cannot be fetched.
+            VideoNotFoundError: If the page says the video does not exist.
+        """
+        response = get_connection_manager().get(
+            self.get_video_page_url(),
+            headers={"User-Agent": USER_AGENT},
+            timeout=20,
+            stream=True,
+        )
+        if response.status_code != 200:
+            response.close()
+            raise Non200StatusCodeError(
+                f"Unexpected status code: {response.status_code}"
+            )
+        extractor = PageExtractor(details_only=True)
+        self.read_responses([response], extractor)
+        details = extractor.get_details()
+        if self.cache is not None and details:
+            self.cache.update(self.video_id, details)
+        self.__video_info.update(details)
+        return details
 
     def get_responses(self) -> List[Union[Response, None]]:
         """
@@ -41,11 +126,15 @@ class UQLoad:
         Raises:
             Exception: If None is found in responses.
         """
-        urls = [self.url, self.url.replace("embed-", "")]
-        self.concurrent_requester = ConcurrentRequester(urls)
-        responses = self.concurrent_requester.run_concurrent_requests()
+        self.concurrent_requester = ConcurrentRequester(
+            self.get_page_urls(), stream=True
+        )
+        responses = self.concurrent_requester.run_concurrent_requests(RESPONSES_TIMEOUT)
 
         if None in responses:
+            for response in responses:
+                if response is not None:
+                    response.close()
             raise Exception("None in responses")
         return responses
 
@@ -63,9 +152,7 @@ class UQLoad:
         return self.concurrent_requester.session.head(
             url=video_url,
             headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/124.0.0.0 Safari/537.36",
+                "User-Agent": USER_AGENT,
                 "Referer": f"{parsed_url.scheme}://{parsed_url.netloc}",
             },
             timeout=20,
@@ -82,6 +169,10 @@ class UQLoad:
         Raises:
             VideoNotFoundError: If the video is not found in the UQLoad URL.
         """
+        cached_info = self.get_cached_info()
+        if cached_info is not None and "video_url" in cached_info:
+            self.__video_info.update(cached_info)
+            return self.__video_info
 
         responses = self.get_responses()
 
@@ -89,50 +180,159 @@ class UQLoad:
             print("None in responses")
             raise
 
-        concatenated_response = f"{responses[0].text}\n{responses[1].text}"
-
-        if (
-            concatenated_response.lower().find("file was deleted") > -1
-            or concatenated_response.lower().find("file not found") > -1
-        ):
-            raise VideoNotFoundError("Video not Found")
-
-        video_url = re.search(r"https?://.+/v\.mp4", concatenated_response).group()
-        img_url = re.search(r"https?://.*?\.jpg", concatenated_response).group()
-        title = re.search(r"title:\s*\"(.*?)\"", concatenated_response).group(1)
-
-        response_head = self.request_head(video_url)
-        content_length = int(response_head.headers.get("content-length", 0))
-        content_type = response_head.headers.get("content-type")
-
-        self.__video_info.update(
-            {
-                "title": remove_special_characters(title),
-                "video_url": video_url,
-                "image_url": img_url,
-                "size": content_length,
-                "type": content_type,
-            }
-        )
+        video_info = self.parse_responses(responses)
 
-        h1_tag = re.findall(r"<h1[^>]*>(.*?)</h1>", concatenated_response, re.DOTALL)
-        if not len(h1_tag):
-            return self.__video_info
-        self.__video_info.update(
-            {"title": remove_special_characters(" ".join(str(h1_tag[0]).split()))}
-        )
+        if cached_info is None and self.probe_size:
+            response_head = self.request_head(video_info["video_url"])
+            video_info.update(
+                {
+                    "size": int(response_head.headers.get("content-length", 0)),
+                    "type": response_head.headers.get("content-type"),
+                }
+            )
+        elif cached_info is not None:
+            video_info = {**cached_info, "video_url": video_info["video_url"]}
+        self.cache_info(video_info, cached_info is not None)
+        self.__video_info.update(video_info)
+        return self.__video_info
 
-        textarea = re.findall(
-            r"<textarea[^>]*>(.*?)</textarea>", concatenated_response, re.DOTALL
-        )
+    def get_cached_info(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached information of the video.
+
+        Returns:
+            Optional[Dict[str, Any]]: The cached information, without 'video_url' if
+            only the signed URL expired, or None if there is no cache or no valid entry.
+        """
+        if self.cache is None:
+            return None
+        return self.cache.get(self.video_id)
+
+    def cache_info(self, video_info: Dict[str, Any], only_video_url: bool) -> None:
+        """
+        Store the resolved information of the video in the cache, if any.
 
-        resolution_pattern = r"\[(\d+x\d+)\, ((\d+:)*\d+)\]"
-        for element in textarea:
-            matches = re.search(resolution_pattern, element)
-            if matches:
-                self.__video_info.update(
-                    {"resolution": matches.group(1), "duration": matches.group(2)}
-                )
+        Args:
+            video_info (Dict[str, Any]): The video information.
+            only_video_url (bool): True if the rest of the information was already
+            cached and only the signed URL was resolved again.
+        """
+        if self.cache is None:
+            return
+        if only_video_url:
+            self.cache.put_video_url(self.video_id, video_info["video_url"])
+        else:
+            self.cache.put(self.video_id, video_info)
+
+    def parse_pages(self, pages: List[str]) -> Dict[str, str]:
+        """
+        Extract the video information found in the HTML of the pages.
+
+        Args:
+            pages (List[str]): The HTML of the embed page and the video page.
+
+        Returns:
+            dict: The title, video URL and image URL, plus the resolution and
+                  duration when available.
+
+        Raises:
+            VideoNotFoundError: If the video is not found in the pages.
+        """
+        extractor = PageExtractor(embed_only=self.embed_only)
+        for page in pages:
+            if extractor.feed(page) or extractor.end_page():
                 break
+        return extractor.get_info()
 
-        return self.__video_info
+    def parse_responses(self, responses: List[Response]) -> Dict[str, str]:
+        """
+        Extract the video information while reading the pages.
+
+        The bodies are decoded and scanned chunk by chunk, and reading stops as
+        soon as every field is found. The responses are closed afterwards.
+
+        Args:
+            responses (List[Response]): The responses of the embed page and the video page.
+
+        Returns:
+            dict: The same information as `parse_pages`.
+
+        Raises:
+            VideoNotFoundError: If the video is not found in the pages.
+        """
+        extractor = PageExtractor(embed_only=self.embed_only)
+        self.read_responses(responses, extractor)
+        return extractor.get_info()
+
+    def read_responses(
+        self, responses: List[Response], extractor: PageExtractor
+    ) -> None:
+        """
+        Feed the pages to an extractor while reading them, then close the responses.
+
+        Args:
+            responses (List[Response]): The responses of the pages, in order.
+            extractor (PageExtractor): The extractor to feed.
+        """
+        try:
+            for response in responses:
+                if response.raw is None:
+                    # built in memory, there is nothing to stream
+                    chunks = [response.text]
+                else:
+                    if response.encoding is None:
+                        response.encoding = "utf-8"
+                    chunks = response.iter_content(PAGE_CHUNK_SIZE, decode_unicode=True)
+                for chunk in chunks:
+                    if extractor.feed(chunk):
+                        break
+                if extractor.end_page():
+                    break
+        finally:
+            for response in responses:
+                response.close()
+
+
+def probe_video(video_url: str, timeout: float = 20) -> Dict[str, Any]:
+    """
+    Read the size and type of a video with a one-byte Range request.
+
+    The one-byte body is read to the end, so the keep-alive connection goes
+    back to the shared pool and the download that follows reuses it.
+
+    Args:
+        video_url (str): The signed video URL.
+        timeout (float): The timeout of the request in seconds.
+
+    Returns:
+        Dict[str, Any]: The 'size' and 'type' of the video.
+
+    Raises:
+        Non200StatusCodeError: If the server answers with another status than 200 or 206.
+    """
+    parsed_url = urlparse(video_url)
+    with get_connection_manager().get(
+        video_url,
+        headers={
+            "User-Agent": USER_AGENT,
+            "Referer": f"{parsed_url.scheme}://{parsed_url.netloc}",
+            "Range": "bytes=0-0",
+        },
+        timeout=timeout,
+        stream=True,
+    ) as response:
+        if response.status_code == 206:
+            # Content-Range: bytes 0-0/<size>
+            size = response.headers.get("content-range", "").rpartition("/")[2]
+            response.content
+        elif response.status_code == 200:
+            # the range was ignored: the body is the whole video, do not read it
+            size = response.headers.get("content-length", "")
+        else:
+            raise Non200StatusCodeError(
+                f"Unexpected status code: {response.status_code}"
+            )
+        return {
+            "size": int(size) if size.isdigit() else 0,
+            "type": response.headers.get("content-type"),
+        }
@@ -1,4 +1,5 @@
 import re, math
+from typing import List, Optional, Set, Tuple
 from uqload_dl_gui.exceptions import InvalidUQLoadURL
 
 
@@ -87,6 +88,57 @@ def validate_uqload_url(url: str) -> str:
     return full_url
 
 
+def get_video_id(url: str) -> str:
+    """
+    Extract the video ID from a UQLoad URL.
+
+    Args:
+        url (str): A UQLoad URL, as returned by `validate_uqload_url`.
+
+    Returns:
+        str: The 12-character video ID.
+
+    Raises:
+        InvalidUQLoadURL: If the URL does not contain a video ID.
+    """
+    matches = re.search(r"([a-zA-Z0-9]{12})\.html$", url or "")
+    if matches is None:
+        raise InvalidUQLoadURL("Invalid Uqload URL. Please try again.")
+    return matches.group(1)
+
+
+def parse_urls(text: str) -> Tuple[List[str], int]:
+    """
+    Extract the UQLoad links of a pasted text or file.
+
+    Links may be separated by whitespace or commas. Every link is normalised
+    with `validate_uqload_url` and links to the same video are kept once.
+
+    Args:
+        text (str): The text containing the links.
+
+    Returns:
+        Tuple[List[str], int]: The normalised links in their original order and
+        the number of entries that are not valid UQLoad links.
+    """
+    urls: List[str] = []
+    seen: Set[str] = set()
+    invalid = 0
+    for entry in re.split(r"[\s,]+", text or ""):
+        if not entry:
+            continue
+        try:
+            url = validate_uqload_url(entry)
+        except InvalidUQLoadURL:
+            invalid += 1
+            continue
+        video_id = get_video_id(url)
+        if video_id not in seen:
+            seen.add(video_id)
+            urls.append(url)
+    return urls, invalid
+
+
 def remove_special_characters(input_string: str) -> str:
     """
     Removes special characters from a string.
@@ -128,3 +180,27 @@ def convert_size(size_bytes: int) -> str:
     base = 1024**size_index
     human_readable_size = round(size_bytes / base, 2)
     return f"{human_readable_size} {size_units[size_index]}"
+
+
+def format_video_size(size_bytes: Optional[int]) -> str:
+    """Formats the size of a video, which may not be known yet.
+
+    Args:
+        size_bytes (Optional[int]): The size of the video in bytes, 0 or None if unknown.
+
+    Returns:
+        str: The human-readable size, or "..." while the size is unknown.
+    """
+    return convert_size(int(size_bytes)) if size_bytes else "..."
+
+
+def format_video_type(content_type: Optional[str]) -> str:
+    """Formats the content type of a video, which may not be known yet.
+
+    Args:
+        content_type (Optional[str]): The content type, e.g. "video/mp4".
+
+    Returns:
+        str: The subtype, e.g. "mp4", or "..." while the type is unknown.
+    """
+    return content_type.split("/")[-1] if content_type else "..."
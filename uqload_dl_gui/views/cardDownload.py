@@ -1,8 +1,7 @@
-from pathlib import Path
-from typing import Dict
+from typing import Any, Dict
 from uuid import uuid4
-from uqload_dl_gui.utils import convert_size
-from PyQt5.QtGui import QIcon, QFont, QFontDatabase
+from uqload_dl_gui.assetRegistry import get_font, get_icon, get_stylesheet, get_svg_data
+from uqload_dl_gui.utils import convert_size, format_video_size, format_video_type
 from PyQt5.QtCore import pyqtSignal, Qt
 from PyQt5.QtSvg import QSvgWidget
 from PyQt5.QtWidgets import (
@@ -15,8 +14,6 @@ from PyQt5.QtWidgets import (
     QFrame,
 )
 
-PARENT_PATH = Path(__file__).parent.parent
-
 
 class Card(QFrame):
     """
@@ -47,14 +44,13 @@ class Card(QFrame):
         """Initialize the user interface of the widget."""
 
         self.setObjectName("card")
-        self.setStyleSheet((PARENT_PATH / "assets/styles/cardDownload.qss").read_text())
+        self.setStyleSheet(get_stylesheet("cardDownload"))
 
-        font_path = str(PARENT_PATH / "assets/fonts/nunito-font/Nunito-Regular.ttf")
-        font_id = QFontDatabase.addApplicationFont(font_path)
-        font_family = QFontDatabase.applicationFontFamilies(font_id)[0]
+        font = get_font()
 
-        self.total_size = convert_size(self.video.get("size", 0))  # -> str
-        thumbnail = QSvgWidget(str(PARENT_PATH / "assets/icons/video-solid.svg"))
+        self.total_size = format_video_size(self.video.get("size"))  # -> str
+        thumbnail = QSvgWidget()
+        thumbnail.load(get_svg_data("video-solid.svg"))
         thumbnail.setFixedSize(26, 26)
         thumbnail.renderer().setAspectRatioMode(Qt.AspectRatioMode.KeepAspectRatio)
 
@@ -67,17 +63,17 @@ class Card(QFrame):
 
         self.title_label = QLabel(f"{self.video.get('title',uuid4().hex)}")
         self.title_label.setObjectName("title")
-        self.title_label.setFont(QFont(font_family))
+        self.title_label.setFont(font)
 
         self.format_badge_button = QPushButton(
-            f"{self.video.get('type').split('/')[-1]}"
+            format_video_type(self.video.get("type"))
         )
-        self.format_badge_button.setFont(QFont(font_family))
+        self.format_badge_button.setFont(font)
         self.format_badge_button.setObjectName("badge_button")
         self.format_badge_button.setEnabled(False)
 
         self.size_badge_button = QPushButton(f"{self.total_size}")
-        self.size_badge_button.setFont(QFont(font_family))
+        self.size_badge_button.setFont(font)
         self.size_badge_button.setEnabled(False)
         self.size_badge_button.setObjectName("badge_button")
 
@@ -87,7 +83,7 @@ class Card(QFrame):
 
         self.bytes_downloaded_label = QLabel(f"0 MB/{self.total_size}")
         self.bytes_downloaded_label.setObjectName("bytes_downloaded_label")
-        self.bytes_downloaded_label.setFont(QFont(font_family))
+        self.bytes_downloaded_label.setFont(font)
 
         self.progress_bar = QProgressBar()
         self.progress_bar.setObjectName("progress_bar")
@@ -97,9 +93,7 @@ class Card(QFrame):
         card_content_layout.addWidget(self.progress_bar)
         card_content_layout.addWidget(self.bytes_downloaded_label)
 
-        self.delete_button = QPushButton(
-            icon=QIcon(str(PARENT_PATH / "assets/icons/xmark-solid.svg"))
-        )
+        self.delete_button = QPushButton(icon=get_icon("xmark-solid.svg"))
         self.delete_button.setObjectName("delete_button")
         self.delete_button.clicked.connect(self.cancel_download.emit)
 
@@ -108,6 +102,18 @@ class Card(QFrame):
         main_layout.addWidget(card_content_frame, 2)
         main_layout.addWidget(self.delete_button)
 
+    def update_video_info(self, info: Dict[str, Any]) -> None:
+        """
+        Show the size and type received once the download started.
+
+        Args:
+            info (Dict[str, Any]): The new 'size' and/or 'type' of the video.
+        """
+        self.video.update(info)
+        self.total_size = format_video_size(self.video.get("size"))
+        self.size_badge_button.setText(self.total_size)
+        self.format_badge_button.setText(format_video_type(self.video.get("type")))
+
     def update_progress(self, value: int) -> None:
         """
         Update the progress bar with the given value.
@@ -1,7 +1,10 @@
-from pathlib import Path
 from typing import Dict
-from uqload_dl_gui.utils import check_special_characters, convert_size
-from PyQt5.QtGui import QIcon, QFontDatabase, QFont
+from uqload_dl_gui.assetRegistry import get_font, get_icon, get_stylesheet, get_svg_data
+from uqload_dl_gui.utils import (
+    check_special_characters,
+    format_video_size,
+    format_video_type,
+)
 from PyQt5.QtCore import QSize, Qt
 from PyQt5.QtSvg import QSvgWidget
 from PyQt5.QtWidgets import (
@@ -15,8 +18,6 @@ from PyQt5.QtWidgets import (
     QMessageBox,
 )
 
-PARENT_PATH = Path(__file__).parent.parent
-
 
 class CardInfo(QFrame):
     """
@@ -42,11 +43,9 @@ class CardInfo(QFrame):
         """Initialize the user interface of the widget."""
         self.setVisible(False)
         self.setObjectName("card_frame")
-        self.setStyleSheet((PARENT_PATH / "assets/styles/cardInfo.qss").read_text())
+        self.setStyleSheet(get_stylesheet("cardInfo"))
 
-        font_path = str(PARENT_PATH / "assets/fonts/nunito-font/Nunito-Regular.ttf")
-        font_id = QFontDatabase.addApplicationFont(font_path)
-        font_family = QFontDatabase.applicationFontFamilies(font_id)[0]
+        font = get_font()
 
         card_thumbnail_frame = QFrame(self)
         card_thumbnail_frame.setObjectName("card_thumbnail_frame")
@@ -54,9 +53,8 @@ class CardInfo(QFrame):
         card_thumbnail_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         card_thumbnail_layout.setContentsMargins(0, 0, 0, 0)
 
-        thumbnail_image = QSvgWidget(
-            str(PARENT_PATH / "assets/icons/file-video-solid.svg")
-        )
+        thumbnail_image = QSvgWidget()
+        thumbnail_image.load(get_svg_data("file-video-solid.svg"))
         thumbnail_image.renderer().setAspectRatioMode(
             Qt.AspectRatioMode.KeepAspectRatio
         )
@@ -68,7 +66,7 @@ class CardInfo(QFrame):
         card_content_layout = QVBoxLayout(card_content_frame)
 
         self.card_title = QLineEdit()
-        self.card_title.setFont(QFont(font_family))
+        self.card_title.setFont(font)
         self.card_title.setObjectName("card_title")
         self.card_title.setPlaceholderText("New Title...")
         self.card_title.textChanged.connect(self.on_change_text)
@@ -77,9 +75,9 @@ class CardInfo(QFrame):
         self.duration_label = QLabel()
         self.video_type_label = QLabel()
         self.video_size_label = QLabel()
-        self.duration_label.setFont(QFont(font_family))
-        self.video_type_label.setFont(QFont(font_family))
-        self.video_size_label.setFont(QFont(font_family))
+        self.duration_label.setFont(font)
+        self.video_type_label.setFont(font)
+        self.video_size_label.setFont(font)
 
         card_content_layout.addWidget(self.card_title)
         card_content_layout.addWidget(self.duration_label)
@@ -90,9 +88,7 @@ class CardInfo(QFrame):
         card_button_frame.setObjectName("card_button_frame")
         card_button_layout = QVBoxLayout(card_button_frame)
         card_button_layout.setContentsMargins(0, 0, 0, 0)
-        self.download_button = QPushButton(
-            icon=QIcon(str(PARENT_PATH / "assets/icons/file-arrow-down-solid.svg"))
-        )
+        self.download_button = QPushButton(icon=get_icon("file-arrow-down-solid.svg"))
         self.download_button.setObjectName("download_button")
         self.download_button.setIconSize(QSize(18, 18))
         self.download_button.clicked.connect(self.start_download)
@@ -131,10 +127,33 @@ class CardInfo(QFrame):
             video_info (Dict[str, str]): Information about the video.
         """
         self.card_title.setText(f"{video_info.get('title')}")
-        self.duration_label.setText(f"Duration: {video_info.get('duration')}")
-        self.video_type_label.setText(f"Type: {video_info.get('type').split('/')[-1]}")
+        self.duration_label.setText(f"Duration: {video_info.get('duration') or '...'}")
+        self.update_file_info(video_info)
+
+    def update_details(self, video_info: Dict[str, str], old_title: str) -> None:
+        """
+        Update the duration, and the title unless the user has edited it.
+
+        Args:
+            video_info (Dict[str, str]): Information about the video.
+            old_title (str): The title shown before the details were fetched.
+        """
+        self.duration_label.setText(f"Duration: {video_info.get('duration') or '...'}")
+        if self.card_title.text() == old_title and video_info.get("title"):
+            self.card_title.setText(f"{video_info.get('title')}")
+
+    def update_file_info(self, video_info: Dict[str, str]) -> None:
+        """
+        Update the video type and size shown on the card.
+
+        Args:
+            video_info (Dict[str, str]): Information about the video.
+        """
+        self.video_type_label.setText(
+            f"Type: {format_video_type(video_info.get('type'))}"
+        )
         self.video_size_label.setText(
-            f"Size: {convert_size(video_info.get('size', 0))}"
+            f"Size: {format_video_size(video_info.get('size'))}"
         )
 
     def start_download(self) -> None:
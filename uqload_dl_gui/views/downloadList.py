@@ -0,0 +1,370 @@
+from typing import Any, Dict, List, Optional
+from uqload_dl_gui.assetRegistry import get_font, get_pixmap
+from uqload_dl_gui.utils import convert_size, format_video_size, format_video_type
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QPainter, QPen
+from PyQt5.QtCore import (
+    QAbstractListModel,
+    QEvent,
+    QModelIndex,
+    QRect,
+    QSize,
+    Qt,
+    pyqtSignal,
+)
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem, QWidget
+
+ITEM_ID_ROLE = Qt.ItemDataRole.UserRole
+VIDEO_ROLE = Qt.ItemDataRole.UserRole + 1
+PROGRESS_ROLE = Qt.ItemDataRole.UserRole + 2
+
+# height of a painted row and the space left below it
+ROW_HEIGHT = 96
+ROW_SPACING = 10
+
+BORDER_COLOR = QColor("#30363d")
+TEXT_COLOR = QColor("#a39b8e")
+BADGE_COLOR = QColor("gray")
+PROGRESS_COLOR = QColor("#EC2868")
+
+
+class DownloadRow:
+    """
+    A download shown in the list.
+
+    Attributes:
+        item_id (str): The identifier of the item in the queue journal.
+        video (Dict[str, Any]): Information about the video.
+        bytes_downloaded (int): The number of bytes downloaded.
+        total (int): The total size of the download, 0 if unknown.
+    """
+
+    __slots__ = ("item_id", "video", "bytes_downloaded", "total")
+
+    def __init__(self, item_id: str, video: Dict[str, Any]) -> None:
+        """
+        Initialize the DownloadRow.
+
+        Args:
+            item_id (str): The identifier of the item in the queue journal.
+            video (Dict[str, Any]): Information about the video.
+        """
+        self.item_id = item_id
+        self.video = video
+        self.bytes_downloaded = 0
+        self.total = 0
+
+
+class DownloadListModel(QAbstractListModel):
+    """
+    Model of the downloads shown by the download page.
+
+    Rows are plain objects instead of widgets, so the list only paints the
+    visible rows, whatever the size of the queue. Rows are found by item
+    identifier, and progress updates only repaint their own row.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the DownloadListModel without any row."""
+        super().__init__()
+        self.__rows: List[DownloadRow] = []
+        self.__positions: Dict[str, int] = {}
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """
+        Get the number of rows.
+
+        Args:
+            parent (QModelIndex): The parent index, invalid for a list.
+
+        Returns:
+            int: The number of downloads in the list.
+        """
+        return 0 if parent.isValid() else len(self.__rows)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        """
+        Get the data of a row.
+
+        Args:
+            index (QModelIndex): The index of the row.
+            role (int): The role of the data.
+
+        Returns:
+            Any: The title for the display role, the item identifier, the video
+            information or the bytes downloaded and total size for the custom
+            roles, None otherwise.
+        """
+        if not index.isValid() or not 0 <= index.row() < len(self.__rows):
+            return None
+        row = self.__rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(row.video.get("title", row.item_id))
+        if role == ITEM_ID_ROLE:
+            return row.item_id
+        if role == VIDEO_ROLE:
+            return row.video
+        if role == PROGRESS_ROLE:
+            return row.bytes_downloaded, row.total
+        return None
+
+    def add_item(self, item_id: str, video: Dict[str, Any]) -> None:
+        """
+        Append a download to the list.
+
+        Args:
+            item_id (str): The identifier of the item in the queue journal.
+            video (Dict[str, Any]): Information about the video.
+        """
+        position = len(self.__rows)
+        self.beginInsertRows(QModelIndex(), position, position)
+        self.__rows.append(DownloadRow(item_id, video))
+        self.__positions[item_id] = position
+        self.endInsertRows()
+
+    def remove_item(self, item_id: str) -> bool:
+        """
+        Remove a download from the list.
+
+        Args:
+            item_id (str): The identifier of the item.
+
+        Returns:
+            bool: True if the item was in the list.
+        """
+        position = self.__positions.pop(item_id, None)
+        if position is None:
+            return False
+        self.beginRemoveRows(QModelIndex(), position, position)
+        del self.__rows[position]
+        for index in range(position, len(self.__rows)):
+            self.__positions[self.__rows[index].item_id] = index
+        self.endRemoveRows()
+        return True
+
+    def clear(self) -> None:
+        """Remove every download at once, with a single model reset."""
+        self.beginResetModel()
+        self.__rows.clear()
+        self.__positions.clear()
+        self.endResetModel()
+
+    def update_progress(self, item_id: str, bytes_downloaded: int, total: int) -> None:
+        """
+        Update the progress of a download.
+
+        Args:
+            item_id (str): The identifier of the item.
+            bytes_downloaded (int): The number of bytes downloaded.
+            total (int): The total size of the download.
+        """
+        position = self.__positions.get(item_id)
+        if position is None:
+            return
+        row = self.__rows[position]
+        row.bytes_downloaded, row.total = bytes_downloaded, total
+        index = self.index(position)
+        self.dataChanged.emit(index, index, [PROGRESS_ROLE])
+
+    def update_video_info(self, item_id: str, info: Dict[str, Any]) -> None:
+        """
+        Show the size and type received once the download started.
+
+        Args:
+            item_id (str): The identifier of the item.
+            info (Dict[str, Any]): The new 'size' and/or 'type' of the video.
+        """
+        position = self.__positions.get(item_id)
+        if position is None:
+            return
+        self.__rows[position].video.update(info)
+        index = self.index(position)
+        self.dataChanged.emit(index, index, [VIDEO_ROLE])
+
+    def row_of(self, item_id: str) -> Optional[int]:
+        """
+        Get the row of a download.
+
+        Args:
+            item_id (str): The identifier of the item.
+
+        Returns:
+            Optional[int]: The row, None if the item is not in the list.
+        """
+        return self.__positions.get(item_id)
+
+
+class DownloadItemDelegate(QStyledItemDelegate):
+    """
+    Paints the downloads of the list the way a download card looks.
+
+    Every row shows an icon, the title, the size and format badges, a progress
+    bar, the bytes downloaded and a button to cancel the download.
+
+    Attributes:
+        cancel_requested (pyqtSignal): Signal emitted with the identifier of the item to cancel.
+    """
+
+    cancel_requested = pyqtSignal(str)
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        """
+        Initialize the DownloadItemDelegate.
+
+        Args:
+            parent (Optional[QWidget]): The parent widget.
+        """
+        super().__init__(parent)
+        self.title_font = QFont(get_font())
+        self.title_font.setPixelSize(13)
+        self.bytes_font = QFont(get_font())
+        self.bytes_font.setPixelSize(11)
+        self.badge_font = QFont(get_font())
+        self.badge_font.setPixelSize(10)
+        self.__thumbnail = get_pixmap("video-solid.svg", 26)
+        self.__delete_icon = get_pixmap("xmark-solid.svg", 16)
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        """
+        Get the size of a row.
+
+        Args:
+            option (QStyleOptionViewItem): The style options of the row.
+            index (QModelIndex): The index of the row.
+
+        Returns:
+            QSize: The size of every row.
+        """
+        return QSize(option.rect.width(), ROW_HEIGHT + ROW_SPACING)
+
+    @staticmethod
+    def delete_rect(rect: QRect) -> QRect:
+        """
+        Get the area of the cancel button of a row.
+
+        Args:
+            rect (QRect): The area of the row.
+
+        Returns:
+            QRect: The area of the cancel button.
+        """
+        return QRect(rect.right() - 40, rect.top() + (ROW_HEIGHT - 28) // 2, 28, 28)
+
+    def paint(
+        self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex
+    ) -> None:
+        """
+        Paint a row.
+
+        Args:
+            painter (QPainter): The painter of the list.
+            option (QStyleOptionViewItem): The style options of the row.
+            index (QModelIndex): The index of the row.
+        """
+        video = index.data(VIDEO_ROLE) or {}
+        bytes_downloaded, total = index.data(PROGRESS_ROLE) or (0, 0)
+        total_size = format_video_size(video.get("size"))
+        rect = QRect(option.rect)
+        rect.setHeight(ROW_HEIGHT)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QPen(BORDER_COLOR))
+        painter.drawRect(rect.adjusted(0, 0, -1, -1))
+
+        painter.drawPixmap(
+            rect.left() + 12, rect.top() + (ROW_HEIGHT - 26) // 2, self.__thumbnail
+        )
+        delete_rect = self.delete_rect(rect)
+        painter.drawPixmap(delete_rect.adjusted(6, 6, -6, -6), self.__delete_icon)
+
+        left = rect.left() + 50
+        right = delete_rect.left() - 12
+
+        # badges, right aligned on the title line
+        painter.setFont(self.badge_font)
+        badge_metrics = QFontMetrics(self.badge_font)
+        for text in (format_video_type(video.get("type")), total_size):
+            width = max(40, badge_metrics.horizontalAdvance(text) + 8)
+            badge = QRect(right - width, rect.top() + 16, width, 18)
+            painter.setPen(QPen(BADGE_COLOR))
+            painter.drawRoundedRect(badge, 4, 4)
+            painter.drawText(badge, Qt.AlignmentFlag.AlignCenter, text)
+            right = badge.left() - 6
+
+        painter.setFont(self.title_font)
+        painter.setPen(QPen(TEXT_COLOR))
+        title_rect = QRect(left, rect.top() + 14, right - left, 22)
+        title = QFontMetrics(self.title_font).elidedText(
+            str(index.data(Qt.ItemDataRole.DisplayRole)),
+            Qt.TextElideMode.ElideRight,
+            title_rect.width(),
+        )
+        painter.drawText(
+            title_rect,
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            title,
+        )
+
+        bar = QRect(left, rect.top() + 46, delete_rect.left() - 12 - left, 4)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(BORDER_COLOR)
+        painter.drawRect(bar)
+        if total:
+            done = QRect(bar)
+            done.setWidth(int(bar.width() * min(bytes_downloaded, total) / total))
+            painter.setBrush(PROGRESS_COLOR)
+            painter.drawRoundedRect(done, 2, 2)
+
+        painter.setFont(self.bytes_font)
+        painter.setPen(QPen(TEXT_COLOR))
+        painter.drawText(
+            QRect(left, rect.top() + 58, bar.width(), 20),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            self.bytes_text(bytes_downloaded, total, total_size),
+        )
+        painter.restore()
+
+    @staticmethod
+    def bytes_text(bytes_downloaded: int, total: int, total_size: str) -> str:
+        """
+        Get the text of the bytes downloaded.
+
+        Args:
+            bytes_downloaded (int): The number of bytes downloaded.
+            total (int): The total size of the download, 0 before the first update.
+            total_size (str): The formatted size of the video.
+
+        Returns:
+            str: The bytes downloaded out of the size of the video.
+        """
+        if not total:
+            return f"0 MB/{total_size}"
+        return f"{convert_size(bytes_downloaded)} / {total_size}"
+
+    def editorEvent(
+        self,
+        event: QEvent,
+        model: QAbstractListModel,
+        option: QStyleOptionViewItem,
+        index: QModelIndex,
+    ) -> bool:
+        """
+        Emit `cancel_requested` when the cancel button of a row is clicked.
+
+        Args:
+            event (QEvent): The event.
+            model (QAbstractListModel): The model of the list.
+            option (QStyleOptionViewItem): The style options of the row.
+            index (QModelIndex): The index of the row.
+
+        Returns:
+            bool: True if the event was handled.
+        """
+        if (
+            event.type() == QEvent.Type.MouseButtonRelease
+            and event.button() == Qt.MouseButton.LeftButton
+            and self.delete_rect(option.rect).contains(event.pos())
+        ):
+            self.cancel_requested.emit(index.data(ITEM_ID_ROLE))
+            return True
+        return super().editorEvent(event, model, option, index)
@@ -1,24 +1,36 @@
-import random
-from pathlib import Path
-from typing import Dict, List
+import logging, os, random
+from typing import Dict, List, Optional, Any, Set, Tuple
+from uuid import uuid4
+from uqload_dl_gui.admissionQueue import AdmissionQueue
+from uqload_dl_gui.assetRegistry import get_font, get_stylesheet
 from uqload_dl_gui.customThreadPool import CustomThreadPool
-from uqload_dl_gui.views.cardDownload import Card
-from uqload_dl_gui.config import get_config
-from uqload_dl_gui.worker import Worker
-from PyQt5.QtCore import Qt, QMutex, pyqtSignal
-from PyQt5.QtGui import QFont, QFontDatabase
+from uqload_dl_gui.asyncEngine import AsyncEngine, AsyncWorker
+from uqload_dl_gui.views.downloadList import (
+    ITEM_ID_ROLE,
+    DownloadItemDelegate,
+    DownloadListModel,
+)
+from uqload_dl_gui.config import get_config, get_data_dir
+from uqload_dl_gui.metadataCache import get_metadata_cache
+from uqload_dl_gui.controlApi import EventHub
+from uqload_dl_gui.worker import Worker, apply_transfer_limits
+from uqload_dl_gui import queueJournal
+from uqload_dl_gui.queueJournal import QueueJournal
+from uqload_dl_gui.taskScheduler import HIGH_PRIORITY, LOW_PRIORITY, NORMAL_PRIORITY
+from PyQt5.QtCore import Qt, QMutex, QPoint, QTimer
 from PyQt5.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QHBoxLayout,
     QPushButton,
-    QScrollArea,
+    QListView,
     QFrame,
     QLabel,
+    QMenu,
     QMessageBox,
 )
 
-PARENT_PATH = Path(__file__).parent.parent
+logger = logging.getLogger(__name__)
 
 
 class DownloadPage(QWidget):
@@ -27,30 +39,68 @@ class DownloadPage(QWidget):
 
     This widget provides functionality for managing download tasks, including
     displaying download progress, canceling downloads, and adding new download tasks.
+    Every queued item is recorded in a queue journal, and unfinished items from a
+    previous session are queued again once the page is shown; their links are
+    resolved again since signed video URLs expire, and the items the user
+    paused come back paused. A paused item holds no worker and no queue slot:
+    its download is stopped, keeping the partial file, and it is queued again
+    when resumed. Items added when
+    the queue is full wait in a backlog that spills over to the disk, so no item
+    is rejected. What happens to every item is published to `events`, which the
+    control API reads. The
+    concurrency and queue limits can be changed while downloads run, and queued
+    items can be reordered by priority or pinned to start next.
     """
 
-    queue_full_signal = pyqtSignal(str)
-
-    def __init__(self) -> None:
+    def __init__(self, journal: Optional[QueueJournal] = None) -> None:
         """
         Initialize the DownloadPage widget.
 
         This method initializes the user interface of the widget and sets up
         necessary variables and components for managing download tasks.
+
+        Args:
+            journal (Optional[QueueJournal]): The queue journal to use. Defaults to
+            the journal in the application data directory.
         """
         super().__init__()
         self.mutex = QMutex()
         self.__mutex2 = QMutex()
         self.errors = 0
+        self.events = EventHub()
+        self.journal = (
+            QueueJournal(os.path.join(get_data_dir(), "queue.sqlite3"))
+            if journal is None
+            else journal
+        )
         self.init_ui()
+        self.journal.compact()
+        self.__backlog = AdmissionQueue(self.journal.path)
+        self.__stopped = False
+        # items paused by the user, out of the queue and kept across sessions
+        # with their video information and byte offset
+        self.__paused: Dict[str, Tuple[Dict[str, Any], int]] = {}
+        # workers of paused items that have not stopped yet
+        self.__stopping: Dict[str, Worker] = {}
+        # items resumed before the worker they were paused in stopped
+        self.__resuming: Dict[str, Tuple[Dict[str, Any], int]] = {}
+        # restored items whose link is being resolved, they hold a queue slot
+        self.__resolving: Dict[str, Dict[str, Any]] = {}
+        # streamed from the journal, the backlog spills the tail to the disk
+        for item_id, video_info, state, offset in self.journal.iter_pending():
+            self.__publish_queued(item_id, video_info)
+            if state == queueJournal.PAUSED:
+                self.__paused[item_id] = (video_info, offset)
+                self.__publish(queueJournal.PAUSED, item_id, queueJournal.PAUSED)
+            else:
+                self.__backlog.append(item_id, video_info)
+        QTimer.singleShot(0, self.__restore_next)
 
     def init_ui(self) -> None:
         """Initialize the user interface of the widget."""
-        self.setStyleSheet((PARENT_PATH / "assets/styles/downloadPage.qss").read_text())
+        self.setStyleSheet(get_stylesheet("downloadPage"))
 
-        font_path = str(PARENT_PATH / "assets/fonts/nunito-font/Nunito-Regular.ttf")
-        font_id = QFontDatabase.addApplicationFont(font_path)
-        font_family = QFontDatabase.applicationFontFamilies(font_id)[0]
+        font = get_font()
 
         self.header_frame = QFrame(self)
         self.header_frame.setObjectName("header_frame")
@@ -58,15 +108,15 @@ class DownloadPage(QWidget):
         self.header_frame_layout = QHBoxLayout(self.header_frame)
 
         self.total_tasks_label = QLabel("0 item(s)")
-        self.total_tasks_label.setFont(QFont(font_family))
+        self.total_tasks_label.setFont(font)
         self.total_tasks_label.setObjectName("total_tasks_label")
 
         self.error_label = QLabel(f"{self.errors} errors")
-        self.error_label.setFont(QFont(font_family))
+        self.error_label.setFont(font)
         self.error_label.setObjectName("error_label")
 
         self.cancel_all_button = QPushButton("Cancel All")
-        self.cancel_all_button.setFont(QFont(font_family))
+        self.cancel_all_button.setFont(font)
         self.cancel_all_button.setObjectName("cancel_all_button")
         self.cancel_all_button.clicked.connect(self.cancel_all)
 
@@ -80,103 +130,197 @@ class DownloadPage(QWidget):
             self.create_new_card_button
         ) """  # only for test!
 
-        self.card_list = QFrame(self)
-        self.card_list.setObjectName("card_list")
-        self.card_list_layout = QVBoxLayout(self.card_list)
-        self.card_list_layout.setSpacing(10)
-        self.card_list_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setObjectName("scroll_area")
-        self.scroll_area.setWidget(self.card_list)
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(
+        # rows are painted by the delegate, so only the visible ones cost anything
+        self.download_model = DownloadListModel()
+        self.download_delegate = DownloadItemDelegate(self)
+        self.download_delegate.cancel_requested.connect(self.cancel_item_dialog)
+
+        self.download_list = QListView(self)
+        self.download_list.setObjectName("download_list")
+        self.download_list.setModel(self.download_model)
+        self.download_list.setItemDelegate(self.download_delegate)
+        self.download_list.setUniformItemSizes(True)
+        self.download_list.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self.download_list.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.download_list.setHorizontalScrollBarPolicy(
             Qt.ScrollBarPolicy.ScrollBarAlwaysOff
         )
-        self.scroll_area.setVerticalScrollBarPolicy(
+        self.download_list.setVerticalScrollBarPolicy(
             Qt.ScrollBarPolicy.ScrollBarAlwaysOn
         )
+        self.download_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.download_list.customContextMenuRequested.connect(self.show_item_menu)
 
         self.main_layout = QVBoxLayout(self)
         self.main_layout.addWidget(self.header_frame)
-        self.main_layout.addWidget(self.scroll_area)
+        self.main_layout.addWidget(self.download_list)
 
         settings = get_config()
         max_size = int(settings.value("max_queue"))
         max_workers = int(settings.value("concurrent_downloads"))
+        policy = str(settings.value("scheduling_policy"))
+        apply_transfer_limits(settings)
 
-        self.__thread_pool = CustomThreadPool(max_workers, max_size)
+        if settings.value("download_engine") == "asyncio":
+            self.__thread_pool = AsyncEngine(max_workers, max_size, policy)
+            self.__worker_class = AsyncWorker
+        else:
+            self.__thread_pool = CustomThreadPool(max_workers, max_size, policy)
+            self.__worker_class = Worker
         self.__worker_list: List[Worker] = []
+        self.__items: Dict[str, Worker] = {}
+        self.__resolvers: Set[Any] = set()
 
-    def start_download(self, video_info: Dict[str, str]) -> None:
+    def start_download(
+        self, video_info: Dict[str, str], item_id: Optional[str] = None
+    ) -> None:
         """
         Start a download task.
 
         This method starts a new download task with the provided video information.
-        It creates a new download card and a worker thread for handling the download,
-        and submits the worker thread to the thread pool.
+        It adds a row to the download list and creates a worker thread for handling
+        the download, and submits the worker thread to the thread pool. New items are
+        recorded in the queue journal, without the signed video URL when their
+        UQLoad link is known. When the queue is full, the item waits in the
+        backlog instead.
 
         Args:
             video_info (Dict[str, str]): Information about the video to be downloaded.
+            item_id (Optional[str]): The journal identifier of an item restored from
+            a previous session.
         """
-        if self.__thread_pool.full():
-            self.queue_full_signal.emit("The queue is full!")
+        if self.__is_full():
+            if item_id is None:
+                self.enqueue(video_info)
+            else:
+                self.__backlog.appendleft(item_id, video_info)
+                self.__update_tasks_label()
             return
 
-        card = Card(self, video_info)
-        worker = Worker(video_info)
-        worker.signals.progress_update.connect(card.handle_progress_update)
-        worker.signals.download_completed.connect(
-            lambda card_arg=card, runnable=worker: self.on_download_complete(
-                card_arg, runnable
+        worker = self.__worker_class(video_info, item_id)
+        if item_id is None:
+            self.journal.append(
+                worker.item_id,
+                queueJournal.QUEUED,
+                queueJournal.get_journal_info(video_info),
             )
+            self.__publish_queued(worker.item_id, video_info)
+        worker.signals.download_started.connect(
+            lambda runnable=worker: self.__on_download_started(runnable)
         )
-        worker.signals.download_error.connect(
-            lambda err, card_arg=card, worker_arg=worker: self.on_download_error(
-                err, card_arg, worker_arg
+        worker.signals.progress_update.connect(
+            lambda done, total, runnable=worker: self.__on_progress(
+                runnable, done, total
             )
         )
-
-        card.cancel_download.connect(
-            lambda card_arg=card, runnable=worker: self.cancel_download_dialog(
-                card_arg, runnable
+        worker.signals.info_update.connect(
+            lambda info, runnable=worker: self.download_model.update_video_info(
+                runnable.item_id, info
             )
         )
+        worker.signals.download_completed.connect(
+            lambda runnable=worker: self.on_download_complete(runnable)
+        )
+        worker.signals.download_error.connect(
+            lambda err, worker_arg=worker: self.on_download_error(err, worker_arg)
+        )
+        worker.signals.download_cancelled.connect(
+            lambda runnable=worker: self.__on_download_stopped(runnable)
+        )
 
-        self.__thread_pool.submit_task(worker)
+        if not self.__thread_pool.submit_task(worker):
+            self.__backlog.appendleft(worker.item_id, video_info)
+            self.__update_tasks_label()
+            return
         self.__update_tasks_label()
         self.__worker_list.append(worker)
-        self.card_list_layout.addWidget(card)
+        self.__items[worker.item_id] = worker
+        self.download_model.add_item(worker.item_id, video_info)
+
+    def __on_download_started(self, worker: Worker) -> None:
+        """
+        Record that a download started.
+
+        Args:
+            worker (Worker): The worker of the download.
+        """
+        # with the destination the worker chose, so a later session resumes it
+        self.journal.append(
+            worker.item_id,
+            queueJournal.RUNNING,
+            queueJournal.get_journal_info(worker.video_info),
+        )
+        self.__publish("started", worker.item_id, queueJournal.RUNNING)
+
+    def __on_progress(self, worker: Worker, bytes_downloaded: int, total: int) -> None:
+        """
+        Show and publish the progress of a download.
+
+        Args:
+            worker (Worker): The worker of the download.
+            bytes_downloaded (int): The number of bytes downloaded.
+            total (int): The total size of the download.
+        """
+        self.download_model.update_progress(worker.item_id, bytes_downloaded, total)
+        self.__publish(
+            "progress",
+            worker.item_id,
+            bytes_downloaded=bytes_downloaded,
+            total_size=total,
+        )
 
-    def on_download_error(self, error: str, card: Card, worker: Worker) -> None:
+    def on_download_error(self, error: str, worker: Worker) -> None:
         """
         Handle download error.
 
         This method is called when an error occurs during the download process.
         It removes the worker associated with the error, updates the total tasks,
-        and removes the card from the layout.
+        and removes its row from the download list.
 
         Args:
             error (str): The error message.
-            card (Card): The card associated with the error.
             worker (Worker): The worker associated with the error.
         """
+        if self.__stopping.get(worker.item_id) is worker:
+            # paused, the item is resumed from its partial file
+            self.__on_download_stopped(worker)
+            return
+        if worker.item_id not in self.__items:
+            # cancelled before the error arrived
+            return
         try:
             self.mutex.lock()
-            print(f"Error downloading the file: {error}")
+            logger.error("Error downloading the file: %s", error)
             self.errors += 1
+            self.journal.append(
+                worker.item_id, queueJournal.FAILED, offset=worker.bytes_downloaded
+            )
+            self.__publish(
+                queueJournal.FAILED, worker.item_id, queueJournal.FAILED, error=error
+            )
             self.__worker_list.remove(worker)
-            self.__thread_pool.current_tasks = self.__thread_pool.current_tasks - 1
+            self.__items.pop(worker.item_id, None)
+            self.__thread_pool.task_done()
             self.__update_tasks_label()
-            self.card_list_layout.removeWidget(card)
+            self.download_model.remove_item(worker.item_id)
             self.error_label.setText(f"{self.errors} errors")
-            card.deleteLater()
-        except Exception as ex:
-            print(str(ex))
+        except Exception:
+            logger.exception("Cannot record the failed download")
         finally:
             self.mutex.unlock()
+        self.__restore_next()
 
-    def cancel_download_dialog(self, card: Card, worker: Worker) -> None:
+    def cancel_item_dialog(self, item_id: str) -> None:
+        """
+        Display cancel download dialog for a row of the download list.
+
+        Args:
+            item_id (str): The identifier of the item.
+        """
+        if item_id in self.__items:
+            self.cancel_download_dialog(self.__items[item_id])
+
+    def cancel_download_dialog(self, worker: Worker) -> None:
         """
         Display cancel download dialog.
 
@@ -184,7 +328,6 @@ class DownloadPage(QWidget):
         If confirmed, it cancels the download; otherwise, it resumes the download.
 
         Args:
-            card (Card): The card associated with the download.
             worker (Worker): The worker associated with the download.
         """
         worker.pause_download()
@@ -198,17 +341,16 @@ class DownloadPage(QWidget):
             worker.resume_download()
             return
 
-        self.__cancel_one(card, worker)
+        self.__cancel_one(worker)
 
-    def __cancel_one(self, card: Card, worker: Worker) -> None:
+    def __cancel_one(self, worker: Worker) -> None:
         """
         Cancel a single download.
 
-        This method attempts to cancel a single download. If successful, it deletes
-        the associated card and worker.
+        This method attempts to cancel a single download. If successful, it removes
+        the associated row and worker.
 
         Args:
-            card (Card): The card associated with the download.
             worker (Worker): The worker associated with the download.
         """
         try:
@@ -216,29 +358,71 @@ class DownloadPage(QWidget):
                 pass
             else:
                 worker.cancel_download()
-            self.__delete_card(card, worker)
-        except Exception as ex:
-            print(str(ex))
+            self.journal.append(
+                worker.item_id, queueJournal.CANCELLED, offset=worker.bytes_downloaded
+            )
+            self.__publish(
+                queueJournal.CANCELLED, worker.item_id, queueJournal.CANCELLED
+            )
+            self.__remove_item(worker)
+        except Exception:
+            logger.exception("Cannot cancel the download")
+        self.__restore_next()
 
     def __remove_all(self) -> None:
         """
         Remove all downloads.
 
-        This method cancels and removes all downloads from the queue.
+        This method cancels and removes all downloads from the queue and the
+        backlog, and empties the download list with a single model reset.
         """
         try:
             for worker in self.__worker_list:
+                self.journal.append(
+                    worker.item_id,
+                    queueJournal.CANCELLED,
+                    offset=worker.bytes_downloaded,
+                )
+                self.__publish(
+                    queueJournal.CANCELLED, worker.item_id, queueJournal.CANCELLED
+                )
                 if worker.is_running:
                     worker.cancel_download()
                 else:
                     self.__thread_pool.tryTake(worker)
+                self.__thread_pool.task_done()
             self.__worker_list.clear()
-
-            for i in range(self.card_list_layout.count()):
-                self.card_list_layout.itemAt(i).widget().deleteLater()
-            self.__update_tasks_label()
-        except Exception as ex:
-            print(str(ex))
+            self.__items.clear()
+            self.__cancel_paused()
+            for item_id in list(self.__resolving):
+                self.__resolving.pop(item_id)
+                self.journal.append(item_id, queueJournal.CANCELLED)
+                self.__publish(queueJournal.CANCELLED, item_id, queueJournal.CANCELLED)
+            self.__cancel_backlog()
+
+            self.download_model.clear()
+        except Exception:
+            logger.exception("Cannot remove the downloads")
+        self.__restore_next()
+
+    def __cancel_paused(self) -> None:
+        """Cancel every paused item, recorded in one transaction."""
+        item_ids = [*self.__paused, *self.__resuming]
+        for item_id in item_ids:
+            self.__publish(queueJournal.CANCELLED, item_id, queueJournal.CANCELLED)
+        self.journal.append_many(item_ids, queueJournal.CANCELLED)
+        self.__paused.clear()
+        self.__resuming.clear()
+
+    def __cancel_backlog(self) -> None:
+        """Cancel every item waiting in the backlog, recorded in one transaction."""
+        item_ids = []
+        item = self.__backlog.popleft()
+        while item is not None:
+            item_ids.append(item[0])
+            self.__publish(queueJournal.CANCELLED, item[0], queueJournal.CANCELLED)
+            item = self.__backlog.popleft()
+        self.journal.append_many(item_ids, queueJournal.CANCELLED)
 
     def __resume_all(self) -> None:
         """
@@ -260,52 +444,471 @@ class DownloadPage(QWidget):
             if worker.is_running:
                 worker.pause_download()
 
-    def on_download_complete(self, card: Card, worker: Worker) -> None:
+    def on_download_complete(self, worker: Worker) -> None:
         """
         Handle download completion.
 
         This method is called when a download is completed. It removes
-        the associated card and worker.
+        the associated row and worker.
 
         Args:
-            card (Card): The card associated with the completed download.
             worker (Worker): The worker associated with the completed download.
         """
+        if self.__stopping.pop(worker.item_id, None) is worker:
+            # finished before it noticed it was paused
+            self.__paused.pop(worker.item_id, None)
+            self.__resuming.pop(worker.item_id, None)
+            self.journal.append(
+                worker.item_id, queueJournal.DONE, offset=worker.bytes_downloaded
+            )
+            self.__publish(queueJournal.DONE, worker.item_id, queueJournal.DONE)
+            self.__update_tasks_label()
+            return
         try:
             self.mutex.lock()
-            self.__delete_card(card, worker)
-        except Exception as ex:
-            print(str(ex))
+            self.journal.append(
+                worker.item_id, queueJournal.DONE, offset=worker.bytes_downloaded
+            )
+            self.__publish(queueJournal.DONE, worker.item_id, queueJournal.DONE)
+            self.__remove_item(worker)
+        except Exception:
+            logger.exception("Cannot record the finished download")
         finally:
             self.mutex.unlock()
+        self.__restore_next()
 
-    def __delete_card(self, card: Card, worker: Worker) -> None:
+    def __remove_item(self, worker: Worker) -> None:
         """
-        Delete a card from the download queue.
+        Remove an item from the download queue.
 
-        This method removes the specified card and its associated worker
-        from the download queue. It also updates the total number of tasks
-        in the thread pool and removes the card from the layout.
+        This method removes the specified worker from the download queue and
+        its row from the download list. It also updates the total number of
+        tasks in the thread pool.
 
         Args:
-            card (Card): The card to be deleted.
-            worker (Worker): The worker associated with the card.
+            worker (Worker): The worker of the item.
         """
         self.__worker_list.remove(worker)
-        self.card_list_layout.removeWidget(card)
-        self.__thread_pool.current_tasks = self.__thread_pool.current_tasks - 1
+        self.__items.pop(worker.item_id, None)
+        self.download_model.remove_item(worker.item_id)
+        self.__thread_pool.task_done()
+        self.__update_tasks_label()
+
+    def __restore_next(self) -> None:
+        """
+        Queue unfinished items from a previous session and enqueued items.
+
+        Items are restored lazily, only as long as the queue has room. The rest
+        wait in the backlog and are restored when running downloads finish.
+        Items recorded with their UQLoad link but without a video URL are
+        resolved first, holding their slot in the queue meanwhile.
+        """
+        if self.__stopped:
+            return
+        links = []
+        while len(self.__backlog) and not self.__is_full():
+            item_id, video_info = self.__backlog.popleft()
+            if video_info.get("page_url") and not video_info.get("video_url"):
+                self.__resolving[item_id] = video_info
+                links.append((item_id, video_info["page_url"]))
+            else:
+                self.start_download(video_info, item_id)
+        if links:
+            self.__resolve(links)
         self.__update_tasks_label()
-        card.deleteLater()
+
+    def __is_full(self) -> bool:
+        """
+        Check if the queue is full, counting the items being resolved.
+
+        Returns:
+            bool: True if no other item can be queued.
+        """
+        return (
+            self.__thread_pool.full()
+            or self.__thread_pool.current_tasks + len(self.__resolving)
+            >= self.__thread_pool.max_size
+        )
+
+    def __resolve(self, links: List[Tuple[str, str]]) -> None:
+        """
+        Resolve the links of restored items again, then start them.
+
+        Args:
+            links (List[Tuple[str, str]]): The identifiers and links of the items.
+        """
+        from uqload_dl_gui.bulkResolver import BulkResolver
+
+        settings = get_config()
+        ids: Dict[str, List[str]] = {}
+        for item_id, url in links:
+            ids.setdefault(url, []).append(item_id)
+        resolver = BulkResolver(
+            list(ids),
+            int(settings.value("resolver_workers")),
+            get_metadata_cache(),
+            settings.value("download_engine") == "asyncio",
+            not settings.value("fast_resolve", type=bool),
+            settings.value("embed_only", type=bool),
+        )
+        # queued, so the results are handled in the GUI thread
+        resolver.url_resolved_signal.connect(
+            lambda url, video_info: [
+                self.__on_resolved(item_id, video_info) for item_id in ids[url]
+            ],
+            Qt.ConnectionType.QueuedConnection,
+        )
+        resolver.failed_signal.connect(
+            lambda url, error: [
+                self.__on_resolve_failed(item_id, error) for item_id in ids[url]
+            ],
+            Qt.ConnectionType.QueuedConnection,
+        )
+        resolver.finished_signal.connect(
+            lambda: self.__resolvers.discard(resolver),
+            Qt.ConnectionType.QueuedConnection,
+        )
+        self.__resolvers.add(resolver)
+        resolver.start()
+
+    def __on_resolved(self, item_id: str, video_info: Dict[str, Any]) -> None:
+        """
+        Start a restored item once its link is resolved, keeping its title and
+        the destination of its partial file.
+
+        Args:
+            item_id (str): The identifier of the item.
+            video_info (Dict[str, Any]): The information of the resolved video.
+        """
+        recorded = self.__resolving.pop(item_id, None)
+        if recorded is None or self.__stopped:
+            # cancelled while it was being resolved
+            return
+        for key in ("title", "destination_path"):
+            if recorded.get(key):
+                video_info = {**video_info, key: recorded[key]}
+        self.start_download(video_info, item_id)
+        self.__restore_next()
+
+    def __on_resolve_failed(self, item_id: str, error: str) -> None:
+        """
+        Record that the link of a restored item could not be resolved.
+
+        Args:
+            item_id (str): The identifier of the item.
+            error (str): The error message.
+        """
+        if self.__resolving.pop(item_id, None) is None or self.__stopped:
+            return
+        self.errors += 1
+        self.journal.append(item_id, queueJournal.FAILED)
+        self.__publish(queueJournal.FAILED, item_id, queueJournal.FAILED, error=error)
+        self.error_label.setText(f"{self.errors} errors")
+        self.__restore_next()
+
+    def enqueue(
+        self, video_info: Dict[str, Any], item_id: Optional[str] = None
+    ) -> None:
+        """
+        Add a download without rejecting it when the queue is full.
+
+        The item is recorded in the queue journal right away and waits in the
+        backlog until the queue has room. Only the head of the backlog is kept in
+        memory, so a bulk import of thousands of links keeps the memory bounded.
+
+        Args:
+            video_info (Dict[str, Any]): Information about the video to be downloaded.
+            item_id (Optional[str]): The identifier to give the item, a new one by default.
+        """
+        item_id = uuid4().hex if item_id is None else item_id
+        self.journal.append(
+            item_id, queueJournal.QUEUED, queueJournal.get_journal_info(video_info)
+        )
+        self.__publish_queued(item_id, video_info)
+        self.__backlog.append(item_id, video_info)
+        self.__restore_next()
+
+    def pause_item(self, item_id: str) -> bool:
+        """
+        Pause a queued or running download, freeing its slot.
+
+        A running download is stopped, keeping its partial file, and a queued one
+        is taken out of the thread pool. The item is queued again by `resume_item`.
+
+        Args:
+            item_id (str): The identifier of the item.
+
+        Returns:
+            bool: True if the item was paused, False if it is not in the queue.
+        """
+        if item_id in self.__paused:
+            return True
+        if item_id in self.__resuming:
+            video_info, offset = self.__resuming.pop(item_id)
+        elif item_id in self.__items:
+            worker = self.__items[item_id]
+            if not self.__thread_pool.tryTake(worker):
+                worker.cancel_download()
+                self.__stopping[item_id] = worker
+            video_info = queueJournal.get_journal_info(worker.video_info)
+            offset = worker.bytes_downloaded
+            self.__remove_item(worker)
+        else:
+            return False
+        self.__paused[item_id] = (video_info, offset)
+        self.journal.append(item_id, queueJournal.PAUSED, offset=offset)
+        self.__publish(queueJournal.PAUSED, item_id, queueJournal.PAUSED)
+        self.__restore_next()
+        return True
+
+    def resume_item(self, item_id: str) -> bool:
+        """
+        Queue a paused download again, ahead of the backlog.
+
+        Args:
+            item_id (str): The identifier of the item.
+
+        Returns:
+            bool: True if the item was resumed, False if it is not paused.
+        """
+        if item_id not in self.__paused:
+            return False
+        video_info, offset = self.__paused.pop(item_id)
+        self.journal.append(item_id, queueJournal.QUEUED, offset=offset)
+        self.__publish("resumed", item_id, queueJournal.QUEUED)
+        if item_id in self.__stopping:
+            # queued once the worker releases the partial file
+            self.__resuming[item_id] = (video_info, offset)
+        else:
+            self.__backlog.appendleft(item_id, video_info)
+            self.__restore_next()
+        return True
+
+    def __on_download_stopped(self, worker: Worker) -> None:
+        """
+        Forget the worker of a paused item once it has stopped.
+
+        The item is queued again if it was resumed meanwhile.
+
+        Args:
+            worker (Worker): The worker of the download.
+        """
+        if self.__stopping.get(worker.item_id) is not worker:
+            return
+        self.__stopping.pop(worker.item_id)
+        resumed = self.__resuming.pop(worker.item_id, None)
+        if resumed is not None:
+            self.__backlog.appendleft(worker.item_id, resumed[0])
+            self.__restore_next()
+
+    def cancel_item(self, item_id: str) -> bool:
+        """
+        Cancel a download without asking, also if it waits in the backlog.
+
+        Args:
+            item_id (str): The identifier of the item.
+
+        Returns:
+            bool: True if the item was cancelled, False if it is not in the queue.
+        """
+        if item_id in self.__items:
+            self.__cancel_one(self.__items[item_id])
+            return True
+        if (
+            self.__paused.pop(item_id, None) is None
+            and self.__resuming.pop(item_id, None) is None
+            and self.__resolving.pop(item_id, None) is None
+            and not self.__backlog.remove(item_id)
+        ):
+            return False
+        self.journal.append(item_id, queueJournal.CANCELLED)
+        self.__publish(queueJournal.CANCELLED, item_id, queueJournal.CANCELLED)
+        self.__update_tasks_label()
+        return True
+
+    def __publish_queued(self, item_id: str, video_info: Dict[str, Any]) -> None:
+        """
+        Publish that an item was queued.
+
+        Args:
+            item_id (str): The identifier of the item.
+            video_info (Dict[str, Any]): Information about the video.
+        """
+        self.__publish(
+            queueJournal.QUEUED,
+            item_id,
+            queueJournal.QUEUED,
+            title=video_info.get("title", ""),
+            bytes_downloaded=0,
+            total_size=video_info.get("size") or 0,
+            error=None,
+        )
+
+    def __publish(
+        self, event: str, item_id: str, state: Optional[str] = None, **fields: Any
+    ) -> None:
+        """
+        Publish an event of an item to `events`.
+
+        Args:
+            event (str): What happened to the item.
+            item_id (str): The identifier of the item.
+            state (Optional[str]): The new state of the item, None if unchanged.
+            **fields (Any): Other fields of the item that changed.
+        """
+        event_dict = {"event": event, "id": item_id, **fields}
+        if state is not None:
+            event_dict["state"] = state
+        self.events.publish(event_dict)
+
+    def set_limits(self, max_workers: int, max_size: int) -> None:
+        """
+        Apply new concurrency and queue limits to the running queue.
+
+        Raising the limits dispatches waiting items right away. Lowering them lets
+        running downloads finish while new ones are held back in the backlog;
+        no item is dropped.
+
+        Args:
+            max_workers (int): Maximum number of downloads running at the same time.
+            max_size (int): Maximum number of items in the queue.
+        """
+        self.__thread_pool.set_limits(max_workers, max_size)
+        self.__restore_next()
+
+    def set_scheduling_policy(self, policy: str) -> None:
+        """
+        Reorder the queued items with a new scheduling policy.
+
+        Args:
+            policy (str): 'fifo' or 'shortest_first', which starts the items with
+            the fewest remaining bytes first.
+        """
+        self.__thread_pool.set_policy(policy)
+
+    def set_item_priority(self, item_id: str, priority: int) -> bool:
+        """
+        Change the priority of a queued item; higher priorities start first.
+
+        Args:
+            item_id (str): The identifier of the item.
+            priority (int): The new priority.
+
+        Returns:
+            bool: True if the item was reordered, False if it is not queued or
+            already started.
+        """
+        if item_id not in self.__items or not self.__thread_pool.set_priority(
+            self.__items[item_id], priority
+        ):
+            return False
+        self.__publish("reordered", item_id, priority=priority)
+        return True
+
+    def pin_item(self, item_id: str) -> bool:
+        """
+        Make an item the next one to start, also if it waits in the backlog.
+
+        Args:
+            item_id (str): The identifier of the item.
+
+        Returns:
+            bool: True if the item was pinned, False if it is not queued or
+            already started.
+        """
+        if item_id in self.__items:
+            if not self.__thread_pool.pin(self.__items[item_id]):
+                return False
+            self.__publish("reordered", item_id, pinned=True)
+            return True
+        if not self.__backlog.move_to_front(item_id):
+            return False
+        self.__publish("reordered", item_id, pinned=True)
+        return True
+
+    def show_item_menu(self, position: QPoint) -> None:
+        """
+        Show the menu to reorder a queued item of the download list.
+
+        Args:
+            position (QPoint): The position of the click in the list.
+        """
+        index = self.download_list.indexAt(position)
+        worker = self.__items.get(index.data(ITEM_ID_ROLE)) if index.isValid() else None
+        if worker is None or worker.is_running:
+            return
+        menu = QMenu(self)
+        menu.addAction("Download next", lambda: self.pin_item(worker.item_id))
+        menu.addSeparator()
+        for text, priority in (
+            ("High priority", HIGH_PRIORITY),
+            ("Normal priority", NORMAL_PRIORITY),
+            ("Low priority", LOW_PRIORITY),
+        ):
+            menu.addAction(
+                text,
+                lambda priority=priority: self.set_item_priority(
+                    worker.item_id, priority
+                ),
+            )
+        menu.exec(self.download_list.viewport().mapToGlobal(position))
+
+    @property
+    def backlog_size(self) -> int:
+        """
+        Get the number of items waiting for room in the queue.
+
+        Returns:
+            int: The number of items in the backlog.
+        """
+        return len(self.__backlog)
+
+    def pause_all(self) -> None:
+        """Pause all running downloads."""
+        self.__pause_all()
+
+    def resume_all(self) -> None:
+        """Resume all paused downloads."""
+        self.__resume_all()
+
+    def shutdown(self) -> None:
+        """
+        Stop all downloads so they can be resumed in the next session.
+
+        Every item of the thread pool is recorded as queued in the queue journal
+        with its current byte offset, then running downloads are stopped, keeping
+        their partial files, and queued ones are removed from the thread pool.
+        Paused items, items of the backlog and the ones being resolved keep their
+        state in the journal and are restored from it.
+        """
+        self.__stopped = True
+        for worker in self.__worker_list:
+            self.journal.append(
+                worker.item_id, queueJournal.QUEUED, offset=worker.bytes_downloaded
+            )
+            self.__publish(queueJournal.QUEUED, worker.item_id, queueJournal.QUEUED)
+            if worker.is_running:
+                worker.cancel_download()
+            else:
+                self.__thread_pool.tryTake(worker)
+        self.__worker_list.clear()
+        self.__items.clear()
 
     def __update_tasks_label(self) -> None:
         """Update tasks label"""
         self.__mutex2.lock()
-        self.total_tasks_label.setText(f"{self.__thread_pool.current_tasks} item(s)")
+        text = f"{self.__thread_pool.current_tasks + len(self.__resolving)} item(s)"
+        waiting = len(self.__backlog) + len(self.__resuming)
+        if waiting:
+            text += f", {waiting} waiting"
+        if self.__paused:
+            text += f", {len(self.__paused)} paused"
+        self.total_tasks_label.setText(text)
         self.__mutex2.unlock()
 
     def cancel_all(self) -> None:
         """
-        Cancel all downloads in the queue.
+        Cancel all downloads in the queue and the backlog.
 
         This method pauses all downloads, prompts the user for confirmation,
         and cancels all downloads if the user confirms. If the user cancels
@@ -313,7 +916,12 @@ class DownloadPage(QWidget):
         """
         self.mutex.lock()
 
-        if not self.thread_pool_size:
+        if (
+            not self.thread_pool_size
+            and not len(self.__backlog)
+            and not self.__paused
+            and not self.__resuming
+        ):
             self.mutex.unlock()
             return
 
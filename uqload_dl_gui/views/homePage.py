@@ -1,14 +1,18 @@
+from concurrent.futures import Future
 from pathlib import Path
 from typing import Dict, Any
-from uqload_dl_gui.requestThread import RequestThread
+from uqload_dl_gui.assetRegistry import get_font, get_stylesheet
+from uqload_dl_gui.config import get_config
+from uqload_dl_gui.metadataCache import get_metadata_cache
 from uqload_dl_gui.exceptions import InvalidUQLoadURL
-from uqload_dl_gui.utils import validate_uqload_url
+from uqload_dl_gui.utils import parse_urls, validate_uqload_url
 from uqload_dl_gui.views.cardInfo import CardInfo
-from PyQt5.QtCore import pyqtSignal
-from PyQt5.QtGui import QFont, QFontDatabase
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtWidgets import (
     QFrame,
+    QLabel,
     QWidget,
+    QFileDialog,
     QLineEdit,
     QVBoxLayout,
     QPushButton,
@@ -19,8 +23,6 @@ from PyQt5.QtWidgets import (
     QMessageBox,
 )
 
-PARENT_PATH = Path(__file__).parent.parent
-
 
 class HomePage(QWidget):
     """
@@ -28,10 +30,17 @@ class HomePage(QWidget):
 
     This widget provides the user interface for the home page,
     including the header with search functionality and a card
-    frame for displaying video information.
+    frame for displaying video information. Several links pasted at
+    once, or a file of links, are resolved in bulk and queued directly.
+    With fast resolve, the card is shown before the size is known and is
+    updated once a one-byte probe returns it. With embed page only, the
+    duration and full title of the displayed card are fetched afterwards.
     """
 
     data_sent = pyqtSignal(object)
+    bulk_data_sent = pyqtSignal(object)
+    probe_finished = pyqtSignal(str, object)
+    details_finished = pyqtSignal(str, object)
 
     def __init__(self) -> None:
         """
@@ -43,13 +52,15 @@ class HomePage(QWidget):
         super().__init__()
         self.init_ui()
         self.video_info = {}
+        self.bulk_resolver = None
+        self.bulk_counts = {"total": 0, "resolved": 0, "failed": 0, "queued": 0}
+        self.probe_finished.connect(self.handle_probe_finished)
+        self.details_finished.connect(self.handle_details_finished)
 
     def init_ui(self) -> None:
         """Initialize the user interface of the widget."""
-        self.setStyleSheet((PARENT_PATH / "assets/styles/homePage.qss").read_text())
-        font_path = str(PARENT_PATH / "assets/fonts/nunito-font/Nunito-Regular.ttf")
-        font_id = QFontDatabase.addApplicationFont(font_path)
-        font_family = QFontDatabase.applicationFontFamilies(font_id)[0]
+        self.setStyleSheet(get_stylesheet("homePage"))
+        font = get_font()
 
         header_frame = QFrame(self)
         header_frame.setObjectName("header_frame")
@@ -65,24 +76,37 @@ class HomePage(QWidget):
         search_frame.setObjectName("search_frame")
 
         self.url_input = QLineEdit()
-        self.url_input.setFont(QFont(font_family))
+        self.url_input.setFont(font)
         self.url_input.setObjectName("url_input")
         self.url_input.setPlaceholderText("Enter link...")
         self.url_input.returnPressed.connect(self.validate_input)
 
         self.search_button = QPushButton("Search")
-        self.search_button.setFont(QFont(font_family))
+        self.search_button.setFont(font)
         self.search_button.setObjectName("search_button")
         self.search_button.clicked.connect(self.validate_input)
 
+        self.import_button = QPushButton("Import")
+        self.import_button.setFont(font)
+        self.import_button.setObjectName("import_button")
+        self.import_button.setToolTip("Import a text file with one link per line")
+        self.import_button.clicked.connect(self.import_file)
+
         search_layout = QHBoxLayout(search_frame)
         search_layout.setContentsMargins(0, 0, 0, 0)
         search_layout.setSpacing(0)
         search_layout.addWidget(self.url_input)
         search_layout.addWidget(self.search_button)
+        search_layout.addWidget(self.import_button)
+
+        self.bulk_status_label = QLabel("")
+        self.bulk_status_label.setFont(font)
+        self.bulk_status_label.setObjectName("bulk_status_label")
+        self.bulk_status_label.setVisible(False)
 
         header_layout.addWidget(self.request_progress_bar)
         header_layout.addWidget(search_frame)
+        header_layout.addWidget(self.bulk_status_label)
 
         spacer_item_1 = QSpacerItem(
             60, 400, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding
@@ -108,10 +132,15 @@ class HomePage(QWidget):
         is valid, it disables UI widgets, starts a request thread using the validated
         URL, and connects success and error signals from the thread to the appropriate
         handler methods (`handle_request_success` and `handle_request_error`).
+        When several links were pasted, they are imported in bulk instead.
 
         Raises:
             InvalidUQLoadURL: If the provided URL is not a valid UQLoad URL.
         """
+        if len(self.url_input.text().split()) > 1:
+            self.start_bulk_import(self.url_input.text())
+            self.url_input.setText("")
+            return
         try:
             self.disable_widgets()
             self.start_request_thread(validate_uqload_url(self.url_input.text()))
@@ -125,18 +154,136 @@ class HomePage(QWidget):
         Starts a request thread with the provided URL.
 
         This private method creates a `RequestThread` object using the given URL,
-        connects its success and error signals to the appropriate handler methods
-        (`handle_request_success` and `handle_request_error`), and starts the thread
-        execution.
+        or an `AsyncRequest` when the asyncio download engine is selected, connects
+        its success and error signals to the appropriate handler methods
+        (`handle_request_success` and `handle_request_error`), and starts it.
 
         Args:
             url (str): The validated UQLoad URL to use for the request.
         """
-        self.request_thread = RequestThread(url)
+        # the network stack is imported on the first request, not at startup
+        from uqload_dl_gui.requestThread import AsyncRequest, RequestThread
+
+        settings = get_config()
+        probe_size = not settings.value("fast_resolve", type=bool)
+        embed_only = settings.value("embed_only", type=bool)
+        if settings.value("download_engine") == "asyncio":
+            self.request_thread = AsyncRequest(url, probe_size, embed_only)
+        else:
+            self.request_thread = RequestThread(url, probe_size, embed_only)
         self.request_thread.success_signal.connect(self.handle_request_success)
         self.request_thread.error_signal.connect(self.handle_request_error)
         self.request_thread.start()
 
+    def import_file(self) -> None:
+        """Ask for a text file of links and import them in bulk."""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import links", "", "Text files (*.txt);;All files (*)"
+        )
+        if not path:
+            return
+        try:
+            text = Path(path).read_text(errors="replace")
+        except OSError as ex:
+            self.show_error_dialog(str(ex))
+            return
+        self.start_bulk_import(text)
+
+    def start_bulk_import(self, text: str) -> None:
+        """
+        Resolve every link of a text and queue the videos as they are resolved.
+
+        The links are normalised and de-duplicated, then resolved by a
+        `BulkResolver` with at most `resolver_workers` requests at a time.
+        Every resolved video is emitted with `bulk_data_sent` right away.
+        Entries that are not valid links count as failed.
+
+        Args:
+            text (str): The text containing the links.
+        """
+        if self.bulk_resolver is not None:
+            self.show_error_dialog("An import is already in progress.")
+            return
+        urls, invalid = parse_urls(text)
+        if not len(urls):
+            self.show_error_dialog("No valid UQLoad URL was found.")
+            return
+
+        from uqload_dl_gui.bulkResolver import BulkResolver
+
+        settings = get_config()
+        self.bulk_counts = {
+            "total": len(urls) + invalid,
+            "resolved": 0,
+            "failed": invalid,
+            "queued": 0,
+        }
+        self.bulk_resolver = BulkResolver(
+            urls,
+            int(settings.value("resolver_workers")),
+            get_metadata_cache(),
+            settings.value("download_engine") == "asyncio",
+            not settings.value("fast_resolve", type=bool),
+            settings.value("embed_only", type=bool),
+        )
+        # always queued, so the results arrive in the order they were emitted
+        # whether they come from a resolver thread or from the GUI thread
+        self.bulk_resolver.resolved_signal.connect(
+            self.handle_bulk_resolved, Qt.ConnectionType.QueuedConnection
+        )
+        self.bulk_resolver.failed_signal.connect(
+            self.handle_bulk_failed, Qt.ConnectionType.QueuedConnection
+        )
+        self.bulk_resolver.finished_signal.connect(
+            self.handle_bulk_finished, Qt.ConnectionType.QueuedConnection
+        )
+        self.import_button.setDisabled(True)
+        self.request_progress_bar.setRange(0, self.bulk_counts["total"])
+        self.__update_bulk_status()
+        self.bulk_resolver.start()
+
+    def handle_bulk_resolved(self, video_info: Dict[str, Any]) -> None:
+        """
+        Queue a video resolved by the bulk import.
+
+        Args:
+            video_info (Dict[str, Any]): The information of the resolved video.
+        """
+        self.bulk_counts["resolved"] += 1
+        self.bulk_data_sent.emit(video_info)
+        self.bulk_counts["queued"] += 1
+        self.__update_bulk_status()
+
+    def handle_bulk_failed(self, url: str, error: str) -> None:
+        """
+        Count a link the bulk import could not resolve.
+
+        Args:
+            url (str): The link.
+            error (str): The error message.
+        """
+        self.bulk_counts["failed"] += 1
+        self.__update_bulk_status()
+
+    def handle_bulk_finished(self) -> None:
+        """Re-enable the import once every link was handled."""
+        self.bulk_resolver = None
+        self.import_button.setDisabled(False)
+        self.request_progress_bar.setRange(0, 100)
+        self.request_progress_bar.setValue(0)
+        self.__update_bulk_status()
+
+    def __update_bulk_status(self) -> None:
+        """Show the counters of the bulk import."""
+        counts = self.bulk_counts
+        if self.bulk_resolver is not None:
+            self.request_progress_bar.setValue(counts["resolved"] + counts["failed"])
+        self.bulk_status_label.setText(
+            f"Resolved {counts['resolved']} · Failed {counts['failed']} · "
+            f"Queued {counts['queued']} of {counts['total']}"
+        )
+        self.bulk_status_label.setVisible(True)
+
     def handle_request_success(self, result: Dict[str, Any]) -> None:
         """
         Handles the successful response of the request.
@@ -149,10 +296,86 @@ class HomePage(QWidget):
             result (Dict[str, Any]): The result of the successful request.
         """
         self.card_frame.setVisible(True)
-        self.video_info = result
+        self.video_info = {**result, "page_url": self.request_thread.url}
         self.card_frame.update_card_info(result)
         self.enable_widgets()
         self.card_frame.card_title.setFocus()
+        if not result.get("size"):
+            self.start_probe(result["video_url"])
+        if not result.get("duration") and self.request_thread.embed_only:
+            self.start_details(self.request_thread.url, result["video_url"])
+
+    def start_probe(self, video_url: str) -> None:
+        """
+        Read the size and type of a video resolved without them, in the background.
+
+        Args:
+            video_url (str): The signed video URL.
+        """
+
+        from uqload_dl_gui.concurrentRequester import get_request_executor
+        from uqload_dl_gui.uqload import probe_video
+
+        def on_done(future: Future) -> None:
+            if future.exception() is None:
+                self.probe_finished.emit(video_url, future.result())
+
+        get_request_executor().submit(
+            video_url, probe_video, video_url
+        ).add_done_callback(on_done)
+
+    def start_details(self, url: str, video_url: str) -> None:
+        """
+        Fetch the duration and full title of a video resolved from its embed page.
+
+        Args:
+            url (str): The UQLoad URL of the video.
+            video_url (str): The signed video URL, identifying the displayed card.
+        """
+
+        from uqload_dl_gui.concurrentRequester import get_request_executor
+        from uqload_dl_gui.uqload import UQLoad
+
+        def on_done(future: Future) -> None:
+            if future.exception() is None:
+                self.details_finished.emit(video_url, future.result())
+
+        uqload = UQLoad(url, get_metadata_cache())
+        get_request_executor().submit(
+            uqload.get_video_page_url(), uqload.get_details
+        ).add_done_callback(on_done)
+
+    def handle_details_finished(self, video_url: str, details: Dict[str, Any]) -> None:
+        """
+        Show the duration and full title of the video, if its card is still displayed.
+
+        The title is only replaced if the user has not edited it yet. A failed
+        request is ignored, the card keeps the title of the embed page.
+
+        Args:
+            video_url (str): The signed video URL of the card.
+            details (Dict[str, Any]): The 'title', 'resolution' and 'duration' found.
+        """
+        if not self.video_info or self.video_info.get("video_url") != video_url:
+            return
+        old_title = self.video_info.get("title")
+        self.video_info.update(details)
+        self.card_frame.update_details(self.video_info, old_title)
+
+    def handle_probe_finished(self, video_url: str, info: Dict[str, Any]) -> None:
+        """
+        Show the size and type of the video, if its card is still displayed.
+
+        A failed probe is ignored, the download fills them in anyway.
+
+        Args:
+            video_url (str): The signed video URL that was probed.
+            info (Dict[str, Any]): The 'size' and 'type' of the video.
+        """
+        if not self.video_info or self.video_info.get("video_url") != video_url:
+            return
+        self.video_info.update({key: value for key, value in info.items() if value})
+        self.card_frame.update_file_info(self.video_info)
 
     def handle_request_error(self, error: str) -> None:
         """
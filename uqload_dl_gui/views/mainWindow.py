@@ -1,10 +1,11 @@
-from typing import Dict
-from pathlib import Path
-from uqload_dl_gui.views.downloadPage import DownloadPage
+import logging, os
+from typing import TYPE_CHECKING, Dict, Optional
+from uqload_dl_gui.assetRegistry import get_icon, get_stylesheet
+from uqload_dl_gui.config import get_config, get_data_dir
 from uqload_dl_gui.views.homePage import HomePage
 from uqload_dl_gui.views.sidebar import Sidebar
-from PyQt5.QtGui import QKeyEvent, QIcon
-from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QKeyEvent
+from PyQt5.QtCore import QEvent, QTimer, Qt, pyqtSignal
 from PyQt5.QtWidgets import (
     QWidget,
     QMainWindow,
@@ -13,22 +14,41 @@ from PyQt5.QtWidgets import (
     QMessageBox,
 )
 
-PARENT_PATH = Path(__file__).parent.parent
+if TYPE_CHECKING:
+    from uqload_dl_gui.controlApi import ControlServer
+    from uqload_dl_gui.queueJournal import QueueJournal
+    from uqload_dl_gui.views.downloadPage import DownloadPage
+
+logger = logging.getLogger(__name__)
 
 
 class MainWindow(QMainWindow):
-    """Main application window."""
+    """
+    Main application window.
+
+    The download page, and the network stack it imports, are created on first
+    use: when the downloads are shown, a video is submitted, the control API is
+    served or the queue journal has downloads to resume after the first paint.
+
+    Attributes:
+        first_paint (pyqtSignal): Signal emitted once the window is painted for the first time.
+    """
+
+    first_paint = pyqtSignal()
 
     def __init__(self) -> None:
         super().__init__()
+        self.__download_page: Optional["DownloadPage"] = None
+        self.__painted = False
+        self.control_server: Optional["ControlServer"] = None
         self.init_ui()
 
     def init_ui(self) -> None:
         """Initialize the user interface of the main window."""
         self.setMinimumSize(800, 600)
         self.setWindowTitle("Uqload Downloader GUI")
-        self.setWindowIcon(QIcon(str(PARENT_PATH / "assets/icons/camera_video.ico")))
-        self.setStyleSheet((PARENT_PATH / "assets/styles/mainWindow.qss").read_text())
+        self.setWindowIcon(get_icon("camera_video.ico"))
+        self.setStyleSheet(get_stylesheet("mainWindow"))
 
         self.central_widget = QWidget(self)
         self.central_widget.setObjectName("mainWindow")
@@ -40,12 +60,14 @@ class MainWindow(QMainWindow):
 
         # Pages
         self.home_page = HomePage()
-        self.download_page = DownloadPage()
         self.home_page.data_sent.connect(self.on_submit)
-        self.download_page.queue_full_signal.connect(self.home_page.show_error_dialog)
+        self.home_page.bulk_data_sent.connect(
+            lambda video_info: self.download_page.enqueue(video_info)
+        )
 
+        # replaced by the download page on first use
         self.stacked_widget.addWidget(self.home_page)
-        self.stacked_widget.addWidget(self.download_page)
+        self.stacked_widget.addWidget(QWidget())
 
         self.main_layout = QHBoxLayout(self.central_widget)
         self.main_layout.setContentsMargins(0, 0, 0, 0)
@@ -54,6 +76,124 @@ class MainWindow(QMainWindow):
         self.main_layout.addWidget(self.stacked_widget)
         self.setCentralWidget(self.central_widget)
 
+    @property
+    def download_page(self) -> "DownloadPage":
+        """
+        Get the download page, created the first time it is used.
+
+        Returns:
+            DownloadPage: The download page.
+        """
+        if self.__download_page is None:
+            self.create_download_page()
+        return self.__download_page
+
+    def create_download_page(self, journal: Optional["QueueJournal"] = None) -> None:
+        """
+        Create the download page in place of its placeholder.
+
+        Args:
+            journal (Optional[QueueJournal]): The queue journal to use. Defaults to
+            the journal in the application data directory.
+        """
+        from uqload_dl_gui.views.downloadPage import DownloadPage
+
+        self.__download_page = DownloadPage(journal)
+        index = self.stacked_widget.currentIndex()
+        placeholder = self.stacked_widget.widget(1)
+        self.stacked_widget.insertWidget(1, self.__download_page)
+        self.stacked_widget.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.stacked_widget.setCurrentIndex(index)
+
+    def set_download_limits(self, max_workers: int, max_size: int) -> None:
+        """
+        Apply new concurrency and queue limits to the download page.
+
+        A download page that was not created yet reads them from the settings.
+
+        Args:
+            max_workers (int): Maximum number of downloads running at the same time.
+            max_size (int): Maximum number of items in the queue.
+        """
+        if self.__download_page is not None:
+            self.__download_page.set_limits(max_workers, max_size)
+
+    def set_scheduling_policy(self, policy: str) -> None:
+        """
+        Apply a new scheduling policy to the download page.
+
+        A download page that was not created yet reads it from the settings.
+
+        Args:
+            policy (str): 'fifo' or 'shortest_first'.
+        """
+        if self.__download_page is not None:
+            self.__download_page.set_scheduling_policy(policy)
+
+    def event(self, event: QEvent) -> bool:
+        """
+        Overrides the event handler to notice the first paint of the window.
+
+        Args:
+            event (QEvent): The event.
+
+        Returns:
+            bool: True if the event was handled.
+        """
+        if event.type() == QEvent.Type.Paint and not self.__painted:
+            self.__painted = True
+            # runs once every widget of the first frame is painted
+            QTimer.singleShot(0, self.__after_first_paint)
+        return super().event(event)
+
+    def __after_first_paint(self) -> None:
+        """
+        Emit `first_paint`, then start the work deferred until the window is shown.
+
+        The control API is served if it is enabled, and the download page is
+        created if the queue journal has downloads to resume.
+        """
+        self.first_paint.emit()
+        self.start_control_server()
+        if self.__download_page is not None:
+            return
+        from uqload_dl_gui.queueJournal import QueueJournal
+
+        journal = QueueJournal(os.path.join(get_data_dir(), "queue.sqlite3"))
+        if next(journal.iter_pending(1), None) is not None:
+            self.create_download_page(journal)
+        else:
+            journal.close()
+
+    def start_control_server(self) -> None:
+        """Serve the control API on 127.0.0.1, if it is enabled in the settings."""
+        settings = get_config()
+        if self.control_server is not None or not settings.value(
+            "control_api_enabled", type=bool
+        ):
+            return
+        from uqload_dl_gui.controlApi import ControlServer
+        from uqload_dl_gui.controlBridge import ControlBridge
+
+        self.control_bridge = ControlBridge(self.download_page)
+        try:
+            self.control_server = ControlServer(
+                self.control_bridge,
+                int(settings.value("control_api_port")),
+                token=str(settings.value("control_api_token")) or None,
+            )
+        except OSError as ex:
+            logger.error("Cannot serve the control API: %s", ex)
+            return
+        self.control_server.start()
+
+    def stop_control_server(self) -> None:
+        """Stop the control API, if it is served."""
+        if self.control_server is not None:
+            self.control_server.stop()
+            self.control_server = None
+
     def on_submit(self, video_info: Dict[str, str]) -> None:
         """
         Triggers an animation on the sidebar and sends data to the download page for processing.
@@ -71,6 +211,8 @@ class MainWindow(QMainWindow):
         Args:
             index: The index of the widget to be displayed within the stacked widget.
         """
+        if index == 1:
+            self.download_page
         self.stacked_widget.setCurrentIndex(index)
 
     def show_message_dialog(self) -> QMessageBox.StandardButton:
@@ -95,20 +237,23 @@ class MainWindow(QMainWindow):
         If there are no active downloads, the event is accepted and the window closes.
         If there are active downloads, they are paused,
         and a message dialog prompts the user to confirm closing the window.
-        If the user confirms, all downloads are removed, and the event is accepted, closing the window.
+        If the user confirms, all downloads are stopped and kept in the queue journal
+        to be resumed on the next start, and the event is accepted, closing the window.
         If the user cancels, all downloads are resumed, and the event is ignored.
 
         Args:
             event (QKeyEvent): The close event.
         """
-        if not self.download_page.thread_pool_size:
+        if self.__download_page is None or not self.__download_page.thread_pool_size:
+            self.stop_control_server()
             event.accept()
             return
 
         self.download_page.pause_all()
 
         if self.show_message_dialog() == QMessageBox.StandardButton.Yes:
-            self.download_page.remove_all()
+            self.download_page.shutdown()
+            self.stop_control_server()
             event.accept()
             return
         self.download_page.resume_all()
@@ -121,21 +266,24 @@ class MainWindow(QMainWindow):
         If the Escape key is pressed and there are no active downloads, the window is closed.
         If the Escape key is pressed and there are active downloads,
         they are paused, and a message dialog prompts the user to confirm closing the window.
-        If the user confirms, all downloads are removed, and the window is closed.
+        If the user confirms, all downloads are stopped and the window is closed.
         If the user cancels, all downloads are resumed.
 
         Args:
             event (QKeyEvent): The key press event.
         """
         if event.key() == Qt.Key.Key_Escape:
-            if not self.download_page.thread_pool_size:
+            if (
+                self.__download_page is None
+                or not self.__download_page.thread_pool_size
+            ):
                 self.close()
                 return
 
             self.download_page.pause_all()
 
             if self.show_message_dialog() == QMessageBox.StandardButton.Yes:
-                self.download_page.remove_all()
+                self.download_page.shutdown()
                 self.close()
                 return
             self.download_page.resume_all()
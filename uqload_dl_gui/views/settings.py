@@ -1,5 +1,4 @@
 import os
-from pathlib import Path
 from PyQt5.QtWidgets import (
     QPushButton,
     QVBoxLayout,
@@ -12,12 +11,14 @@ from PyQt5.QtWidgets import (
     QFormLayout,
     QGroupBox,
     QMessageBox,
+    QCheckBox,
+    QComboBox,
 )
-from PyQt5.QtGui import QIcon, QKeyEvent, QFontDatabase, QFont
-from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QKeyEvent
+from PyQt5.QtCore import Qt, pyqtSignal
+from uqload_dl_gui.assetRegistry import get_font, get_icon, get_stylesheet
 from uqload_dl_gui.config import get_config
-
-PARENT_PATH = Path(__file__).parent.parent
+from uqload_dl_gui.bandwidthLimiter import get_bandwidth_limiter
 
 
 class Settings(QDialog):
@@ -25,22 +26,31 @@ class Settings(QDialog):
     Dialog for application settings.
 
     This dialog allows the user to configure various settings such as concurrent downloads,
-    maximum queue size, and output folder.
+    segments per download, maximum queue size, file preallocation, bandwidth limit,
+    download engine, scheduling policy, fast resolve and output folder. The
+    concurrency and queue limits, the bandwidth limit, the scheduling policy and
+    fast resolve are applied immediately; only a new download engine requires a
+    restart.
+
+    Attributes:
+        limits_changed (pyqtSignal): Signal emitted with the new concurrent downloads and max queue size.
+        policy_changed (pyqtSignal): Signal emitted with the new scheduling policy.
     """
 
+    limits_changed = pyqtSignal(int, int)
+    policy_changed = pyqtSignal(str)
+
     def __init__(self) -> None:
         """Initialize the Settings dialog."""
         super().__init__()
-        self.setFixedSize(600, 124)
+        self.setFixedSize(600, 344)
         self.setObjectName("settings")
         self.setWindowTitle("Settings")
-        self.setWindowIcon(QIcon(str(PARENT_PATH / "assets/icons/gear-solid.svg")))
-        self.setStyleSheet((PARENT_PATH / "assets/styles/settings.qss").read_text())
+        self.setWindowIcon(get_icon("gear-solid.svg"))
+        self.setStyleSheet(get_stylesheet("settings"))
         self.changes_pending = False
 
-        font_path = str(PARENT_PATH / "assets/fonts/nunito-font/Nunito-Regular.ttf")
-        font_id = QFontDatabase.addApplicationFont(font_path)
-        font_family = QFontDatabase.applicationFontFamilies(font_id)[0]
+        font = get_font()
 
         self.settings = get_config()
 
@@ -49,57 +59,162 @@ class Settings(QDialog):
         form_layout.setContentsMargins(0, 0, 0, 0)
 
         self.concurrent_download_spin_box = QSpinBox(group_box)
-        self.concurrent_download_spin_box.setFont(QFont(font_family))
+        self.concurrent_download_spin_box.setFont(font)
         self.concurrent_download_spin_box.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.concurrent_download_spin_box.setRange(2, 5)
         self.concurrent_download_spin_box.setValue(
             int(self.settings.value("concurrent_downloads"))
         )
-        self.concurrent_download_spin_box.valueChanged.connect(
-            self.on_spin_box_value_changed
-        )
+        self.concurrent_download_spin_box.valueChanged.connect(self.on_limits_changed)
+
+        self.segments_spin_box = QSpinBox(group_box)
+        self.segments_spin_box.setFont(font)
+        self.segments_spin_box.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.segments_spin_box.setRange(1, 16)
+        self.segments_spin_box.setValue(int(self.settings.value("download_segments")))
+        self.segments_spin_box.valueChanged.connect(self.on_spin_box_value_changed)
 
         self.max_queue_size_spin_box = QSpinBox(group_box)
-        self.max_queue_size_spin_box.setFont(QFont(font_family))
+        self.max_queue_size_spin_box.setFont(font)
         self.max_queue_size_spin_box.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.max_queue_size_spin_box.setRange(10, 50)
         self.max_queue_size_spin_box.setValue(int(self.settings.value("max_queue")))
-        self.max_queue_size_spin_box.valueChanged.connect(
+        self.max_queue_size_spin_box.valueChanged.connect(self.on_limits_changed)
+
+        self.bandwidth_spin_box = QSpinBox(group_box)
+        self.bandwidth_spin_box.setFont(font)
+        self.bandwidth_spin_box.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.bandwidth_spin_box.setRange(0, 1000000)
+        self.bandwidth_spin_box.setSingleStep(100)
+        self.bandwidth_spin_box.setSpecialValueText("Unlimited")
+        self.bandwidth_spin_box.setSuffix(" KB/s")
+        self.bandwidth_spin_box.setValue(
+            int(self.settings.value("bandwidth_limit_kbps"))
+        )
+        self.bandwidth_spin_box.valueChanged.connect(self.on_bandwidth_limit_changed)
+
+        self.engine_combo_box = QComboBox(group_box)
+        self.engine_combo_box.setFont(font)
+        self.engine_combo_box.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.engine_combo_box.addItem("Threads", "threads")
+        self.engine_combo_box.addItem("asyncio", "asyncio")
+        self.engine_combo_box.setCurrentIndex(
+            max(
+                0,
+                self.engine_combo_box.findData(self.settings.value("download_engine")),
+            )
+        )
+        self.engine_combo_box.currentIndexChanged.connect(
             self.on_spin_box_value_changed
         )
 
+        self.scheduling_combo_box = QComboBox(group_box)
+        self.scheduling_combo_box.setFont(font)
+        self.scheduling_combo_box.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.scheduling_combo_box.addItem("First in, first out", "fifo")
+        self.scheduling_combo_box.addItem("Smallest first", "shortest_first")
+        self.scheduling_combo_box.setToolTip(
+            "Start the queued downloads with the fewest bytes left first"
+        )
+        self.scheduling_combo_box.setCurrentIndex(
+            max(
+                0,
+                self.scheduling_combo_box.findData(
+                    self.settings.value("scheduling_policy")
+                ),
+            )
+        )
+        self.scheduling_combo_box.currentIndexChanged.connect(
+            self.on_scheduling_policy_changed
+        )
+
+        self.preallocate_check_box = QCheckBox(group_box)
+        self.preallocate_check_box.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.preallocate_check_box.setChecked(
+            self.settings.value("preallocate", type=bool)
+        )
+        self.preallocate_check_box.toggled.connect(self.on_spin_box_value_changed)
+
+        self.fast_resolve_check_box = QCheckBox(group_box)
+        self.fast_resolve_check_box.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.fast_resolve_check_box.setToolTip(
+            "Skip the size request, the size is shown once the download starts"
+        )
+        self.fast_resolve_check_box.setChecked(
+            self.settings.value("fast_resolve", type=bool)
+        )
+        self.fast_resolve_check_box.toggled.connect(self.on_fast_resolve_changed)
+
+        self.embed_only_check_box = QCheckBox(group_box)
+        self.embed_only_check_box.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.embed_only_check_box.setToolTip(
+            "Resolve from the embed page only, the duration is loaded afterwards"
+        )
+        self.embed_only_check_box.setChecked(
+            self.settings.value("embed_only", type=bool)
+        )
+        self.embed_only_check_box.toggled.connect(self.on_embed_only_changed)
+
         field = QFrame()
         field_layout = QHBoxLayout(field)
         field_layout.setContentsMargins(0, 0, 0, 0)
 
         # Label to display selected folder path
         self.folder_label = QLabel(f"{self.settings.value('output_dir')}")
-        self.folder_label.setFont(QFont(font_family))
+        self.folder_label.setFont(font)
         self.folder_label.setObjectName("folder_label")
 
         self.change_folder_button = QPushButton(
-            icon=QIcon(str(PARENT_PATH / "assets/icons/folder-open-regular.svg")),
+            icon=get_icon("folder-open-regular.svg"),
             text="Browse...",
         )
-        self.change_folder_button.setFont(QFont(font_family))
+        self.change_folder_button.setFont(font)
         self.change_folder_button.clicked.connect(self.select_folder)
 
         field_layout.addWidget(self.folder_label)
         field_layout.addWidget(self.change_folder_button)
 
         self.max_size_label = QLabel("Max queue size: ")
-        self.max_size_label.setFont(QFont(font_family))
+        self.max_size_label.setFont(font)
 
         self.concurrent_downloads_label = QLabel("Concurrent Downloads: ")
-        self.concurrent_downloads_label.setFont(QFont(font_family))
+        self.concurrent_downloads_label.setFont(font)
+
+        self.segments_label = QLabel("Segments per Download: ")
+        self.segments_label.setFont(font)
+
+        self.bandwidth_label = QLabel("Bandwidth Limit: ")
+        self.bandwidth_label.setFont(font)
+
+        self.engine_label = QLabel("Download Engine: ")
+        self.engine_label.setFont(font)
+
+        self.scheduling_label = QLabel("Scheduling: ")
+        self.scheduling_label.setFont(font)
+
+        self.preallocate_label = QLabel("Preallocate Files: ")
+        self.preallocate_label.setFont(font)
+
+        self.fast_resolve_label = QLabel("Fast Resolve: ")
+        self.fast_resolve_label.setFont(font)
+
+        self.embed_only_label = QLabel("Embed Page Only: ")
+        self.embed_only_label.setFont(font)
 
         output_folder_label = QLabel("Output Folder: ")
-        output_folder_label.setFont(QFont(font_family))
+        output_folder_label.setFont(font)
 
         form_layout.addRow(self.max_size_label, self.max_queue_size_spin_box)
         form_layout.addRow(
             self.concurrent_downloads_label, self.concurrent_download_spin_box
         )
+        form_layout.addRow(self.segments_label, self.segments_spin_box)
+        form_layout.addRow(self.bandwidth_label, self.bandwidth_spin_box)
+        form_layout.addRow(self.engine_label, self.engine_combo_box)
+        form_layout.addRow(self.scheduling_label, self.scheduling_combo_box)
+        form_layout.addRow(self.preallocate_label, self.preallocate_check_box)
+        form_layout.addRow(self.fast_resolve_label, self.fast_resolve_check_box)
+        form_layout.addRow(self.embed_only_label, self.embed_only_check_box)
         form_layout.addRow(output_folder_label, field)
 
         main_layout = QVBoxLayout()
@@ -115,6 +230,65 @@ class Settings(QDialog):
         """
         self.changes_pending = True
 
+    def on_limits_changed(self) -> None:
+        """
+        Handle concurrent downloads or max queue size changed event.
+
+        The new limits are saved and emitted with `limits_changed`, so the
+        download queue applies them without a restart.
+        """
+        max_workers = int(self.concurrent_download_spin_box.value())
+        max_size = int(self.max_queue_size_spin_box.value())
+        self.settings.setValue("concurrent_downloads", max_workers)
+        self.settings.setValue("max_queue", max_size)
+        self.limits_changed.emit(max_workers, max_size)
+
+    def on_scheduling_policy_changed(self) -> None:
+        """
+        Handle scheduling policy changed event.
+
+        The policy is saved and emitted with `policy_changed`, so the queued
+        downloads are reordered right away.
+        """
+        policy = str(self.scheduling_combo_box.currentData())
+        self.settings.setValue("scheduling_policy", policy)
+        self.policy_changed.emit(policy)
+
+    def on_bandwidth_limit_changed(self, value: int) -> None:
+        """
+        Handle bandwidth limit changed event.
+
+        The new limit is saved and applied to the running downloads right away,
+        so it does not require a restart.
+
+        Args:
+            value (int): The new limit in KB/s, 0 for no limit.
+        """
+        self.settings.setValue("bandwidth_limit_kbps", int(value))
+        get_bandwidth_limiter().set_rate(int(value) * 1024)
+
+    def on_fast_resolve_changed(self, checked: bool) -> None:
+        """
+        Handle fast resolve toggled event.
+
+        The setting is saved right away and used by the next resolved link.
+
+        Args:
+            checked (bool): True to resolve links without the size request.
+        """
+        self.settings.setValue("fast_resolve", checked)
+
+    def on_embed_only_changed(self, checked: bool) -> None:
+        """
+        Handle embed page only toggled event.
+
+        The setting is saved right away and used by the next resolved link.
+
+        Args:
+            checked (bool): True to resolve links from the embed page alone.
+        """
+        self.settings.setValue("embed_only", checked)
+
     def apply_changes(self) -> None:
         """
         Apply changes made in settings dialog.
@@ -122,25 +296,30 @@ class Settings(QDialog):
         This method applies the changes made in the settings dialog by updating the application settings.
         """
         # update settings
-        self.settings.setValue("max_queue", int(self.max_queue_size_spin_box.value()))
-        self.settings.setValue(
-            "concurrent_downloads", int(self.concurrent_download_spin_box.value())
-        )
+        self.settings.setValue("download_segments", int(self.segments_spin_box.value()))
+        self.settings.setValue("preallocate", self.preallocate_check_box.isChecked())
+        self.settings.setValue("download_engine", self.engine_combo_box.currentData())
 
     def closeEvent(self, event) -> None:
         """
         Override close event.
 
         This method is called when the dialog is being closed. If there are pending changes,
-        it applies the changes and shows a restart message.
+        it applies the changes. Segments and file preallocation are used by the next
+        download, so a restart message is only shown when the download engine changed.
 
         Args:
             event: Close event object.
         """
         if not self.changes_pending:
             return
+        engine_changed = self.engine_combo_box.currentData() != self.settings.value(
+            "download_engine"
+        )
         self.apply_changes()
-        self.show_restart_message()
+        if engine_changed:
+            self.show_restart_message()
+        self.changes_pending = False
 
     def show_restart_message(self) -> None:
         """
@@ -1,6 +1,5 @@
-from pathlib import Path
-from uqload_dl_gui.views.settings import Settings
-from PyQt5.QtGui import QIcon
+from typing import TYPE_CHECKING, Optional
+from uqload_dl_gui.assetRegistry import get_icon, get_stylesheet
 from PyQt5.QtCore import QPropertyAnimation, QRect
 from PyQt5.QtWidgets import (
     QFrame,
@@ -11,7 +10,8 @@ from PyQt5.QtWidgets import (
     QWidget,
 )
 
-PARENT_PATH = Path(__file__).parent.parent
+if TYPE_CHECKING:
+    from uqload_dl_gui.views.settings import Settings
 
 
 class Sidebar(QFrame):
@@ -36,24 +36,20 @@ class Sidebar(QFrame):
     def init_ui(self) -> None:
         """Initialize the user interface of the Sidebar widget."""
         self.setObjectName("sidebar")
-        self.setStyleSheet((PARENT_PATH / "assets/styles/sidebar.qss").read_text())
+        self.setStyleSheet(get_stylesheet("sidebar"))
 
         self.home_button = QPushButton()
-        self.home_button.setIcon(QIcon(str(PARENT_PATH / "assets/icons/house.svg")))
+        self.home_button.setIcon(get_icon("house.svg"))
 
         self.downloads_button = QPushButton()
-        self.downloads_button.setIcon(
-            QIcon(str(PARENT_PATH / "assets/icons/download.svg"))
-        )
+        self.downloads_button.setIcon(get_icon("download.svg"))
 
         spacer_item = QSpacerItem(
             60, 400, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding
         )
 
         self.settings_button = QPushButton()
-        self.settings_button.setIcon(
-            QIcon(str(PARENT_PATH / "assets/icons/gear-solid.svg"))
-        )
+        self.settings_button.setIcon(get_icon("gear-solid.svg"))
 
         self.sidebar_vertical_layout = QVBoxLayout(self)
         self.sidebar_vertical_layout.setContentsMargins(0, 10, 0, 10)
@@ -65,8 +61,18 @@ class Sidebar(QFrame):
         self.home_button.clicked.connect(lambda: self.parent.change_content(0))
         self.downloads_button.clicked.connect(lambda: self.parent.change_content(1))
         # self.downloads_button.clicked.connect(self.start_animation)
-        self.settings = Settings()
-        self.settings_button.clicked.connect(lambda: self.settings.exec())
+        self.settings: Optional["Settings"] = None
+        self.settings_button.clicked.connect(self.open_settings)
+
+    def open_settings(self) -> None:
+        """Show the Settings dialog, created the first time it is opened."""
+        if self.settings is None:
+            from uqload_dl_gui.views.settings import Settings
+
+            self.settings = Settings()
+            self.settings.limits_changed.connect(self.parent.set_download_limits)
+            self.settings.policy_changed.connect(self.parent.set_scheduling_policy)
+        self.settings.exec()
 
     def start_animation(self) -> None:
         """
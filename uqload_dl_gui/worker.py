@@ -1,62 +1,496 @@
-import time, random, requests, os
-from typing import Dict
+import logging, time, requests, os
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
 from uuid import uuid4
-from threading import Event
+from threading import Event, Lock, Thread
 from urllib.parse import urlparse
-from PyQt5.QtCore import pyqtSignal, QObject, QRunnable
 from uqload_dl_gui.config import get_config
+from uqload_dl_gui.connectionManager import get_connection_manager
+from uqload_dl_gui.diskWriter import DiskWriter, get_memory_budget
+from uqload_dl_gui.bandwidthLimiter import BandwidthShare, get_bandwidth_limiter
+from uqload_dl_gui.adaptiveChunkSize import AdaptiveChunkSize
+from uqload_dl_gui.partFile import (
+    PartFile,
+    claim_part_file,
+    get_validators,
+    release_part_file,
+    split_ranges,
+)
+from uqload_dl_gui.progressThrottle import ProgressThrottle
+from uqload_dl_gui.signals import create_download_signals
 from uqload_dl_gui.exceptions import (
     MissingContentLengthError,
     Non200StatusCodeError,
     DownloadCancelledError,
+    IncompleteDownloadError,
+    InsufficientSpaceError,
+)
+
+logger = logging.getLogger(__name__)
+
+# segments smaller than this are not worth an extra connection
+MIN_SEGMENT_SIZE = 1024 * 1024
+# bytes written by a segment between two sidecar updates
+COMMIT_SIZE = 4 * 1024 * 1024
+
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/124.0.0.0 Safari/537.36"
 )
 
 
-class Signals(QObject):
+def get_missing_info(
+    video_info: Dict[str, Any], headers: Mapping[str, str]
+) -> Dict[str, Any]:
+    """
+    Get the size and type the video information lacks from the download response.
+
+    Videos resolved without the HEAD request have no size and type yet, and a
+    stale cached size is corrected by the actual response.
+
+    Args:
+        video_info (Dict[str, Any]): The information of the video.
+        headers (Mapping[str, str]): The headers of the full GET response.
+
+    Returns:
+        Dict[str, Any]: The 'size' and 'type' that are missing or changed.
+    """
+    info = {}
+    size = int(headers.get("content-length", 0))
+    if size and int(video_info.get("size") or 0) != size:
+        info["size"] = size
+    content_type = headers.get("content-type")
+    if content_type and not video_info.get("type"):
+        info["type"] = content_type
+    return info
+
+
+def get_file_name(video_info: Dict[str, Any]) -> Tuple[str, str, str]:
+    """
+    Get the URL of a video and the name of the file it is saved to.
+
+    The file is named after the title of the video, or after the URL when the
+    video has no title.
+
+    Args:
+        video_info (Dict[str, Any]): The information of the video.
+
+    Returns:
+        Tuple[str, str, str]: The URL, the file name without extension and the
+        extension, including the dot.
+
+    Raises:
+        ValueError: If the URL is not a non empty string or has no file name.
+    """
+    url = video_info.get("video_url", None)
+    filename = video_info.get("title", None)
+
+    if not isinstance(url, str) or not len(url):
+        raise ValueError("URL must be a non empty string")
+
+    # Get filename and extension from the URL
+    root, ext = os.path.splitext(os.path.basename(urlparse(url).path))
+    if root == "" or ext == "":
+        raise ValueError("URL must be a non empty string")
+
+    filename = root if filename is None or filename == "" else filename
+    return url, filename, ext
+
+
+def claim_download(
+    video_info: Dict[str, Any], output_dir: str
+) -> Tuple[str, Dict[str, str], PartFile]:
+    """
+    Get the URL and request headers of a video and claim its partial file.
+
+    The chosen destination is recorded in the 'destination_path' of the video
+    information, which is kept with the queued item, so a download resumed
+    later finds its partial file even under a unique name.
+
+    Args:
+        video_info (Dict[str, Any]): The information of the video.
+        output_dir (str): The directory to save the video to.
+
+    Returns:
+        Tuple[str, Dict[str, str], PartFile]: The URL of the video, the headers
+        of the download requests and the claimed partial file.
+
+    Raises:
+        ValueError: If the URL is not a non empty string or has no file name.
+    """
+    url, filename, ext = get_file_name(video_info)
+    parsed_url = urlparse(url)
+    headers = {
+        "User-Agent": USER_AGENT,
+        "Referer": f"{parsed_url.scheme}://{parsed_url.netloc}",
+    }
+    part = claim_part_file(
+        output_dir, filename, ext, video_info.get("destination_path")
+    )
+    video_info["destination_path"] = part.destination_path
+    return url, headers, part
+
+
+def get_committed_bytes(video_info: Dict[str, Any], output_dir: str) -> int:
+    """
+    Get the bytes a previous attempt left in the partial file of a video.
+
+    Workers count them as downloaded before they start, so the
+    'shortest_first' policy orders a resumable download by what is left.
+
+    Args:
+        video_info (Dict[str, Any]): The information of the video.
+        output_dir (str): The directory the video is saved to.
+
+    Returns:
+        int: The committed bytes of a partial file of the same size, 0 if there
+        is none.
+    """
+    try:
+        url, filename, ext = get_file_name(video_info)
+        size = int(video_info.get("size") or 0)
+    except (TypeError, ValueError):
+        return 0
+    part = PartFile(
+        video_info.get("destination_path")
+        or os.path.join(output_dir, f"{filename}{ext}")
+    )
+    if not part.load() or (size and not part.matches(size, url)):
+        return 0
+    return part.bytes_committed
+
+
+def apply_transfer_limits(settings: Any) -> None:
+    """
+    Apply the bandwidth limit and write buffer settings.
+
+    They go to the process-wide bandwidth limiter and memory budget, once by
+    the owner of the download queue rather than by every download.
+
+    Args:
+        settings (Any): The settings to read, as returned by `get_config`.
+    """
+    get_memory_budget().set_limit(int(settings.value("write_buffer_mb")) * 1024 * 1024)
+    get_bandwidth_limiter().set_rate(int(settings.value("bandwidth_limit_kbps")) * 1024)
+
+
+def get_content_length(status_code: int, headers: Mapping[str, str]) -> int:
+    """
+    Check the first response of a download and get the size of the file.
+
+    Args:
+        status_code (int): The HTTP status code of the response.
+        headers (Mapping[str, str]): The headers of the response.
+
+    Returns:
+        int: The size of the file.
+
+    Raises:
+        Non200StatusCodeError: If the status code is not 200.
+        MissingContentLengthError: If the 'Content-Length' header is missing.
+    """
+    if status_code != 200:
+        raise Non200StatusCodeError(f"Unexpected status code: {status_code}")
+
+    total_size = int(headers.get("content-length", 0))
+
+    if not total_size:
+        raise MissingContentLengthError("Content-Length header is missing")
+    return total_size
+
+
+def prepare_part_file(
+    part: PartFile,
+    url: str,
+    total_size: int,
+    headers: Mapping[str, str],
+    segments: int,
+    preallocate: bool,
+) -> bool:
     """
-    Custom signals emitted by the Worker class during different stages of the download process.
-
-    Signals:
-        progress_update: Emitted to update the progress of the download.
-        download_started: Emitted when the download process starts.
-        download_completed: Emitted when the download process is successfully completed.
-        download_cancelled: Emitted when the download process is cancelled by the user.
-        download_error: Emitted when an error occurs during the download process.
+    Load or create the sidecar of a partial file from the first response.
+
+    If the server advertises `Accept-Ranges: bytes`, a partial from a previous
+    attempt is continued when it matches the size and the ETag, Last-Modified
+    date or URL path of the response, and a new download is split into `segments`
+    parallel segments when there are more than one. Otherwise the download
+    starts over with the body of the first response.
+
+    Args:
+        part (PartFile): The claimed partial file.
+        url (str): The URL of the file.
+        total_size (int): The size of the file.
+        headers (Mapping[str, str]): The headers of the first response.
+        segments (int): The number of parallel segments of a new download.
+        preallocate (bool): True to reserve the whole file on disk up front.
+
+    Returns:
+        bool: True if the body of the first response must be streamed, False if
+        the remaining segments must be requested with Range requests.
     """
+    accepts_ranges = headers.get("accept-ranges", "").lower() == "bytes"
+    etag, last_modified = get_validators(headers)
+
+    if (
+        accepts_ranges
+        and part.load()
+        and part.matches(total_size, url, etag, last_modified)
+    ):
+        logger.info(
+            "Resuming %s at %d bytes", part.destination_path, part.bytes_committed
+        )
+        if preallocate:
+            part.preallocate()
+        return False
+    if accepts_ranges and segments > 1:
+        part.create(
+            url,
+            total_size,
+            split_ranges(total_size, segments, MIN_SEGMENT_SIZE),
+            preallocate,
+            etag,
+            last_modified,
+        )
+        return False
+    part.create(
+        url, total_size, [[0, total_size - 1]], preallocate, etag, last_modified
+    )
+    return True
+
+
+class DownloadProgress:
+    """
+    Thread-safe byte counter of a download, shared by its segments.
+
+    Progress updates are rate-limited by a ProgressThrottle so the GUI thread
+    is not flooded with queued signals; the update that completes the download
+    is always emitted.
+
+    Attributes:
+        interval (float): Minimum number of seconds between two updates.
+        min_bytes (int): Minimum number of bytes between two updates.
+    """
+
+    def __init__(self, signals: Any, interval: float, min_bytes: int) -> None:
+        """
+        Initialize the DownloadProgress.
+
+        Args:
+            signals (Any): The signals of the worker, `progress_update` is emitted.
+            interval (float): Minimum number of seconds between two updates.
+            min_bytes (int): Minimum number of bytes between two updates.
+        """
+        self.interval = interval
+        self.min_bytes = min_bytes
+        self.__signals = signals
+        self.__throttle = ProgressThrottle(interval, min_bytes)
+        self.__lock = Lock()
+        self.__value = 0
+
+    @property
+    def value(self) -> int:
+        """
+        Get the number of bytes downloaded so far.
+
+        Returns:
+            int: The number of bytes downloaded.
+        """
+        with self.__lock:
+            return self.__value
+
+    def reset(self, value: int) -> None:
+        """
+        Set the number of bytes downloaded, when a download starts or resumes.
+
+        Args:
+            value (int): The number of bytes already downloaded.
+        """
+        with self.__lock:
+            self.__value = value
+
+    def add(self, size: int, total: int) -> None:
+        """
+        Add bytes received by a segment and emit the progress if due.
+
+        Args:
+            size (int): The number of bytes just received.
+            total (int): The total size of the file being downloaded.
+        """
+        with self.__lock:
+            self.__value += size
+            if self.__throttle.ready(self.__value, total):
+                self.__signals.progress_update.emit(self.__value, total)
+
+    def flush(self) -> None:
+        """Emit the last progress update held back by the throttle, if any."""
+        with self.__lock:
+            pending = self.__throttle.flush()
+        if pending is not None:
+            self.__signals.progress_update.emit(*pending)
+
+
+class PartWriter:
+    """
+    Write-behind writer of a partial file that keeps its sidecar up to date.
+
+    Chunks go through a DiskWriter, charged to the shared MemoryBudget. Bytes
+    are committed to the sidecar once they are on disk, every `COMMIT_SIZE`
+    bytes per segment and once more when the writer is closed, so an
+    interrupted download can be resumed.
+    """
+
+    def __init__(self, part: PartFile) -> None:
+        """
+        Open the partial file for writing.
+
+        Args:
+            part (PartFile): The partial file, with its segments created or loaded.
+        """
+        self.__part = part
+        self.__uncommitted = [0] * len(part.segments)
+        self.__writer = DiskWriter(part.part_path, self.__on_written)
+
+    def write(
+        self,
+        index: int,
+        offset: int,
+        data: Union[bytes, memoryview],
+        check: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Queue data of a segment to be written at the given offset.
+
+        Blocks while the memory budget or the queue of the file is full.
+
+        Args:
+            index (int): The index of the segment the data belongs to.
+            offset (int): The file offset to write the data at.
+            data (Union[bytes, memoryview]): The data to write.
+            check (Optional[Callable[[], None]]): Called periodically while blocked,
+            may raise to abort the wait.
+
+        Raises:
+            OSError: If a previous write failed.
+        """
+        self.__writer.write(index, offset, data, check)
+
+    def close(self) -> None:
+        """
+        Drain and close the disk writer, then commit what it wrote to the sidecar.
+
+        Raises:
+            OSError: If any write failed.
+        """
+        try:
+            self.__writer.close()
+        finally:
+            for index, size in enumerate(self.__uncommitted):
+                self.__part.commit(index, size)
+            self.__uncommitted = [0] * len(self.__uncommitted)
 
-    progress_update = pyqtSignal(int, int)
-    download_started = pyqtSignal()
-    download_completed = pyqtSignal()
-    download_cancelled = pyqtSignal()
-    download_error = pyqtSignal(str)
+    def __on_written(self, index: int, size: int) -> None:
+        """
+        Commit bytes written to disk by the disk writer to the sidecar.
+
+        Called from the writer thread only.
 
+        Args:
+            index (int): The index of the segment in the partial file.
+            size (int): The number of bytes just written.
+        """
+        self.__uncommitted[index] += size
+        if self.__uncommitted[index] >= COMMIT_SIZE:
+            self.__part.commit(index, self.__uncommitted[index])
+            self.__uncommitted[index] = 0
 
-class Worker(QRunnable):
+
+class Worker:
     """
     A worker class for downloading videos.
 
     This class represents a worker responsible for downloading videos from a given URL.
+    It does not depend on Qt: the GUI runs it on a CustomThreadPool and the command
+    line on a plain thread pool.
 
     Attributes:
         video_info (Dict[str, str]): A dictionary containing information about the video,
         including title and video URL.
+        item_id (str): The identifier of the item in the queue journal.
     """
 
-    def __init__(self, video_info: Dict[str, str]) -> None:
+    def __init__(
+        self,
+        video_info: Dict[str, str],
+        item_id: Optional[str] = None,
+        progress_interval: Optional[float] = None,
+        progress_min_bytes: Optional[int] = None,
+        weight: float = 1.0,
+        signals: Any = None,
+        output_dir: Optional[str] = None,
+    ) -> None:
         """
         Initialize the Worker instance with video information.
 
         Args:
             video_info (Dict[str, str]): A dictionary containing information about the video,
             including title and video URL.
+            item_id (Optional[str]): The identifier of the item in the queue journal.
+            progress_interval (Optional[float]): Minimum seconds between two progress
+            updates. Defaults to the 'progress_interval_ms' setting.
+            progress_min_bytes (Optional[int]): Minimum bytes between two progress
+            updates. Defaults to the 'progress_min_bytes' setting.
+            weight (float): The share of the bandwidth limit relative to other downloads.
+            signals (Any): The signals to emit, `DownloadSignals` for a headless
+            download. Defaults to the Qt signals when PyQt5 is installed.
+            output_dir (Optional[str]): The directory to save the video to. Defaults
+            to the 'output_dir' setting.
         """
-        super().__init__()
         self.video_info = self.__validate_video_info(video_info)
+        settings = get_config()
+        self.item_id = uuid4().hex if item_id is None else item_id
         self.__pause_event = Event()
-        self.signals = Signals()
+        self.signals = create_download_signals() if signals is None else signals
         self.__cancelled = False
         self.is_running = False
-        self.__output_dir = self.__validate_output_dir(get_config().value("output_dir"))
+        self.__output_dir = self.__validate_output_dir(
+            settings.value("output_dir") if output_dir is None else output_dir,
+            settings,
+        )
+        self.__segments = max(1, int(settings.value("download_segments")))
+        self.__min_chunk_size = int(settings.value("min_chunk_kb")) * 1024
+        self.__max_chunk_size = int(settings.value("max_chunk_kb")) * 1024
+        self.__preallocate = settings.value("preallocate", type=bool)
+        self.__writer: Optional[PartWriter] = None
+        self.__weight = weight
+        self.__bandwidth: Optional[BandwidthShare] = None
+        self.__http = get_connection_manager()
+        self.__concurrent_downloads = int(settings.value("concurrent_downloads"))
+        self.__part: Optional[PartFile] = None
+        self.__progress = DownloadProgress(
+            self.signals,
+            (
+                int(settings.value("progress_interval_ms")) / 1000
+                if progress_interval is None
+                else progress_interval
+            ),
+            (
+                int(settings.value("progress_min_bytes"))
+                if progress_min_bytes is None
+                else progress_min_bytes
+            ),
+        )
+        self.__progress.reset(get_committed_bytes(self.video_info, self.__output_dir))
         self.__pause_event.set()
 
     def __validate_video_info(self, video_info: Dict[str, str]) -> None:
@@ -64,7 +498,7 @@ class Worker(QRunnable):
             raise ValueError("video_info must be a dict")
         return video_info
 
-    def __validate_output_dir(self, output_dir: str) -> str:
+    def __validate_output_dir(self, output_dir: str, settings: Any) -> str:
         """
         Validate the output directory and return the normalized directory path.
 
@@ -72,16 +506,28 @@ class Worker(QRunnable):
 
         Args:
             output_dir (str): The output directory path to be validated.
+            settings (Any): The settings of the application, updated with the
+            current working directory if the output directory does not exist.
 
         Returns:
             str: The validated and normalized output directory path.
         """
         if not os.path.isdir(output_dir):
             current_directory = os.getcwd()
-            get_config().setValue("output_dir", os.path.normpath(current_directory))
+            settings.setValue("output_dir", os.path.normpath(current_directory))
             return current_directory
         return output_dir
 
+    @property
+    def bytes_downloaded(self) -> int:
+        """
+        Get the number of bytes downloaded so far.
+
+        Returns:
+            int: The number of bytes downloaded.
+        """
+        return self.__progress.value
+
     def run(self) -> None:
         """Run the worker task, initiating the download process."""
         self.__download()
@@ -89,41 +535,33 @@ class Worker(QRunnable):
     def __download(self) -> None:
         """Initiate the download process of the video."""
         try:
-            url = self.video_info.get("video_url", None)
-            filename = self.video_info.get("title", None)
-
-            if not isinstance(url, str) or not len(url):
-                raise ValueError("URL must be a non empty string")
-
-            parsed_url = urlparse(url)
-            self.headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/124.0.0.0 Safari/537.36",
-                "Referer": f"{parsed_url.scheme}://{parsed_url.netloc}",
-            }
-
-            # Get filename and extension from the URL
-            root, ext = os.path.splitext(os.path.basename(parsed_url.path))
-            if root == "" or ext == "":
-                raise ValueError("URL must be a non empty string")
-
-            filename = root if filename is None or filename == "" else filename
-
-            self.destination_path = os.path.join(self.__output_dir, f"{filename}{ext}")
-
-            # check if the file already exist
-            if os.path.isfile(self.destination_path):
-                self.destination_path = os.path.join(
-                    self.__output_dir,
-                    f"{filename}_{uuid4().hex}{ext}",
-                )
+            url, self.headers, self.__part = claim_download(
+                self.video_info, self.__output_dir
+            )
+            self.destination_path = self.__part.destination_path
 
-            # self.__download_test(url)
             self.__download_file(url)
         except Exception as ex:
-            print(str(ex))
+            logger.warning("Download of %s failed: %s", self.item_id, ex)
             self.on_download_error(str(ex))
+        finally:
+            self.__release_part()
+
+    def set_weight(self, weight: float) -> None:
+        """
+        Change the share of the bandwidth limit relative to other downloads.
+
+        Args:
+            weight (float): The new weight, must be positive.
+
+        Raises:
+            ValueError: If the weight is not positive.
+        """
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        self.__weight = weight
+        if self.__bandwidth is not None:
+            self.__bandwidth.set_weight(weight)
 
     def start_download(self) -> None:
         """Start the download process."""
@@ -135,14 +573,27 @@ class Worker(QRunnable):
         self.__cancelled = True
         self.__pause_event.set()
 
+    def __release_part(self) -> None:
+        """
+        Mark the partial file as no longer active.
+
+        Called before the outcome of the download is reported, so a download
+        resumed right away can claim the same partial file.
+        """
+        if self.__part is not None:
+            release_part_file(self.__part)
+            self.__part = None
+
     def on_download_cancelled(self) -> None:
         """Handle the case when the download is cancelled."""
-        print("Download cancelled. Incomplete file may be saved.")
+        self.__release_part()
+        logger.info("Download of %s cancelled, partial file kept", self.item_id)
         self.signals.download_cancelled.emit()
 
     def on_download_complete(self) -> None:
         """Handle the case when the download is completed successfully."""
-        print(f"Download successful. File saved to: {self.__output_dir}")
+        self.__release_part()
+        logger.info("Download of %s saved to %s", self.item_id, self.__output_dir)
         self.signals.download_completed.emit()
 
     def on_download_error(self, error: str) -> None:
@@ -152,18 +603,28 @@ class Worker(QRunnable):
         Args:
             error (str): The error message.
         """
+        self.__release_part()
         self.signals.download_error.emit(str(error))
 
     def pause_download(self) -> None:
-        """Pause the download process."""
+        """Pause the download process, leaving its bandwidth to the other downloads."""
         self.__pause_event.clear()
+        if self.__bandwidth is not None:
+            self.__bandwidth.set_idle()
 
     def resume_download(self) -> None:
         """Resume the download process."""
         self.__pause_event.set()
 
     def is_paused(self) -> None:
-        """Check if the download is currently paused."""
+        """
+        Check if the download is currently paused.
+
+        Blocks while the download is paused, after emitting any progress update
+        that was held back by the throttle.
+        """
+        if not self.__pause_event.is_set():
+            self.__progress.flush()
         self.__pause_event.wait()
 
     def is_download_cancelled(self) -> None:
@@ -176,105 +637,259 @@ class Worker(QRunnable):
         if self.__cancelled:
             raise DownloadCancelledError("Download cancelled by the user.")
 
-    def __progress(self, bytes_downloaded: int, total: int) -> None:
+    def __download_file(self, url: str) -> None:
         """
-        Emit a signal to update the progress of the download.
+        Download a file from the given URL.
 
-        This method emits a signal to update the progress of the download, indicating the
-        number of bytes downloaded and the total size of the file.
+        Data is written to a `.part` file with a sidecar tracking the committed bytes,
+        and moved to its destination once complete. The first GET request doubles as a
+        probe: if the server advertises `Accept-Ranges: bytes`, a matching partial from a
+        previous attempt is continued with Range requests, and new downloads are split
+        into parallel segments when enabled. Otherwise the body of that same response is
+        streamed from the beginning.
 
         Args:
-            bytes_downloaded (int): The number of bytes downloaded so far.
-            total (int): The total size of the file being downloaded.
-        """
-        self.signals.progress_update.emit(bytes_downloaded, total)
-
-    def __download_test(self, url: str) -> None:
-        """
-        Download test method for simulation purposes.
-
-        Args:
-            url (str): The URL of the file to be simulated for download.
+            url (str): The URL of the file to be downloaded.
 
         Raises:
-            DownloadCancelledError: If the download is cancelled by the user.
+            ValueError: If the URL is an empty string.
+            requests.exceptions.RequestException: If there is an issue with the HTTP request.
+            Non200StatusCodeError: If there is a non-200 status code.
+            MissingContentLengthError: If the 'Content-Length' header is missing.
         """
         try:
-            self.start_download()
-            total_size = int(self.video_info.get("size", 0))
-            bytes_downloaded = 0
-
-            error = True if random.randint(0, 1) else False
-
-            while bytes_downloaded < total_size:
-                self.is_paused()
-                self.is_download_cancelled()
-                chunk = random.randint(10000, 100000)
-
-                if error:
-                    time.sleep(random.random() * 2)
-                    raise ValueError("Request Error")
-
-                bytes_downloaded += chunk
-                if bytes_downloaded >= total_size:
-                    bytes_downloaded = total_size
-                self.__progress(bytes_downloaded, total_size)
+            # every running download may open a connection per segment to the host
+            self.__http.ensure_pool_size(
+                url, self.__concurrent_downloads * self.__segments
+            )
+            with self.__http.get(
+                url, stream=True, headers=self.headers, timeout=20
+            ) as response:
 
-                time.sleep(0.04)
-                # time.sleep(random.random())
-            self.on_download_complete()
+                total_size = get_content_length(response.status_code, response.headers)
 
+                self.start_download()
+                missing_info = get_missing_info(self.video_info, response.headers)
+                if missing_info:
+                    self.video_info.update(missing_info)
+                    self.signals.info_update.emit(missing_info)
+
+                stream_response = prepare_part_file(
+                    self.__part,
+                    url,
+                    total_size,
+                    response.headers,
+                    self.__segments,
+                    self.__preallocate,
+                )
+                if not stream_response:
+                    response.close()
+
+                self.__bandwidth = get_bandwidth_limiter().register(self.__weight)
+                self.__writer = PartWriter(self.__part)
+                try:
+                    if stream_response:
+                        self.__progress.reset(0)
+                        self.__write_segment(response, 0, total_size)
+                    else:
+                        self.__download_segments(url, total_size)
+                finally:
+                    self.__bandwidth.close()
+                    self.__writer.close()
+                self.__part.finalize()
+                self.on_download_complete()
+        except Non200StatusCodeError as e:
+            self.on_download_error(str(e))
+        except MissingContentLengthError as e:
+            self.on_download_error(str(e))
+        except IncompleteDownloadError as e:
+            self.on_download_error(str(e))
+        except InsufficientSpaceError as e:
+            self.on_download_error(str(e))
         except DownloadCancelledError:
             self.on_download_cancelled()
-        except Exception as ex:
-            print(str(ex))
-            self.on_download_error(str(ex))
         finally:
             self.is_running = False
 
-    def __download_file(self, url: str) -> None:
+    def __download_segments(self, url: str, total_size: int) -> None:
         """
-        Download a file from the given URL.
+        Download the unfinished segments of the partial file with HTTP Range requests.
+
+        A single remaining segment is downloaded on the current thread, several
+        segments are downloaded in parallel.
 
         Args:
             url (str): The URL of the file to be downloaded.
+            total_size (int): The total size of the file.
 
         Raises:
-            ValueError: If the URL is an empty string.
-            requests.exceptions.RequestException: If there is an issue with the HTTP request.
-            Non200StatusCodeError: If there is a non-200 status code.
-            MissingContentLengthError: If the 'Content-Length' header is missing.
+            DownloadCancelledError: If the download is cancelled by the user.
+            Exception: The first error raised by any of the segments.
+        """
+        remaining = self.__part.remaining()
+        if not len(remaining):
+            return
+
+        self.__progress.reset(self.__part.bytes_committed)
+        abort_event = Event()
+        errors: List[Exception] = []
+
+        if len(remaining) == 1:
+            self.__download_segment(url, remaining[0], total_size, abort_event, errors)
+        else:
+            thread_list: List[Thread] = []
+            for index in remaining:
+                thread = Thread(
+                    target=self.__download_segment,
+                    args=(url, index, total_size, abort_event, errors),
+                    daemon=True,
+                )
+                thread_list.append(thread)
+                thread.start()
+
+            for thread in thread_list:
+                thread.join()
+
+        self.is_download_cancelled()
+        if len(errors):
+            raise errors[0]
+
+    def __download_segment(
+        self,
+        url: str,
+        index: int,
+        total_size: int,
+        abort_event: Event,
+        errors: List[Exception],
+    ) -> None:
+        """
+        Download the rest of a single segment and write it at its offset.
+
+        Any error is stored in `errors` and signals the other segments to stop.
+
+        Args:
+            url (str): The URL of the file to be downloaded.
+            index (int): The index of the segment in the partial file.
+            total_size (int): The total size of the file.
+            abort_event (Event): Set when any segment fails or is cancelled.
+            errors (List[Exception]): Shared list collecting segment errors.
         """
         try:
-            with requests.get(
-                url, stream=True, headers=self.headers, timeout=20
+            start, end, committed = self.__part.segments[index]
+            first_byte = start + committed
+            last_byte = "" if end == total_size - 1 else end
+
+            headers = dict(self.headers)
+            headers["Range"] = f"bytes={first_byte}-{last_byte}"
+            with self.__http.get(
+                url, stream=True, headers=headers, timeout=20
             ) as response:
-
-                if response.status_code != 200:
+                if response.status_code != 206:
                     raise Non200StatusCodeError(
                         f"Unexpected status code: {response.status_code}"
                     )
+                self.__write_segment(response, index, total_size, abort_event)
+        except DownloadCancelledError:
+            abort_event.set()
+        except Exception as ex:
+            errors.append(ex)
+            abort_event.set()
+
+    def __write_segment(
+        self,
+        response: requests.Response,
+        index: int,
+        total_size: int,
+        abort_event: Optional[Event] = None,
+    ) -> None:
+        """
+        Stream a response into the partial file at the offset of a segment.
 
-                total_size = int(response.headers.get("content-length", 0))
+        Chunks are handed to the write-behind disk writer, which commits them to
+        the sidecar once they are on disk, so an interrupted download can be resumed.
 
-                if not total_size:
-                    raise MissingContentLengthError("Content-Length header is missing")
+        Args:
+            response (requests.Response): The response to read from.
+            index (int): The index of the segment in the partial file.
+            total_size (int): The total size of the file.
+            abort_event (Optional[Event]): Set when another segment fails.
 
-                self.start_download()
-                bytes_downloaded = 0
-                with open(self.destination_path, "wb") as file:
-                    for chunk in response.iter_content(chunk_size=10 * 1024):
-                        self.is_paused()
-                        self.is_download_cancelled()
-                        bytes_downloaded += len(chunk)
-                        self.__progress(bytes_downloaded, total_size)
-                        file.write(chunk)
-                self.on_download_complete()
-        except Non200StatusCodeError as e:
-            self.on_download_error(str(e))
-        except MissingContentLengthError as e:
-            self.on_download_error(str(e))
-        except DownloadCancelledError:
-            self.on_download_cancelled()
-        finally:
-            self.is_running = False
+        Raises:
+            DownloadCancelledError: If the download is cancelled by the user.
+            IncompleteDownloadError: If the response ends before the segment is complete.
+        """
+        start, end, committed = self.__part.segments[index]
+        offset = start + committed
+
+        def check() -> None:
+            self.is_download_cancelled()
+            if abort_event is not None and abort_event.is_set():
+                raise DownloadCancelledError("Download aborted.")
+
+        for chunk in self.__iter_chunks(response):
+            self.is_paused()
+            self.is_download_cancelled()
+            if abort_event is not None and abort_event.is_set():
+                return
+            if offset + len(chunk) > end + 1:
+                chunk = chunk[: end + 1 - offset]
+            # the writer releases the chunk once written, keep only its size
+            size = len(chunk)
+            self.__writer.write(index, offset, chunk, check)
+            offset += size
+            self.__progress.add(size, total_size)
+            if offset > end:
+                break
+            delay = self.__bandwidth.reserve(size)
+            if delay > 0:
+                self.__wait_for_bandwidth(delay, check)
+
+        if offset != end + 1:
+            raise IncompleteDownloadError(
+                f"Incomplete download: {offset - start} of {end - start + 1} bytes received"
+            )
+
+    def __wait_for_bandwidth(self, delay: float, check: Callable[[], None]) -> None:
+        """
+        Sleep until the bandwidth limit allows receiving more data.
+
+        Args:
+            delay (float): The number of seconds to wait.
+            check (Callable[[], None]): Raises if the download is cancelled or aborted.
+        """
+        deadline = time.monotonic() + delay
+        while True:
+            check()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, 0.1))
+
+    def __iter_chunks(self, response: requests.Response) -> Iterator[bytes]:
+        """
+        Read the body of a response in chunks sized to the measured throughput.
+
+        urllib3's `read1` is used when available, so a read returns as soon as
+        some data has arrived and pausing or cancelling is never held up by a
+        partially received chunk.
+
+        Args:
+            response (requests.Response): The streamed response to read from.
+
+        Yields:
+            bytes: The next chunk of the body.
+        """
+        chunk_size = AdaptiveChunkSize(self.__min_chunk_size, self.__max_chunk_size)
+
+        read = getattr(response.raw, "read1", response.raw.read)
+        while True:
+            started = time.monotonic()
+            chunk = read(chunk_size.size, decode_content=True)
+            if not chunk:
+                break
+            chunk_size.update(len(chunk), time.monotonic() - started)
+            yield chunk
+
+        # the body was read without iter_content, hand the connection back to
+        # the pool so closing the response does not drop it
+        response.raw.release_conn()